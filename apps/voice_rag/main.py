@@ -10,6 +10,7 @@ from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
 from vocode.streaming.client_backend.conversation import ConversationRouter
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.vector_db.factory import VectorDBFactory
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
 from vocode.streaming.vector_db.pinecone import PineconeConfig
 from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
 
@@ -29,9 +30,15 @@ logging.basicConfig()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-vector_db_config = PineconeConfig(
-    index=os.getenv('PINECONE_INDEX_NAME')
-)
+# set LOCAL_VECTOR_DB_PATH to search a local store (see LocalVectorDB) instead of Pinecone
+if os.getenv('LOCAL_VECTOR_DB_PATH'):
+    vector_db_config = LocalVectorDBConfig(
+        path=os.getenv('LOCAL_VECTOR_DB_PATH')
+    )
+else:
+    vector_db_config = PineconeConfig(
+        index=os.getenv('PINECONE_INDEX_NAME')
+    )
 
 INITIAL_MESSAGE="Hello!"
 PROMPT_PREAMBLE='''
@@ -43,6 +43,7 @@ from vocode.streaming.models.synthesizer import (
     PlayHtSynthesizerConfig,
     RimeSynthesizerConfig,
     StreamElementsSynthesizerConfig,
+    SYNTHESIZER_DEFAULT_FIRST_CHUNK_SIZE_SECONDS,
 )
 from vocode.streaming.models.transcriber import (
     DeepgramTranscriberConfig,
@@ -157,6 +158,13 @@ parser.add_argument(
     default="Alice was beginning to get very tired of sitting by her sister on the bank, and of having nothing to do: once or twice she had peeped into the book her sister was reading, but it had no pictures or conversations in it, “and what is the use of a book,” thought Alice “without pictures or conversations?”",
     help="The text for synthesizers to synthesize",
 )
+parser.add_argument(
+    "--synthesizer_first_chunk_size_seconds",
+    type=float,
+    default=SYNTHESIZER_DEFAULT_FIRST_CHUNK_SIZE_SECONDS,
+    help="The size of the first synthesized chunk, which ramps up to 1 second. "
+    + "Set to 0 to use 1 second chunks throughout (compare the create_first latencies).",
+)
 parser.add_argument(
     "--agent_prompt_preamble",
     type=str,
@@ -396,6 +404,9 @@ async def run_synthesizers():
                 extra_config["voice_id"] = "larry"
             elif synthesizer_name == "rime":
                 extra_config["speaker"] = "young_male_unmarked-1"
+            extra_config[
+                "first_chunk_size_seconds"
+            ] = args.synthesizer_first_chunk_size_seconds
             synthesizer = synthesizer_class(
                 synthesizer_config_class.from_output_device(file_output, **extra_config)
             )
@@ -514,7 +525,10 @@ async def run_transcribers():
                     break
             if not args.transcriber_use_mic:
                 pbar.update(pbar.total - pbar.n)
-            transcriber.terminate()
+            # websocket transcribers terminate asynchronously
+            terminated = transcriber.terminate()
+            if asyncio.iscoroutine(terminated):
+                await terminated
 
 
 def create_graphs(final_results):
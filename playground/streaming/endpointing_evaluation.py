@@ -0,0 +1,210 @@
+"""Compares endpointing strategies offline over labelled call recordings.
+
+Replays each call's word timings (and audio, if given) through every endpointer
+in 50ms steps, as a streaming transcriber would see them, and reports the
+average delay between a labelled end of turn and the endpointer ending the
+turn, against how often it ends a turn while the caller is still speaking.
+
+The labels file has one call per line:
+
+    {"audio_path": "call.wav", "words": [{"word": "hi", "punctuated_word": "Hi.",
+     "start": 0.52, "end": 0.81}, ...], "turn_ends": [0.81, 6.2, ...]}
+
+- words: the caller's words with timings in seconds, e.g. from a recorded
+  Deepgram transcript with punctuation on (`punctuated_word` is optional)
+- turn_ends: the end of the last word of each of the caller's turns, as labelled
+  by listening to the call
+- audio_path: optional recording of the caller, for the energy feature; relative
+  paths are relative to the labels file
+
+An endpointer that ends a turn after a word that isn't a labelled turn end has
+cut the caller off. A labelled turn end that no endpointer decision follows
+before the caller's next word is missed.
+
+Example usage:
+    python -m playground.streaming.endpointing_evaluation --labels calls.jsonl
+    python -m playground.streaming.endpointing_evaluation --labels calls.jsonl \\
+        --time_cutoffs 0.4 2 --thresholds 0.4 0.5 0.6
+"""
+
+import argparse
+import bisect
+import json
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from playground.streaming.fakes import load_audio
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.transcriber import ClassifierEndpointingConfig
+from vocode.streaming.transcriber.endpointing import (
+    AudioEnergyTracker,
+    EndpointingClassifier,
+    EndpointingFeatures,
+)
+
+SAMPLING_RATE = 16000
+# 20ms of linear16
+CHUNK_SIZE = 640
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--labels", type=str, required=True)
+parser.add_argument(
+    "--time_cutoffs", type=float, nargs="+", default=[0.4, 0.8, 1.2, 2.0]
+)
+parser.add_argument("--thresholds", type=float, nargs="+", default=[0.3, 0.5, 0.7])
+parser.add_argument("--step_seconds", type=float, default=0.05)
+# how long after a word starts it shows up in an interim transcript
+parser.add_argument("--transcript_delay_seconds", type=float, default=0.1)
+# how far a decision's last word can be from a labelled turn end to count as it
+parser.add_argument("--tolerance_seconds", type=float, default=0.1)
+
+# (transcript of the turn so far, seconds of silence, energy ratio of the last word)
+Endpointer = Callable[[str, float, Optional[float]], bool]
+
+
+def get_time_endpointer(time_cutoff_seconds: float) -> Endpointer:
+    return lambda transcript, silence_seconds, _: silence_seconds > time_cutoff_seconds
+
+
+def get_classifier_endpointer(threshold: float) -> Endpointer:
+    classifier = EndpointingClassifier(ClassifierEndpointingConfig(threshold=threshold))
+
+    def endpointer(
+        transcript: str, silence_seconds: float, energy_ratio: Optional[float]
+    ) -> bool:
+        features = EndpointingFeatures.from_transcript(
+            transcript, silence_seconds, energy_ratio
+        )
+        return classifier.is_end_of_turn(transcript, features)
+
+    return endpointer
+
+
+def simulate(
+    call: dict, endpointer: Endpointer, audio: Optional[bytes], args
+) -> List[Tuple[float, float]]:
+    """(time the turn was ended, end of the last word heard) of each decision"""
+    words = call["words"]
+    # interim transcripts show a word shortly after it starts
+    word_starts = [word["start"] + args.transcript_delay_seconds for word in words]
+    energy_tracker = AudioEnergyTracker(AudioEncoding.LINEAR16)
+    audio_position = 0
+    decisions = []
+    turn_start = 0
+    end_time = words[-1]["end"] + 5
+    num_steps = int(end_time / args.step_seconds) + 1
+    for step in range(num_steps):
+        time = step * args.step_seconds
+        if audio is not None:
+            while (
+                audio_position + CHUNK_SIZE <= len(audio)
+                and (audio_position + CHUNK_SIZE) / 2 / SAMPLING_RATE <= time
+            ):
+                audio_position += CHUNK_SIZE
+                energy_tracker.add(
+                    audio[audio_position - CHUNK_SIZE : audio_position],
+                    audio_position / 2 / SAMPLING_RATE,
+                )
+        num_heard = bisect.bisect_right(word_starts, time)
+        if num_heard <= turn_start:
+            continue
+        last_word = words[num_heard - 1]
+        transcript = " ".join(
+            word.get("punctuated_word", word["word"])
+            for word in words[turn_start:num_heard]
+        )
+        energy_ratio = (
+            energy_tracker.get_energy_ratio(last_word["start"], last_word["end"])
+            if audio is not None
+            else None
+        )
+        silence_seconds = max(time - last_word["end"], 0.0)
+        if endpointer(transcript, silence_seconds, energy_ratio):
+            decisions.append((time, last_word["end"]))
+            turn_start = num_heard
+    return decisions
+
+
+def score(
+    decisions: List[Tuple[float, float]], turn_ends: List[float], tolerance: float
+) -> Tuple[List[float], int, int]:
+    """Delays of the decisions that ended a labelled turn, cut-offs and missed turn ends"""
+    delays = []
+    cut_offs = 0
+    ended_turns = set()
+    for decision_time, last_word_end in decisions:
+        turn_index = next(
+            (
+                i
+                for i, turn_end in enumerate(turn_ends)
+                if abs(turn_end - last_word_end) <= tolerance
+            ),
+            None,
+        )
+        if turn_index is None:
+            cut_offs += 1
+        else:
+            delays.append(decision_time - turn_ends[turn_index])
+            ended_turns.add(turn_index)
+    return delays, cut_offs, len(turn_ends) - len(ended_turns)
+
+
+def load_calls(labels_path: str) -> List[dict]:
+    with open(labels_path) as f:
+        calls = [json.loads(line) for line in f if line.strip()]
+    for call in calls:
+        if call.get("audio_path") and not os.path.isabs(call["audio_path"]):
+            call["audio_path"] = os.path.join(
+                os.path.dirname(os.path.abspath(labels_path)), call["audio_path"]
+            )
+    return calls
+
+
+def main():
+    args = parser.parse_args()
+    calls = [call for call in load_calls(args.labels) if call["words"]]
+    endpointers: Dict[str, Endpointer] = {}
+    for time_cutoff_seconds in args.time_cutoffs:
+        endpointers[f"time {time_cutoff_seconds}s"] = get_time_endpointer(
+            time_cutoff_seconds
+        )
+    for threshold in args.thresholds:
+        endpointers[f"classifier {threshold}"] = get_classifier_endpointer(threshold)
+
+    num_turns = sum(len(call["turn_ends"]) for call in calls)
+    print(f"{len(calls)} calls, {num_turns} labelled turn ends")
+    print(
+        f"  {'endpointer':16} {'avg delay':>10} {'p90 delay':>10}"
+        f" {'cut-off rate':>13} {'missed':>7}"
+    )
+    for name, endpointer in endpointers.items():
+        delays: List[float] = []
+        cut_offs = 0
+        missed = 0
+        num_decisions = 0
+        for call in calls:
+            audio = (
+                load_audio(call["audio_path"], SAMPLING_RATE, AudioEncoding.LINEAR16)
+                if call.get("audio_path")
+                else None
+            )
+            decisions = simulate(call, endpointer, audio, args)
+            call_delays, call_cut_offs, call_missed = score(
+                decisions, call["turn_ends"], args.tolerance_seconds
+            )
+            delays.extend(call_delays)
+            cut_offs += call_cut_offs
+            missed += call_missed
+            num_decisions += len(decisions)
+        delays.sort()
+        avg_delay = sum(delays) / len(delays) if delays else float("nan")
+        p90_delay = delays[int(0.9 * (len(delays) - 1))] if delays else float("nan")
+        cut_off_rate = cut_offs / num_decisions if num_decisions else 0.0
+        print(
+            f"  {name:16} {avg_delay:9.2f}s {p90_delay:9.2f}s"
+            f" {cut_off_rate:12.1%} {missed / max(num_turns, 1):7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
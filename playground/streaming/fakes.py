@@ -0,0 +1,359 @@
+"""Local stand-ins for transcribers, agents, synthesizers and telephony output devices.
+
+They behave like the real providers as far as StreamingConversation can tell
+(latency, chunking, queueing) without touching the network or sound devices,
+so that many conversations can be run in one process by load_benchmark.py.
+"""
+
+import asyncio
+import audioop
+import logging
+import math
+import random
+from functools import lru_cache
+from typing import AsyncGenerator, List, Optional, Set, Tuple
+
+import aiohttp
+
+from vocode.streaming.agent.base_agent import RespondAgent
+from vocode.streaming.agent.factory import AgentFactory
+from vocode.streaming.agent.bot_sentiment_analyser import BotSentiment
+from vocode.streaming.constants import AUDIO_QUEUE_MAX_SIZE
+from vocode.streaming.models.agent import AgentConfig
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.model import BaseModel
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.models.transcriber import TranscriberConfig
+from vocode.streaming.output_device.base_output_device import BaseOutputDevice
+from vocode.streaming.synthesizer.base_synthesizer import (
+    BaseSynthesizer,
+    SynthesisResult,
+)
+from vocode.streaming.synthesizer.factory import SynthesizerFactory
+from vocode.streaming.transcriber.base_transcriber import (
+    BaseAsyncTranscriber,
+    Transcription,
+)
+from vocode.streaming.transcriber.factory import TranscriberFactory
+from vocode.streaming.utils import (
+    convert_wav,
+    get_chunk_size_per_second,
+    get_chunk_sizes,
+    split_audio,
+)
+from vocode.streaming.utils.bounded_queue import BoundedQueue, OverflowPolicy
+from vocode.streaming.utils.turn_timeline import TurnMark, mark_current_turn
+from vocode.streaming.utils.cache import RedisRenewableTTLCache
+
+# z-score of the 95th percentile of a standard normal distribution
+P95_Z_SCORE = 1.645
+FAKE_WORDS = "so I was wondering whether you could help me change my appointment to next week".split()
+
+
+class LatencyDistribution(BaseModel):
+    """Log-normal latency given its median and 95th percentile, in seconds"""
+
+    median_seconds: float
+    p95_seconds: float
+
+    @classmethod
+    def parse(cls, value: str) -> "LatencyDistribution":
+        """Parses "<median>,<p95>" or a single constant latency"""
+        median, _, p95 = value.partition(",")
+        return cls(median_seconds=float(median), p95_seconds=float(p95 or median))
+
+    def sample(self) -> float:
+        if self.median_seconds <= 0:
+            return 0.0
+        sigma = math.log(max(self.p95_seconds, self.median_seconds) / self.median_seconds) / P95_Z_SCORE
+        return random.lognormvariate(math.log(self.median_seconds), sigma)
+
+
+@lru_cache(maxsize=None)
+def load_audio(
+    audio_path: str, sampling_rate: int, audio_encoding: AudioEncoding
+) -> bytes:
+    """Recorded audio in the given format, converted once per process"""
+    return convert_wav(
+        audio_path, output_sample_rate=sampling_rate, output_encoding=audio_encoding
+    )
+
+
+def get_silence(audio_encoding: AudioEncoding, num_bytes: int) -> bytes:
+    # 0xff is digital silence in mu-law
+    return (b"\xff" if audio_encoding == AudioEncoding.MULAW else b"\x00") * num_bytes
+
+
+def get_rms(chunk: bytes, audio_encoding: AudioEncoding) -> int:
+    if audio_encoding == AudioEncoding.MULAW:
+        chunk = audioop.ulaw2lin(chunk, 2)
+    return audioop.rms(chunk, 2)
+
+
+class FakeTranscriberConfig(TranscriberConfig, type="transcriber_fake"):
+    # StreamingConversation compares every transcription against this
+    min_interrupt_confidence: Optional[float] = 0.0
+    latency: LatencyDistribution = LatencyDistribution(median_seconds=0.3, p95_seconds=0.6)
+    # frames quieter than this are silence; the fake caller sends digital silence between utterances
+    speech_rms_threshold: int = 1
+    endpointing_silence_seconds: float = 0.4
+    interim_interval_seconds: float = 0.5
+    words_per_second: float = 2.5
+
+
+class FakeTranscriber(BaseAsyncTranscriber[FakeTranscriberConfig]):
+    """Energy-based endpointing on the incoming audio, with a sampled delay before
+    each transcription is emitted, like a streaming ASR socket"""
+
+    def __init__(self, transcriber_config: FakeTranscriberConfig, **kwargs):
+        super().__init__(transcriber_config, **kwargs)
+        self.bytes_per_second = get_chunk_size_per_second(
+            transcriber_config.audio_encoding, transcriber_config.sampling_rate
+        )
+        self.pending_transcriptions: Set[asyncio.Task] = set()
+        # transcriptions are emitted in order, as they would be on a single socket
+        self.last_emit_time = 0.0
+
+    def get_message(self, speech_seconds: float) -> str:
+        num_words = max(3, int(speech_seconds * self.transcriber_config.words_per_second))
+        return " ".join(FAKE_WORDS[i % len(FAKE_WORDS)] for i in range(num_words))
+
+    async def emit(self, transcription: Transcription, emit_time: float):
+        await asyncio.sleep(emit_time - asyncio.get_running_loop().time())
+        self.output_queue.put_nowait(transcription)
+
+    def schedule(self, speech_seconds: float, is_final: bool):
+        transcription = Transcription(
+            message=self.get_message(speech_seconds),
+            confidence=1.0,
+            is_final=is_final,
+            latency=self.transcriber_config.latency.sample(),
+        )
+        emit_time = max(
+            asyncio.get_running_loop().time() + (transcription.latency or 0),
+            self.last_emit_time,
+        )
+        self.last_emit_time = emit_time
+        task = asyncio.create_task(self.emit(transcription, emit_time))
+        self.pending_transcriptions.add(task)
+        task.add_done_callback(self.pending_transcriptions.discard)
+
+    async def _run_loop(self):
+        config = self.transcriber_config
+        speech_seconds = 0.0
+        silence_seconds = 0.0
+        last_interim_seconds = 0.0
+        while True:
+            chunk = await self.input_queue.get()
+            chunk_seconds = len(chunk) / self.bytes_per_second
+            if get_rms(chunk, config.audio_encoding) >= config.speech_rms_threshold:
+                speech_seconds += chunk_seconds
+                silence_seconds = 0.0
+                if speech_seconds - last_interim_seconds >= config.interim_interval_seconds:
+                    last_interim_seconds = speech_seconds
+                    self.schedule(speech_seconds, is_final=False)
+                continue
+            silence_seconds += chunk_seconds
+            if speech_seconds > 0 and silence_seconds >= config.endpointing_silence_seconds:
+                self.schedule(speech_seconds, is_final=True)
+                speech_seconds = 0.0
+                last_interim_seconds = 0.0
+
+    async def terminate(self):
+        for task in list(self.pending_transcriptions):
+            task.cancel()
+        super().terminate()
+
+
+class FakeAgentConfig(AgentConfig, type="agent_fake"):
+    # time to the first sentence, then between sentences
+    first_response_latency: LatencyDistribution = LatencyDistribution(
+        median_seconds=0.5, p95_seconds=1.2
+    )
+    sentence_latency: LatencyDistribution = LatencyDistribution(
+        median_seconds=0.3, p95_seconds=0.6
+    )
+    response_sentences: List[str] = [
+        "Sure, I can help you with that.",
+        "Which day next week works best for you?",
+    ]
+
+
+class FakeAgent(RespondAgent[FakeAgentConfig]):
+    """Streams canned sentences with sampled delays, like a streaming LLM"""
+
+    async def respond(
+        self,
+        human_input,
+        conversation_id: str,
+        is_interrupt: bool = False,
+    ) -> Tuple[str, bool]:
+        await asyncio.sleep(self.agent_config.first_response_latency.sample())
+        return " ".join(self.agent_config.response_sentences), False
+
+    async def generate_response(
+        self,
+        human_input,
+        conversation_id: str,
+        is_interrupt: bool = False,
+    ) -> AsyncGenerator[Tuple[str, bool], None]:
+        latency = self.agent_config.first_response_latency
+        for sentence in self.agent_config.response_sentences:
+            await asyncio.sleep(latency.sample())
+            latency = self.agent_config.sentence_latency
+            # sentences arrive whole, so the first token is the first sentence
+            mark_current_turn(TurnMark.LLM_FIRST_TOKEN)
+            yield sentence, True
+
+    def update_last_bot_message_on_cut_off(self, message: str):
+        pass
+
+
+class FakeSynthesizerConfig(SynthesizerConfig, type="synthesizer_fake"):
+    audio_path: str
+    time_to_first_byte: LatencyDistribution = LatencyDistribution(
+        median_seconds=0.2, p95_seconds=0.4
+    )
+    seconds_per_word: float = 0.35
+    # synthesis runs faster than real time, chunks after the first arrive this much faster than they play
+    real_time_factor: float = 5.0
+
+
+class FakeSynthesizer(BaseSynthesizer[FakeSynthesizerConfig]):
+    """Streams slices of a recording (looped to the length of the message) after a sampled time to first byte"""
+
+    def __init__(self, synthesizer_config: FakeSynthesizerConfig, **kwargs):
+        super().__init__(synthesizer_config, **kwargs)
+        self.audio = load_audio(
+            synthesizer_config.audio_path,
+            synthesizer_config.sampling_rate,
+            synthesizer_config.audio_encoding,
+        )
+        self.bytes_per_second = get_chunk_size_per_second(
+            synthesizer_config.audio_encoding, synthesizer_config.sampling_rate
+        )
+
+    def get_audio(self, message: BaseMessage) -> bytes:
+        sample_width = 2 if self.synthesizer_config.audio_encoding == AudioEncoding.LINEAR16 else 1
+        num_words = max(len(message.text.split()), 1)
+        num_bytes = int(num_words * self.synthesizer_config.seconds_per_word * self.bytes_per_second)
+        num_bytes = num_bytes // sample_width * sample_width
+        num_loops = num_bytes // len(self.audio) + 1
+        return (self.audio * num_loops)[:num_bytes]
+
+    async def create_speech(
+        self,
+        message: BaseMessage,
+        chunk_size: int,
+        bot_sentiment: Optional[BotSentiment] = None,
+        return_tuple: bool = False,
+    ):
+        output_bytes = self.get_audio(message)
+        chunk_sizes = get_chunk_sizes(
+            self.synthesizer_config.audio_encoding,
+            self.synthesizer_config.sampling_rate,
+            chunk_size,
+            self.synthesizer_config.first_chunk_size_seconds,
+        )
+
+        async def chunk_generator():
+            await asyncio.sleep(self.synthesizer_config.time_to_first_byte.sample())
+            mark_current_turn(TurnMark.TTS_FIRST_BYTE)
+            for chunk, is_last_chunk in split_audio(output_bytes, chunk_sizes):
+                yield SynthesisResult.ChunkResult(chunk, is_last_chunk)
+                await asyncio.sleep(
+                    len(chunk) / self.bytes_per_second / self.synthesizer_config.real_time_factor
+                )
+
+        synthesis_result = SynthesisResult(
+            chunk_generator(),
+            lambda seconds: self.get_message_cutoff_from_total_response_length(
+                self.synthesizer_config, message, seconds, len(output_bytes)
+            ),
+        )
+        if return_tuple:
+            return synthesis_result, message
+        return synthesis_result
+
+
+class FakeTelephonyOutputDevice(BaseOutputDevice):
+    """Queues audio like TwilioOutputDevice and records when it arrives instead of sending it"""
+
+    def __init__(
+        self,
+        sampling_rate: int,
+        audio_encoding: AudioEncoding,
+        max_queue_size: int = AUDIO_QUEUE_MAX_SIZE,
+    ):
+        super().__init__(sampling_rate=sampling_rate, audio_encoding=audio_encoding)
+        self.queue: asyncio.Queue[bytes] = BoundedQueue(
+            "output_device.fake.queue",
+            maxsize=max_queue_size,
+            overflow_policy=OverflowPolicy.DROP_OLDEST,
+        )
+        self.audio_received = asyncio.Event()
+        self.last_audio_time: Optional[float] = None
+        self.bytes_received = 0
+        self.process_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.process_task = asyncio.create_task(self.process())
+
+    async def process(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await self.queue.get()
+            self.bytes_received += len(chunk)
+            self.last_audio_time = loop.time()
+            self.audio_received.set()
+
+    def consume_nonblocking(self, chunk: bytes):
+        self.queue.put_nowait(chunk)
+
+    def terminate(self):
+        if self.process_task:
+            self.process_task.cancel()
+
+
+class FakeTranscriberFactory(TranscriberFactory):
+    def create_transcriber(
+        self,
+        transcriber_config: TranscriberConfig,
+        logger: Optional[logging.Logger] = None,
+    ):
+        if isinstance(transcriber_config, FakeTranscriberConfig):
+            return FakeTranscriber(transcriber_config, logger=logger)
+        return super().create_transcriber(transcriber_config, logger=logger)
+
+
+class FakeAgentFactory(AgentFactory):
+    def create_agent(
+        self, agent_config: AgentConfig, logger: Optional[logging.Logger] = None
+    ):
+        if isinstance(agent_config, FakeAgentConfig):
+            return FakeAgent(agent_config=agent_config, logger=logger)
+        return super().create_agent(agent_config, logger=logger)
+
+
+class FakeSynthesizerFactory(SynthesizerFactory):
+    def create_synthesizer(
+        self,
+        synthesizer_config: SynthesizerConfig,
+        synthesizer_cache: Optional[RedisRenewableTTLCache] = None,
+        logger: Optional[logging.Logger] = None,
+        aiohttp_session: Optional[aiohttp.ClientSession] = None,
+    ):
+        if isinstance(synthesizer_config, FakeSynthesizerConfig):
+            return FakeSynthesizer(
+                synthesizer_config,
+                cache=synthesizer_cache,
+                logger=logger,
+                aiohttp_session=aiohttp_session,
+            )
+        return super().create_synthesizer(
+            synthesizer_config,
+            synthesizer_cache=synthesizer_cache,
+            logger=logger,
+            aiohttp_session=aiohttp_session,
+        )
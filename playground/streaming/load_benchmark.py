@@ -0,0 +1,357 @@
+"""Runs many StreamingConversations in one process against local fake providers.
+
+Each simulated call streams recorded caller audio in real time 20ms frames (like
+a telephony websocket), waits for the bot to answer and to finish speaking, and
+repeats for a number of turns. Reports CPU per call, event loop lag, memory per
+call and turn latency, so that nodes can be sized and regressions caught without
+network access or sound devices.
+
+Example usage:
+    python -m playground.streaming.load_benchmark --num_calls 200 --ramp_up_seconds 20 --output_json results.json
+    python -m playground.streaming.load_benchmark --num_calls 200 --baseline_json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import resource
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from playground.streaming.fakes import (
+    FakeAgent,
+    FakeAgentConfig,
+    FakeSynthesizer,
+    FakeSynthesizerConfig,
+    FakeTelephonyOutputDevice,
+    FakeTranscriber,
+    FakeTranscriberConfig,
+    LatencyDistribution,
+    get_silence,
+    load_audio,
+)
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.streaming_conversation import StreamingConversation
+from vocode.streaming.telephony.constants import DEFAULT_CHUNK_SIZE
+from vocode.streaming.utils import get_chunk_size_per_second
+
+DEFAULT_AUDIO_PATH = os.path.join(os.path.dirname(__file__), "test.wav")
+CALLER_FRAME_SECONDS = 0.02
+PERCENTILES = [50, 90, 99]
+
+logger = logging.getLogger(__name__)
+
+parser = argparse.ArgumentParser(
+    description="Load test StreamingConversation with fake transcribers, agents and synthesizers."
+)
+parser.add_argument("--num_calls", type=int, default=50, help="Number of concurrent calls")
+parser.add_argument("--turns", type=int, default=5, help="Caller utterances per call")
+parser.add_argument(
+    "--ramp_up_seconds",
+    type=float,
+    default=10.0,
+    help="Calls are started evenly over this many seconds",
+)
+parser.add_argument(
+    "--audio_path",
+    type=str,
+    default=DEFAULT_AUDIO_PATH,
+    help="Recording used for both caller and bot audio",
+)
+parser.add_argument("--sampling_rate", type=int, default=8000)
+parser.add_argument(
+    "--audio_encoding",
+    type=AudioEncoding,
+    default=AudioEncoding.MULAW,
+    choices=list(AudioEncoding),
+)
+parser.add_argument("--utterance_seconds", type=float, default=2.0)
+parser.add_argument(
+    "--think_time",
+    type=LatencyDistribution.parse,
+    default=LatencyDistribution(median_seconds=0.7, p95_seconds=1.5),
+    help="Pause between the bot finishing and the caller speaking, as <median>,<p95> seconds",
+)
+parser.add_argument(
+    "--transcriber_latency",
+    type=LatencyDistribution.parse,
+    default=FakeTranscriberConfig.__fields__["latency"].default,
+    help="<median>,<p95> seconds",
+)
+parser.add_argument(
+    "--agent_latency",
+    type=LatencyDistribution.parse,
+    default=FakeAgentConfig.__fields__["first_response_latency"].default,
+    help="Time to the first sentence, <median>,<p95> seconds",
+)
+parser.add_argument(
+    "--synthesizer_latency",
+    type=LatencyDistribution.parse,
+    default=FakeSynthesizerConfig.__fields__["time_to_first_byte"].default,
+    help="Time to first byte, <median>,<p95> seconds",
+)
+parser.add_argument(
+    "--bot_idle_seconds",
+    type=float,
+    default=1.5,
+    help="The bot is considered done speaking after this long without audio",
+)
+parser.add_argument("--turn_timeout_seconds", type=float, default=15.0)
+parser.add_argument("--lag_interval_seconds", type=float, default=0.05)
+parser.add_argument("--seed", type=int, default=None)
+parser.add_argument("--log_level", type=str, default="WARNING")
+parser.add_argument("--output_json", type=str, default=None, help="Write the results here")
+parser.add_argument(
+    "--baseline_json",
+    type=str,
+    default=None,
+    help="Print the change of each result against an earlier --output_json",
+)
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def get_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class LoadTestStats:
+    def __init__(self):
+        self.turn_latencies: List[float] = []
+        self.timed_out_turns = 0
+        self.failed_calls = 0
+        self.call_seconds = 0.0
+        self.loop_lags: List[float] = []
+        self.base_rss_bytes = 0
+        self.peak_rss_bytes = 0
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a sleep of `interval` seconds"""
+
+    def __init__(self, stats: LoadTestStats, interval: float):
+        self.stats = stats
+        self.interval = interval
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.stats.loop_lags.append(max(loop.time() - expected, 0.0))
+            self.stats.peak_rss_bytes = max(self.stats.peak_rss_bytes, get_rss_bytes())
+
+
+class CallerSimulator:
+    """Streams caller audio in real time frames: speech when asked to speak, silence otherwise"""
+
+    def __init__(
+        self,
+        send_frame: Callable[[bytes], Awaitable[None]],
+        audio: bytes,
+        audio_encoding: AudioEncoding,
+        sampling_rate: int,
+    ):
+        self.send_frame = send_frame
+        self.audio = audio
+        self.bytes_per_second = get_chunk_size_per_second(audio_encoding, sampling_rate)
+        sample_width = 2 if audio_encoding == AudioEncoding.LINEAR16 else 1
+        self.frame_size = int(self.bytes_per_second * CALLER_FRAME_SECONDS) // sample_width * sample_width
+        self.silence = get_silence(audio_encoding, self.frame_size)
+        self.speech = b""
+        self.speech_sent = asyncio.Event()
+
+    async def speak(self, seconds: float) -> float:
+        """Returns the loop time at which the last speech frame was sent"""
+        num_bytes = int(seconds * self.bytes_per_second) // self.frame_size * self.frame_size
+        offset = random.randrange(0, len(self.audio) // self.frame_size) * self.frame_size
+        looped_audio = self.audio * (num_bytes // len(self.audio) + 2)
+        self.speech = looped_audio[offset : offset + num_bytes]
+        self.speech_sent.clear()
+        await self.speech_sent.wait()
+        return asyncio.get_running_loop().time()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_frame_time = loop.time()
+        while True:
+            if self.speech:
+                frame, self.speech = self.speech[: self.frame_size], self.speech[self.frame_size :]
+                if not self.speech:
+                    self.speech_sent.set()
+            else:
+                frame = self.silence
+            await self.send_frame(frame)
+            next_frame_time += CALLER_FRAME_SECONDS
+            await asyncio.sleep(max(next_frame_time - loop.time(), 0))
+
+
+async def wait_for_bot_to_finish(output_device: Any, idle_seconds: float):
+    """Waits until `output_device.last_audio_time` is `idle_seconds` old"""
+    loop = asyncio.get_running_loop()
+    while (
+        output_device.last_audio_time is not None
+        and loop.time() - output_device.last_audio_time < idle_seconds
+    ):
+        await asyncio.sleep(0.1)
+
+
+async def run_call(args: argparse.Namespace, stats: LoadTestStats, audio: bytes):
+    loop = asyncio.get_running_loop()
+    output_device = FakeTelephonyOutputDevice(
+        sampling_rate=args.sampling_rate, audio_encoding=args.audio_encoding
+    )
+    conversation = StreamingConversation(
+        output_device=output_device,
+        transcriber=FakeTranscriber(
+            FakeTranscriberConfig(
+                sampling_rate=args.sampling_rate,
+                audio_encoding=args.audio_encoding,
+                chunk_size=DEFAULT_CHUNK_SIZE,
+                latency=args.transcriber_latency,
+            ),
+            logger=logger,
+        ),
+        agent=FakeAgent(
+            FakeAgentConfig(
+                initial_message=BaseMessage(text="Hi there, how can I help you today?"),
+                first_response_latency=args.agent_latency,
+            ),
+            logger=logger,
+        ),
+        synthesizer=FakeSynthesizer(
+            FakeSynthesizerConfig.from_output_device(
+                output_device,
+                audio_path=args.audio_path,
+                time_to_first_byte=args.synthesizer_latency,
+            ),
+            logger=logger,
+        ),
+        logger=logger,
+    )
+
+    async def send_frame(frame: bytes):
+        conversation.receive_audio(frame)
+
+    caller = CallerSimulator(send_frame, audio, args.audio_encoding, args.sampling_rate)
+    start_time = loop.time()
+    caller_task: Optional[asyncio.Task] = None
+    try:
+        await conversation.start()
+        caller_task = asyncio.create_task(caller.run())
+        # the initial message
+        await asyncio.wait_for(output_device.audio_received.wait(), args.turn_timeout_seconds)
+        for _ in range(args.turns):
+            await wait_for_bot_to_finish(output_device, args.bot_idle_seconds)
+            await asyncio.sleep(args.think_time.sample())
+            output_device.audio_received.clear()
+            speech_end_time = await caller.speak(args.utterance_seconds)
+            try:
+                await asyncio.wait_for(
+                    output_device.audio_received.wait(), args.turn_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                stats.timed_out_turns += 1
+                continue
+            stats.turn_latencies.append(output_device.last_audio_time - speech_end_time)
+        await wait_for_bot_to_finish(output_device, args.bot_idle_seconds)
+    except Exception:
+        logger.exception("Call failed")
+        stats.failed_calls += 1
+    finally:
+        if caller_task:
+            caller_task.cancel()
+        await conversation.terminate()
+        stats.call_seconds += loop.time() - start_time
+
+
+def summarize(args: argparse.Namespace, stats: LoadTestStats, cpu_seconds: float, wall_seconds: float) -> Dict[str, Optional[float]]:
+    results: Dict[str, Optional[float]] = {
+        "num_calls": args.num_calls,
+        "failed_calls": stats.failed_calls,
+        "completed_turns": len(stats.turn_latencies),
+        "timed_out_turns": stats.timed_out_turns,
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "cpu_utilization": cpu_seconds / wall_seconds,
+        # CPU time spent per second of call, i.e. the fraction of a core each call needs
+        "cpu_per_call": cpu_seconds / stats.call_seconds if stats.call_seconds else None,
+        "memory_per_call_mb": (stats.peak_rss_bytes - stats.base_rss_bytes) / args.num_calls / 2**20,
+        "peak_rss_mb": stats.peak_rss_bytes / 2**20,
+        "loop_lag_max_ms": max(stats.loop_lags, default=0.0) * 1000,
+    }
+    for p in PERCENTILES:
+        lag = percentile(stats.loop_lags, p)
+        results[f"loop_lag_p{p}_ms"] = lag * 1000 if lag is not None else None
+    for p in PERCENTILES:
+        latency = percentile(stats.turn_latencies, p)
+        results[f"turn_latency_p{p}_ms"] = latency * 1000 if latency is not None else None
+    return results
+
+
+def print_results(results: Dict[str, Optional[float]], baseline: Optional[Dict[str, Optional[float]]] = None):
+    for name, value in results.items():
+        if value is None:
+            print(f"{name:>24}: -")
+            continue
+        line = f"{name:>24}: {value:.4g}"
+        baseline_value = baseline.get(name) if baseline else None
+        if baseline_value:
+            line += f" ({(value - baseline_value) / baseline_value:+.1%} vs baseline {baseline_value:.4g})"
+        print(line)
+
+
+async def main():
+    args = parser.parse_args()
+    logging.basicConfig()
+    logger.setLevel(args.log_level)
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    audio = load_audio(args.audio_path, args.sampling_rate, args.audio_encoding)
+    stats = LoadTestStats()
+    stats.base_rss_bytes = stats.peak_rss_bytes = get_rss_bytes()
+    monitor_task = asyncio.create_task(
+        LoopLagMonitor(stats, args.lag_interval_seconds).run()
+    )
+
+    start_cpu_seconds = time.process_time()
+    start_time = time.monotonic()
+    call_tasks = []
+    for i in range(args.num_calls):
+        call_tasks.append(asyncio.create_task(run_call(args, stats, audio)))
+        await asyncio.sleep(args.ramp_up_seconds / args.num_calls)
+    await asyncio.gather(*call_tasks)
+    cpu_seconds = time.process_time() - start_cpu_seconds
+    wall_seconds = time.monotonic() - start_time
+    monitor_task.cancel()
+
+    results = summarize(args, stats, cpu_seconds, wall_seconds)
+    baseline = None
+    if args.baseline_json:
+        with open(args.baseline_json) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.output_json:
+        with open(args.output_json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
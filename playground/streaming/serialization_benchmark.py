@@ -0,0 +1,211 @@
+"""Times per-message JSON handling on the streaming hot paths.
+
+Replays message streams the way a call sees them: Twilio media frames parsed by
+TwilioCall and written by TwilioOutputDevice, websocket_audio frames parsed by
+the client backend and written by WebsocketOutputDevice, and Deepgram interim
+results parsed by DeepgramTranscriber. Each stream is timed through the old path
+(stdlib json and pydantic models) and through vocode.streaming.utils.serialization
+with every available serializer.
+
+The streams are built from recorded audio by default. Pass `--recording` with
+a file of raw messages, one per line, as captured from a Twilio media stream,
+a client websocket or a Deepgram connection, to replay real traffic instead.
+
+Example usage:
+    python -m playground.streaming.serialization_benchmark
+    python -m playground.streaming.serialization_benchmark --recording deepgram.jsonl --stream deepgram
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+from typing import Callable, Dict, List
+
+from playground.streaming.fakes import load_audio
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.websocket import AudioMessage, WebSocketMessage
+from vocode.streaming.utils import serialization
+from vocode.streaming.utils.serialization import JsonSerializer, OrjsonSerializer
+
+DEFAULT_AUDIO_PATH = os.path.join(os.path.dirname(__file__), "test.wav")
+STREAMS = ["twilio", "websocket", "deepgram"]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--audio_path", type=str, default=DEFAULT_AUDIO_PATH)
+parser.add_argument("--recording", type=str, default=None)
+parser.add_argument("--stream", type=str, choices=STREAMS, default=None)
+parser.add_argument("--repeat", type=int, default=20)
+
+
+def chunks(audio: bytes, chunk_size: int) -> List[bytes]:
+    return [audio[i : i + chunk_size] for i in range(0, len(audio), chunk_size)]
+
+
+def record_twilio_stream(audio_path: str) -> List[str]:
+    audio = load_audio(audio_path, 8000, AudioEncoding.MULAW)
+    return [
+        json.dumps(
+            {
+                "event": "media",
+                "sequenceNumber": str(i + 2),
+                "media": {
+                    "track": "inbound",
+                    "chunk": str(i + 1),
+                    "timestamp": str(i * 20),
+                    "payload": base64.b64encode(chunk).decode("utf-8"),
+                },
+                "streamSid": "MZ" + "0" * 32,
+            }
+        )
+        for i, chunk in enumerate(chunks(audio, 160))
+    ]
+
+
+def record_websocket_stream(audio_path: str) -> List[str]:
+    audio = load_audio(audio_path, 16000, AudioEncoding.LINEAR16)
+    return [AudioMessage.from_bytes(chunk).json() for chunk in chunks(audio, 640)]
+
+
+def record_deepgram_stream(num_messages: int = 500) -> List[str]:
+    words = "so I was wondering if you could help me move my appointment".split()
+    messages = []
+    for i in range(num_messages):
+        transcript_words = words[: i % len(words) + 1]
+        messages.append(
+            json.dumps(
+                {
+                    "type": "Results",
+                    "channel_index": [0, 1],
+                    "duration": 1.02,
+                    "start": i * 0.25,
+                    "is_final": i % len(words) == len(words) - 1,
+                    "speech_final": False,
+                    "channel": {
+                        "alternatives": [
+                            {
+                                "transcript": " ".join(transcript_words),
+                                "confidence": 0.98,
+                                "words": [
+                                    {
+                                        "word": word,
+                                        "start": i * 0.25 + j * 0.1,
+                                        "end": i * 0.25 + j * 0.1 + 0.08,
+                                        "confidence": 0.98,
+                                        "punctuated_word": word,
+                                    }
+                                    for j, word in enumerate(transcript_words)
+                                ],
+                            }
+                        ]
+                    },
+                    "metadata": {"request_id": "0" * 36, "model_uuid": "0" * 36},
+                }
+            )
+        )
+    return messages
+
+
+def twilio_old(message: str):
+    data = json.loads(message)
+    chunk = base64.b64decode(data["media"]["payload"])
+    json.dumps(
+        {
+            "event": "media",
+            "streamSid": data["streamSid"],
+            "media": {"payload": base64.b64encode(chunk).decode("utf-8")},
+        }
+    )
+
+
+def twilio_new(message: str):
+    data = serialization.loads(message)
+    chunk = base64.b64decode(data["media"]["payload"])
+    serialization.dumps(
+        {
+            "event": "media",
+            "streamSid": data["streamSid"],
+            "media": {"payload": base64.b64encode(chunk).decode("utf-8")},
+        }
+    )
+
+
+def websocket_old(message: str):
+    audio_message = WebSocketMessage.parse_obj(json.loads(message))
+    chunk = audio_message.get_bytes()
+    AudioMessage.from_bytes(chunk).json()
+
+
+def websocket_new(message: str):
+    chunk = AudioMessage.parse_bytes(serialization.loads(message))
+    AudioMessage.json_from_bytes(chunk)
+
+
+def deepgram_old(message: str):
+    json.loads(message)
+
+
+def deepgram_new(message: str):
+    serialization.loads(message)
+
+
+HANDLERS: Dict[str, Dict[str, Callable[[str], None]]] = {
+    "twilio": {"old": twilio_old, "new": twilio_new},
+    "websocket": {"old": websocket_old, "new": websocket_new},
+    "deepgram": {"old": deepgram_old, "new": deepgram_new},
+}
+
+
+def time_handler(
+    handler: Callable[[str], None], messages: List[str], repeat: int
+) -> float:
+    """Microseconds per message, best of `repeat` passes"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            handler(message)
+        best = min(best, time.perf_counter() - start)
+    return best / len(messages) * 1e6
+
+
+def main():
+    args = parser.parse_args()
+    if args.recording is not None:
+        if args.stream is None:
+            parser.error("--stream is required with --recording")
+        with open(args.recording) as f:
+            streams = {args.stream: [line.strip() for line in f if line.strip()]}
+    else:
+        streams = {
+            "twilio": record_twilio_stream(args.audio_path),
+            "websocket": record_websocket_stream(args.audio_path),
+            "deepgram": record_deepgram_stream(),
+        }
+        if args.stream is not None:
+            streams = {args.stream: streams[args.stream]}
+
+    serializers = [JsonSerializer()]
+    if serialization.orjson is not None:
+        serializers.append(OrjsonSerializer())
+    else:
+        print("orjson is not installed, only timing the stdlib serializer")
+
+    for name, messages in streams.items():
+        handlers = HANDLERS[name]
+        baseline = time_handler(handlers["old"], messages, args.repeat)
+        print(f"{name} ({len(messages)} messages)")
+        print(f"  json + pydantic: {baseline:8.2f} us/message")
+        for serializer in serializers:
+            serialization.set_serializer(serializer)
+            per_message = time_handler(handlers["new"], messages, args.repeat)
+            print(
+                f"  {serializer.name:15}: {per_message:8.2f} us/message "
+                f"({baseline / per_message:.1f}x)"
+            )
+        serialization.set_serializer(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,686 @@
+"""Drives a TelephonyServer with simulated Twilio and Vonage media streams.
+
+`--serve` runs a TelephonyServer under uvicorn, backed by InMemoryConfigManager
+and the fake providers in fakes.py, with stub Twilio/Vonage API clients. It
+exposes /load_test/stats with its event loop lag, CPU time and dropped queue
+items.
+
+Without `--serve`, the load generator starts that server in a subprocess (or
+targets `--server_url`). It adds `--step_calls` calls at a time. Each call is
+created through the inbound call route, like Twilio or Vonage would do, and then
+streams real-time media frames over /connect_call/{id}: Twilio start/media/stop
+JSON or Vonage binary L16. At every step it prints the server's loop lag, CPU,
+and dropped inbound/outbound frames. It also prints the outbound audio jitter
+and underruns seen by the callers, and the turn latency. The first step where
+the loop lag p99 exceeds `--max_loop_lag_ms`, or frames are dropped, is the
+saturation point. Pin the server with `--server_cpu` to get it per core.
+
+Example usage:
+    python -m playground.streaming.telephony_load_benchmark --provider twilio --step_calls 25 --max_calls 400 --server_cpu 0
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import re
+import secrets
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import aiohttp
+from fastapi import FastAPI
+from opentelemetry import metrics
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from playground.streaming.fakes import (
+    FakeAgentConfig,
+    FakeAgentFactory,
+    FakeSynthesizerConfig,
+    FakeSynthesizerFactory,
+    FakeTranscriberConfig,
+    FakeTranscriberFactory,
+    LatencyDistribution,
+    load_audio,
+)
+from playground.streaming.load_benchmark import (
+    DEFAULT_AUDIO_PATH,
+    CallerSimulator,
+    LoadTestStats,
+    LoopLagMonitor,
+    get_rss_bytes,
+    percentile,
+    wait_for_bot_to_finish,
+)
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.telephony import (
+    BaseCallConfig,
+    TwilioCallConfig,
+    TwilioConfig,
+    VonageCallConfig,
+    VonageConfig,
+)
+from vocode.streaming.output_device.twilio_output_device import TwilioOutputDevice
+from vocode.streaming.output_device.vonage_output_device import VonageOutputDevice
+from vocode.streaming.telephony.client.base_telephony_client import BaseTelephonyClient
+from vocode.streaming.telephony.config_manager.in_memory_config_manager import (
+    InMemoryConfigManager,
+)
+from vocode.streaming.telephony.constants import (
+    DEFAULT_AUDIO_ENCODING,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_SAMPLING_RATE,
+    VONAGE_AUDIO_ENCODING,
+    VONAGE_CHUNK_SIZE,
+    VONAGE_SAMPLING_RATE,
+)
+from vocode.streaming.telephony.conversation.call import Call
+from vocode.streaming.telephony.conversation.twilio_call import TwilioCall
+from vocode.streaming.telephony.conversation.vonage_call import VonageCall
+from vocode.streaming.telephony.server.base import (
+    TelephonyServer,
+    TwilioInboundCallConfig,
+    VonageInboundCallConfig,
+)
+from vocode.streaming.telephony.server.router.calls import CallsRouter
+from vocode.streaming.utils import get_chunk_size_per_second
+
+TWILIO_INBOUND_URL = "/inbound_call"
+VONAGE_INBOUND_URL = "/inbound_call_vonage"
+STATS_URL = "/load_test/stats"
+# outbound frames further apart than this start a new utterance rather than an underrun
+UTTERANCE_GAP_SECONDS = 0.25
+SERVER_STARTUP_TIMEOUT_SECONDS = 30
+
+logger = logging.getLogger(__name__)
+
+parser = argparse.ArgumentParser(
+    description="Load test TelephonyServer with simulated Twilio and Vonage media streams."
+)
+parser.add_argument("--serve", action="store_true", help="Run the TelephonyServer under test")
+parser.add_argument("--host", type=str, default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8765)
+parser.add_argument(
+    "--server_url",
+    type=str,
+    default=None,
+    help="Target an already running --serve process instead of starting one",
+)
+parser.add_argument(
+    "--server_cpu",
+    type=int,
+    default=None,
+    help="Pin the server process to this CPU so results are per core (Linux only)",
+)
+parser.add_argument("--provider", type=str, default="twilio", choices=["twilio", "vonage"])
+parser.add_argument("--step_calls", type=int, default=25, help="Calls added at each step")
+parser.add_argument("--max_calls", type=int, default=200)
+parser.add_argument(
+    "--step_seconds",
+    type=float,
+    default=30.0,
+    help="How long each level of concurrency is held before it is measured",
+)
+parser.add_argument(
+    "--step_ramp_seconds",
+    type=float,
+    default=5.0,
+    help="The calls of a step are started evenly over this many seconds",
+)
+parser.add_argument(
+    "--max_loop_lag_ms",
+    type=float,
+    default=50.0,
+    help="A server loop lag p99 above this marks the saturation point",
+)
+parser.add_argument("--stop_on_saturation", action="store_true")
+parser.add_argument("--audio_path", type=str, default=DEFAULT_AUDIO_PATH)
+parser.add_argument("--utterance_seconds", type=float, default=2.0)
+parser.add_argument(
+    "--think_time",
+    type=LatencyDistribution.parse,
+    default=LatencyDistribution(median_seconds=0.7, p95_seconds=1.5),
+)
+parser.add_argument(
+    "--transcriber_latency",
+    type=LatencyDistribution.parse,
+    default=FakeTranscriberConfig.__fields__["latency"].default,
+)
+parser.add_argument(
+    "--agent_latency",
+    type=LatencyDistribution.parse,
+    default=FakeAgentConfig.__fields__["first_response_latency"].default,
+)
+parser.add_argument(
+    "--synthesizer_latency",
+    type=LatencyDistribution.parse,
+    default=FakeSynthesizerConfig.__fields__["time_to_first_byte"].default,
+)
+parser.add_argument("--bot_idle_seconds", type=float, default=1.5)
+parser.add_argument("--turn_timeout_seconds", type=float, default=15.0)
+parser.add_argument("--lag_interval_seconds", type=float, default=0.05)
+parser.add_argument("--log_level", type=str, default="WARNING")
+
+
+# server
+
+
+class StubTelephonyClient(BaseTelephonyClient):
+    """Stands in for the Twilio/Vonage API clients: every call is answered by a person"""
+
+    def __init__(self, base_url: str):
+        super().__init__(base_url)
+        self.twilio_client = self
+
+    def calls(self, twilio_sid: str):
+        return self
+
+    def fetch(self):
+        return SimpleNamespace(answered_by=None)
+
+    async def end_call(self, id) -> bool:
+        return True
+
+
+class LoadTestTwilioCall(TwilioCall):
+    def __init__(
+        self,
+        twilio_sid: str,
+        twilio_config: TwilioConfig,
+        base_url: str,
+        **kwargs,
+    ):
+        # skips TwilioCall.__init__, which checks the credentials against the Twilio API
+        Call.__init__(self, base_url=base_url, output_device=TwilioOutputDevice(), **kwargs)
+        self.twilio_config = twilio_config
+        self.telephony_client = StubTelephonyClient(base_url)
+        self.twilio_sid = twilio_sid
+        self.latest_media_timestamp = 0
+
+
+class LoadTestVonageCall(VonageCall):
+    def __init__(
+        self,
+        vonage_uuid: str,
+        vonage_config: VonageConfig,
+        base_url: str,
+        **kwargs,
+    ):
+        # skips VonageCall.__init__, which creates a Vonage API client
+        Call.__init__(self, base_url=base_url, output_device=VonageOutputDevice(), **kwargs)
+        self.output_to_speaker = False
+        self.vonage_config = vonage_config
+        self.telephony_client = StubTelephonyClient(base_url)
+        self.vonage_uuid = vonage_uuid
+
+
+class LoadTestCallsRouter(CallsRouter):
+    def _from_call_config(
+        self,
+        base_url: str,
+        call_config: BaseCallConfig,
+        **kwargs,
+    ):
+        call_kwargs = dict(
+            base_url=base_url,
+            from_phone=call_config.from_phone,
+            to_phone=call_config.to_phone,
+            agent_config=call_config.agent_config,
+            transcriber_config=call_config.transcriber_config,
+            synthesizer_config=call_config.synthesizer_config,
+            **kwargs,
+        )
+        if isinstance(call_config, TwilioCallConfig):
+            return LoadTestTwilioCall(
+                twilio_sid=call_config.twilio_sid,
+                twilio_config=call_config.twilio_config,
+                **call_kwargs,
+            )
+        elif isinstance(call_config, VonageCallConfig):
+            return LoadTestVonageCall(
+                vonage_uuid=call_config.vonage_uuid,
+                vonage_config=call_config.vonage_config,
+                **call_kwargs,
+            )
+        raise ValueError(f"Unknown call config type {call_config.type}")
+
+
+class LoadTestTelephonyServer(TelephonyServer):
+    def create_calls_router(self, **kwargs) -> CallsRouter:
+        return LoadTestCallsRouter(
+            base_url=self.base_url,
+            config_manager=self.config_manager,
+            events_manager=self.events_manager,
+            logger=self.logger,
+            **kwargs,
+        )
+
+
+def get_dropped_items(metric_reader: InMemoryMetricReader) -> Dict[str, int]:
+    dropped_items: Dict[str, int] = {}
+    metrics_data = metric_reader.get_metrics_data()
+    for resource_metrics in metrics_data.resource_metrics if metrics_data else []:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                if metric.name == "queue.dropped_items":
+                    for data_point in metric.data.data_points:
+                        dropped_items[data_point.attributes["queue"]] = data_point.value
+    return dropped_items
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    metric_reader = InMemoryMetricReader()
+    metrics.set_meter_provider(MeterProvider(metric_readers=[metric_reader]))
+
+    def get_inbound_call_kwargs(sampling_rate: int, audio_encoding: AudioEncoding, chunk_size: int):
+        return dict(
+            agent_config=FakeAgentConfig(
+                initial_message=BaseMessage(text="Hi there, how can I help you today?"),
+                first_response_latency=args.agent_latency,
+            ),
+            transcriber_config=FakeTranscriberConfig(
+                sampling_rate=sampling_rate,
+                audio_encoding=audio_encoding,
+                chunk_size=chunk_size,
+                latency=args.transcriber_latency,
+            ),
+            synthesizer_config=FakeSynthesizerConfig(
+                sampling_rate=sampling_rate,
+                audio_encoding=audio_encoding,
+                audio_path=args.audio_path,
+                time_to_first_byte=args.synthesizer_latency,
+            ),
+        )
+
+    config_manager = InMemoryConfigManager()
+    telephony_server = LoadTestTelephonyServer(
+        base_url=f"{args.host}:{args.port}",
+        config_manager=config_manager,
+        inbound_call_configs=[
+            TwilioInboundCallConfig(
+                url=TWILIO_INBOUND_URL,
+                twilio_config=TwilioConfig(account_sid="load_test", auth_token="load_test"),
+                **get_inbound_call_kwargs(
+                    DEFAULT_SAMPLING_RATE, DEFAULT_AUDIO_ENCODING, DEFAULT_CHUNK_SIZE
+                ),
+            ),
+            VonageInboundCallConfig(
+                url=VONAGE_INBOUND_URL,
+                vonage_config=VonageConfig(
+                    api_key="load_test",
+                    api_secret="load_test",
+                    application_id="load_test",
+                    private_key="load_test",
+                ),
+                **get_inbound_call_kwargs(
+                    VONAGE_SAMPLING_RATE, VONAGE_AUDIO_ENCODING, VONAGE_CHUNK_SIZE
+                ),
+            ),
+        ],
+        transcriber_factory=FakeTranscriberFactory(),
+        agent_factory=FakeAgentFactory(),
+        synthesizer_factory=FakeSynthesizerFactory(),
+        logger=logger,
+    )
+    app = FastAPI()
+    app.include_router(telephony_server.get_router())
+    stats = LoadTestStats()
+
+    @app.on_event("startup")
+    async def start_loop_lag_monitor():
+        asyncio.create_task(LoopLagMonitor(stats, args.lag_interval_seconds).run())
+
+    @app.get(STATS_URL)
+    async def get_stats():
+        """Cumulative CPU time and dropped items, loop lag since the previous request"""
+        loop_lags, stats.loop_lags = stats.loop_lags, []
+        return {
+            "active_calls": len(config_manager.configs),
+            "cpu_seconds": time.process_time(),
+            "rss_mb": get_rss_bytes() / 2**20,
+            "loop_lag_p50_ms": (percentile(loop_lags, 50) or 0) * 1000,
+            "loop_lag_p99_ms": (percentile(loop_lags, 99) or 0) * 1000,
+            "loop_lag_max_ms": max(loop_lags, default=0) * 1000,
+            "dropped_items": get_dropped_items(metric_reader),
+        }
+
+    return app
+
+
+def serve(args: argparse.Namespace):
+    import uvicorn
+
+    if args.server_cpu is not None:
+        os.sched_setaffinity(0, {args.server_cpu})
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+# load generator
+
+
+class ClientStats(LoadTestStats):
+    def __init__(self):
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        """Starts measuring a new step"""
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.jitters: List[float] = []
+        self.underruns = 0
+        self.turn_latencies = []
+        self.timed_out_turns = 0
+        self.failed_calls = 0
+        self.loop_lags = []
+
+
+class OutboundAudioTracker:
+    """Measures the bot audio a caller receives against real-time playout.
+
+    Within an utterance, each frame should arrive one frame duration after the
+    previous one; the deviation is the jitter. A frame that arrives after
+    everything before it has finished playing is an underrun (an audible gap).
+    """
+
+    def __init__(self, stats: ClientStats, bytes_per_second: int):
+        self.stats = stats
+        self.bytes_per_second = bytes_per_second
+        self.audio_received = asyncio.Event()
+        self.last_audio_time: Optional[float] = None
+        self.last_frame_seconds = 0.0
+        self.playout_end_time = 0.0
+
+    def on_audio(self, num_bytes: int):
+        now = asyncio.get_running_loop().time()
+        frame_seconds = num_bytes / self.bytes_per_second
+        self.stats.frames_received += 1
+        if self.last_audio_time is not None and now - self.playout_end_time < UTTERANCE_GAP_SECONDS:
+            self.stats.jitters.append(abs(now - self.last_audio_time - self.last_frame_seconds))
+            if now > self.playout_end_time:
+                self.stats.underruns += 1
+        self.playout_end_time = max(self.playout_end_time, now) + frame_seconds
+        self.last_audio_time = now
+        self.last_frame_seconds = frame_seconds
+        self.audio_received.set()
+
+
+class SimulatedCall:
+    """A caller that sets up a call through the inbound route and then streams media like Twilio or Vonage"""
+
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        session: aiohttp.ClientSession,
+        server_url: str,
+        stats: ClientStats,
+    ):
+        self.args = args
+        self.session = session
+        self.server_url = server_url
+        self.stats = stats
+        self.is_twilio = args.provider == "twilio"
+        if self.is_twilio:
+            self.sampling_rate, self.audio_encoding = DEFAULT_SAMPLING_RATE, DEFAULT_AUDIO_ENCODING
+        else:
+            self.sampling_rate, self.audio_encoding = VONAGE_SAMPLING_RATE, VONAGE_AUDIO_ENCODING
+        self.call_sid = "CA" + secrets.token_hex(16)
+        self.stream_sid = "MZ" + secrets.token_hex(16)
+        self.sequence_number = 0
+        self.media_timestamp_ms = 0
+        self.outbound_audio = OutboundAudioTracker(
+            stats, get_chunk_size_per_second(self.audio_encoding, self.sampling_rate)
+        )
+
+    async def create_call(self) -> str:
+        """Returns the websocket URL of the call"""
+        caller = {"From": "+15555550100", "To": "+15555550101"}
+        if self.is_twilio:
+            async with self.session.post(
+                self.server_url + TWILIO_INBOUND_URL, data={"CallSid": self.call_sid, **caller}
+            ) as response:
+                twiml = await response.text()
+            path = re.search(r'url="wss://[^/]+(/connect_call/[^"]+)"', twiml).group(1)
+        else:
+            async with self.session.post(
+                self.server_url + VONAGE_INBOUND_URL,
+                json={"to": caller["To"], "from": caller["From"], "uuid": self.call_sid},
+            ) as response:
+                ncco = await response.json()
+            uri = ncco[-1]["endpoint"][0]["uri"]
+            path = uri[uri.index("/connect_call/") :]
+        return re.sub(r"^http", "ws", self.server_url) + path
+
+    def twilio_event(self, event: str, **payload) -> str:
+        self.sequence_number += 1
+        return json.dumps(
+            {
+                "event": event,
+                "sequenceNumber": str(self.sequence_number),
+                "streamSid": self.stream_sid,
+                **payload,
+            }
+        )
+
+    async def send_frame(self, ws: aiohttp.ClientWebSocketResponse, frame: bytes):
+        if self.is_twilio:
+            await ws.send_str(
+                self.twilio_event(
+                    "media",
+                    media={
+                        "track": "inbound",
+                        "chunk": str(self.sequence_number),
+                        "timestamp": str(self.media_timestamp_ms),
+                        "payload": base64.b64encode(frame).decode("utf-8"),
+                    },
+                )
+            )
+            self.media_timestamp_ms += 20
+        else:
+            await ws.send_bytes(frame)
+        self.stats.frames_sent += 1
+
+    async def receive(self, ws: aiohttp.ClientWebSocketResponse):
+        async for message in ws:
+            if message.type == aiohttp.WSMsgType.BINARY:
+                self.outbound_audio.on_audio(len(message.data))
+            elif message.type == aiohttp.WSMsgType.TEXT:
+                data = json.loads(message.data)
+                if data.get("event") == "media":
+                    # 4 base64 characters encode 3 bytes
+                    self.outbound_audio.on_audio(len(data["media"]["payload"]) * 3 // 4)
+
+    async def run(self, audio: bytes):
+        ws_url = await self.create_call()
+        async with self.session.ws_connect(ws_url) as ws:
+            if self.is_twilio:
+                await ws.send_str(json.dumps({"event": "connected", "protocol": "Call", "version": "1.0.0"}))
+                await ws.send_str(
+                    self.twilio_event(
+                        "start",
+                        start={
+                            "streamSid": self.stream_sid,
+                            "callSid": self.call_sid,
+                            "tracks": ["inbound"],
+                            "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": 8000, "channels": 1},
+                        },
+                    )
+                )
+            else:
+                await ws.send_str(json.dumps({"event": "websocket:connected", "content-type": "audio/l16;rate=16000"}))
+            caller = CallerSimulator(
+                lambda frame: self.send_frame(ws, frame), audio, self.audio_encoding, self.sampling_rate
+            )
+            tasks = [asyncio.create_task(caller.run()), asyncio.create_task(self.receive(ws))]
+            try:
+                await self.converse(caller)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                if self.is_twilio and not ws.closed:
+                    await ws.send_str(self.twilio_event("stop", stop={"callSid": self.call_sid}))
+
+    async def converse(self, caller: CallerSimulator):
+        """Takes turns with the bot until cancelled"""
+        outbound_audio = self.outbound_audio
+        # the initial message
+        await asyncio.wait_for(outbound_audio.audio_received.wait(), self.args.turn_timeout_seconds)
+        while True:
+            await wait_for_bot_to_finish(outbound_audio, self.args.bot_idle_seconds)
+            await asyncio.sleep(self.args.think_time.sample())
+            outbound_audio.audio_received.clear()
+            speech_end_time = await caller.speak(self.args.utterance_seconds)
+            try:
+                await asyncio.wait_for(
+                    outbound_audio.audio_received.wait(), self.args.turn_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                self.stats.timed_out_turns += 1
+                continue
+            self.stats.turn_latencies.append(outbound_audio.last_audio_time - speech_end_time)
+
+
+async def run_call(
+    args: argparse.Namespace,
+    session: aiohttp.ClientSession,
+    server_url: str,
+    stats: ClientStats,
+    audio: bytes,
+):
+    try:
+        await SimulatedCall(args, session, server_url, stats).run(audio)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception("Simulated call failed")
+        stats.failed_calls += 1
+
+
+def format_ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+async def wait_for_server(session: aiohttp.ClientSession, server_url: str):
+    deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT_SECONDS
+    while True:
+        try:
+            async with session.get(server_url + STATS_URL) as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            if time.monotonic() > deadline:
+                raise
+        await asyncio.sleep(0.5)
+
+
+async def generate_load(args: argparse.Namespace):
+    server_url = args.server_url or f"http://{args.host}:{args.port}"
+    audio = load_audio(
+        args.audio_path,
+        DEFAULT_SAMPLING_RATE if args.provider == "twilio" else VONAGE_SAMPLING_RATE,
+        DEFAULT_AUDIO_ENCODING if args.provider == "twilio" else VONAGE_AUDIO_ENCODING,
+    )
+    stats = ClientStats()
+    monitor_task = asyncio.create_task(LoopLagMonitor(stats, args.lag_interval_seconds).run())
+    call_tasks: List[asyncio.Task] = []
+    columns = [
+        "calls", "server_cpu%", "lag_p50", "lag_p99", "lag_max", "in_drop", "out_drop",
+        "jitter_p50", "jitter_p99", "underruns", "turn_p50", "turn_p99", "client_lag_p99",
+    ]
+    print(" ".join(f"{column:>14}" for column in columns))
+    saturation_calls: Optional[int] = None
+    # unlimited connections: every call holds a websocket
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        await wait_for_server(session, server_url)
+        async with session.get(server_url + STATS_URL) as response:
+            previous = await response.json()
+        for num_calls in range(args.step_calls, args.max_calls + 1, args.step_calls):
+            while len(call_tasks) < num_calls:
+                call_tasks.append(
+                    asyncio.create_task(run_call(args, session, server_url, stats, audio))
+                )
+                await asyncio.sleep(args.step_ramp_seconds / args.step_calls)
+            # only the steady state of each step is measured
+            stats.reset()
+            step_start_time = time.monotonic()
+            await asyncio.sleep(args.step_seconds)
+            async with session.get(server_url + STATS_URL) as response:
+                current = await response.json()
+
+            def get_dropped(prefix: str) -> int:
+                return sum(
+                    count - previous["dropped_items"].get(queue, 0)
+                    for queue, count in current["dropped_items"].items()
+                    if queue.startswith(prefix)
+                )
+
+            inbound_dropped = get_dropped("transcriber.")
+            outbound_dropped = get_dropped("output_device.")
+            server_cpu = (current["cpu_seconds"] - previous["cpu_seconds"]) / (
+                time.monotonic() - step_start_time
+            )
+            row = [
+                str(num_calls - stats.failed_calls),
+                f"{server_cpu:.0%}",
+                f"{current['loop_lag_p50_ms']:.1f}",
+                f"{current['loop_lag_p99_ms']:.1f}",
+                f"{current['loop_lag_max_ms']:.1f}",
+                str(inbound_dropped),
+                str(outbound_dropped),
+                format_ms(percentile(stats.jitters, 50)),
+                format_ms(percentile(stats.jitters, 99)),
+                str(stats.underruns),
+                format_ms(percentile(stats.turn_latencies, 50)),
+                format_ms(percentile(stats.turn_latencies, 99)),
+                format_ms(percentile(stats.loop_lags, 99)),
+            ]
+            print(" ".join(f"{value:>14}" for value in row), flush=True)
+            previous = current
+            is_saturated = (
+                current["loop_lag_p99_ms"] > args.max_loop_lag_ms
+                or inbound_dropped > 0
+                or outbound_dropped > 0
+            )
+            if is_saturated and saturation_calls is None:
+                saturation_calls = num_calls
+                if args.stop_on_saturation:
+                    break
+        for task in call_tasks:
+            task.cancel()
+        await asyncio.gather(*call_tasks, return_exceptions=True)
+    monitor_task.cancel()
+    if saturation_calls is None:
+        print(f"Not saturated at {args.max_calls} calls")
+    else:
+        print(f"Saturated at {saturation_calls} calls")
+
+
+def main():
+    args = parser.parse_args()
+    logging.basicConfig()
+    logger.setLevel(args.log_level)
+    if args.serve:
+        serve(args)
+        return
+    server_process = None
+    if args.server_url is None:
+        server_process = subprocess.Popen(
+            [sys.executable, "-m", "playground.streaming.telephony_load_benchmark", *sys.argv[1:], "--serve"]
+        )
+    try:
+        asyncio.run(generate_load(args))
+    finally:
+        if server_process:
+            server_process.terminate()
+            server_process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Measures how fast audio gets from send_audio onto a transcriber's websocket.
+
+Streams recorded telephone audio (8kHz mu-law, 20ms chunks) as fast as possible
+to a local websocket server that only counts what it receives, through the
+frame buffering and send of each transport:
+
+- base64 json (old): per-chunk audioop.ulaw2lin into a growing bytearray, and
+  json.dumps of an AudioMessage per frame, as AssemblyAI and Gladia used to
+- base64 json: AudioFrameBuffer and Base64JsonAudioTransport (Gladia)
+- binary: AudioFrameBuffer and BinaryAudioTransport (AssemblyAI)
+
+and reports the audio throughput (best of `--repeat` runs) and the bytes put on
+the wire per second of audio.
+
+Example usage:
+    python -m playground.streaming.transcriber_transport_benchmark --seconds 600
+"""
+
+import argparse
+import asyncio
+import audioop
+import json
+import os
+import time
+from typing import Callable, Dict, List
+
+import websockets
+
+from playground.streaming.fakes import load_audio
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.websocket import AudioMessage
+from vocode.streaming.transcriber.audio_transport import (
+    AudioFrameBuffer,
+    AudioTransport,
+    Base64JsonAudioTransport,
+    BinaryAudioTransport,
+)
+
+DEFAULT_AUDIO_PATH = os.path.join(os.path.dirname(__file__), "test.wav")
+SAMPLING_RATE = 8000
+CHUNK_SIZE = 160
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--audio_path", type=str, default=DEFAULT_AUDIO_PATH)
+parser.add_argument("--seconds", type=float, default=300)
+parser.add_argument("--buffer_size_seconds", type=float, default=0.1)
+parser.add_argument("--repeat", type=int, default=5)
+
+
+class CountingServer:
+    def __init__(self):
+        self.bytes_received = 0
+        self.messages_received = 0
+
+    async def handler(self, ws):
+        async for message in ws:
+            self.bytes_received += len(message)
+            self.messages_received += 1
+
+
+def get_chunks(audio_path: str, seconds: float) -> List[bytes]:
+    audio = load_audio(audio_path, SAMPLING_RATE, AudioEncoding.MULAW)
+    num_bytes = int(seconds * SAMPLING_RATE)
+    audio = (audio * (num_bytes // len(audio) + 1))[:num_bytes]
+    return [audio[i : i + CHUNK_SIZE] for i in range(0, len(audio), CHUNK_SIZE)]
+
+
+async def stream_old(ws, chunks: List[bytes], buffer_size_seconds: float):
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer.extend(audioop.ulaw2lin(chunk, 2))
+        if len(buffer) / (2 * SAMPLING_RATE) >= buffer_size_seconds:
+            await ws.send(json.dumps({"audio_data": AudioMessage.from_bytes(buffer).data}))
+            buffer = bytearray()
+
+
+def stream_with(transport: AudioTransport) -> Callable:
+    async def stream(ws, chunks: List[bytes], buffer_size_seconds: float):
+        frame_buffer = AudioFrameBuffer.from_duration(
+            buffer_size_seconds, SAMPLING_RATE, AudioEncoding.MULAW
+        )
+        for chunk in chunks:
+            for frame in frame_buffer.write(chunk):
+                await transport.send(ws, frame)
+                frame_buffer.release(frame)
+
+    return stream
+
+
+async def run(args):
+    chunks = get_chunks(args.audio_path, args.seconds)
+    streams: Dict[str, Callable] = {
+        "base64 json (old)": stream_old,
+        "base64 json": stream_with(Base64JsonAudioTransport("audio_data")),
+        "binary": stream_with(BinaryAudioTransport()),
+    }
+    print(f"{args.seconds:.0f}s of audio in {len(chunks)} chunks")
+    counting_server = CountingServer()
+    server = await websockets.serve(counting_server.handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    for name, stream in streams.items():
+        elapsed = float("inf")
+        for _ in range(args.repeat):
+            counting_server.bytes_received = counting_server.messages_received = 0
+            async with websockets.connect(
+                f"ws://127.0.0.1:{port}", compression=None
+            ) as ws:
+                start = time.perf_counter()
+                await stream(ws, chunks, args.buffer_size_seconds)
+                elapsed = min(elapsed, time.perf_counter() - start)
+        print(
+            f"  {name:18} {args.seconds / elapsed:10.0f}x realtime"
+            f"  {counting_server.bytes_received / args.seconds / 1000:6.1f} kB/s of audio"
+            f"  {counting_server.messages_received} messages"
+        )
+    server.close()
+    await server.wait_closed()
+
+
+def main():
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from vocode.streaming.agent import llamacpp_agent
+from vocode.streaming.agent.llamacpp_agent import (
+    GenerationCancelledError,
+    LlamacppAgent,
+)
+from vocode.streaming.agent.llamacpp_server import LlamacppModelServer
+from vocode.streaming.models.agent import LlamacppAgentConfig
+
+
+class FakeConversationChain:
+    """Streams tokens from the generation thread until the callback stops it"""
+
+    started = threading.Event()
+    stopped = threading.Event()
+    errors: List[Exception] = []
+    callbacks: list = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def predict(self, input: str, callbacks: list) -> str:
+        FakeConversationChain.callbacks.extend(callbacks)
+        FakeConversationChain.started.set()
+        try:
+            while True:
+                callbacks[0].on_llm_new_token("word ")
+                time.sleep(0.01)
+        except GenerationCancelledError as e:
+            FakeConversationChain.errors.append(e)
+            # winding down takes a moment, the slot must stay held meanwhile
+            time.sleep(0.05)
+            raise
+        finally:
+            FakeConversationChain.stopped.set()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_response_holds_slot_until_generation_stops(monkeypatch):
+    monkeypatch.setattr(LlamacppModelServer, "_servers", {})
+    monkeypatch.setattr(LlamacppModelServer, "load_model", lambda self, _: object())
+    monkeypatch.setattr(llamacpp_agent, "ConversationChain", FakeConversationChain)
+    agent = LlamacppAgent(LlamacppAgentConfig(prompt_preamble="You are a bot"))
+    server = agent.model_server
+    released_after_stop: List[bool] = []
+    release_slot = server.release_slot
+
+    def record_release(slot):
+        released_after_stop.append(FakeConversationChain.stopped.is_set())
+        release_slot(slot)
+
+    monkeypatch.setattr(server, "release_slot", record_release)
+
+    response = asyncio.create_task(agent.respond("hi", conversation_id="1"))
+    await asyncio.to_thread(FakeConversationChain.started.wait, 5)
+    response.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await response
+
+    callback = FakeConversationChain.callbacks[0]
+    assert callback.cancel_event.is_set()
+    assert len(FakeConversationChain.errors) == 1
+    assert callback.num_tokens_after_cancel == 1
+    assert released_after_stop == [True]
+    assert len(server.idle_slots) == 1
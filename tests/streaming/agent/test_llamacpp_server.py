@@ -0,0 +1,82 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from vocode.streaming.agent.llamacpp_server import LlamacppModelServer
+
+
+class FakeModelServer(LlamacppModelServer):
+    def load_model(self, prompt_cache_capacity_bytes):
+        return object()
+
+
+@pytest.mark.asyncio
+async def test_requests_wait_for_an_idle_slot():
+    server = FakeModelServer({}, num_slots=2)
+    acquired: List[int] = []
+    release = asyncio.Event()
+
+    async def generate(index: int):
+        async with server.acquire_slot() as slot:
+            acquired.append(index)
+            await release.wait()
+            return slot
+
+    tasks = [asyncio.create_task(generate(i)) for i in range(3)]
+    await asyncio.sleep(0.01)
+    # both slots are busy, the third request waits
+    assert acquired == [0, 1]
+    release.set()
+    slots = await asyncio.gather(*tasks)
+    assert acquired == [0, 1, 2]
+    assert slots[2] in slots[:2]
+    assert len(server.idle_slots) == 2
+
+
+@pytest.mark.asyncio
+async def test_slots_are_picked_by_prefix():
+    server = FakeModelServer({}, num_slots=2)
+    async with server.acquire_slot("preamble a") as slot_a:
+        pass
+    async with server.acquire_slot("preamble b") as slot_b:
+        pass
+    assert slot_a is not slot_b
+    for prefix_key, expected_slot in [
+        ("preamble a", slot_a),
+        ("preamble b", slot_b),
+        ("preamble a", slot_a),
+    ]:
+        async with server.acquire_slot(prefix_key) as slot:
+            assert slot is expected_slot
+
+
+@pytest.mark.asyncio
+async def test_server_is_shared_by_event_loops():
+    server = FakeModelServer({}, num_slots=1)
+
+    async def generate():
+        async with server.acquire_slot() as slot:
+            await asyncio.sleep(0.01)
+            return slot
+
+    # used from another event loop, while this one waits for the same slot
+    async with server.acquire_slot():
+        other_loop = asyncio.get_running_loop().run_in_executor(
+            None, asyncio.run, generate()
+        )
+        await asyncio.sleep(0.01)
+    assert await other_loop is server.slots[0]
+    assert await generate() is server.slots[0]
+
+
+def test_prompt_cache_capacity_is_split_between_slots():
+    capacities: List[int] = []
+
+    class RecordingModelServer(LlamacppModelServer):
+        def load_model(self, prompt_cache_capacity_bytes):
+            capacities.append(prompt_cache_capacity_bytes)
+            return object()
+
+    RecordingModelServer({}, num_slots=4, prompt_cache_capacity_bytes=2 << 30)
+    assert capacities == [512 << 20] * 4
@@ -0,0 +1,142 @@
+import zlib
+from typing import List
+
+import pytest
+from aioresponses import aioresponses
+
+from vocode.streaming.models.synthesizer import ElevenLabsSynthesizerConfig
+from vocode.streaming.models.vector_db import LocalVectorDBConfig, PineconeConfig
+from vocode.streaming.synthesizer import index_ingestion
+from vocode.streaming.synthesizer.index_ingestion import PhraseIngestionPipeline
+from vocode.streaming.utils.object_store import LocalObjectStore
+from vocode.streaming.vector_db import pinecone
+from vocode.streaming.vector_db.local import LocalVectorDB
+from vocode.streaming.vector_db.pinecone import PineconeDB
+
+DIMENSION = 32
+PHRASES = [f"phrase number {i}" for i in range(10)]
+
+
+def embed(texts: List[str]) -> List[List[float]]:
+    embeddings = []
+    for text in texts:
+        embedding = [0.0] * DIMENSION
+        for word in text.split():
+            embedding[zlib.crc32(word.encode()) % DIMENSION] += 1
+        embeddings.append(embedding)
+    return embeddings
+
+
+class FakeSynthesizer:
+    def __init__(self):
+        self.calls: List[str] = []
+
+    async def synthesize(self, text: str) -> bytes:
+        self.calls.append(text)
+        if self.calls.count(text) == 1 and text == PHRASES[3]:
+            raise Exception("rate limited")
+        return f"audio for {text}".encode()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(index_ingestion, "RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(pinecone, "UPSERT_RETRY_BACKOFF_SECONDS", 0)
+
+
+def create_pipeline(tmp_path, synthesizer: FakeSynthesizer, vector_db: LocalVectorDB):
+    return PhraseIngestionPipeline(
+        ElevenLabsSynthesizerConfig.from_telephone_output_device(
+            voice_id="voice", stability=0.5, similarity_boost=0.75
+        ),
+        synthesizer.synthesize,
+        LocalObjectStore(str(tmp_path / "objects")),
+        vector_db,
+        state_path=str(tmp_path / "phrases.indexed"),
+        max_concurrent_syntheses=2,
+        batch_size=4,
+    )
+
+
+@pytest.mark.asyncio
+async def test_ingestion_resumes_after_failure(tmp_path):
+    vector_db = LocalVectorDB(
+        LocalVectorDBConfig(path=str(tmp_path / "index"), embeddings_function=embed)
+    )
+    add_texts = vector_db.add_texts
+    num_adds = 0
+
+    async def add_texts_failing_second_batch(*args, **kwargs):
+        nonlocal num_adds
+        num_adds += 1
+        if num_adds > 1:
+            raise Exception("index unavailable")
+        return await add_texts(*args, **kwargs)
+
+    vector_db.add_texts = add_texts_failing_second_batch
+    synthesizer = FakeSynthesizer()
+    result = await create_pipeline(tmp_path, synthesizer, vector_db).ingest(
+        PHRASES + [PHRASES[0], " "]
+    )
+    assert result.num_phrases == 10
+    assert result.num_synthesized == 10
+    assert result.num_indexed == 4
+    assert len(result.failed_phrases) == 6
+    # the failed synthesis was retried
+    assert len(synthesizer.calls) == 11
+
+    # the rerun indexes the rest, with the audio uploaded by the first run
+    vector_db.add_texts = add_texts
+    synthesizer = FakeSynthesizer()
+    result = await create_pipeline(tmp_path, synthesizer, vector_db).ingest(PHRASES)
+    assert result.num_skipped == 4
+    assert result.num_reused_audio == 6
+    assert result.num_indexed == 6
+    assert result.failed_phrases == []
+    assert synthesizer.calls == []
+    assert len(vector_db.documents) == 10
+
+    # what the synthesizer reads from the index
+    results = await vector_db.similarity_search_with_score(
+        PHRASES[7], filter={"voice_id": "voice", "stability": 0.5, "similarity_boost": 0.75}
+    )
+    doc = results[0][0]
+    assert doc.page_content == PHRASES[7]
+    assert await LocalObjectStore(str(tmp_path / "objects")).get(
+        doc.metadata["object_key"]
+    ) == f"audio for {PHRASES[7]}".encode()
+
+    result = await create_pipeline(tmp_path, synthesizer, vector_db).ingest(PHRASES)
+    assert result.num_skipped == 10
+    assert result.num_indexed == 0
+    await vector_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_pinecone_upserts_in_pages_with_retries(monkeypatch):
+    monkeypatch.setattr(pinecone, "UPSERT_BATCH_SIZE", 2)
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    vector_db = PineconeDB(
+        PineconeConfig(index="index", api_key="key", api_environment="env")
+    )
+
+    async def create_openai_embeddings(texts, model=None):
+        return embed(texts)
+
+    monkeypatch.setattr(vector_db, "create_openai_embeddings", create_openai_embeddings)
+    upsert_url = f"{vector_db.pinecone_url}/vectors/upsert"
+    with aioresponses() as mocked:
+        mocked.post(upsert_url, status=200)
+        mocked.post(upsert_url, status=503)
+        mocked.post(upsert_url, status=200)
+        mocked.post(upsert_url, status=200)
+        ids = await vector_db.add_texts(["a", "b", "c", "d", "e"])
+        requests = [
+            call.kwargs["json"]
+            for (method, url), calls in mocked.requests.items()
+            for call in calls
+        ]
+    assert len(ids) == 5
+    assert [len(request["vectors"]) for request in requests] == [2, 2, 2, 1]
+    assert [vector["metadata"]["text"] for vector in requests[-1]["vectors"]] == ["e"]
+    await vector_db.tear_down()
@@ -0,0 +1,97 @@
+import asyncio
+import base64
+import zlib
+from typing import Dict, List
+
+import pytest
+
+from vocode.streaming.models.index_config import IndexConfig
+from vocode.streaming.models.synthesizer import ElevenLabsSynthesizerConfig
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
+from vocode.streaming.synthesizer import base_synthesizer
+from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer
+from vocode.streaming.synthesizer.phrase_promotion import (
+    PhraseFrequencyTracker,
+    PhrasePromoter,
+)
+from vocode.streaming.utils.object_store import LocalObjectStore
+from vocode.streaming.vector_db.factory import VectorDBFactory
+
+
+class FakeCache:
+    def __init__(self):
+        self.values: Dict[str, bytes] = {}
+
+    async def set_async(self, key, value):
+        self.values[key] = value
+
+
+def embed(texts: List[str]) -> List[List[float]]:
+    return [[float(zlib.crc32(text.encode()) % 7), 1.0] for text in texts]
+
+
+async def wait_for(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+@pytest.mark.asyncio
+async def test_frequent_phrases_are_cached_then_indexed(monkeypatch, tmp_path):
+    tracker = PhraseFrequencyTracker(width=1024)
+    promoter = PhrasePromoter(
+        create_object_store=lambda bucket_name: LocalObjectStore(str(tmp_path / bucket_name))
+    )
+    monkeypatch.setattr(base_synthesizer, "phrase_frequency_tracker", tracker)
+    monkeypatch.setattr(base_synthesizer, "phrase_promoter", promoter)
+    vector_db_config = LocalVectorDBConfig(
+        path=str(tmp_path / "index"), embeddings_function=embed
+    )
+    synthesizer_config = ElevenLabsSynthesizerConfig.from_telephone_output_device(
+        voice_id="voice",
+        stability=0.5,
+        similarity_boost=0.75,
+        index_config=IndexConfig(vector_db_config=vector_db_config, bucket_name="bucket"),
+        index_promotion_threshold=3,
+    )
+    cache = FakeCache()
+    synthesizer = BaseSynthesizer(synthesizer_config, cache=cache)
+    cache_key = synthesizer.get_cache_key("Thanks for calling!")
+
+    synthesizer.record_synthesized_phrase("Thanks for calling!", b"audio 1")
+    synthesizer.record_synthesized_phrase("Anything else?", b"other audio")
+    await asyncio.sleep(0.01)
+    assert cache.values == {}
+
+    # said again, with different case and spacing
+    synthesizer.record_synthesized_phrase("thanks  for calling!", b"audio 2")
+    await wait_for(lambda: cache.values)
+    assert list(cache.values) == [synthesizer.get_cache_key("thanks  for calling!")]
+    assert base64.b64decode(list(cache.values.values())[0]) == b"audio 2"
+
+    synthesizer.record_cached_phrase("Thanks for calling!")
+    assert tracker.estimate(synthesizer.get_voice_key(), "Thanks for calling!") == 3
+    synthesizer.record_synthesized_phrase("Thanks for calling!", b"audio 4")
+    await wait_for(lambda: cache_key in promoter.indexed_keys)
+
+    vector_db = VectorDBFactory().create_vector_db(vector_db_config)
+    documents = await vector_db.retrieve_k_vectors_with_filter(
+        filters={"voice_id": "voice", "stability": 0.5, "similarity_boost": 0.75}
+    )
+    assert [document.page_content for document in documents] == ["Thanks for calling!"]
+    assert (
+        await LocalObjectStore(str(tmp_path / "bucket")).get(
+            documents[0].metadata["object_key"]
+        )
+        == b"audio 4"
+    )
+    # indexed once per process
+    synthesizer.record_synthesized_phrase("Thanks for calling!", b"audio 5")
+    await asyncio.sleep(0.05)
+    assert len(await vector_db.retrieve_k_vectors_with_filter()) == 1
+
+    promoter.task.cancel()
+    await vector_db.tear_down()
+    await synthesizer.tear_down()
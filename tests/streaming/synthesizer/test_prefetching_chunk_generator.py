@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+
+from vocode.streaming.synthesizer.base_synthesizer import SynthesisResult
+
+CHUNK_DURATION_SECONDS = 0.1
+UNDERRUN_TOLERANCE_SECONDS = 0.03
+# mostly fast reads with a stall much longer than a chunk once the buffer is warm
+UPSTREAM_DELAYS = [0.02] * 6 + [0.25] + [0.02] * 5
+
+
+async def slow_upstream(delays=UPSTREAM_DELAYS):
+    for i, delay in enumerate(delays):
+        await asyncio.sleep(delay)
+        yield SynthesisResult.ChunkResult(bytes(800), i == len(delays) - 1)
+
+
+async def count_underruns(chunk_generator) -> int:
+    underruns = 0
+    chunk_idx = 0
+    while True:
+        start = time.monotonic()
+        try:
+            await chunk_generator.__anext__()
+        except StopAsyncIteration:
+            break
+        if chunk_idx > 0 and time.monotonic() - start > UNDERRUN_TOLERANCE_SECONDS:
+            underruns += 1
+        chunk_idx += 1
+        # simulate the chunk being played
+        await asyncio.sleep(CHUNK_DURATION_SECONDS)
+    return underruns
+
+
+@pytest.mark.asyncio
+async def test_prefetch_has_no_underruns_with_slow_upstream():
+    synthesis_result = SynthesisResult(slow_upstream(), lambda seconds: "")
+    assert await count_underruns(synthesis_result.chunk_generator) == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_upstream_underruns_without_prefetch():
+    assert await count_underruns(slow_upstream()) > 0
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_prefetch():
+    upstream_closed = asyncio.Event()
+
+    async def endless_upstream():
+        try:
+            while True:
+                await asyncio.sleep(0.01)
+                yield SynthesisResult.ChunkResult(bytes(800), False)
+        finally:
+            upstream_closed.set()
+
+    synthesis_result = SynthesisResult(
+        endless_upstream(), lambda seconds: "", max_prefetched_chunks=2
+    )
+    await synthesis_result.chunk_generator.__anext__()
+    await synthesis_result.close()
+    assert upstream_closed.is_set()
+    assert synthesis_result.chunk_generator.prefetch_task.done()
+    with pytest.raises(StopAsyncIteration):
+        await synthesis_result.chunk_generator.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_upstream_errors_are_raised_to_consumer():
+    async def failing_upstream():
+        yield SynthesisResult.ChunkResult(bytes(800), False)
+        raise ValueError("upstream failed")
+
+    synthesis_result = SynthesisResult(failing_upstream(), lambda seconds: "")
+    await synthesis_result.chunk_generator.__anext__()
+    with pytest.raises(ValueError):
+        await synthesis_result.chunk_generator.__anext__()
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from vocode.streaming.telephony.server.sharding import TelephonyWorkerPool
+
+
+class AliveProcess:
+    def __init__(self, alive: bool = True):
+        self.alive = alive
+        self.exitcode = None if alive else 1
+
+    def is_alive(self):
+        return self.alive
+
+
+def create_pool(num_workers: int) -> TelephonyWorkerPool:
+    pool = TelephonyWorkerPool("app:create_app", num_workers=num_workers)
+    for worker in pool.workers:
+        worker.process = AliveProcess()
+    return pool
+
+
+def test_acquire_least_loaded_live_worker():
+    pool = create_pool(3)
+    pool.workers[2].process = AliveProcess(alive=False)
+    placements = [pool.acquire().index for _ in range(4)]
+    assert sorted(placements) == [0, 0, 1, 1]
+    pool.release(pool.workers[0])
+    assert pool.acquire().index == 0
+    assert pool.active_calls == 4
+
+
+def test_acquire_without_live_workers():
+    pool = create_pool(1)
+    pool.workers[0].process = AliveProcess(alive=False)
+    assert pool.acquire() is None
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_active_calls():
+    pool = create_pool(1)
+    worker = pool.acquire()
+    drain_task = asyncio.create_task(pool.drain())
+    await asyncio.sleep(0.1)
+    assert pool.draining
+    assert not drain_task.done()
+    pool.release(worker)
+    await asyncio.wait_for(drain_task, 2)
+
+
+@pytest.mark.asyncio
+async def test_dropped_calls_released_after_restart(monkeypatch):
+    pool = create_pool(2)
+    worker = pool.workers[0]
+    dropped = [pool.acquire(), pool.acquire()]
+    assert dropped[0] is worker
+
+    async def wait_until_ready(worker):
+        pass
+
+    worker.process = AliveProcess(alive=False)
+    monkeypatch.setattr(
+        pool, "spawn", lambda worker: setattr(worker, "process", AliveProcess())
+    )
+    monkeypatch.setattr(pool, "wait_until_ready", wait_until_ready)
+    await pool.restart(worker)
+    assert pool.acquire() is worker
+
+    # the dropped call's proxy unwinds after the restart
+    pool.release(dropped[0])
+    assert worker.active_calls == 1
+    drain_task = asyncio.create_task(pool.drain())
+    await asyncio.sleep(0.1)
+    assert not drain_task.done()
+    pool.release(dropped[1])
+    pool.release(worker)
+    await asyncio.wait_for(drain_task, 2)
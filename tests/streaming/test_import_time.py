@@ -0,0 +1,70 @@
+import os
+import re
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+# Provider SDKs and clients that should only be imported when they're used
+DEFERRED_MODULES = [
+    "aiobotocore",
+    "anthropic",
+    "boto3",
+    "chromadb",
+    "langchain",
+    "nltk",
+    "openai",
+    "pinecone",
+    "redis",
+    "scipy",
+]
+# Generous, so that slow CI machines pass; eager provider imports take seconds
+IMPORT_TIME_BUDGET_SECONDS = float(
+    os.environ.get("VOCODE_IMPORT_TIME_BUDGET_SECONDS", 2.0)
+)
+IMPORT_TIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def get_import_times(module: str) -> Dict[str, float]:
+    """Cumulative import time in seconds of every module imported, via -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is not None:
+            import_times[match.group(3)] = int(match.group(1)) / 1e6
+    return import_times
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "vocode.streaming.streaming_conversation",
+        "vocode.streaming.agent",
+        "vocode.streaming.synthesizer",
+        "vocode.streaming.transcriber",
+        "vocode.streaming.telephony.server.base",
+    ],
+)
+def test_import_does_not_load_providers(module: str):
+    import_times = get_import_times(module)
+    imported = {name.split(".")[0] for name in import_times}
+    assert imported.isdisjoint(DEFERRED_MODULES), sorted(
+        imported.intersection(DEFERRED_MODULES)
+    )
+    assert import_times[module] < IMPORT_TIME_BUDGET_SECONDS
+
+
+def test_lazy_reexports():
+    from vocode.streaming import synthesizer, transcriber
+    from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
+
+    assert transcriber.DeepgramTranscriber is DeepgramTranscriber
+    with pytest.raises(AttributeError):
+        synthesizer.NotASynthesizer
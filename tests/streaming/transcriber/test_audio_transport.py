@@ -0,0 +1,101 @@
+import asyncio
+import audioop
+import base64
+import json
+import os
+from typing import List
+
+import pytest
+import websockets
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.transcriber import AssemblyAITranscriberConfig
+from vocode.streaming.transcriber import assembly_ai_transcriber
+from vocode.streaming.transcriber.assembly_ai_transcriber import AssemblyAITranscriber
+from vocode.streaming.transcriber.audio_transport import (
+    AudioFrameBuffer,
+    Base64JsonAudioTransport,
+)
+
+
+def write_in_chunks(frame_buffer: AudioFrameBuffer, audio: bytes, chunk_size: int):
+    frames: List[bytes] = []
+    for i in range(0, len(audio), chunk_size):
+        frames.extend(bytes(frame) for frame in frame_buffer.write(audio[i : i + chunk_size]))
+    return frames
+
+
+def test_mulaw_frames_match_audioop():
+    audio = os.urandom(1000)
+    frame_buffer = AudioFrameBuffer(320, AudioEncoding.MULAW)
+    frames = write_in_chunks(frame_buffer, audio, 77)
+    assert len(frames) == 6
+    assert b"".join(frames) == audioop.ulaw2lin(audio, 2)[: 6 * 320]
+
+
+def test_linear16_frames_are_reused_once_released():
+    audio = os.urandom(1000)
+    frame_buffer = AudioFrameBuffer(320, AudioEncoding.LINEAR16)
+    frames = frame_buffer.write(audio[:700])
+    assert [bytes(frame) for frame in frames] == [audio[:320], audio[320:640]]
+    frame_buffer.release(frames[0])
+    # the partial frame continues where it left off, the next one reuses a released one
+    next_frames = frame_buffer.write(audio[700:1000])
+    assert bytes(next_frames[0]) == audio[640:960]
+    assert frame_buffer.frame is frames[0]
+
+
+def test_base64_json_transport_matches_json_dumps():
+    transport = Base64JsonAudioTransport("frames", {"x_gladia_key": 'key"with quotes'})
+    frame = bytearray(os.urandom(100))
+    assert json.loads(transport.encode(frame)) == {
+        "x_gladia_key": 'key"with quotes',
+        "frames": base64.b64encode(frame).decode("utf-8"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_assembly_ai_sends_binary_frames(monkeypatch):
+    received: List = []
+
+    async def handler(ws):
+        async for message in ws:
+            received.append(message)
+            if len(received) == 1:
+                await ws.send(
+                    json.dumps(
+                        {
+                            "message_type": "FinalTranscript",
+                            "text": "hello",
+                            "confidence": 1.0,
+                            "audio_start": 0,
+                            "audio_end": 100,
+                        }
+                    )
+                )
+
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    monkeypatch.setattr(
+        assembly_ai_transcriber, "ASSEMBLY_AI_URL", f"ws://127.0.0.1:{port}"
+    )
+    transcriber = AssemblyAITranscriber(
+        AssemblyAITranscriberConfig(
+            sampling_rate=8000,
+            audio_encoding=AudioEncoding.MULAW,
+            chunk_size=160,
+        ),
+        api_key="test",
+    )
+    transcriber.start()
+    audio = os.urandom(800)
+    for i in range(0, len(audio), 160):
+        transcriber.send_audio(audio[i : i + 160])
+
+    transcription = await asyncio.wait_for(transcriber.output_queue.get(), 5)
+    assert transcription.message == "hello" and transcription.is_final
+    assert received[0] == audioop.ulaw2lin(audio, 2)
+
+    await transcriber.terminate()
+    server.close()
+    await server.wait_closed()
@@ -0,0 +1,134 @@
+import asyncio
+import json
+from typing import List
+
+import pytest
+import websockets
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.transcriber import DeepgramTranscriberConfig
+from vocode.streaming.transcriber import deepgram_transcriber
+from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
+
+# 0.2 seconds of 8kHz mulaw each
+CHUNKS = [bytes([i]) * 1600 for i in range(1, 5)]
+
+
+def create_result(transcript: str, start: float, duration: float) -> str:
+    return json.dumps(
+        {
+            "is_final": True,
+            "speech_final": True,
+            "start": start,
+            "duration": duration,
+            "channel": {
+                "alternatives": [
+                    {
+                        "transcript": transcript,
+                        "confidence": 1.0,
+                        "words": [{"word": transcript, "end": start + duration}],
+                    }
+                ]
+            },
+        }
+    )
+
+
+class FakeDeepgramServer:
+    """Records the messages received on each connection"""
+
+    def __init__(self, close_first_connection_after: int = 0):
+        self.connections: List[List] = []
+        self.close_first_connection_after = close_first_connection_after
+
+    async def handler(self, ws):
+        messages: List = []
+        connection_index = len(self.connections)
+        self.connections.append(messages)
+        async for message in ws:
+            messages.append(message)
+            audio = [m for m in messages if isinstance(m, bytes)]
+            if connection_index > 0 or not self.close_first_connection_after:
+                continue
+            if len(audio) == 1:
+                await ws.send(create_result("hello", 0, 0.2))
+            if len(audio) == self.close_first_connection_after:
+                return
+
+    def audio(self, connection_index: int) -> List[bytes]:
+        return [m for m in self.connections[connection_index] if isinstance(m, bytes)]
+
+
+async def start_server(monkeypatch, fake_server: FakeDeepgramServer):
+    server = await websockets.serve(fake_server.handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    monkeypatch.setattr(
+        deepgram_transcriber, "DEEPGRAM_LISTEN_URL", f"ws://127.0.0.1:{port}/v1/listen"
+    )
+    return server
+
+
+def create_transcriber_config(**kwargs) -> DeepgramTranscriberConfig:
+    return DeepgramTranscriberConfig(
+        sampling_rate=8000,
+        audio_encoding=AudioEncoding.MULAW,
+        chunk_size=1600,
+        **kwargs,
+    )
+
+
+async def wait_for(condition, timeout: float = 5):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_prewarmed_connection_is_claimed(monkeypatch):
+    fake_server = FakeDeepgramServer()
+    server = await start_server(monkeypatch, fake_server)
+    pool = deepgram_transcriber.deepgram_connection_pool
+    monkeypatch.setattr(pool, "keepalive_interval_seconds", 0.05)
+    transcriber_config = create_transcriber_config(prewarmed_connections=1)
+
+    await DeepgramTranscriber.warm_up(transcriber_config, api_key="test")
+    assert len(fake_server.connections) == 1
+    await wait_for(lambda: len(fake_server.connections[0]) > 0)
+    assert json.loads(fake_server.connections[0][0]) == {"type": "KeepAlive"}
+
+    transcriber = DeepgramTranscriber(transcriber_config, api_key="test")
+    transcriber.start()
+    assert await transcriber.ready()
+    transcriber.send_audio(CHUNKS[0])
+    await wait_for(lambda: fake_server.audio(0) == [CHUNKS[0]])
+    # a replacement is connected for the next call
+    await wait_for(lambda: len(fake_server.connections) == 2)
+
+    await transcriber.terminate()
+    await pool.close()
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_audio_after_last_final_is_replayed_on_reconnect(monkeypatch):
+    fake_server = FakeDeepgramServer(close_first_connection_after=3)
+    server = await start_server(monkeypatch, fake_server)
+    transcriber = DeepgramTranscriber(create_transcriber_config(), api_key="test")
+    transcriber.start()
+    assert await transcriber.ready()
+
+    for chunk in CHUNKS[:3]:
+        transcriber.send_audio(chunk)
+        await asyncio.sleep(0.05)
+    transcription = await asyncio.wait_for(transcriber.output_queue.get(), 5)
+    assert transcription.message.strip() == "hello" and transcription.is_final
+    await wait_for(lambda: len(fake_server.connections) == 2)
+    transcriber.send_audio(CHUNKS[3])
+
+    await wait_for(lambda: CHUNKS[3] in fake_server.audio(1))
+    assert fake_server.audio(1) == CHUNKS[1:]
+
+    await transcriber.terminate()
+    server.close()
@@ -0,0 +1,154 @@
+import json
+import struct
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.transcriber import (
+    ClassifierEndpointingConfig,
+    DeepgramTranscriberConfig,
+    TimeEndpointingConfig,
+)
+from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
+from vocode.streaming.transcriber.endpointing import (
+    AudioEnergyTracker,
+    EndpointingClassifier,
+    EndpointingFeatures,
+)
+
+
+def first_end_of_turn(classifier: EndpointingClassifier, transcript: str) -> float:
+    """The least silence after which the classifier ends the turn, in 50ms steps"""
+    for step in range(100):
+        silence_seconds = round(step * 0.05, 2)
+        features = EndpointingFeatures.from_transcript(transcript, silence_seconds)
+        if classifier.is_end_of_turn(transcript, features):
+            return silence_seconds
+    raise AssertionError("turn never ended")
+
+
+def test_features():
+    features = EndpointingFeatures.from_transcript("What time do you open?", 0.3)
+    assert features.terminal_punctuation and features.question
+    assert not features.trailing_continuation and not features.short_answer
+
+    features = EndpointingFeatures.from_transcript("I was thinking, um,", 0.3)
+    assert features.trailing_continuation and not features.terminal_punctuation
+
+    assert EndpointingFeatures.from_transcript("Yes.", 0.3).short_answer
+    assert not EndpointingFeatures.from_transcript("I want", 0.3).short_answer
+    assert EndpointingFeatures.from_transcript("ok", 0.3, 0.25).energy_drop == 0.75
+
+
+def test_classifier_waits_longer_for_unfinished_sentences():
+    classifier = EndpointingClassifier(
+        ClassifierEndpointingConfig(min_silence_seconds=0.1, max_silence_seconds=1.5)
+    )
+    punctuated = first_end_of_turn(classifier, "I'd like to book a table.")
+    unpunctuated = first_end_of_turn(classifier, "I'd like to book a table")
+    continuation = first_end_of_turn(classifier, "I'd like to book a table and")
+    assert 0.1 <= punctuated < unpunctuated < continuation <= 1.5
+
+    # min and max silence bound the classifier either way
+    strict = EndpointingClassifier(
+        ClassifierEndpointingConfig(
+            min_silence_seconds=0.5, max_silence_seconds=0.6, weights={"bias": 10}
+        )
+    )
+    assert first_end_of_turn(strict, "I'd like to book a table.") == 0.5
+    lenient = EndpointingClassifier(
+        ClassifierEndpointingConfig(max_silence_seconds=0.6, weights={"bias": -10})
+    )
+    assert first_end_of_turn(lenient, "I'd like to book a table and") == 0.6
+
+
+def test_audio_energy_tracker():
+    tracker = AudioEnergyTracker(AudioEncoding.LINEAR16)
+    loud = struct.pack("<h", 4000) * 320
+    quiet = struct.pack("<h", 200) * 320
+    cursor = 0.0
+    for chunk in [loud] * 10 + [quiet] * 5:
+        cursor += 0.02
+        tracker.add(chunk, cursor)
+    assert tracker.get_energy_ratio(0, 0.2) == 1.0
+    ratio = tracker.get_energy_ratio(0.2, cursor)
+    assert ratio is not None and ratio < 0.5
+    assert tracker.get_energy_ratio(cursor, cursor + 1) is None
+
+    # a new connection starts the cursors over
+    tracker.add(quiet, 0.02)
+    assert tracker.get_energy_ratio(0.2, 0.3) is None
+
+
+def create_result(transcript: str, start: float, duration: float, word_end: float):
+    return json.dumps(
+        {
+            "is_final": True,
+            "speech_final": False,
+            "start": start,
+            "duration": duration,
+            "channel": {
+                "alternatives": [
+                    {
+                        "transcript": transcript,
+                        "confidence": 1.0,
+                        "words": [
+                            {"word": word, "start": start, "end": word_end}
+                            for word in transcript.split()
+                        ],
+                    }
+                ]
+            },
+        }
+    )
+
+
+def test_deepgram_classifier_endpointing():
+    transcriber = DeepgramTranscriber(
+        DeepgramTranscriberConfig(
+            sampling_rate=8000,
+            audio_encoding=AudioEncoding.LINEAR16,
+            chunk_size=160,
+            endpointing_config=ClassifierEndpointingConfig(),
+        ),
+        api_key="test",
+    )
+    assert "punctuate=true" in transcriber.get_url()
+
+    # 0.3s of silence after "and" doesn't end the turn, after a full stop it does
+    transcriber.handle_message(create_result("I'd like a table and", 0, 1.3, 1.0))
+    assert transcriber.output_queue.get_nowait().is_final is False
+    transcriber.handle_message(create_result("a window seat.", 1.3, 1.3, 2.3))
+    transcription = transcriber.output_queue.get_nowait()
+    assert transcription.is_final
+    assert transcription.message.strip() == "I'd like a table and a window seat."
+    assert transcriber.buffer == ""
+
+
+def test_deepgram_endpointing_config_switched_mid_call():
+    transcriber = DeepgramTranscriber(
+        DeepgramTranscriberConfig(
+            sampling_rate=8000,
+            audio_encoding=AudioEncoding.LINEAR16,
+            chunk_size=160,
+            endpointing_config=TimeEndpointingConfig(),
+        ),
+        api_key="test",
+    )
+    # as StreamingConversation's state manager does
+    transcriber.get_transcriber_config().endpointing_config = (
+        ClassifierEndpointingConfig()
+    )
+    transcriber.handle_message(create_result("I'd like a table and", 0, 1.3, 1.0))
+    assert transcriber.output_queue.get_nowait().is_final is False
+    transcriber.handle_message(create_result("a window seat.", 1.3, 1.3, 2.3))
+    assert transcriber.output_queue.get_nowait().is_final
+
+    # a classifier is built for the new config's weights
+    transcriber.get_transcriber_config().endpointing_config = (
+        ClassifierEndpointingConfig(max_silence_seconds=0.6, weights={"bias": -10})
+    )
+    transcriber.handle_message(create_result("I'd like a table and", 0, 1.3, 1.0))
+    assert transcriber.output_queue.get_nowait().is_final is False
+    assert transcriber.endpointing_classifier is not None
+    assert transcriber.endpointing_classifier.endpointing_config.weights == {
+        "bias": -10
+    }
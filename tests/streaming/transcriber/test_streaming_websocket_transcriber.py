@@ -0,0 +1,123 @@
+import asyncio
+import json
+from typing import List
+
+import pytest
+import websockets
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.transcriber import AssemblyAITranscriberConfig
+from vocode.streaming.transcriber import (
+    assembly_ai_transcriber,
+    streaming_websocket_transcriber,
+)
+from vocode.streaming.transcriber.assembly_ai_transcriber import AssemblyAITranscriber
+
+# 0.1 seconds of 8kHz mulaw each, a whole AssemblyAI frame
+CHUNKS = [bytes([i]) * 800 for i in range(1, 5)]
+
+
+class FakeAssemblyAIServer:
+    """Records the messages received on each connection. If
+    `close_first_connection_after` is set, the first connection sends a final
+    transcript of the first frame and is closed after that many frames."""
+
+    def __init__(self, close_first_connection_after: int = 0):
+        self.connections: List[List] = []
+        self.close_first_connection_after = close_first_connection_after
+
+    async def handler(self, ws):
+        messages: List = []
+        connection_index = len(self.connections)
+        self.connections.append(messages)
+        async for message in ws:
+            messages.append(message)
+            audio = [m for m in messages if isinstance(m, bytes)]
+            if connection_index > 0 or not self.close_first_connection_after:
+                continue
+            if len(audio) == 1:
+                await ws.send(
+                    json.dumps(
+                        {
+                            "message_type": "FinalTranscript",
+                            "text": "hello",
+                            "confidence": 1.0,
+                            "audio_start": 0,
+                            "audio_end": 100,
+                        }
+                    )
+                )
+            if len(audio) == self.close_first_connection_after:
+                return
+
+    def audio(self, connection_index: int) -> List[bytes]:
+        return [m for m in self.connections[connection_index] if isinstance(m, bytes)]
+
+    def text(self, connection_index: int) -> List[str]:
+        return [m for m in self.connections[connection_index] if isinstance(m, str)]
+
+
+async def start_transcriber(monkeypatch, fake_server: FakeAssemblyAIServer):
+    server = await websockets.serve(fake_server.handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    monkeypatch.setattr(
+        assembly_ai_transcriber, "ASSEMBLY_AI_URL", f"ws://127.0.0.1:{port}"
+    )
+    transcriber = AssemblyAITranscriber(
+        AssemblyAITranscriberConfig(
+            sampling_rate=8000,
+            audio_encoding=AudioEncoding.MULAW,
+            chunk_size=800,
+        ),
+        api_key="test",
+    )
+    transcriber.start()
+    assert await transcriber.ready()
+    return server, transcriber
+
+
+async def wait_for(condition, timeout: float = 5):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_reconnects_and_replays_audio_after_last_final(monkeypatch):
+    fake_server = FakeAssemblyAIServer(close_first_connection_after=3)
+    server, transcriber = await start_transcriber(monkeypatch, fake_server)
+
+    for chunk in CHUNKS[:3]:
+        transcriber.send_audio(chunk)
+        await asyncio.sleep(0.05)
+    transcription = await asyncio.wait_for(transcriber.output_queue.get(), 5)
+    assert transcription.message == "hello" and transcription.is_final
+    await wait_for(lambda: len(fake_server.connections) == 2)
+    transcriber.send_audio(CHUNKS[3])
+
+    # the first frame was finally transcribed, the next two are replayed
+    await wait_for(lambda: len(fake_server.audio(1)) == 3)
+    assert fake_server.audio(1) == fake_server.audio(0)[1:] + [fake_server.audio(1)[-1]]
+
+    await transcriber.terminate()
+    # the session is ended before the connection is closed
+    await wait_for(lambda: fake_server.text(1) == [transcriber.close_message])
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_sends_keepalive_while_idle(monkeypatch):
+    monkeypatch.setattr(streaming_websocket_transcriber, "KEEPALIVE_INTERVAL_SECONDS", 0.05)
+    monkeypatch.setattr(AssemblyAITranscriber, "keepalive_message", '{"keepalive": true}')
+    fake_server = FakeAssemblyAIServer()
+    server, transcriber = await start_transcriber(monkeypatch, fake_server)
+
+    await wait_for(lambda: len(fake_server.text(0)) >= 2)
+    assert set(fake_server.text(0)) == {'{"keepalive": true}'}
+
+    await transcriber.terminate()
+    server.close()
+    await server.wait_closed()
@@ -0,0 +1,128 @@
+import asyncio
+import audioop
+import math
+import struct
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.transcriber import WhisperCPPTranscriberConfig
+from vocode.streaming.transcriber.whisper_cpp_transcriber import (
+    AudioRingBuffer,
+    TranscriptStabilizer,
+    WhisperCPPTranscriber,
+)
+
+WORDS = "please move my appointment to thursday afternoon at three".split()
+
+
+class FakeContextPool:
+    """Transcribes two words per second of audio it's given"""
+
+    def __init__(self):
+        self.decoded_seconds: List[float] = []
+        self.prompts: List[str] = []
+
+    async def transcribe(self, audio: np.ndarray, initial_prompt: str = "") -> Tuple[str, float]:
+        await asyncio.sleep(0)
+        seconds = len(audio) / 16000
+        self.decoded_seconds.append(seconds)
+        self.prompts.append(initial_prompt)
+        return " ".join(WORDS[: int(seconds * 2)]), 0.9
+
+
+def get_mulaw_audio(seconds: float, amplitude: int) -> bytes:
+    num_samples = int(seconds * 8000)
+    pcm = struct.pack(
+        f"<{num_samples}h",
+        *(int(amplitude * math.sin(2 * math.pi * 300 * i / 8000)) for i in range(num_samples)),
+    )
+    return audioop.lin2ulaw(pcm, 2)
+
+
+def test_ring_buffer_wraps():
+    ring_buffer = AudioRingBuffer(5)
+    ring_buffer.append(np.arange(3, dtype=np.float32))
+    ring_buffer.append(np.arange(3, 7, dtype=np.float32))
+    assert ring_buffer.start == 2
+    assert ring_buffer.get(0).tolist() == [2, 3, 4, 5, 6]
+    assert ring_buffer.get(4).tolist() == [4, 5, 6]
+    ring_buffer.append(np.arange(7, 15, dtype=np.float32))
+    assert ring_buffer.end == 15
+    assert ring_buffer.get(12).tolist() == [12, 13, 14]
+
+
+def test_stabilizer_commits_agreed_prefix():
+    stabilizer = TranscriptStabilizer(agreements_to_commit=2)
+    assert stabilizer.update("please move") == ("", "please move")
+    assert stabilizer.update("Please move my") == ("Please move", "my")
+    # committed words aren't changed by later decodes
+    assert stabilizer.update("Peas move my appointment") == (
+        "Please move my",
+        "appointment",
+    )
+    assert stabilizer.get_committed_before_window() == []
+    stabilizer.slide()
+    # the slid window starts with the end of the committed text
+    assert stabilizer.update("my appointment to") == ("Please move my appointment", "to")
+    assert stabilizer.get_committed_before_window() == ["Please", "move"]
+    assert stabilizer.finalize("my appointment to thursday.") == (
+        "Please move my appointment to thursday."
+    )
+
+
+@pytest.mark.asyncio
+async def test_streams_interim_and_final_transcriptions():
+    context_pool = FakeContextPool()
+    transcriber = WhisperCPPTranscriber(
+        WhisperCPPTranscriberConfig(
+            sampling_rate=8000,
+            audio_encoding=AudioEncoding.MULAW,
+            chunk_size=160,
+            libname="libwhisper.so",
+            fname_model="model.bin",
+            buffer_size_seconds=0.5,
+            window_seconds=2,
+            window_overlap_seconds=1,
+        ),
+        context_pool=context_pool,
+    )
+    transcriber.start()
+    audio = (
+        get_mulaw_audio(1, amplitude=0)
+        + get_mulaw_audio(3, amplitude=8000)
+        + get_mulaw_audio(1, amplitude=0)
+    )
+    for i in range(0, len(audio), 160):
+        transcriber.send_audio(audio[i : i + 160])
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.05)
+    transcriber.terminate()
+
+    transcriptions = []
+    while not transcriber.output_queue.empty():
+        transcriptions.append(transcriber.output_queue.get_nowait())
+    # nothing was decoded during the leading silence, and the window never
+    # grew past window_seconds
+    assert len(context_pool.decoded_seconds) < 10
+    assert max(context_pool.decoded_seconds) <= 2.5
+    assert [transcription.is_final for transcription in transcriptions][-1]
+    assert not any(transcription.is_final for transcription in transcriptions[:-1])
+    final = transcriptions[-1]
+    assert final.message.startswith("please move")
+    assert final.time_silent is not None and final.time_silent >= 0.6
+    assert final.latency is not None
+    # the window isn't decoded with its own words as the prompt, only with
+    # those it slid past
+    num_unslid_decodes = next(
+        i
+        for i in range(1, len(context_pool.decoded_seconds))
+        if context_pool.decoded_seconds[i] < context_pool.decoded_seconds[i - 1]
+    )
+    assert context_pool.prompts[:num_unslid_decodes] == [""] * num_unslid_decodes
+    assert any(
+        prompt.startswith("please")
+        for prompt in context_pool.prompts[num_unslid_decodes:]
+    )
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from vocode.streaming.utils.bounded_queue import BoundedQueue, OverflowPolicy
+from vocode.streaming.utils.worker import AsyncWorker
+
+
+def test_drop_oldest():
+    queue = BoundedQueue("test", maxsize=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    for i in range(4):
+        queue.put_nowait(i)
+    assert [queue.get_nowait(), queue.get_nowait()] == [2, 3]
+    assert queue.num_dropped == 2
+
+
+def test_drop_newest():
+    queue = BoundedQueue("test", maxsize=2, overflow_policy=OverflowPolicy.DROP_NEWEST)
+    for i in range(4):
+        queue.put_nowait(i)
+    assert [queue.get_nowait(), queue.get_nowait()] == [0, 1]
+    assert queue.num_dropped == 2
+
+
+def test_drop_oldest_skips_undroppable_items():
+    queue = BoundedQueue(
+        "test",
+        maxsize=2,
+        overflow_policy=OverflowPolicy.DROP_OLDEST,
+        is_droppable=lambda item: item != "mark",
+    )
+    for item in ["mark", "audio 1", "audio 2", "mark", "audio 3"]:
+        queue.put_nowait(item)
+    assert [queue.get_nowait() for _ in range(queue.qsize())] == [
+        "mark",
+        "mark",
+        "audio 3",
+    ]
+    assert queue.num_dropped == 2
+    assert queue.num_overflowed == 1
+
+
+@pytest.mark.asyncio
+async def test_block():
+    queue = BoundedQueue("test", maxsize=1)
+    queue.put_nowait(0)
+    put_task = asyncio.create_task(queue.put(1))
+    await asyncio.sleep(0)
+    assert not put_task.done()
+    assert queue.get_nowait() == 0
+    await put_task
+    assert queue.get_nowait() == 1
+
+
+def test_block_put_nowait_overflows():
+    queue = BoundedQueue("test", maxsize=1)
+    for i in range(3):
+        queue.put_nowait(i)
+    assert queue.num_overflowed == 2
+    assert queue.num_dropped == 0
+    assert [queue.get_nowait() for _ in range(3)] == [0, 1, 2]
+    # the bound still applies once the queue has drained
+    queue.put_nowait(3)
+    assert queue.full()
+
+
+def test_workers_do_not_share_default_output_queue():
+    first_worker = AsyncWorker(asyncio.Queue())
+    second_worker = AsyncWorker(asyncio.Queue())
+    assert first_worker.output_queue is not second_worker.output_queue
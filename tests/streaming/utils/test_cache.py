@@ -0,0 +1,191 @@
+import asyncio
+import base64
+import zlib
+from typing import Dict, List
+
+import pytest
+from cachetools import LRUCache
+
+from vocode.streaming.models.index_config import IndexConfig
+from vocode.streaming.models.synthesizer import ElevenLabsSynthesizerConfig
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
+from vocode.streaming.utils import cache as cache_module
+from vocode.streaming.utils.cache import HIT_COUNTS_KEY, RedisRenewableTTLCache
+from vocode.streaming.utils.object_store import LocalObjectStore
+from vocode.streaming.vector_db.factory import VectorDBFactory
+from vocode.streaming.vector_db.local import LocalVectorDB
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: Dict[str, bytes] = {}
+        self.sorted_sets: Dict[str, Dict[str, float]] = {}
+
+    def getex(self, key, ex):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def expire(self, key, ttl):
+        pass
+
+    def zincrby(self, name, amount, key):
+        scores = self.sorted_sets.setdefault(name, {})
+        scores[key] = scores.get(key, 0) + amount
+
+    def zadd(self, name, mapping, nx=False, xx=False, incr=False):
+        scores = self.sorted_sets.setdefault(name, {})
+        for key, score in mapping.items():
+            if (nx and key in scores) or (xx and key not in scores):
+                continue
+            scores[key] = scores.get(key, 0) + score if incr else score
+
+    def zremrangebyrank(self, name, start, end):
+        scores = self.sorted_sets.get(name, {})
+        ranked = sorted(scores, key=scores.get)
+        for key in ranked[start : len(ranked) + end + 1 if end < 0 else end + 1]:
+            del scores[key]
+
+    def zrevrange(self, name, start, end):
+        scores = self.sorted_sets.get(name, {})
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return [key.encode() for key in ranked[start : end + 1]]
+
+    def zmscore(self, name, keys):
+        return [self.sorted_sets.get(name, {}).get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self.calls.append(
+                    lambda: getattr(redis, name)(*args, **kwargs)
+                )
+
+            def execute(self):
+                return [call() for call in self.calls]
+
+        return Pipeline()
+
+
+def embed(texts: List[str]) -> List[List[float]]:
+    return [[float(zlib.crc32(text.encode()) % 7), 1.0] for text in texts]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(RedisRenewableTTLCache, "_redis_client", FakeRedis())
+    monkeypatch.setattr(RedisRenewableTTLCache, "_lru_cache", LRUCache(maxsize=100))
+    monkeypatch.setattr(RedisRenewableTTLCache, "_last_hit_counts_trim_time", 0.0)
+    return RedisRenewableTTLCache()
+
+
+def test_hit_counts_are_bounded(cache, monkeypatch):
+    monkeypatch.setattr(cache_module, "MAX_HIT_COUNTS", 2)
+    redis = RedisRenewableTTLCache._redis_client
+    cache.set("a", b"a")
+    assert cache.get("missing") is None
+    cache._lru_cache.clear()
+    for key in ["a", "a"]:
+        assert cache.get(key) == b"a"
+    cache.set("b", b"b")
+    cache.set("c", b"c")
+    # misses aren't counted, and trimming waits for the interval
+    assert redis.sorted_sets[HIT_COUNTS_KEY] == {"a": 2, "b": 0, "c": 0}
+
+    monkeypatch.setattr(RedisRenewableTTLCache, "_last_hit_counts_trim_time", 0.0)
+    cache.set("d", b"d")
+    assert len(redis.sorted_sets[HIT_COUNTS_KEY]) == 2
+    assert redis.sorted_sets[HIT_COUNTS_KEY]["a"] == 2
+
+
+@pytest.mark.asyncio
+async def test_load_from_index_downloads_most_hit_phrases_first(
+    cache, tmp_path, monkeypatch
+):
+    vector_db_config = LocalVectorDBConfig(
+        path=str(tmp_path / "index"), embeddings_function=embed
+    )
+    synthesizer_config = ElevenLabsSynthesizerConfig.from_telephone_output_device(
+        voice_id="voice",
+        stability=0.5,
+        similarity_boost=0.75,
+        index_config=IndexConfig(vector_db_config=vector_db_config, bucket_name="bucket"),
+    )
+    object_store = LocalObjectStore(str(tmp_path / "objects"))
+    phrases = [f"phrase {i}" for i in range(30)]
+    for phrase in phrases:
+        await object_store.put(f"{phrase}.mp3", phrase.encode(), "audio/mpeg")
+    vector_db = VectorDBFactory().create_vector_db(vector_db_config)
+    await vector_db.add_texts(
+        ["missing phrase"] + phrases + ["other voice"],
+        metadatas=[
+            {
+                "voice_id": "voice",
+                "stability": 0.5,
+                "similarity_boost": 0.75,
+                "object_key": "missing.mp3",
+            }
+        ]
+        + [
+            {
+                "voice_id": "voice",
+                "stability": 0.5,
+                "similarity_boost": 0.75,
+                "object_key": f"{phrase}.mp3",
+            }
+            for phrase in phrases
+        ]
+        + [{"voice_id": "other", "object_key": "phrase 0.mp3"}],
+    )
+    await vector_db.tear_down()
+
+    redis = RedisRenewableTTLCache._redis_client
+    for i, hits in [(7, 3), (12, 5), (25, 1)]:
+        redis.zincrby(HIT_COUNTS_KEY, hits, synthesizer_config.get_cache_key(phrases[i]))
+    # the most hit phrase fails to download, and doesn't count toward the load size
+    redis.zincrby(HIT_COUNTS_KEY, 9, synthesizer_config.get_cache_key("missing phrase"))
+    # already in redis, so pulled into the LRU rather than downloaded
+    redis.setex(synthesizer_config.get_cache_key(phrases[3]), 1, b"cached")
+
+    # the most hit phrases are spread over later pages, which take a while to list
+    list_documents = LocalVectorDB.list_documents
+
+    async def list_documents_slowly(self, *args, **kwargs):
+        await asyncio.sleep(0.02)
+        return await list_documents(self, *args, **kwargs)
+
+    monkeypatch.setattr(LocalVectorDB, "list_documents", list_documents_slowly)
+    result = await cache.load_from_index(
+        synthesizer_config,
+        load_size=4,
+        max_concurrency=2,
+        page_size=8,
+        object_store=object_store,
+    )
+    assert result.num_listed == 31
+    assert result.num_cached == 1
+    assert result.num_downloaded == 4
+    assert result.num_failed == 1
+    assert cache.get(synthesizer_config.get_cache_key(phrases[3])) == b"cached"
+    # the most hit phrases, then the first listed
+    assert sorted(
+        base64.b64decode(value) for value in redis.values.values() if value != b"cached"
+    ) == [b"phrase 0", b"phrase 12", b"phrase 25", b"phrase 7"]
+
+    # without a limit, everything listed is loaded
+    result = await cache.load_from_index(
+        synthesizer_config, load_size=None, page_size=8, object_store=object_store
+    )
+    assert result.num_listed == 31
+    assert result.num_cached == 5
+    assert result.num_downloaded == 25
+    assert result.num_failed == 1
+    assert cache.get(synthesizer_config.get_cache_key(phrases[29])) == base64.b64encode(
+        b"phrase 29"
+    )
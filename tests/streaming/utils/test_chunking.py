@@ -0,0 +1,39 @@
+from itertools import islice
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.utils import get_chunk_sizes, split_audio
+
+
+def test_chunk_sizes_start_small_and_double():
+    # 16000 bytes per second of LINEAR16 at 8000 Hz
+    sizes = get_chunk_sizes(
+        AudioEncoding.LINEAR16, 8000, chunk_size=16000, first_chunk_size_seconds=0.1
+    )
+    assert list(islice(sizes, 7)) == [1600, 3200, 6400, 12800, 16000, 16000, 16000]
+
+
+def test_first_chunk_size_is_whole_samples():
+    sizes = get_chunk_sizes(
+        AudioEncoding.LINEAR16, 8000, chunk_size=16000, first_chunk_size_seconds=0.0001
+    )
+    assert next(sizes) == 2
+
+
+def test_chunk_sizes_without_first_chunk_size():
+    sizes = get_chunk_sizes(AudioEncoding.MULAW, 8000, chunk_size=8000)
+    assert list(islice(sizes, 3)) == [8000, 8000, 8000]
+
+
+def test_split_audio_marks_last_chunk():
+    audio = bytes(range(10))
+    assert list(split_audio(audio, iter([2, 4, 4, 4]))) == [
+        (audio[:2], False),
+        (audio[2:6], False),
+        (audio[6:], True),
+    ]
+    # a length that's an exact multiple of the chunk size
+    assert list(split_audio(audio, iter([5, 5, 5]))) == [
+        (audio[:5], False),
+        (audio[5:], True),
+    ]
+    assert list(split_audio(audio[:3], iter([5]))) == [(audio[:3], True)]
@@ -0,0 +1,30 @@
+import numpy as np
+
+from vocode.streaming.utils.count_min_sketch import CountMinSketch
+
+
+def test_estimates_never_undercount():
+    sketch = CountMinSketch(width=1024, depth=4, halve_every=0)
+    rng = np.random.default_rng(0)
+    # a few phrases said very often and a long tail said once or twice
+    phrases = [f"phrase {i}" for i in rng.zipf(1.5, size=5000) if i < 100000]
+    counts = {}
+    for phrase in phrases:
+        counts[phrase] = counts.get(phrase, 0) + 1
+        assert sketch.add(phrase) >= counts[phrase]
+
+    estimates = {phrase: sketch.estimate(phrase) for phrase in counts}
+    assert all(estimates[phrase] >= count for phrase, count in counts.items())
+    assert estimates["phrase 1"] == counts["phrase 1"]
+    overcounted = sum(estimates[phrase] > count for phrase, count in counts.items())
+    assert overcounted / len(counts) < 0.05
+
+
+def test_counts_are_halved():
+    sketch = CountMinSketch(width=64, depth=2, halve_every=10)
+    for _ in range(9):
+        sketch.add("hello")
+    assert sketch.estimate("hello") == 9
+    sketch.add("world")
+    assert sketch.estimate("hello") == 4
+    assert sketch.estimate("world") == 0
@@ -25,6 +25,17 @@ async def test_publish_event():
     assert not manager.queue.empty()
 
 
+@pytest.mark.asyncio
+async def test_publish_event_to_full_queue():
+    event = PhoneCallEndedEvent(
+        conversation_id=CONVERSATION_ID, type=EventType.PHONE_CALL_ENDED
+    )
+    manager = EventsManager([EventType.PHONE_CALL_ENDED], max_queue_size=1)
+    manager.publish_event(event)
+    manager.publish_event(event)
+    assert manager.queue.qsize() == 2
+
+
 @pytest.mark.asyncio
 async def test_handle_event_default_implementation():
     event = PhoneCallEndedEvent(
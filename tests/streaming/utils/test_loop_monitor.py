@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from vocode.streaming.utils.loop_monitor import (
+    LoopMonitor,
+    current_conversation_id,
+    describe_task,
+    get_task_name,
+    profile_event_loop,
+)
+
+
+def block_loop(seconds: float):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_stall_is_attributed_to_task(caplog):
+    monitor = LoopMonitor(interval_seconds=0.02, slow_callback_seconds=0.05)
+    monitor.start()
+    await asyncio.sleep(0.05)
+
+    async def stall():
+        block_loop(0.3)
+
+    current_conversation_id.set("conversation-id")
+    task = asyncio.create_task(stall(), name=get_task_name("StallingWorker"))
+    current_conversation_id.set(None)
+    assert describe_task(task) == ("StallingWorker", "conversation-id")
+    with caplog.at_level(logging.WARNING):
+        await task
+        await asyncio.sleep(0.05)
+    monitor.stop()
+
+    assert "blocked" in caplog.text
+    assert "StallingWorker (conversation conversation-id)" in caplog.text
+    assert "block_loop" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_profile_event_loop():
+    loop = asyncio.get_running_loop()
+
+    async def busy():
+        end_time = loop.time() + 0.2
+        while loop.time() < end_time:
+            block_loop(0.01)
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(busy(), name="BusyWorker")
+    collapsed_stacks = await loop.run_in_executor(
+        None, profile_event_loop, loop, threading.get_ident(), 0.1, 0.001
+    )
+    await task
+    assert any(
+        line.startswith("BusyWorker;") and "block_loop" in line
+        for line in collapsed_stacks.splitlines()
+    )
@@ -0,0 +1,107 @@
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.output_device.base_output_device import BaseOutputDevice
+from vocode.streaming.utils.playout_scheduler import PlayoutScheduler
+
+# 8000 bytes per second, so 160 byte frames and 800 byte batches
+SAMPLING_RATE = 8000
+
+
+class FakeClock:
+    """Stands in for the event loop's clock, every sleep wakes up late by `oversleep`"""
+
+    def __init__(self, oversleep: float = 0.0):
+        self.now = 100.0
+        self.oversleep = oversleep
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float):
+        self.now += delay + self.oversleep
+
+
+class RecordingOutputDevice(BaseOutputDevice):
+    def __init__(self, clock: FakeClock):
+        super().__init__(SAMPLING_RATE, AudioEncoding.MULAW)
+        self.clock = clock
+        self.sent: List[Tuple[float, bytes]] = []
+
+    def consume_nonblocking(self, chunk: bytes):
+        self.sent.append((self.clock.now, chunk))
+
+
+def create_scheduler(monkeypatch, clock: FakeClock):
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+    output_device = RecordingOutputDevice(clock)
+    scheduler = PlayoutScheduler(
+        output_device,
+        AudioEncoding.MULAW,
+        SAMPLING_RATE,
+        frame_seconds=0.02,
+        lead_seconds=0.06,
+        batch_seconds=0.1,
+    )
+    scheduler.loop = clock
+    return scheduler, output_device
+
+
+async def play(scheduler: PlayoutScheduler, seconds: float):
+    for frame in scheduler.get_frames(bytes(int(SAMPLING_RATE * seconds))):
+        await scheduler.send(frame)
+    await scheduler.flush()
+
+
+@pytest.mark.asyncio
+async def test_frames_are_sent_in_batches_without_drift(monkeypatch):
+    clock = FakeClock(oversleep=0.004)
+    scheduler, output_device = create_scheduler(monkeypatch, clock)
+    start = clock.now
+    await play(scheduler, 2.0)
+
+    assert [len(batch) for _, batch in output_device.sent] == [800] * 20
+    for i, (sent_time, _) in enumerate(output_device.sent):
+        # each batch goes out lead_seconds before it plays, late wakeups don't add up
+        expected = max(start + i * 0.1 - 0.06, start)
+        assert expected <= sent_time <= expected + 0.004 + 1e-9
+
+
+@pytest.mark.asyncio
+async def test_timeline_is_re_anchored_when_output_runs_dry(monkeypatch):
+    clock = FakeClock()
+    scheduler, output_device = create_scheduler(monkeypatch, clock)
+    await play(scheduler, 0.5)
+    # the next audio comes a second after the last batch played
+    clock.now = scheduler.start_time + 1.5
+    resumed = clock.now
+    await play(scheduler, 0.5)
+
+    resumed_times = [sent_time for sent_time, _ in output_device.sent[5:]]
+    # paced from the new anchor rather than burst out to catch up
+    assert resumed_times == pytest.approx(
+        [resumed] + [resumed + i * 0.1 - 0.06 for i in range(1, 5)]
+    )
+    await scheduler.wait_for_playout()
+    assert clock.now == pytest.approx(resumed + 0.5)
+
+
+@pytest.mark.asyncio
+async def test_audio_sent_ahead_of_playback_is_bounded(monkeypatch):
+    clock = FakeClock(oversleep=0.002)
+    scheduler, output_device = create_scheduler(monkeypatch, clock)
+    audio = bytes(int(SAMPLING_RATE * 3.05))
+    for frame in scheduler.get_frames(audio):
+        await scheduler.send(frame)
+        if scheduler.start_time is None:
+            continue
+        seconds_ahead = scheduler.seconds_sent - (clock.now - scheduler.start_time)
+        # what would still play after an interrupt at this point
+        assert seconds_ahead <= 0.06 + 0.1 + 1e-9
+    # frames of an unfinished batch haven't reached the output device
+    assert sum(len(batch) for _, batch in output_device.sent) == scheduler.bytes_sent
+    assert scheduler.pending_size == 400
+    assert scheduler.bytes_sent + scheduler.pending_size == len(audio)
@@ -0,0 +1,49 @@
+import pytest
+
+from vocode.streaming.models.events import Sender
+from vocode.streaming.models.transcript import TranscriptEvent
+from vocode.streaming.models.websocket import (
+    AudioMessage,
+    StopMessage,
+    TranscriptMessage,
+    WebSocketMessage,
+)
+from vocode.streaming.utils import serialization
+from vocode.streaming.utils.serialization import JsonSerializer, OrjsonSerializer
+
+SERIALIZERS = [JsonSerializer()]
+if serialization.orjson is not None:
+    SERIALIZERS.append(OrjsonSerializer())
+
+
+@pytest.fixture(params=SERIALIZERS, ids=lambda serializer: serializer.name)
+def serializer(request):
+    serialization.set_serializer(request.param)
+    yield request.param
+    serialization.set_serializer(None)
+
+
+def test_round_trip(serializer):
+    obj = {"event": "media", "media": {"payload": "/w==", "timestamp": "20"}}
+    message = serialization.dumps(obj)
+    assert isinstance(message, str)
+    assert serialization.loads(message) == obj
+    assert serialization.loads(message.encode("utf-8")) == obj
+
+
+def test_audio_message_fast_path_matches_model(serializer):
+    message = AudioMessage.json_from_bytes(b"\x00\x01\x02")
+    parsed = WebSocketMessage.parse_obj(serialization.loads(message))
+    assert parsed == AudioMessage.from_bytes(b"\x00\x01\x02")
+    assert AudioMessage.parse_bytes(serialization.loads(message)) == b"\x00\x01\x02"
+    assert AudioMessage.parse_bytes(serialization.loads(StopMessage().json())) is None
+
+
+def test_transcript_message_fast_path_matches_model(serializer):
+    event = TranscriptEvent(
+        text="hello", sender=Sender.HUMAN, timestamp=1.5, conversation_id="id"
+    )
+    message = TranscriptMessage.json_from_event(event)
+    assert serialization.loads(message) == serialization.loads(
+        TranscriptMessage.from_event(event).json()
+    )
@@ -0,0 +1,75 @@
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from vocode.streaming.synthesizer.base_synthesizer import SynthesisResult
+from vocode.streaming.utils import turn_timeline
+from vocode.streaming.utils.turn_timeline import (
+    TurnMark,
+    TurnTimeline,
+    current_turn_timeline,
+    mark_current_turn,
+)
+
+
+def test_segments_use_first_mark():
+    timeline = TurnTimeline()
+    timeline.mark(TurnMark.SPEECH_ENDED, 10.0)
+    timeline.mark(TurnMark.TRANSCRIPTION_RECEIVED, 10.5)
+    timeline.mark(TurnMark.AGENT_STARTED, 10.5)
+    timeline.mark(TurnMark.LLM_FIRST_TOKEN, 11.0)
+    timeline.mark(TurnMark.LLM_FIRST_TOKEN, 12.0)
+    assert timeline.get_segments() == {
+        "endpointing_delay": 0.5,
+        "agent_queue": 0.0,
+        "llm_ttft": 0.5,
+    }
+
+
+def test_close_emits_span_tree(monkeypatch):
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(turn_timeline, "tracer", tracer_provider.get_tracer(__name__))
+
+    timeline = TurnTimeline(conversation_id="test")
+    timeline.mark(TurnMark.SPEECH_ENDED, 10.0)
+    timeline.mark(TurnMark.TRANSCRIPTION_RECEIVED, 10.5)
+    timeline.mark(TurnMark.FIRST_CHUNK_READY, 11.5)
+    timeline.mark(TurnMark.FIRST_AUDIO_SENT, 11.75)
+    timeline.close()
+    timeline.close()
+    timeline.mark(TurnMark.AGENT_STARTED)
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert set(spans) == {
+        "conversation.turn",
+        "conversation.turn.endpointing_delay",
+        "conversation.turn.playout",
+    }
+    turn_span = spans["conversation.turn"]
+    assert turn_span.attributes["conversation_id"] == "test"
+    assert turn_span.end_time - turn_span.start_time == 1_750_000_000
+    playout_span = spans["conversation.turn.playout"]
+    assert playout_span.parent.span_id == turn_span.context.span_id
+    assert TurnMark.AGENT_STARTED not in timeline.marks
+
+
+@pytest.mark.asyncio
+async def test_synthesis_result_carries_timeline():
+    timeline = TurnTimeline()
+
+    async def chunk_generator():
+        mark_current_turn(TurnMark.TTS_FIRST_BYTE)
+        yield SynthesisResult.ChunkResult(b"\x00", True)
+
+    current_turn_timeline.set(timeline)
+    synthesis_result = SynthesisResult(chunk_generator(), lambda seconds: "")
+    current_turn_timeline.set(None)
+    # the read-ahead task is started here, outside of the timeline's context
+    async for _ in synthesis_result.chunk_generator:
+        pass
+    assert synthesis_result.turn_timeline is timeline
+    assert TurnMark.TTS_FIRST_BYTE in timeline.marks
+    assert TurnMark.FIRST_CHUNK_READY in timeline.marks
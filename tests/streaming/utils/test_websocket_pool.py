@@ -0,0 +1,54 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from vocode.streaming.utils.websocket_pool import WebsocketConnectionPool
+
+
+class FakeWebsocket:
+    def __init__(self):
+        self.open = True
+        self.sent: List[str] = []
+
+    async def send(self, message: str):
+        self.sent.append(message)
+
+    async def close(self):
+        self.open = False
+
+
+class FakeConnectionPool(WebsocketConnectionPool):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.connections: List[FakeWebsocket] = []
+
+    async def connect(self, url: str, extra_headers: Dict[str, str]):
+        ws = FakeWebsocket()
+        self.connections.append(ws)
+        return ws
+
+
+@pytest.mark.asyncio
+async def test_expired_connections_are_only_replaced_while_used():
+    pool = FakeConnectionPool(
+        keepalive_message="ping",
+        keepalive_interval_seconds=0.01,
+        max_idle_seconds=0.03,
+        max_unused_seconds=10,
+    )
+    used = pool.get_signature("wss://used", {})
+    unused = pool.get_signature("wss://unused", {})
+    await pool.warm_up("wss://used", {}, pool_size=1)
+    await pool.warm_up("wss://unused", {}, pool_size=1)
+    # last claimed long ago
+    pool.last_used[unused] -= 60
+    await asyncio.sleep(0.05)
+
+    assert pool.connections[0].sent[0] == "ping"
+    # the used signature's expired connection was replaced, the unused one's wasn't
+    assert list(pool.idle_connections) == [used]
+    assert len(pool.connections) == 3
+    assert [ws.open for ws in pool.connections] == [False, False, True]
+    assert unused not in pool.last_used
+    await pool.close()
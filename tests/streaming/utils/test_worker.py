@@ -0,0 +1,64 @@
+import asyncio
+import gc
+
+import pytest
+
+from vocode.streaming.utils.worker import (
+    InterruptibleEvent,
+    InterruptibleEventRegistry,
+    InterruptibleWorker,
+)
+
+
+def test_registry_interrupts_in_flight_events():
+    registry = InterruptibleEventRegistry()
+    events = [InterruptibleEvent(i) for i in range(3)]
+    non_interruptible_event = InterruptibleEvent(3, is_interruptible=False)
+    for event in events + [non_interruptible_event]:
+        registry.register(event)
+
+    assert registry.interrupt_all() == 3
+    assert all(event.is_interrupted() for event in events)
+    assert not non_interruptible_event.is_interrupted()
+    # only the event that could not be interrupted is still tracked
+    assert len(registry) == 1
+
+
+def test_registry_drops_completed_and_collected_events():
+    registry = InterruptibleEventRegistry()
+    completed_event = InterruptibleEvent("completed")
+    dropped_event = InterruptibleEvent("dropped")
+    registry.register(completed_event)
+    registry.register(dropped_event)
+
+    completed_event.mark_completed()
+    del dropped_event
+    gc.collect()
+
+    assert len(registry) == 0
+    assert registry.interrupt_all() == 0
+
+
+class NoopWorker(InterruptibleWorker):
+    async def process(self, item):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_worker_marks_events_completed():
+    registry = InterruptibleEventRegistry()
+    input_queue: asyncio.Queue = asyncio.Queue()
+    worker = NoopWorker(input_queue=input_queue)
+    worker.start()
+    interrupted_event = InterruptibleEvent("interrupted")
+    processed_event = InterruptibleEvent("processed")
+    for event in (interrupted_event, processed_event):
+        registry.register(event)
+        input_queue.put_nowait(event)
+    interrupted_event.interrupt()
+
+    await asyncio.sleep(0.01)
+    assert interrupted_event.is_completed
+    assert processed_event.is_completed
+    assert len(registry) == 0
+    worker.terminate()
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from vocode.streaming.models.vector_db import ChromaDBConfig
+from vocode.streaming.vector_db import chroma
+from vocode.streaming.vector_db.chroma import ChromaDB
+
+
+class FakeCollection:
+    """Blocks like the chromadb HTTP client and records each call"""
+
+    def __init__(self):
+        self.queries: List[dict] = []
+        self.adds: List[dict] = []
+        self.threads: List[threading.Thread] = []
+
+    def query(self, query_texts, n_results, include, where):
+        self.threads.append(threading.current_thread())
+        self.queries.append({"query_texts": query_texts, "where": where})
+        time.sleep(0.05)
+        return {
+            "metadatas": [[{"text": f"result for {text}"}] for text in query_texts],
+            "distances": [[0.25] for _ in query_texts],
+        }
+
+    def add(self, ids, documents, metadatas):
+        self.threads.append(threading.current_thread())
+        self.adds.append({"ids": ids, "documents": documents, "metadatas": metadatas})
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = FakeCollection()
+
+    class FakeHttpClient:
+        def __init__(self, **kwargs):
+            time.sleep(0.05)
+
+        def get_collection(self, name, embedding_function):
+            collection.threads.append(threading.current_thread())
+            return collection
+
+    monkeypatch.setattr(chroma.chromadb, "HttpClient", FakeHttpClient)
+    return collection
+
+
+def create_chroma_db() -> ChromaDB:
+    return ChromaDB(
+        ChromaDBConfig(
+            collection="test", host="localhost", embeddings_function=lambda texts: []
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_are_batched_off_loop(collection):
+    start_time = time.time()
+    chroma_db = create_chroma_db()
+    assert time.time() - start_time < 0.05
+
+    results = await asyncio.gather(
+        *[chroma_db.similarity_search_with_score(f"query {i}") for i in range(5)],
+        chroma_db.similarity_search_with_score("filtered", filter={"voice_id": "a"}),
+    )
+
+    assert results[3][0][0].page_content == "result for query 3"
+    assert results[3][0][1] == 0.75
+    assert results[5][0][0].page_content == "result for filtered"
+    assert sorted(len(query["query_texts"]) for query in collection.queries) == [1, 5]
+    assert {"voice_id": {"$eq": "a"}} in [query["where"] for query in collection.queries]
+    assert threading.main_thread() not in collection.threads
+
+    # a query made while a batch is in flight goes in the next one
+    first = asyncio.create_task(chroma_db.similarity_search_with_score("first"))
+    await asyncio.sleep(0.01)
+    rest = [chroma_db.similarity_search_with_score(f"next {i}") for i in range(3)]
+    await asyncio.gather(first, *rest)
+    assert [len(query["query_texts"]) for query in collection.queries[-2:]] == [1, 3]
+    await chroma_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_add_texts_in_batches(collection):
+    chroma_db = create_chroma_db()
+    texts = [f"text {i}" for i in range(250)]
+    ids = await chroma_db.add_texts(texts, metadatas=[{"i": i} for i in range(250)])
+
+    assert len(ids) == 250
+    assert [len(add["ids"]) for add in collection.adds] == [100, 100, 50]
+    assert collection.adds[2]["metadatas"][0] == {"i": 200, "text": "text 200"}
+    assert [id for add in collection.adds for id in add["ids"]] == ids
+    await chroma_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batching_fails_waiting_queries(collection):
+    chroma_db = create_chroma_db()
+    await chroma_db.get_collection()
+    first = asyncio.create_task(chroma_db.similarity_search_with_score("first"))
+    await asyncio.sleep(0.01)
+    assert len(collection.queries) == 1
+    queued = asyncio.create_task(chroma_db.similarity_search_with_score("queued"))
+    await asyncio.sleep(0)
+    for task in asyncio.all_tasks():
+        if task.get_coro().__name__ == "send_queries":
+            task.cancel()
+
+    # the in flight and the queued query fail rather than waiting forever
+    results = await asyncio.wait_for(
+        asyncio.gather(first, queued, return_exceptions=True), 1
+    )
+    assert [str(result) for result in results] == [
+        "Chroma query batch was cancelled"
+    ] * 2
+    assert chroma_db.pending_queries == {}
+    assert chroma_db.filters_in_flight == set()
+    await chroma_db.tear_down()
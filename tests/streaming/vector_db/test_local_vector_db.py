@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import zlib
+from typing import List
+
+import numpy as np
+import pytest
+
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
+from vocode.streaming.vector_db.factory import VectorDBFactory
+from vocode.streaming.vector_db.local import LocalVectorDB, matches_filter
+
+DIMENSION = 64
+
+
+def embed(texts: List[str]) -> List[List[float]]:
+    """Bag of words hashed into DIMENSION buckets"""
+    embeddings = []
+    for text in texts:
+        embedding = [0.0] * DIMENSION
+        for word in text.lower().split():
+            embedding[zlib.crc32(word.encode()) % DIMENSION] += 1
+        embeddings.append(embedding)
+    return embeddings
+
+
+def create_vector_db(path, **kwargs) -> LocalVectorDB:
+    vector_db = VectorDBFactory().create_vector_db(
+        LocalVectorDBConfig(path=str(path), embeddings_function=embed, **kwargs)
+    )
+    assert isinstance(vector_db, LocalVectorDB)
+    return vector_db
+
+
+def test_matches_filter():
+    metadata = {"source": "faq.md", "year": 2023}
+    assert matches_filter(metadata, {"source": "faq.md"})
+    assert matches_filter(metadata, {"$and": [{"source": {"$eq": "faq.md"}}]})
+    assert matches_filter(metadata, {"year": {"$gte": 2020, "$lt": 2024}})
+    assert matches_filter(metadata, {"$or": [{"year": 2020}, {"source": {"$in": ["faq.md"]}}]})
+    assert not matches_filter(metadata, {"source": {"$nin": ["faq.md"]}})
+    assert not matches_filter(metadata, {"author": {"$gt": 1}})
+
+
+@pytest.mark.asyncio
+async def test_search_filter_and_reload(tmp_path):
+    vector_db = create_vector_db(tmp_path, top_k=2)
+    await vector_db.add_texts(
+        [
+            "we are open from nine to five on weekdays",
+            "delivery is free for orders over fifty dollars",
+            "we deliver to boston and cambridge",
+        ],
+        metadatas=[{"source": "hours.md"}, {"source": "shipping.md"}, {"source": "shipping.md"}],
+    )
+    await vector_db.add_texts(["internal pricing notes"], namespace="staff")
+
+    results = await vector_db.similarity_search_with_score("do you deliver to boston")
+    assert [doc.metadata["source"] for doc, _ in results] == ["shipping.md", "shipping.md"]
+    assert results[0][0].page_content == "we deliver to boston and cambridge"
+    assert results[0][1] > results[1][1]
+
+    results = await vector_db.similarity_search_with_score(
+        "do you deliver to boston", filter={"source": "hours.md"}
+    )
+    assert [doc.metadata["source"] for doc, _ in results] == ["hours.md"]
+    assert await vector_db.similarity_search_with_score("pricing", filter={"source": "x"}) == []
+
+    documents = await vector_db.retrieve_k_vectors_with_filter(namespace="staff")
+    assert [doc.page_content for doc in documents] == ["internal pricing notes"]
+    await vector_db.tear_down()
+
+    # a write interrupted between the vectors and the documents is dropped
+    with open(vector_db.vectors_path, "ab") as f:
+        f.write(np.ones(DIMENSION, dtype=np.float32).tobytes())
+    reloaded = create_vector_db(tmp_path, top_k=1)
+    assert len(reloaded.vectors) == len(reloaded.documents) == 4
+    await reloaded.add_texts(["we are closed on sundays"])
+    results = await reloaded.similarity_search_with_score("closed on sundays")
+    assert results[0][0].page_content == "we are closed on sundays"
+    await reloaded.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_ivf_index_finds_nearest_neighbours(tmp_path):
+    rng = np.random.default_rng(0)
+    # clustered vectors, like embeddings of documents on a handful of topics
+    centers = rng.normal(size=(16, DIMENSION))
+    vectors = centers[rng.integers(16, size=4000)] + 0.3 * rng.normal(size=(4000, DIMENSION))
+    queries = vectors[:20] + 0.05 * rng.normal(size=(20, DIMENSION))
+    embeddings = {f"text {i}": vector.tolist() for i, vector in enumerate(vectors)}
+    embeddings.update({f"query {i}": query.tolist() for i, query in enumerate(queries)})
+
+    vector_db = VectorDBFactory().create_vector_db(
+        LocalVectorDBConfig(
+            path=str(tmp_path),
+            top_k=5,
+            ivf_min_vectors=1000,
+            embeddings_function=lambda texts: [embeddings[text] for text in texts],
+        )
+    )
+    await vector_db.add_texts(list(embeddings)[:4000])
+    exhaustive_vector_db = create_vector_db(tmp_path, top_k=5, ivf_min_vectors=None)
+    exhaustive_vector_db.config.embeddings_function = vector_db.config.embeddings_function
+
+    # the first search starts building the index and is exhaustive meanwhile
+    await vector_db.similarity_search_with_score("query 0")
+    assert vector_db.index is None
+    await vector_db.build_index_task
+    assert vector_db.index is not None
+    recall = []
+    for i in range(20):
+        results = await vector_db.similarity_search_with_score(f"query {i}")
+        expected = await exhaustive_vector_db.similarity_search_with_score(f"query {i}")
+        recall.append(
+            len({doc.page_content for doc, _ in results} & {doc.page_content for doc, _ in expected})
+            / 5
+        )
+    assert np.mean(recall) >= 0.9
+    await vector_db.tear_down()
+    await exhaustive_vector_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_add_texts_during_ivf_search(tmp_path):
+    vector_db = create_vector_db(tmp_path, top_k=3, ivf_min_vectors=100, ivf_probes=16)
+    await vector_db.add_texts([f"text {i} topic {i % 7}" for i in range(200)])
+    vector_db.get_index()
+    await vector_db.build_index_task
+    assert vector_db.index is not None
+
+    # the search runs in its thread only after more texts were added
+    searching, added = threading.Event(), threading.Event()
+    search = vector_db.search
+
+    def search_after_add(*args):
+        searching.set()
+        added.wait(5)
+        return search(*args)
+
+    vector_db.search = search_after_add
+    search_task = asyncio.create_task(
+        vector_db.similarity_search_with_score("topic 3", filter={})
+    )
+    await asyncio.to_thread(searching.wait, 5)
+    await vector_db.add_texts([f"new text {i} topic 3" for i in range(50)])
+    added.set()
+    results = await search_task
+    assert len(results) == 3
+    assert all("topic 3" in doc.page_content for doc, _ in results)
+    await vector_db.tear_down()
@@ -0,0 +1,90 @@
+import re
+
+import pytest
+from aioresponses import aioresponses
+
+from vocode.streaming.models.vector_db import PineconeConfig
+from vocode.streaming.vector_db.pinecone import PineconeDB
+
+
+def vector(id: str, voice_id: str) -> dict:
+    metadata = {"text": f"text {id}", "voice_id": voice_id}
+    return {"id": id, "values": [0.0], "metadata": metadata}
+
+
+@pytest.mark.asyncio
+async def test_retrieve_k_vectors_with_filter_lists_every_page(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    vector_db = PineconeDB(
+        PineconeConfig(index="index", api_key="key", api_environment="env")
+    )
+    with aioresponses() as mocked:
+        mocked.get(
+            re.compile(r".*/vectors/list\?.*"),
+            payload={
+                "vectors": [{"id": "a"}, {"id": "b"}],
+                "pagination": {"next": "page 2"},
+            },
+        )
+        mocked.get(
+            re.compile(r".*/vectors/fetch\?.*"),
+            payload={"vectors": {"a": vector("a", "x"), "b": vector("b", "y")}},
+        )
+        mocked.get(re.compile(r".*/vectors/list\?.*"), payload={"vectors": [{"id": "c"}]})
+        mocked.get(
+            re.compile(r".*/vectors/fetch\?.*"),
+            payload={"vectors": {"c": vector("c", "x")}},
+        )
+        documents = await vector_db.retrieve_k_vectors_with_filter(
+            filters={"voice_id": "x"}, k=None
+        )
+        requests = [url for (_, url) in mocked.requests]
+
+    assert [document.page_content for document in documents] == ["text a", "text c"]
+    assert documents[0].metadata == {"voice_id": "x"}
+    assert requests[2].query["paginationToken"] == "page 2"
+    assert requests[1].query.getall("ids") == ["a", "b"]
+    await vector_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_iterate_documents_queries_pod_indexes(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    vector_db = PineconeDB(
+        PineconeConfig(index="index", api_key="key", api_environment="env")
+    )
+    with aioresponses() as mocked:
+        mocked.get(re.compile(r".*/vectors/list\?.*"), status=400)
+        mocked.post(re.compile(r".*/describe_index_stats"), payload={"dimension": 3})
+        mocked.post(
+            re.compile(r".*/query"),
+            payload={"matches": [vector("a", "x"), vector("c", "x")]},
+        )
+        mocked.post(
+            re.compile(r".*/query"),
+            payload={"matches": [vector("a", "x"), vector("c", "x"), vector("d", "x")]},
+        )
+        documents = [
+            document
+            async for page in vector_db.iterate_documents(
+                filters={"voice_id": "x"}, page_size=2
+            )
+            for document in page
+        ]
+        queries = [
+            call.kwargs["json"]
+            for (method, url), calls in mocked.requests.items()
+            if url.path == "/query"
+            for call in calls
+        ]
+
+    assert [document.page_content for document in documents] == [
+        "text a",
+        "text c",
+        "text d",
+    ]
+    assert vector_db.supports_list_endpoint is False
+    assert [query["top_k"] for query in queries] == [2, 4]
+    assert queries[0]["vector"] == [1.0, 0.0, 0.0]
+    assert queries[0]["filter"] == {"voice_id": "x"}
+    await vector_db.tear_down()
@@ -0,0 +1,90 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from vocode.streaming.vector_db.speculative_retrieval import (
+    RetrievalStatus,
+    SpeculativeRetriever,
+)
+
+
+class FakeVectorDB:
+    def __init__(self, delay_seconds: float = 0.0):
+        self.delay_seconds = delay_seconds
+        self.queries: List[str] = []
+
+    async def similarity_search_with_score(self, query: str, filter=None, namespace=None):
+        self.queries.append(query)
+        await asyncio.sleep(self.delay_seconds)
+        return [(f"doc for {query}", 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_stable_interim_is_retrieved_before_the_final():
+    vector_db = FakeVectorDB()
+    retriever = SpeculativeRetriever(vector_db, latency_budget_seconds=1)
+
+    retriever.on_interim_transcript("What are your")
+    retriever.on_interim_transcript("What are your hours")
+    assert vector_db.queries == []
+    retriever.on_interim_transcript("what are your hours")
+    await asyncio.sleep(0.01)
+    assert vector_db.queries == ["what are your hours"]
+
+    result = await retriever.retrieve("What are your hours?")
+    assert result.status == RetrievalStatus.HIT
+    assert result.docs_with_scores == [("doc for what are your hours", 1.0)]
+    assert vector_db.queries == ["what are your hours"]
+
+
+@pytest.mark.asyncio
+async def test_retrieval_over_budget_uses_earlier_interim():
+    vector_db = FakeVectorDB(delay_seconds=0.1)
+    retriever = SpeculativeRetriever(vector_db, latency_budget_seconds=0.05)
+
+    retriever.on_interim_transcript("do you deliver to")
+    retriever.on_interim_transcript("do you deliver to")
+    await asyncio.sleep(0.15)
+    result = await retriever.retrieve("Do you deliver to Boston?")
+    assert result.status == RetrievalStatus.PARTIAL
+    assert result.docs_with_scores == [("doc for do you deliver to", 1.0)]
+    assert result.wait_seconds < 0.1
+
+    # nothing to fall back on, the LLM starts without documents
+    retriever.on_interim_transcript("can I pay by card")
+    retriever.on_interim_transcript("can I pay by card")
+    result = await retriever.retrieve("Can I pay by card?")
+    assert result.status == RetrievalStatus.TIMEOUT
+    assert result.docs_with_scores == []
+
+    # the retrievals that missed the budget are cached for the conversation
+    await asyncio.sleep(0.1)
+    result = await retriever.retrieve("do you deliver to boston")
+    assert result.status == RetrievalStatus.HIT
+    assert len(vector_db.queries) == 3
+    retriever.cancel()
+
+
+@pytest.mark.asyncio
+async def test_turn_without_speculative_retrievals_waits_for_documents():
+    # an embedding and a vector db query, slower than the default budget
+    vector_db = FakeVectorDB(delay_seconds=0.5)
+    retriever = SpeculativeRetriever(vector_db, latency_budget_seconds=0.3)
+
+    # too short to be retrieved ahead of the final transcript
+    retriever.on_interim_transcript("hi there")
+    retriever.on_interim_transcript("hi there")
+    result = await retriever.retrieve("Hi there, are you open on Sundays?")
+    assert result.status == RetrievalStatus.MISS
+    assert result.docs_with_scores == [("doc for Hi there, are you open on Sundays?", 1.0)]
+    assert result.wait_seconds >= 0.5
+
+    # as with speculative retrieval turned off
+    retriever = SpeculativeRetriever(vector_db, latency_budget_seconds=None)
+    retriever.on_interim_transcript("are you open on")
+    retriever.on_interim_transcript("are you open on")
+    result = await retriever.retrieve("Are you open on Sundays?")
+    assert result.status == RetrievalStatus.MISS
+    assert result.docs_with_scores == [("doc for Are you open on Sundays?", 1.0)]
+    retriever.cancel()
@@ -1,10 +1,30 @@
-from vocode.streaming.agent.anthropic_agent import ChatAnthropicAgent
-from vocode.streaming.agent.base_agent import BaseAgent
-from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
-from vocode.streaming.agent.echo_agent import EchoAgent
-from vocode.streaming.agent.gpt4all_agent import GPT4AllAgent
-from vocode.streaming.agent.information_retrieval_agent import InformationRetrievalAgent
-from vocode.streaming.agent.llm_agent import LLMAgent
-from vocode.streaming.agent.restful_user_implemented_agent import (
-    RESTfulUserImplementedAgent,
-)
+from typing import TYPE_CHECKING
+
+from vocode.streaming.utils.lazy_import import lazy_getattr
+
+if TYPE_CHECKING:
+    from vocode.streaming.agent.anthropic_agent import ChatAnthropicAgent
+    from vocode.streaming.agent.base_agent import BaseAgent
+    from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
+    from vocode.streaming.agent.echo_agent import EchoAgent
+    from vocode.streaming.agent.gpt4all_agent import GPT4AllAgent
+    from vocode.streaming.agent.information_retrieval_agent import (
+        InformationRetrievalAgent,
+    )
+    from vocode.streaming.agent.llm_agent import LLMAgent
+    from vocode.streaming.agent.restful_user_implemented_agent import (
+        RESTfulUserImplementedAgent,
+    )
+
+_imports = {
+    "ChatAnthropicAgent": "vocode.streaming.agent.anthropic_agent",
+    "BaseAgent": "vocode.streaming.agent.base_agent",
+    "ChatGPTAgent": "vocode.streaming.agent.chat_gpt_agent",
+    "EchoAgent": "vocode.streaming.agent.echo_agent",
+    "GPT4AllAgent": "vocode.streaming.agent.gpt4all_agent",
+    "InformationRetrievalAgent": "vocode.streaming.agent.information_retrieval_agent",
+    "LLMAgent": "vocode.streaming.agent.llm_agent",
+    "RESTfulUserImplementedAgent": "vocode.streaming.agent.restful_user_implemented_agent",
+}
+__all__ = list(_imports)
+__getattr__ = lazy_getattr(__name__, _imports)
@@ -20,6 +20,7 @@ import typing
 from opentelemetry import trace
 from opentelemetry.trace import Span
 from vocode.streaming.action.factory import ActionFactory
+from vocode.streaming.constants import CONTROL_QUEUE_MAX_SIZE
 from vocode.streaming.action.phone_call_action import (
     TwilioPhoneCallAction,
     VonagePhoneCallAction,
@@ -41,7 +42,12 @@ from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.model import BaseModel, TypedModel
 from vocode.streaming.transcriber.base_transcriber import Transcription
 from vocode.streaming.utils import remove_non_letters_digits
-from vocode.streaming.utils.goodbye_model import GoodbyeModel
+from vocode.streaming.utils.bounded_queue import BoundedQueue
+from vocode.streaming.utils.turn_timeline import (
+    TurnMark,
+    TurnTimeline,
+    current_turn_timeline,
+)
 from vocode.streaming.models.transcript import Transcript
 from vocode.streaming.utils.worker import (
     InterruptibleAgentResponseEvent,
@@ -76,6 +82,7 @@ class AgentInput(TypedModel, type=AgentInputType.BASE.value):
 
 class TranscriptionAgentInput(AgentInput, type=AgentInputType.TRANSCRIPTION.value):
     transcription: Transcription
+    turn_timeline: Optional[TurnTimeline] = None
 
 
 class ActionResultAgentInput(AgentInput, type=AgentInputType.ACTION_RESULT.value):
@@ -94,16 +101,18 @@ class AgentResponseType(str, Enum):
 
 
 class AgentResponse(TypedModel, type=AgentResponseType.BASE.value):
-    pass
+    class Config:
+        arbitrary_types_allowed = True
 
     def __str__(self):
-        return json.dumps(self.dict())
+        return json.dumps(self.dict(exclude={"turn_timeline"}))
 
 
 
 class AgentResponseMessage(AgentResponse, type=AgentResponseType.MESSAGE.value):
     message: BaseMessage
     is_interruptible: bool = True
+    turn_timeline: Optional[TurnTimeline] = None
 
 
 class AgentResponseStop(AgentResponse, type=AgentResponseType.STOP.value):
@@ -157,13 +166,16 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
         action_factory: ActionFactory = ActionFactory(),
         interruptible_event_factory: InterruptibleEventFactory = InterruptibleEventFactory(),
         logger: Optional[logging.Logger] = None,
+        input_queue_size: int = CONTROL_QUEUE_MAX_SIZE,
+        output_queue_size: int = CONTROL_QUEUE_MAX_SIZE,
+        actions_queue_size: int = CONTROL_QUEUE_MAX_SIZE,
     ):
         self.input_queue: asyncio.Queue[
             InterruptibleEvent[AgentInput]
-        ] = asyncio.Queue()
+        ] = BoundedQueue("agent.input_queue", maxsize=input_queue_size)
         self.output_queue: asyncio.Queue[
             InterruptibleAgentResponseEvent[AgentResponse]
-        ] = asyncio.Queue()
+        ] = BoundedQueue("agent.output_queue", maxsize=output_queue_size)
         AbstractAgent.__init__(self, agent_config=agent_config)
         InterruptibleWorker.__init__(
             self,
@@ -174,10 +186,12 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
         self.action_factory = action_factory
         self.actions_queue: asyncio.Queue[
             InterruptibleEvent[ActionInput]
-        ] = asyncio.Queue()
+        ] = BoundedQueue("agent.actions_queue", maxsize=actions_queue_size)
         self.logger = logger or logging.getLogger(__name__)
         self.goodbye_model = None
         if self.agent_config.end_conversation_on_goodbye:
+            from vocode.streaming.utils.goodbye_model import GoodbyeModel
+
             self.goodbye_model = GoodbyeModel()
             self.goodbye_model_initialize_task = asyncio.create_task(
                 self.goodbye_model.initialize_embeddings()
@@ -215,6 +229,11 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
         assert self.goodbye_model is not None
         return asyncio.create_task(self.goodbye_model.is_goodbye(message))
 
+    def handle_interim_transcription(self, transcription: Transcription):
+        """Called with each interim transcription of the human's current turn,
+        so agents can start work the final transcription will need"""
+        pass
+
 
 class RespondAgent(BaseAgent[AgentConfigType]):
     async def handle_generate_response(
@@ -243,8 +262,13 @@ class RespondAgent(BaseAgent[AgentConfigType]):
             if is_first_response:
                 agent_span_first.end()
                 is_first_response = False
-            self.produce_interruptible_agent_response_event_nonblocking(
-                AgentResponseMessage(message=BaseMessage(text=response)),
+            turn_timeline = current_turn_timeline.get()
+            if turn_timeline is not None:
+                turn_timeline.mark(TurnMark.FIRST_SENTENCE)
+            await self.produce_interruptible_agent_response_event(
+                AgentResponseMessage(
+                    message=BaseMessage(text=response), turn_timeline=turn_timeline
+                ),
                 is_interruptible=self.agent_config.allow_agent_to_be_cut_off
                 and is_interruptible,
                 agent_response_tracker=agent_input.agent_response_tracker,
@@ -273,8 +297,13 @@ class RespondAgent(BaseAgent[AgentConfigType]):
             response = None
             return True
         if response:
-            self.produce_interruptible_agent_response_event_nonblocking(
-                AgentResponseMessage(message=BaseMessage(text=response)),
+            turn_timeline = current_turn_timeline.get()
+            if turn_timeline is not None:
+                turn_timeline.mark(TurnMark.FIRST_SENTENCE)
+            await self.produce_interruptible_agent_response_event(
+                AgentResponseMessage(
+                    message=BaseMessage(text=response), turn_timeline=turn_timeline
+                ),
                 is_interruptible=self.agent_config.allow_agent_to_be_cut_off,
             )
             return should_stop
@@ -289,10 +318,14 @@ class RespondAgent(BaseAgent[AgentConfigType]):
         assert self.transcript is not None
         try:
             agent_input = item.payload
+            current_turn_timeline.set(None)
             if isinstance(agent_input, TranscriptionAgentInput):
                 transcription = typing.cast(
                     TranscriptionAgentInput, agent_input
                 ).transcription
+                if agent_input.turn_timeline is not None:
+                    agent_input.turn_timeline.mark(TurnMark.AGENT_STARTED)
+                    current_turn_timeline.set(agent_input.turn_timeline)
                 self.transcript.add_human_message(
                     text=transcription.message,
                     conversation_id=agent_input.conversation_id,
@@ -323,7 +356,7 @@ class RespondAgent(BaseAgent[AgentConfigType]):
             # only output filler_audio with a probability
             if (self.agent_config.send_filler_audio and 
                 random.random() < self.agent_config.send_filler_audio.probability):
-                self.produce_interruptible_agent_response_event_nonblocking(
+                await self.produce_interruptible_agent_response_event(
                     AgentResponseFillerAudio()
                 )
             self.logger.debug("Responding to transcription")
@@ -339,7 +372,7 @@ class RespondAgent(BaseAgent[AgentConfigType]):
 
             if should_stop:
                 self.logger.debug("Agent requested to stop")
-                self.produce_interruptible_agent_response_event_nonblocking(
+                await self.produce_interruptible_agent_response_event(
                     AgentResponseStop()
                 )
                 return
@@ -350,7 +383,7 @@ class RespondAgent(BaseAgent[AgentConfigType]):
                     )
                     if goodbye_detected:
                         self.logger.debug("Goodbye detected, ending conversation")
-                        self.produce_interruptible_agent_response_event_nonblocking(
+                        await self.produce_interruptible_agent_response_event(
                             AgentResponseStop()
                         )
                         return
@@ -380,7 +413,7 @@ class RespondAgent(BaseAgent[AgentConfigType]):
         if "user_message" in params:
             user_message = params["user_message"]
             user_message_tracker = asyncio.Event()
-            self.produce_interruptible_agent_response_event_nonblocking(
+            await self.produce_interruptible_agent_response_event(
                 AgentResponseMessage(message=BaseMessage(text=user_message)),
                 agent_response_tracker=user_message_tracker,
             )
@@ -419,7 +452,7 @@ class RespondAgent(BaseAgent[AgentConfigType]):
             action_input=action_input,
             conversation_id=agent_input.conversation_id,
         )
-        self.actions_queue.put_nowait(event)
+        await self.actions_queue.put(event)
 
     async def get_tracer_name_start(self) -> str:
         if hasattr(self, "tracer_name_start"):
@@ -1,6 +1,4 @@
 from typing import List, Optional
-from langchain.llms import OpenAI
-from langchain.prompts import PromptTemplate
 from pydantic import BaseModel
 
 from vocode import getenv
@@ -27,6 +25,9 @@ class BotSentimentAnalyser:
         model_name: str = "text-davinci-003",
         openai_api_key: Optional[str] = None,
     ):
+        from langchain.llms import OpenAI
+        from langchain.prompts import PromptTemplate
+
         self.model_name = model_name
         openai_api_key = openai_api_key or getenv("OPENAI_API_KEY")
         if not openai_api_key:
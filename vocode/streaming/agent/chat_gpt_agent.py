@@ -24,7 +24,9 @@ from vocode.streaming.agent.utils import (
 )
 from vocode.streaming.models.events import Sender
 from vocode.streaming.models.transcript import Transcript
+from vocode.streaming.transcriber.base_transcriber import Transcription
 from vocode.streaming.vector_db.factory import VectorDBFactory
+from vocode.streaming.vector_db.speculative_retrieval import SpeculativeRetriever
 from vocode.streaming.agent.utils import replace_map_symbols, replace_username_with_spelling_pattern, format_time_in_text
 
 TIMEOUT_SECONDS = 5
@@ -91,6 +93,13 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
             self.vector_db = vector_db_factory.create_vector_db(
                 self.agent_config.vector_db_config
             )
+            self.retriever = SpeculativeRetriever(
+                self.vector_db,
+                self.agent_config.vector_db_config.retrieval_latency_budget_seconds
+                if self.agent_config.vector_db_config.speculative_retrieval
+                else None,
+                logger=self.logger,
+            )
 
     def get_functions(self):
         assert self.agent_config.actions
@@ -148,6 +157,18 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
     def attach_transcript(self, transcript: Transcript):
         self.transcript = transcript
 
+    def handle_interim_transcription(self, transcription: Transcription):
+        if (
+            self.agent_config.vector_db_config
+            and self.agent_config.vector_db_config.speculative_retrieval
+        ):
+            self.retriever.on_interim_transcript(transcription.message)
+
+    def terminate(self):
+        if self.agent_config.vector_db_config:
+            self.retriever.cancel()
+        return super().terminate()
+
     async def get_stream_response(
             self, 
             chat_parameters: dict,
@@ -213,9 +234,10 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
         chat_parameters = {}
         if self.agent_config.vector_db_config:
             try:
-                docs_with_scores = await self.vector_db.similarity_search_with_score(
+                retrieval_result = await self.retriever.retrieve(
                     self.transcript.get_last_user_message()[1]
                 )
+                docs_with_scores = retrieval_result.docs_with_scores
                 docs_with_scores_str = "\n\n".join(
                     [
                         "Document: "
@@ -1,16 +1,7 @@
 import logging
 from typing import Optional
 import typing
-from vocode.streaming.agent.anthropic_agent import ChatAnthropicAgent
 from vocode.streaming.agent.base_agent import BaseAgent
-from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
-from vocode.streaming.agent.echo_agent import EchoAgent
-from vocode.streaming.agent.information_retrieval_agent import InformationRetrievalAgent
-from vocode.streaming.agent.llm_agent import LLMAgent
-from vocode.streaming.agent.restful_user_implemented_agent import (
-    RESTfulUserImplementedAgent,
-)
-from vocode.streaming.agent.llamacpp_agent import LlamacppAgent
 from vocode.streaming.models.agent import (
     AgentConfig,
     AgentType,
@@ -24,22 +15,38 @@ from vocode.streaming.models.agent import (
 )
 
 
+# Provider modules are imported in their branch, so only the agents that are
+# used get imported along with their SDKs
 class AgentFactory:
     def create_agent(
         self, agent_config: AgentConfig, logger: Optional[logging.Logger] = None
     ) -> BaseAgent:
         if isinstance(agent_config, LLMAgentConfig):
+            from vocode.streaming.agent.llm_agent import LLMAgent
+
             return LLMAgent(agent_config=agent_config, logger=logger)
         elif isinstance(agent_config, ChatGPTAgentConfig):
+            from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
+
             return ChatGPTAgent(agent_config=agent_config, logger=logger)
         elif isinstance(agent_config, EchoAgentConfig):
+            from vocode.streaming.agent.echo_agent import EchoAgent
+
             return EchoAgent(agent_config=agent_config, logger=logger)
         elif isinstance(agent_config, InformationRetrievalAgentConfig):
+            from vocode.streaming.agent.information_retrieval_agent import InformationRetrievalAgent
+
             return InformationRetrievalAgent(agent_config=agent_config, logger=logger)
         elif isinstance(agent_config, RESTfulUserImplementedAgentConfig):
+            from vocode.streaming.agent.restful_user_implemented_agent import RESTfulUserImplementedAgent
+
             return RESTfulUserImplementedAgent(agent_config=agent_config, logger=logger)
         elif isinstance(agent_config, ChatAnthropicAgentConfig):
+            from vocode.streaming.agent.anthropic_agent import ChatAnthropicAgent
+
             return ChatAnthropicAgent(agent_config=agent_config, logger=logger)
         elif isinstance(agent_config, LlamacppAgentConfig):
+            from vocode.streaming.agent.llamacpp_agent import LlamacppAgent
+
             return LlamacppAgent(agent_config=agent_config, logger=logger)
         raise Exception("Invalid agent config", agent_config.type)
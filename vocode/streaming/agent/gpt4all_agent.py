@@ -1,8 +1,18 @@
+import asyncio
+import threading
 from typing import Optional, Tuple
+from opentelemetry import metrics
 from vocode.streaming.agent.base_agent import BaseAgent, RespondAgent
 from vocode.streaming.models.agent import GPT4AllAgentConfig
 from vocode.turn_based.agent.gpt4all_agent import GPT4AllAgent as TurnBasedGPT4AllAgent
 
+meter = metrics.get_meter(__name__)
+wasted_tokens_counter = meter.create_counter(
+    name="agent.gpt4all.wasted_tokens",
+    unit="tokens",
+    description="Tokens generated for responses that were interrupted",
+)
+
 
 class GPT4AllAgent(RespondAgent[GPT4AllAgentConfig]):
     def __init__(self, agent_config: GPT4AllAgentConfig):
@@ -21,4 +31,23 @@ class GPT4AllAgent(RespondAgent[GPT4AllAgentConfig]):
         conversation_id: str,
         is_interrupt: bool = False,
     ) -> Tuple[Optional[str], bool]:
-        return (await self.turn_based_agent.respond_async(human_input)), False
+        # the generation thread checks this before every token
+        cancel_event = threading.Event()
+        num_tokens = 0
+
+        def count_token(_: str):
+            nonlocal num_tokens
+            num_tokens += 1
+
+        try:
+            return (
+                await self.turn_based_agent.respond_async(
+                    human_input,
+                    cancel_event=cancel_event,
+                    new_token_callback=count_token,
+                )
+            ), False
+        except asyncio.CancelledError:
+            cancel_event.set()
+            wasted_tokens_counter.add(num_tokens)
+            raise
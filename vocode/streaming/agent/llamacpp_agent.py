@@ -1,15 +1,14 @@
-from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import logging
+import threading
 from typing import AsyncGenerator, Optional, Tuple, Any, Union
 import typing
 from langchain import ConversationChain
 from vocode.streaming.agent.base_agent import RespondAgent
+from vocode.streaming.agent.llamacpp_server import LlamacppModelServer
 from vocode.streaming.models.agent import LlamacppAgentConfig
 from vocode.streaming.agent.utils import collate_response_async
 from langchain.callbacks.base import BaseCallbackHandler
-from langchain.callbacks.manager import CallbackManager
-from langchain.llms import LlamaCpp
 from langchain.prompts import (
     ChatPromptTemplate,
     MessagesPlaceholder,
@@ -25,6 +24,7 @@ from langchain.prompts import (
     PromptTemplate,
 )
 from langchain.prompts.base import DEFAULT_FORMATTER_MAPPING
+from opentelemetry import metrics
 
 ALPACA_TEMPLATE_WITH_HISTORY = """### Instruction:
 Your previous conversation history:
@@ -33,6 +33,18 @@ Your previous conversation history:
 Current instruction/message to respond to: {input}
 ### Response:"""
 
+meter = metrics.get_meter(__name__)
+wasted_tokens_counter = meter.create_counter(
+    name="agent.llamacpp.wasted_tokens",
+    unit="tokens",
+    description="Tokens generated for responses that were interrupted",
+)
+tokens_after_cancel_hist = meter.create_histogram(
+    name="agent.llamacpp.tokens_after_cancel",
+    unit="tokens",
+    description="Tokens generated between an interrupt and generation stopping",
+)
+
 
 class CallbackOutput(BaseModel):
     finish: bool = False
@@ -47,18 +59,47 @@ class FormatHistoryPromptTemplate(PromptTemplate):
         return DEFAULT_FORMATTER_MAPPING[self.template_format](self.template, **kwargs)
 
 
+class GenerationCancelledError(Exception):
+    pass
+
+
 class CustomStreamingCallbackHandler(BaseCallbackHandler):
-    def __init__(self, output_queue: asyncio.Queue) -> None:
+    """Forwards tokens from the llama.cpp generation thread to the event loop.
+
+    Setting `cancel_event` stops generation at the next token.
+    """
+
+    raise_error = True
+
+    def __init__(
+        self,
+        output_queue: Optional[asyncio.Queue] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> None:
         super().__init__()
         self.output_queue = output_queue
+        self.cancel_event = cancel_event
+        self.loop = asyncio.get_running_loop()
+        self.num_tokens = 0
+        self.num_tokens_after_cancel = 0
+
+    def put(self, callback_output: CallbackOutput) -> None:
+        if self.output_queue is not None:
+            self.loop.call_soon_threadsafe(
+                self.output_queue.put_nowait, callback_output
+            )
 
     def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
         """Run on new LLM token. Only available when streaming is enabled."""
-        self.output_queue.put_nowait(CallbackOutput(token=token))
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            self.num_tokens_after_cancel += 1
+            raise GenerationCancelledError()
+        self.num_tokens += 1
+        self.put(CallbackOutput(token=token))
 
     def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
         """Run when LLM ends running."""
-        self.output_queue.put_nowait(CallbackOutput(finish=True, response=response))
+        self.put(CallbackOutput(finish=True, response=response))
 
 
 class LlamacppAgent(RespondAgent[LlamacppAgentConfig]):
@@ -89,13 +130,13 @@ class LlamacppAgent(RespondAgent[LlamacppAgentConfig]):
                     ]
                 )
             else:
-                self.promt = typing.cast(PromptTemplate, agent_config.prompt_template)
+                self.prompt = typing.cast(PromptTemplate, agent_config.prompt_template)
 
-        self.callback_queue: asyncio.Queue = asyncio.Queue()
-        callback = CustomStreamingCallbackHandler(self.callback_queue)
-        callback_manager = CallbackManager([callback])
-        self.llm = LlamaCpp(
-            callback_manager=callback_manager, **agent_config.llamacpp_kwargs
+        self.model_server = LlamacppModelServer.get_or_create(
+            agent_config.llamacpp_kwargs,
+            num_slots=agent_config.num_model_slots,
+            prompt_cache_capacity_bytes=agent_config.prompt_cache_capacity_bytes,
+            logger=self.logger,
         )
 
         self.memory = ConversationBufferMemory(return_messages=True)
@@ -103,10 +144,49 @@ class LlamacppAgent(RespondAgent[LlamacppAgentConfig]):
             SystemMessage(content=self.agent_config.prompt_preamble)
         )
 
-        self.conversation = ConversationChain(
-            memory=self.memory, prompt=self.prompt, llm=self.llm
-        )
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+    async def predict(
+        self, human_input: str, callback: CustomStreamingCallbackHandler
+    ) -> str:
+        # slots are picked by preamble so the shared prefix is already in the KV cache
+        async with self.model_server.acquire_slot(
+            self.agent_config.prompt_preamble
+        ) as slot:
+            conversation = ConversationChain(
+                memory=self.memory, prompt=self.prompt, llm=slot.llm
+            )
+            future = asyncio.get_running_loop().run_in_executor(
+                slot.executor,
+                lambda: conversation.predict(input=human_input, callbacks=[callback]),
+            )
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # hold the slot until the generation thread has stopped
+                self.cancel_generation(callback)
+                await asyncio.wait([future])
+                raise
+
+    def cancel_generation(self, callback: CustomStreamingCallbackHandler):
+        if callback.cancel_event is None or callback.cancel_event.is_set():
+            return
+        callback.cancel_event.set()
+        wasted_tokens_counter.add(callback.num_tokens)
+
+    def record_tokens_after_cancel(self, callback: CustomStreamingCallbackHandler):
+        if callback.cancel_event is not None and callback.cancel_event.is_set():
+            tokens_after_cancel_hist.record(callback.num_tokens_after_cancel)
+
+    def on_generation_done(
+        self, callback: CustomStreamingCallbackHandler, generation: asyncio.Future
+    ):
+        self.record_tokens_after_cancel(callback)
+        if generation.cancelled():
+            return
+        exception = generation.exception()
+        if exception is not None and not isinstance(
+            exception, GenerationCancelledError
+        ):
+            self.logger.error(f"llama.cpp generation failed: {exception}")
 
     async def respond(
         self,
@@ -114,18 +194,18 @@ class LlamacppAgent(RespondAgent[LlamacppAgentConfig]):
         conversation_id: str,
         is_interrupt: bool = False,
     ) -> Tuple[str, bool]:
-        text = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor,
-            lambda input: self.conversation.predict(input=input),
-            human_input,
-        )
+        callback = CustomStreamingCallbackHandler(cancel_event=threading.Event())
+        try:
+            text = await self.predict(human_input, callback)
+        finally:
+            self.record_tokens_after_cancel(callback)
 
         self.logger.debug(f"LLM response: {text}")
         return text, False
 
-    async def llamacpp_get_tokens(self):
+    async def llamacpp_get_tokens(self, callback_queue: asyncio.Queue):
         while True:
-            callback_output = await self.callback_queue.get()
+            callback_output = await callback_queue.get()
             if callback_output.finish:
                 break
             yield callback_output.token
@@ -136,13 +216,25 @@ class LlamacppAgent(RespondAgent[LlamacppAgentConfig]):
         conversation_id: str,
         is_interrupt: bool = False,
     ) -> AsyncGenerator[Tuple[str, bool], None]:
-        asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor,
-            lambda input: self.conversation.predict(input=input),
-            human_input,
+        callback_queue: asyncio.Queue = asyncio.Queue()
+        callback = CustomStreamingCallbackHandler(
+            callback_queue, cancel_event=threading.Event()
+        )
+        generation = asyncio.create_task(self.predict(human_input, callback))
+        # make sure the token stream terminates even if generation fails
+        generation.add_done_callback(
+            lambda _: callback_queue.put_nowait(CallbackOutput(finish=True))
+        )
+        generation.add_done_callback(
+            lambda generation: self.on_generation_done(callback, generation)
         )
 
-        async for message in collate_response_async(
-            self.llamacpp_get_tokens(),
-        ):
-            yield str(message), True
+        try:
+            async for message in collate_response_async(
+                self.llamacpp_get_tokens(callback_queue),
+            ):
+                yield str(message), True
+        finally:
+            # interrupted (or abandoned) before generation finished
+            if not generation.done():
+                self.cancel_generation(callback)
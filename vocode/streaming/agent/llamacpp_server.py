@@ -0,0 +1,191 @@
+import asyncio
+import json
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from langchain.llms import LlamaCpp
+
+from vocode.streaming.models.agent import (
+    LLAMACPP_AGENT_DEFAULT_PROMPT_CACHE_CAPACITY_BYTES,
+)
+
+
+class LlamacppSlot:
+    """A llama.cpp context bound to a single generation thread.
+
+    Each slot owns its own KV cache; the model weights are memory-mapped so
+    every slot of a server shares the same pages.
+    """
+
+    def __init__(self, index: int, llm: LlamaCpp):
+        self.index = index
+        self.llm = llm
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"llamacpp-slot-{index}"
+        )
+        self.prefix_key: Optional[str] = None
+
+
+class SlotWaiters:
+    """The requests of one event loop waiting for a slot"""
+
+    def __init__(self):
+        self.slot_available = asyncio.Condition()
+        self.num_waiting = 0
+
+    async def notify(self):
+        async with self.slot_available:
+            self.slot_available.notify()
+
+
+class LlamacppModelServer:
+    """Process-level llama.cpp inference service shared by every LlamacppAgent.
+
+    Models are loaded once per set of llamacpp_kwargs (with mmap) into
+    `num_slots` contexts. Requests from all conversations are scheduled onto
+    idle slots, preferring a slot that last served the same prompt prefix so
+    that the shared system preamble stays in its KV cache. Each slot also
+    keeps a RAM prompt cache so other prefixes can be restored without being
+    re-evaluated; `prompt_cache_capacity_bytes` is split between the slots'
+    caches, on top of their KV caches. The server can be shared by several event loops: idle slots
+    are guarded by a thread lock and each loop waits on its own condition.
+    """
+
+    _servers: Dict[str, "LlamacppModelServer"] = {}
+    _servers_lock = threading.Lock()
+
+    def __init__(
+        self,
+        llamacpp_kwargs: dict,
+        num_slots: int = 1,
+        prompt_cache_capacity_bytes: Optional[
+            int
+        ] = LLAMACPP_AGENT_DEFAULT_PROMPT_CACHE_CAPACITY_BYTES,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.logger = logger or logging.getLogger(__name__)
+        self.llamacpp_kwargs = llamacpp_kwargs
+        num_slots = max(num_slots, 1)
+        slot_prompt_cache_capacity_bytes = (
+            prompt_cache_capacity_bytes // num_slots
+            if prompt_cache_capacity_bytes
+            else None
+        )
+        self.slots: List[LlamacppSlot] = [
+            LlamacppSlot(index, self.load_model(slot_prompt_cache_capacity_bytes))
+            for index in range(num_slots)
+        ]
+        self.idle_slots: List[LlamacppSlot] = list(self.slots)
+        self.idle_slots_lock = threading.Lock()
+        # event loop -> its requests waiting for a slot, created lazily since a
+        # condition is bound to the loop it's first used on
+        self.waiters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def get_model_key(llamacpp_kwargs: dict) -> str:
+        return json.dumps(llamacpp_kwargs, sort_keys=True, default=str)
+
+    @classmethod
+    def get_or_create(
+        cls,
+        llamacpp_kwargs: dict,
+        num_slots: int = 1,
+        prompt_cache_capacity_bytes: Optional[
+            int
+        ] = LLAMACPP_AGENT_DEFAULT_PROMPT_CACHE_CAPACITY_BYTES,
+        logger: Optional[logging.Logger] = None,
+    ) -> "LlamacppModelServer":
+        model_key = cls.get_model_key(llamacpp_kwargs)
+        with cls._servers_lock:
+            server = cls._servers.get(model_key)
+            if server is None:
+                server = cls(
+                    llamacpp_kwargs,
+                    num_slots=num_slots,
+                    prompt_cache_capacity_bytes=prompt_cache_capacity_bytes,
+                    logger=logger,
+                )
+                cls._servers[model_key] = server
+            elif len(server.slots) != num_slots:
+                server.logger.warning(
+                    f"llama.cpp model already loaded with {len(server.slots)} slots, ignoring num_slots={num_slots}"
+                )
+            return server
+
+    def load_model(self, prompt_cache_capacity_bytes: Optional[int]) -> LlamaCpp:
+        llm = LlamaCpp(**{"use_mmap": True, **self.llamacpp_kwargs})
+        if prompt_cache_capacity_bytes:
+            try:
+                from llama_cpp import LlamaRAMCache
+
+                llm.client.set_cache(
+                    LlamaRAMCache(capacity_bytes=prompt_cache_capacity_bytes)
+                )
+            except ImportError:
+                self.logger.debug(
+                    "llama_cpp does not support prompt caching, only reusing the KV cache of each slot"
+                )
+        return llm
+
+    def get_waiters(self) -> SlotWaiters:
+        loop = asyncio.get_running_loop()
+        with self.idle_slots_lock:
+            waiters = self.waiters.get(loop)
+            if waiters is None:
+                waiters = self.waiters[loop] = SlotWaiters()
+            return waiters
+
+    def take_idle_slot(
+        self, prefix_key: Optional[str], waiters: SlotWaiters, waiting: bool
+    ) -> Optional[LlamacppSlot]:
+        """An idle slot, preferably one that last served the prefix. If there's
+        none, the request is counted as waiting (atomically, so a release
+        meanwhile notifies it)."""
+        with self.idle_slots_lock:
+            if waiting:
+                waiters.num_waiting -= 1
+            if not self.idle_slots:
+                waiters.num_waiting += 1
+                return None
+            slot = next(
+                (s for s in self.idle_slots if s.prefix_key == prefix_key),
+                self.idle_slots[0],
+            )
+            self.idle_slots.remove(slot)
+            return slot
+
+    @asynccontextmanager
+    async def acquire_slot(self, prefix_key: Optional[str] = None):
+        waiters = self.get_waiters()
+        async with waiters.slot_available:
+            slot = self.take_idle_slot(prefix_key, waiters, waiting=False)
+            try:
+                while slot is None:
+                    await waiters.slot_available.wait()
+                    slot = self.take_idle_slot(prefix_key, waiters, waiting=True)
+            except asyncio.CancelledError:
+                with self.idle_slots_lock:
+                    waiters.num_waiting -= 1
+                raise
+        slot.prefix_key = prefix_key
+        try:
+            yield slot
+        finally:
+            self.release_slot(slot)
+
+    def release_slot(self, slot: LlamacppSlot):
+        with self.idle_slots_lock:
+            self.idle_slots.append(slot)
+            waiting_loops = [
+                (loop, waiters)
+                for loop, waiters in self.waiters.items()
+                if waiters.num_waiting > 0
+            ]
+        # every loop with requests waiting gets a chance at the slot
+        for loop, waiters in waiting_loops:
+            if not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(waiters.notify(), loop)
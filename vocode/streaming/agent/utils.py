@@ -9,12 +9,14 @@ from typing import (
     List,
     Literal,
     Optional,
+    TYPE_CHECKING,
     TypeVar,
     Union,
 )
 import logging
-from openai.types.chat import ChatCompletionChunk
-from openai.types.chat.chat_completion_chunk import Choice, ChoiceDelta
+
+if TYPE_CHECKING:
+    from openai.types.chat.chat_completion_chunk import Choice, ChoiceDelta
 
 # from openai.openai_object import OpenAIObject
 from vocode.streaming.models.actions import FunctionCall, FunctionFragment
@@ -26,6 +28,7 @@ from vocode.streaming.models.transcript import (
     Message,
     Transcript,
 )
+from vocode.streaming.utils.turn_timeline import TurnMark, mark_current_turn
 
 SENTENCE_ENDINGS = [".", "!", "?", "\n"]
 
@@ -47,6 +50,7 @@ async def collate_response_async(
     async for token in gen:
         if not token:
             continue
+        mark_current_turn(TurnMark.LLM_FIRST_TOKEN)
         if isinstance(token, str):
             if prev_ends_with_money and token.startswith(" "):
                 yield buffer.strip()
@@ -1,8 +1,8 @@
 import asyncio
-import json
 import logging
 from typing import Dict
 from vocode.streaming.transcriber.base_transcriber import Transcription
+from vocode.streaming.utils import serialization
 from vocode.streaming.utils.worker import (
     InterruptibleAgentResponseEvent,
     InterruptibleEvent,
@@ -131,7 +131,7 @@ class WebSocketUserImplementedAgent(BaseAgent[WebSocketUserImplementedAgentConfi
                     try:
                         msg = await ws.recv()
                         self.logger.info("Received data from web socket agent")
-                        data = json.loads(msg)
+                        data = serialization.loads(msg)
                         message = WebSocketAgentMessage.parse_obj(data)
                         self._handle_incoming_socket_message(message)
 
@@ -25,6 +25,7 @@ from vocode.streaming.synthesizer.azure_synthesizer import AzureSynthesizer
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer
 from vocode.streaming.transcriber.base_transcriber import BaseTranscriber
 from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
+from vocode.streaming.utils import serialization
 from vocode.streaming.utils.base_router import BaseRouter
 
 from vocode.streaming.models.events import Event, EventType
@@ -98,13 +99,14 @@ class ConversationRouter(BaseRouter):
         conversation = self.get_conversation(output_device, start_message)
         await conversation.start(lambda: websocket.send_text(ReadyMessage().json()))
         while conversation.is_active():
-            message: WebSocketMessage = WebSocketMessage.parse_obj(
-                await websocket.receive_json()
-            )
+            data = serialization.loads(await websocket.receive_text())
+            chunk = AudioMessage.parse_bytes(data)
+            if chunk is not None:
+                conversation.receive_audio(chunk)
+                continue
+            message: WebSocketMessage = WebSocketMessage.parse_obj(data)
             if message.type == WebSocketMessageType.STOP:
                 break
-            audio_message = typing.cast(AudioMessage, message)
-            conversation.receive_audio(audio_message.get_bytes())
         output_device.mark_closed()
         await conversation.terminate()
 
@@ -1,3 +1,16 @@
 TEXT_TO_SPEECH_CHUNK_SIZE_SECONDS = 1
 PER_CHUNK_ALLOWANCE_SECONDS = 0.01
 ALLOWED_IDLE_TIME = 15
+# audio is paced in frames of this size, sent to the output device in batches of frames,
+# each batch this far ahead of its playback
+PLAYOUT_FRAME_SECONDS = 0.02
+PLAYOUT_BATCH_SECONDS = 0.1
+PLAYOUT_LEAD_SECONDS = 0.06
+# chunks read ahead from a synthesizer while earlier chunks are played
+SYNTHESIS_PREFETCH_MAX_CHUNKS = 4
+# bounded queues: audio queues drop the oldest chunks when full, producers of control queues wait for space
+AUDIO_QUEUE_MAX_SIZE = 500
+CONTROL_QUEUE_MAX_SIZE = 100
+# event loop monitoring: how often the loop is checked, and how long a callback can block it before it's reported
+LOOP_MONITOR_INTERVAL_SECONDS = 0.1
+SLOW_CALLBACK_SECONDS = 0.1
@@ -1,6 +1,5 @@
-from typing import List, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, List, Dict, Optional, Union
 from enum import Enum
-from langchain.prompts import PromptTemplate
 
 from pydantic import validator
 from vocode.streaming.models.actions import ActionConfig
@@ -9,6 +8,9 @@ from vocode.streaming.models.message import BaseMessage
 from .model import TypedModel, BaseModel
 from .vector_db import VectorDBConfig
 
+if TYPE_CHECKING:
+    from langchain.prompts import PromptTemplate
+
 FILLER_AUDIO_DEFAULT_SILENCE_THRESHOLD_SECONDS = 0.5
 FILLER_AUDIO_DEFAULT_PROBABILITY = 0.5
 FOLLOW_UP_DEFAULT_SILENCE_THRESHOLD_SECONDS = 3
@@ -24,6 +26,7 @@ CHAT_VERTEX_AI_DEFAULT_MODEL_NAME = "chat-bison@001"
 AZURE_OPENAI_DEFAULT_API_TYPE = "azure"
 AZURE_OPENAI_DEFAULT_API_VERSION = "2023-03-15-preview"
 AZURE_OPENAI_DEFAULT_ENGINE = "gpt-35-turbo"
+LLAMACPP_AGENT_DEFAULT_PROMPT_CACHE_CAPACITY_BYTES = 2 << 30
 
 
 class AgentType(str, Enum):
@@ -139,7 +142,25 @@ class ChatVertexAIAgentConfig(AgentConfig, type=AgentType.CHAT_VERTEX_AI.value):
 class LlamacppAgentConfig(AgentConfig, type=AgentType.LLAMACPP.value):
     prompt_preamble: str
     llamacpp_kwargs: dict = {}
-    prompt_template: Optional[Union[PromptTemplate, str]] = None
+    # a PromptTemplate or the name of a built in one
+    prompt_template: Optional[Any] = None
+    # contexts loaded for the model, shared by every conversation in the process
+    num_model_slots: int = 1
+    # RAM for the prompt caches of all the slots together, split between them
+    prompt_cache_capacity_bytes: Optional[
+        int
+    ] = LLAMACPP_AGENT_DEFAULT_PROMPT_CACHE_CAPACITY_BYTES
+
+    # not typed as PromptTemplate, so that importing the models doesn't import langchain
+    @validator("prompt_template")
+    def parse_prompt_template(cls, v) -> Optional[Union["PromptTemplate", str]]:
+        if v is None or isinstance(v, str):
+            return v
+        from langchain.prompts import PromptTemplate
+
+        if isinstance(v, PromptTemplate):
+            return v
+        return PromptTemplate.parse_obj(v)
 
 
 class InformationRetrievalAgentConfig(
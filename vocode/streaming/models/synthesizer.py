@@ -93,13 +93,22 @@ class BotSentiment(BaseModel):
     emotion: Optional[str] = None
     degree: float = 0.0
 
+SYNTHESIZER_DEFAULT_FIRST_CHUNK_SIZE_SECONDS = 0.15
+
+
 class SynthesizerConfig(TypedModel, type=SynthesizerType.BASE.value):
     sampling_rate: int
     audio_encoding: AudioEncoding
     should_encode_as_wav: bool = False
+    # the first chunk of each utterance is this long and doubles up to the requested chunk size
+    first_chunk_size_seconds: Optional[float] = SYNTHESIZER_DEFAULT_FIRST_CHUNK_SIZE_SECONDS
     sentiment_config: Optional[SentimentConfig] = None
     initial_bot_sentiment: Optional[BotSentiment] = None
     index_config: Optional[IndexConfig] = None
+    # a synthesized phrase is cached once it's been said this many times with the voice
+    cache_admission_threshold: int = 2
+    # and added to the index_config's index at this many, never if None
+    index_promotion_threshold: Optional[int] = None
     base_filler_audio_path: str = FILLER_AUDIO_PATH
     base_follow_up_audio_path: str = FOLLOW_UP_AUDIO_PATH
     base_backtrack_audio_path: str = BACKTRACK_AUDIO_PATH
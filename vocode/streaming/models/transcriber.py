@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import validator
 
@@ -10,6 +10,7 @@ from vocode.streaming.telephony.constants import (
     DEFAULT_CHUNK_SIZE,
     DEFAULT_SAMPLING_RATE,
 )
+from vocode.streaming.constants import AUDIO_QUEUE_MAX_SIZE
 from .audio_encoding import AudioEncoding
 from .model import TypedModel
 from vocode.streaming.voice_activity_detection import BaseVoiceActivityDetectorConfig
@@ -32,6 +33,7 @@ class EndpointingType(str, Enum):
     BASE = "endpointing_base"
     TIME_BASED = "endpointing_time_based"
     PUNCTUATION_BASED = "endpointing_punctuation_based"
+    CLASSIFIER_BASED = "endpointing_classifier_based"
 
 
 class EndpointingConfig(TypedModel, type=EndpointingType.BASE):
@@ -48,6 +50,21 @@ class PunctuationEndpointingConfig(
     time_cutoff_seconds: float = 0.4
 
 
+class ClassifierEndpointingConfig(
+    EndpointingConfig, type=EndpointingType.CLASSIFIER_BASED
+):
+    """Ends the turn when a local classifier over the transcript, the silence
+    after the last word and the energy of the audio says the speaker is done"""
+
+    # probability of end of turn above which the turn is ended
+    threshold: float = 0.5
+    # the turn is never ended with less silence than this, and always with more than max
+    min_silence_seconds: float = 0.1
+    max_silence_seconds: float = 2.0
+    # overrides of the classifier's feature weights, see vocode.streaming.transcriber.endpointing
+    weights: Optional[Dict[str, float]] = None
+
+
 class TranscriberConfig(TypedModel, type=TranscriberType.BASE.value):
     sampling_rate: int
     audio_encoding: AudioEncoding
@@ -60,6 +77,14 @@ class TranscriberConfig(TypedModel, type=TranscriberType.BASE.value):
     interruption_word_threshold: int = 2 
     voice_activity_detector_config: Optional[BaseVoiceActivityDetectorConfig] = None
     minimum_speaking_duration_to_interrupt: float = 0
+    # audio chunks buffered before the oldest are dropped (e.g. if the provider's socket stalls)
+    input_queue_max_size: int = AUDIO_QUEUE_MAX_SIZE
+    # for websocket transcribers: connections kept open ahead of calls with the same
+    # settings (if the provider supports it), 0 connects per call
+    prewarmed_connections: int = 0
+    # for websocket transcribers: after a reconnect, audio since the last final
+    # transcription (up to this long) is resent
+    replay_buffer_seconds: float = 5.0
 
     @validator("min_interrupt_confidence")
     def min_interrupt_confidence_must_be_between_0_and_1(cls, v):
@@ -142,9 +167,24 @@ class AssemblyAITranscriberConfig(
 class WhisperCPPTranscriberConfig(
     TranscriberConfig, type=TranscriberType.WHISPER_CPP.value
 ):
+    # how often the window is decoded while the caller is speaking
     buffer_size_seconds: float = 1
     libname: str
     fname_model: str
+    # the longest window decoded at once; longer utterances slide it forward
+    window_seconds: float = 10
+    # audio kept from the previous window when it slides, for context
+    window_overlap_seconds: float = 2
+    # words are committed once this many consecutive decodes agree on them
+    agreements_to_commit: int = 2
+    # silence after speech that ends the utterance with a final transcription
+    final_silence_seconds: float = 0.6
+    # RMS (16-bit) treated as speech when no voice_activity_detector_config is set
+    speech_energy_threshold: int = 300
+    # whisper contexts (worker processes) shared by all calls in the process
+    num_contexts: int = 1
+    n_threads: int = 4
+    language: str = "en"
 
 
 class RevAITranscriberConfig(TranscriberConfig, type=TranscriberType.REV_AI.value):
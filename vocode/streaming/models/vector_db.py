@@ -9,9 +9,15 @@ class VectorDBType(str, Enum):
     BASE = "vector_db_base"
     PINECONE = "vector_db_pinecone"
     CHROMA = "vector_db_chroma"
+    LOCAL = "vector_db_local"
 
 class VectorDBConfig(TypedModel, type=VectorDBType.BASE.value):
     embeddings_model: str = DEFAULT_EMBEDDINGS_MODEL
+    # start retrievals from stable interim transcripts, before the turn ends
+    speculative_retrieval: bool = True
+    # how long a turn with speculative retrievals waits for retrieval before the
+    # LLM is started without it, turns with none (and None) wait for the documents
+    retrieval_latency_budget_seconds: Optional[float] = 0.3
 
 
 class PineconeConfig(VectorDBConfig, type=VectorDBType.PINECONE.value):
@@ -26,4 +32,17 @@ class ChromaDBConfig(VectorDBConfig, type=VectorDBType.CHROMA.value):
     port: Optional[str]
     api_key: Optional[str]
     top_k: int = 3
-    embeddings_function: Optional[Callable] = None # default is OpenAIEmbeddingFunction
\ No newline at end of file
+    embeddings_function: Optional[Callable] = None # default is OpenAIEmbeddingFunction
+
+
+class LocalVectorDBConfig(VectorDBConfig, type=VectorDBType.LOCAL.value):
+    # directory the vectors and documents are stored in, created if missing
+    path: str
+    top_k: int = 3
+    # corpora with at least this many vectors are searched through an IVF index
+    # built in memory on first use, smaller ones (or all, if None) exhaustively
+    ivf_min_vectors: Optional[int] = 10000
+    # IVF lists searched per query: more is slower and closer to exhaustive search
+    ivf_probes: int = 8
+    # called with a list of texts and returns their embeddings, defaults to OpenAI embeddings
+    embeddings_function: Optional[Callable] = None
@@ -1,6 +1,6 @@
 import base64
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.models.client_backend import InputAudioConfig, OutputAudioConfig
@@ -10,6 +10,7 @@ from .agent import AgentConfig
 from .synthesizer import SynthesizerConfig
 from .events import Sender
 from .transcript import TranscriptEvent
+from vocode.streaming.utils import serialization
 
 
 class WebSocketMessageType(str, Enum):
@@ -36,6 +37,26 @@ class AudioMessage(WebSocketMessage, type=WebSocketMessageType.AUDIO):
     def get_bytes(self) -> bytes:
         return base64.b64decode(self.data)
 
+    # Audio frames are most of the traffic, so they skip pydantic both ways
+
+    @staticmethod
+    def dict_from_bytes(chunk: bytes) -> Dict[str, Any]:
+        return {
+            "type": WebSocketMessageType.AUDIO.value,
+            "data": base64.b64encode(chunk).decode("utf-8"),
+        }
+
+    @staticmethod
+    def json_from_bytes(chunk: bytes) -> str:
+        return serialization.dumps(AudioMessage.dict_from_bytes(chunk))
+
+    @staticmethod
+    def parse_bytes(obj: Dict[str, Any]) -> Optional[bytes]:
+        """Returns the audio in a parsed websocket_audio frame, None for other types"""
+        if obj.get("type") != WebSocketMessageType.AUDIO.value:
+            return None
+        return base64.b64decode(obj["data"])
+
 
 class TranscriptMessage(WebSocketMessage, type=WebSocketMessageType.TRANSCRIPT):
     text: str
@@ -46,6 +67,19 @@ class TranscriptMessage(WebSocketMessage, type=WebSocketMessageType.TRANSCRIPT):
     def from_event(cls, event: TranscriptEvent):
         return cls(text=event.text, sender=event.sender, timestamp=event.timestamp)
 
+    @staticmethod
+    def dict_from_event(event: TranscriptEvent) -> Dict[str, Any]:
+        return {
+            "type": WebSocketMessageType.TRANSCRIPT.value,
+            "text": event.text,
+            "sender": event.sender.value,
+            "timestamp": event.timestamp,
+        }
+
+    @staticmethod
+    def json_from_event(event: TranscriptEvent) -> str:
+        return serialization.dumps(TranscriptMessage.dict_from_event(event))
+
 
 class StartMessage(WebSocketMessage, type=WebSocketMessageType.START):
     transcriber_config: TranscriberConfig
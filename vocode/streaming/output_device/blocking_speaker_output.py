@@ -3,9 +3,11 @@ import queue
 from typing import Optional
 import sounddevice as sd
 import numpy as np
+from vocode.streaming.constants import AUDIO_QUEUE_MAX_SIZE
 from vocode.streaming.models.audio_encoding import AudioEncoding
 
 from vocode.streaming.output_device.base_output_device import BaseOutputDevice
+from vocode.streaming.utils.bounded_queue import BoundedQueue, OverflowPolicy
 from vocode.streaming.utils.worker import ThreadAsyncWorker
 
 
@@ -22,7 +24,11 @@ class BlockingSpeakerOutput(BaseOutputDevice, ThreadAsyncWorker):
         sampling_rate = sampling_rate or int(
             self.device_info.get("default_samplerate", self.DEFAULT_SAMPLING_RATE)
         )
-        self.input_queue = asyncio.Queue()
+        self.input_queue = BoundedQueue(
+            "output_device.blocking_speaker.input_queue",
+            maxsize=AUDIO_QUEUE_MAX_SIZE,
+            overflow_policy=OverflowPolicy.DROP_OLDEST,
+        )
         BaseOutputDevice.__init__(self, sampling_rate, audio_encoding)
         ThreadAsyncWorker.__init__(self, self.input_queue)
         self.stream = sd.OutputStream(
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import base64
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import WebSocket
 
+from vocode.streaming.constants import AUDIO_QUEUE_MAX_SIZE
 from vocode.streaming.output_device.base_output_device import BaseOutputDevice
+from vocode.streaming.utils.bounded_queue import BoundedQueue, OverflowPolicy
+from vocode.streaming.utils import serialization
+from vocode.streaming.utils.loop_monitor import get_task_name
 from vocode.streaming.telephony.constants import (
     DEFAULT_AUDIO_ENCODING,
     DEFAULT_SAMPLING_RATE,
@@ -16,7 +19,10 @@ from vocode.streaming.telephony.constants import (
 
 class TwilioOutputDevice(BaseOutputDevice):
     def __init__(
-        self, ws: Optional[WebSocket] = None, stream_sid: Optional[str] = None
+        self,
+        ws: Optional[WebSocket] = None,
+        stream_sid: Optional[str] = None,
+        max_queue_size: int = AUDIO_QUEUE_MAX_SIZE,
     ):
         super().__init__(
             sampling_rate=DEFAULT_SAMPLING_RATE, audio_encoding=DEFAULT_AUDIO_ENCODING
@@ -24,13 +30,21 @@ class TwilioOutputDevice(BaseOutputDevice):
         self.ws = ws
         self.stream_sid = stream_sid
         self.active = True
-        self.queue: asyncio.Queue[str] = asyncio.Queue()
-        self.process_task = asyncio.create_task(self.process())
+        # serialized when sent, so marks can be told apart and are never dropped
+        self.queue: asyncio.Queue[Dict[str, Any]] = BoundedQueue(
+            "output_device.twilio.queue",
+            maxsize=max_queue_size,
+            overflow_policy=OverflowPolicy.DROP_OLDEST,
+            is_droppable=lambda message: message["event"] == "media",
+        )
+        self.process_task = asyncio.create_task(
+            self.process(), name=get_task_name(type(self).__name__)
+        )
 
     async def process(self):
         while self.active:
             message = await self.queue.get()
-            await self.ws.send_text(message)
+            await self.ws.send_text(serialization.dumps(message))
 
     def consume_nonblocking(self, chunk: bytes):
         twilio_message = {
@@ -38,7 +52,7 @@ class TwilioOutputDevice(BaseOutputDevice):
             "streamSid": self.stream_sid,
             "media": {"payload": base64.b64encode(chunk).decode("utf-8")},
         }
-        self.queue.put_nowait(json.dumps(twilio_message))
+        self.queue.put_nowait(twilio_message)
 
     def maybe_send_mark_nonblocking(self, message_sent):
         mark_message = {
@@ -48,7 +62,7 @@ class TwilioOutputDevice(BaseOutputDevice):
                 "name": "Sent {}".format(message_sent),
             },
         }
-        self.queue.put_nowait(json.dumps(mark_message))
+        self.queue.put_nowait(mark_message)
 
     def terminate(self):
         self.process_task.cancel()
@@ -3,9 +3,11 @@ from typing import Optional
 import wave
 
 from fastapi import WebSocket
+from vocode.streaming.constants import AUDIO_QUEUE_MAX_SIZE
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.output_device.base_output_device import BaseOutputDevice
-from vocode.streaming.output_device.speaker_output import SpeakerOutput
+from vocode.streaming.utils.bounded_queue import BoundedQueue, OverflowPolicy
+from vocode.streaming.utils.loop_monitor import get_task_name
 from vocode.streaming.telephony.constants import (
     VONAGE_AUDIO_ENCODING,
     VONAGE_CHUNK_SIZE,
@@ -18,16 +20,26 @@ class VonageOutputDevice(BaseOutputDevice):
         self,
         ws: Optional[WebSocket] = None,
         output_to_speaker: bool = False,
+        max_queue_size: int = AUDIO_QUEUE_MAX_SIZE,
     ):
         super().__init__(
             sampling_rate=VONAGE_SAMPLING_RATE, audio_encoding=VONAGE_AUDIO_ENCODING
         )
         self.ws = ws
         self.active = True
-        self.queue: asyncio.Queue[bytes] = asyncio.Queue()
-        self.process_task = asyncio.create_task(self.process())
+        self.queue: asyncio.Queue[bytes] = BoundedQueue(
+            "output_device.vonage.queue",
+            maxsize=max_queue_size,
+            overflow_policy=OverflowPolicy.DROP_OLDEST,
+        )
+        self.process_task = asyncio.create_task(
+            self.process(), name=get_task_name(type(self).__name__)
+        )
         self.output_to_speaker = output_to_speaker
         if output_to_speaker:
+            # imported here so servers don't need sounddevice/PortAudio
+            from vocode.streaming.output_device.speaker_output import SpeakerOutput
+
             self.output_speaker = SpeakerOutput.from_default_device(
                 sampling_rate=VONAGE_SAMPLING_RATE, blocksize=VONAGE_CHUNK_SIZE // 2
             )
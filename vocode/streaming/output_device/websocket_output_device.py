@@ -1,27 +1,47 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Any, Dict
+
 from fastapi import WebSocket
+from vocode.streaming.constants import AUDIO_QUEUE_MAX_SIZE
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.output_device.base_output_device import BaseOutputDevice
 from vocode.streaming.models.websocket import AudioMessage
 from vocode.streaming.models.websocket import TranscriptMessage
+from vocode.streaming.models.websocket import WebSocketMessageType
 from vocode.streaming.models.transcript import TranscriptEvent
+from vocode.streaming.utils import serialization
+from vocode.streaming.utils.bounded_queue import BoundedQueue, OverflowPolicy
+from vocode.streaming.utils.loop_monitor import get_task_name
 
 
 
 class WebsocketOutputDevice(BaseOutputDevice):
     def __init__(
-        self, ws: WebSocket, sampling_rate: int, audio_encoding: AudioEncoding
+        self,
+        ws: WebSocket,
+        sampling_rate: int,
+        audio_encoding: AudioEncoding,
+        max_queue_size: int = AUDIO_QUEUE_MAX_SIZE,
     ):
         super().__init__(sampling_rate, audio_encoding)
         self.ws = ws
         self.active = False
-        self.queue: asyncio.Queue[str] = asyncio.Queue()
+        # serialized when sent, so transcripts can be told apart and are never dropped
+        self.queue: asyncio.Queue[Dict[str, Any]] = BoundedQueue(
+            "output_device.websocket.queue",
+            maxsize=max_queue_size,
+            overflow_policy=OverflowPolicy.DROP_OLDEST,
+            is_droppable=lambda message: message["type"]
+            == WebSocketMessageType.AUDIO.value,
+        )
 
     def start(self):
         self.active = True
-        self.process_task = asyncio.create_task(self.process())
+        self.process_task = asyncio.create_task(
+            self.process(), name=get_task_name(type(self).__name__)
+        )
 
     def mark_closed(self):
         self.active = False
@@ -29,17 +49,15 @@ class WebsocketOutputDevice(BaseOutputDevice):
     async def process(self):
         while self.active:
             message = await self.queue.get()
-            await self.ws.send_text(message)
+            await self.ws.send_text(serialization.dumps(message))
 
     def consume_nonblocking(self, chunk: bytes):
         if self.active:
-            audio_message = AudioMessage.from_bytes(chunk)
-            self.queue.put_nowait(audio_message.json())
+            self.queue.put_nowait(AudioMessage.dict_from_bytes(chunk))
 
     def consume_transcript(self, event: TranscriptEvent):
         if self.active:
-            transcript_message = TranscriptMessage.from_event(event)
-            self.queue.put_nowait(transcript_message.json())
+            self.queue.put_nowait(TranscriptMessage.dict_from_event(event))
 
     def terminate(self):
         self.process_task.cancel()
@@ -20,6 +20,7 @@ from vocode.streaming.models.transcript import (
     TranscriptCompleteEvent,
 )
 from vocode.streaming.synthesizer.base_synthesizer import FillerAudio
+from vocode.streaming.utils.bounded_queue import BoundedQueue
 from vocode.streaming.utils.worker import InterruptibleAgentResponseWorker, InterruptibleAgentResponseEvent
 
 
@@ -102,7 +103,6 @@ class RandomResponseAudioWorker(InterruptibleAgentResponseWorker):
                     filler_audio.message.text,
                     filler_synthesis_result,
                     item.interruption_event,
-                    filler_audio.seconds_per_chunk,
                     started_event=self.filler_audio_started_event,
                 )
                 item.agent_response_tracker.set()
@@ -157,9 +157,9 @@ class RandomAudioManager:
         self.follow_up_worker: Optional[FollowUpAudioWorker] = None
         self.backtrack_worker: Optional[BacktrackAudioWorker] = None
 
-        self.filler_audio_queue: asyncio.Queue[InterruptibleAgentResponseEvent[FillerAudio]] = asyncio.Queue()
-        self.follow_up_queue: asyncio.Queue[InterruptibleAgentResponseEvent[FillerAudio]] = asyncio.Queue()
-        self.backtrack_queue: asyncio.Queue[InterruptibleAgentResponseEvent[FillerAudio]] = asyncio.Queue()
+        self.filler_audio_queue: asyncio.Queue[InterruptibleAgentResponseEvent[FillerAudio]] = BoundedQueue("random_audio.filler_audio_queue")
+        self.follow_up_queue: asyncio.Queue[InterruptibleAgentResponseEvent[FillerAudio]] = BoundedQueue("random_audio.follow_up_queue")
+        self.backtrack_queue: asyncio.Queue[InterruptibleAgentResponseEvent[FillerAudio]] = BoundedQueue("random_audio.backtrack_queue")
 
         if self.agent_config.send_filler_audio:
             if not isinstance(
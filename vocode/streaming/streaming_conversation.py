@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import queue
 import random
 import threading
 from typing import Any, Awaitable, Callable, Generic, Optional, Tuple, TypeVar, cast
@@ -14,7 +13,6 @@ from vocode.streaming.action.worker import ActionsWorker
 from vocode.streaming.agent.bot_sentiment_analyser import (
     BotSentimentAnalyser,
 )
-from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
 from vocode.streaming.models.actions import ActionInput
 from vocode.streaming.models.events import Sender
 from vocode.streaming.models.transcript import (
@@ -27,7 +25,6 @@ from vocode.streaming.models.transcriber import EndpointingConfig, TranscriberCo
 from vocode.streaming.output_device.base_output_device import BaseOutputDevice
 from vocode.streaming.utils.conversation_logger_adapter import wrap_logger
 from vocode.streaming.utils.events_manager import EventsManager
-from vocode.streaming.utils.goodbye_model import GoodbyeModel
 
 from vocode.streaming.models.agent import ChatGPTAgentConfig, FillerAudioConfig
 from vocode.streaming.models.audio_encoding import AudioEncoding
@@ -38,7 +35,10 @@ from vocode.streaming.models.synthesizer import (
 from vocode.streaming.constants import (
     TEXT_TO_SPEECH_CHUNK_SIZE_SECONDS,
     PER_CHUNK_ALLOWANCE_SECONDS,
+    PLAYOUT_FRAME_SECONDS,
+    PLAYOUT_LEAD_SECONDS,
     ALLOWED_IDLE_TIME,
+    CONTROL_QUEUE_MAX_SIZE,
 )
 from vocode.streaming.agent.base_agent import (
     AgentInput,
@@ -67,14 +67,24 @@ from vocode.streaming.transcriber.base_transcriber import (
     BaseTranscriber,
     HUMAN_ACTIVITY_DETECTED
 )
+from vocode.streaming.utils.bounded_queue import BoundedQueue
+from vocode.streaming.utils.loop_monitor import current_conversation_id
+from vocode.streaming.utils.playout_scheduler import PlayoutScheduler
 from vocode.streaming.utils.state_manager import ConversationStateManager
+from vocode.streaming.utils.turn_timeline import (
+    TurnMark,
+    TurnTimeline,
+    current_turn_timeline,
+)
 from vocode.streaming.utils.worker import (
     AsyncQueueWorker,
     InterruptibleAgentResponseWorker,
     InterruptibleEvent,
     InterruptibleEventFactory,
+    InterruptibleEventRegistry,
     InterruptibleAgentResponseEvent,
     InterruptibleWorker,
+    InterruptionEventType,
 )
 from vocode.streaming.utils.duration_from_message import should_finish_sentence
 from vocode.streaming.response_worker.random_response import RandomAudioManager
@@ -100,7 +110,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
             interruptible_event: InterruptibleEvent = (
                 super().create_interruptible_event(payload, is_interruptible)
             )
-            self.conversation.interruptible_events.put_nowait(interruptible_event)
+            self.conversation.interruptible_events.register(interruptible_event)
             return interruptible_event
 
         def create_interruptible_agent_response_event(
@@ -114,7 +124,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
                 is_interruptible=is_interruptible,
                 agent_response_tracker=agent_response_tracker,
             )
-            self.conversation.interruptible_events.put_nowait(interruptible_event)
+            self.conversation.interruptible_events.register(interruptible_event)
             return interruptible_event
 
     class TranscriptionsWorker(AsyncQueueWorker):
@@ -176,7 +186,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
                     #     self.conversation.logger.debug("Sending interrupt...")
                     self.conversation.logger.debug("Human started speaking")
                     self.conversation.logger.debug("Sending Backtrack audio to AgentResponseWorker.")
-                    self.conversation.agent.produce_interruptible_agent_response_event_nonblocking(
+                    await self.conversation.agent.produce_interruptible_agent_response_event(
                         AgentResponseBacktrackAudio()
                     )
                 else:    
@@ -194,8 +204,22 @@ class StreamingConversation(Generic[OutputDeviceType]):
             transcription.is_interrupt = (
                 self.conversation.current_transcription_is_interrupt
             )
+            if (
+                not transcription.is_final
+                and transcription.message != HUMAN_ACTIVITY_DETECTED
+            ):
+                self.conversation.agent.handle_interim_transcription(transcription)
             self.conversation.is_human_speaking = not transcription.is_final
             if transcription.is_final:
+                turn_timeline = TurnTimeline(conversation_id=self.conversation.id)
+                received_time = time.time()
+                turn_timeline.mark(
+                    TurnMark.SPEECH_ENDED,
+                    received_time
+                    - (transcription.latency or 0)
+                    - (transcription.time_silent or 0),
+                )
+                turn_timeline.mark(TurnMark.TRANSCRIPTION_RECEIVED, received_time)
                 # we use getattr here to avoid the dependency cycle between VonageCall and StreamingConversation
                 event = self.interruptible_event_factory.create_interruptible_event(
                     TranscriptionAgentInput(
@@ -203,9 +227,10 @@ class StreamingConversation(Generic[OutputDeviceType]):
                         conversation_id=self.conversation.id,
                         vonage_uuid=getattr(self.conversation, "vonage_uuid", None),
                         twilio_sid=getattr(self.conversation, "twilio_sid", None),
+                        turn_timeline=turn_timeline,
                     )
                 )
-                self.output_queue.put_nowait(event)
+                await self.output_queue.put(event)
     class AgentResponsesWorker(InterruptibleAgentResponseWorker):
         """Runs Synthesizer.create_speech and sends the SynthesisResult to the output queue"""
 
@@ -298,15 +323,24 @@ class StreamingConversation(Generic[OutputDeviceType]):
                     "conversation.synthesizer.create_first_speech"
                 )
                 self.conversation.first_chunk_flag = True
+                turn_timeline = agent_response_message.turn_timeline
+                if turn_timeline is not None:
+                    turn_timeline.mark(TurnMark.SYNTHESIS_STARTED)
+                # picked up by the SynthesisResult, and lets the synthesizer
+                # mark its first byte on this turn
+                current_turn_timeline.set(turn_timeline)
 
                 self.conversation.logger.debug("Synthesizing speech for message")
                 self.conversation.is_synthesizing = True
-                synthesis_results = await self.conversation.synthesizer.create_speech(
-                    agent_response_message.message,
-                    self.chunk_size,
-                    bot_sentiment=self.conversation.bot_sentiment,
-                    return_tuple=self.use_index
-                )
+                try:
+                    synthesis_results = await self.conversation.synthesizer.create_speech(
+                        agent_response_message.message,
+                        self.chunk_size,
+                        bot_sentiment=self.conversation.bot_sentiment,
+                        return_tuple=self.use_index
+                    )
+                finally:
+                    current_turn_timeline.set(None)
                 if self.use_index:
                     synthesis_result, message = synthesis_results
                 else:
@@ -314,7 +348,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
                     message = agent_response_message.message
                 # check if there is more to synthesize 
                 self.conversation.is_synthesizing = self.input_queue_has_agent_response_message()
-                self.produce_interruptible_agent_response_event_nonblocking(
+                await self.produce_interruptible_agent_response_event(
                     (message, synthesis_result),
                     is_interruptible=item.is_interruptible,
                     agent_response_tracker=item.agent_response_tracker,
@@ -378,7 +412,6 @@ class StreamingConversation(Generic[OutputDeviceType]):
                     message.text,
                     synthesis_result,
                     item.interruption_event,
-                    TEXT_TO_SPEECH_CHUNK_SIZE_SECONDS,
                     transcript_message=transcript_message,
                 )
                 # set flag to indicate whether bot was interrupted
@@ -426,7 +459,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
                 )
                 if should_send_follow_up:
                     self.conversation.logger.debug("Sending Follow Up to AgentResponseWorker.")
-                    self.conversation.agent.produce_interruptible_agent_response_event_nonblocking(
+                    await self.conversation.agent.produce_interruptible_agent_response_event(
                         AgentResponseFollowUpAudio())
             except asyncio.CancelledError:
                 pass
@@ -441,6 +474,9 @@ class StreamingConversation(Generic[OutputDeviceType]):
         per_chunk_allowance_seconds: float = PER_CHUNK_ALLOWANCE_SECONDS,
         events_manager: Optional[EventsManager] = None,
         logger: Optional[logging.Logger] = None,
+        playout_frame_seconds: float = PLAYOUT_FRAME_SECONDS,
+        playout_lead_seconds: float = PLAYOUT_LEAD_SECONDS,
+        synthesis_results_queue_size: int = CONTROL_QUEUE_MAX_SIZE,
     ):
         self.last_action_timestamp = None
         self.id = conversation_id or create_conversation_id()
@@ -454,14 +490,16 @@ class StreamingConversation(Generic[OutputDeviceType]):
         self.synthesizer = synthesizer
         self.synthesis_enabled = True
 
-        self.interruptible_events: queue.Queue[InterruptibleEvent] = queue.Queue()
+        self.interruptible_events = InterruptibleEventRegistry()
         self.interruptible_event_factory = self.QueueingInterruptibleEventFactory(
             conversation=self
         )
         self.agent.set_interruptible_event_factory(self.interruptible_event_factory)
         self.synthesis_results_queue: asyncio.Queue[
             InterruptibleAgentResponseEvent[Tuple[BaseMessage, SynthesisResult]]
-        ] = asyncio.Queue()
+        ] = BoundedQueue(
+            "conversation.synthesis_results_queue", maxsize=synthesis_results_queue_size
+        )
 
         self.state_manager = self.create_state_manager()
         self.transcriptions_worker = self.TranscriptionsWorker(
@@ -494,6 +532,8 @@ class StreamingConversation(Generic[OutputDeviceType]):
         self.events_manager = events_manager or EventsManager()
         self.events_task: Optional[asyncio.Task] = None
         self.per_chunk_allowance_seconds = per_chunk_allowance_seconds
+        self.playout_frame_seconds = playout_frame_seconds
+        self.playout_lead_seconds = playout_lead_seconds
         self.transcript = Transcript()
         self.transcript.attach_events_manager(self.events_manager)
         self.bot_sentiment = self.synthesizer.get_synthesizer_config().initial_bot_sentiment
@@ -541,41 +581,47 @@ class StreamingConversation(Generic[OutputDeviceType]):
             mark_ready: Optional[Callable[[], Awaitable[None]]] = None
         ):
         self.call_start_time = time.time()
-        self.transcriber.start()
-        self.transcriptions_worker.start()
-        self.agent_responses_worker.start()
-        self.synthesis_results_worker.start()
-        self.output_device.start()
-        self.random_audio_manager.start()
-        if self.actions_worker is not None:
-            self.actions_worker.start()
-        self.agent.start()
-        self.agent.attach_transcript(self.transcript)
-        initial_message = self.agent.get_agent_config().initial_message
-        if initial_message:
-            self.initial_message_task = asyncio.create_task(self.send_initial_message(initial_message))
-        self.active = True
-        if started_event:
-            started_event.set()
-        is_ready = await self.transcriber.ready()
-        if not is_ready:
-            raise Exception("Transcriber startup failed")
-        if mark_ready:
-            await mark_ready()
-        if (
-            self.synthesizer.get_synthesizer_config().sentiment_config 
-            and self.agent.get_agent_config().track_bot_sentiment
-        ):
-            await self.update_bot_sentiment()
-       
-        if (self.synthesizer.get_synthesizer_config().sentiment_config 
-                and self.agent.get_agent_config().track_bot_sentiment):
-            self.track_bot_sentiment_task = asyncio.create_task(
-                self.track_bot_sentiment()
-            )
-        self.check_for_idle_task = asyncio.create_task(self.check_for_idle())
-        if len(self.events_manager.subscriptions) > 0:
-            self.events_task = asyncio.create_task(self.events_manager.start())
+        # names the tasks started here after this conversation; reset afterwards
+        # so the id doesn't leak into the caller's context
+        token = current_conversation_id.set(self.id)
+        try:
+            self.transcriber.start()
+            self.transcriptions_worker.start()
+            self.agent_responses_worker.start()
+            self.synthesis_results_worker.start()
+            self.output_device.start()
+            self.random_audio_manager.start()
+            if self.actions_worker is not None:
+                self.actions_worker.start()
+            self.agent.start()
+            self.agent.attach_transcript(self.transcript)
+            initial_message = self.agent.get_agent_config().initial_message
+            if initial_message:
+                self.initial_message_task = asyncio.create_task(self.send_initial_message(initial_message))
+            self.active = True
+            if started_event:
+                started_event.set()
+            is_ready = await self.transcriber.ready()
+            if not is_ready:
+                raise Exception("Transcriber startup failed")
+            if mark_ready:
+                await mark_ready()
+            if (
+                self.synthesizer.get_synthesizer_config().sentiment_config 
+                and self.agent.get_agent_config().track_bot_sentiment
+            ):
+                await self.update_bot_sentiment()
+
+            if (self.synthesizer.get_synthesizer_config().sentiment_config 
+                    and self.agent.get_agent_config().track_bot_sentiment):
+                self.track_bot_sentiment_task = asyncio.create_task(
+                    self.track_bot_sentiment()
+                )
+            self.check_for_idle_task = asyncio.create_task(self.check_for_idle())
+            if len(self.events_manager.subscriptions) > 0:
+                self.events_task = asyncio.create_task(self.events_manager.start())
+        finally:
+            current_conversation_id.reset(token)
 
     async def send_initial_message(self, initial_message: BaseMessage):
         try:
@@ -588,7 +634,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
                         agent_response_tracker=initial_message_tracker,
                     )
                 )
-                self.agent_responses_worker.consume_nonblocking(agent_response_event)
+                await self.agent_responses_worker.consume(agent_response_event)
                 self.sent_initial_message = await initial_message_tracker.wait()
         except asyncio.CancelledError:
             self.logger.debug("Initial message task cancelled")
@@ -646,16 +692,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
 
         Returns true if any events were interrupted - which is used as a flag for the agent (is_interrupt)
         """
-        num_interrupts = 0
-        while True:
-            try:
-                interruptible_event = self.interruptible_events.get_nowait()
-                if not interruptible_event.is_interrupted():
-                    if interruptible_event.interrupt():
-                        self.logger.debug("Interrupting event")
-                        num_interrupts += 1
-            except queue.Empty:
-                break
+        num_interrupts = self.interruptible_events.interrupt_all()
         self.agent.cancel_current_task()
         self.agent_responses_worker.cancel_current_task()
         self.random_audio_manager.stop_all_audios()
@@ -719,8 +756,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
         self,
         message: str,
         synthesis_result: SynthesisResult,
-        stop_event: threading.Event,
-        seconds_per_chunk: int,
+        stop_event: InterruptionEventType,
         transcript_message: Optional[Message] = None,
         started_event: Optional[threading.Event] = None,
     ):
@@ -730,9 +766,10 @@ class StreamingConversation(Generic[OutputDeviceType]):
         - If the stop_event is set, the output is stopped
         - Sets started_event when the first chunk is sent
 
-        Importantly, we rate limit the chunks sent to the output. For interrupts to work properly,
-        the next chunk of audio can only be sent after the last chunk is played, so we send
-        a chunk of x seconds only after x seconds have passed since the last chunk was sent.
+        Importantly, we rate limit the audio sent to the output. For interrupts to work properly,
+        audio is only sent a small lead ahead of playback: each chunk is sliced into short frames
+        which are sent in small batches against loop.time() deadlines relative to the start of
+        the stream. Frames not sent yet when the stop_event is set are never played.
 
         Returns the message that was sent up to, and a flag if the message was cut off
         """
@@ -741,61 +778,73 @@ class StreamingConversation(Generic[OutputDeviceType]):
             self.transcriber.mute()
         message_sent = message
         cut_off = False
-        chunk_size = seconds_per_chunk * get_chunk_size_per_second(
-            self.synthesizer.get_synthesizer_config().audio_encoding,
-            self.synthesizer.get_synthesizer_config().sampling_rate,
+        synthesizer_config = self.synthesizer.get_synthesizer_config()
+        playout_scheduler = PlayoutScheduler(
+            self.output_device,
+            synthesizer_config.audio_encoding,
+            synthesizer_config.sampling_rate,
+            frame_seconds=self.playout_frame_seconds,
+            lead_seconds=self.playout_lead_seconds,
         )
 
+        def mark_first_audio_sent():
+            if (
+                playout_scheduler.bytes_sent
+                and synthesis_result.turn_timeline is not None
+                and not synthesis_result.turn_timeline.closed
+            ):
+                synthesis_result.turn_timeline.mark(TurnMark.FIRST_AUDIO_SENT)
+                synthesis_result.turn_timeline.close()
+
         chunk_idx = 0
-        seconds_spoken = 0
-        async for chunk_result in synthesis_result.chunk_generator:
-            if self.first_chunk_flag:
-                self.first_chunk_flag = False
-                self.first_synthesis_span.end()
-            start_time = time.time()
-            speech_length_seconds = seconds_per_chunk * (
-                len(chunk_result.chunk) / chunk_size
-            )
-            seconds_spoken = chunk_idx * seconds_per_chunk
-            if stop_event.is_set() and (not cut_off):
-                self.logger.debug("Stop event triggered, checking if bot should finish sentence.")
-                if should_finish_sentence(message, seconds_spoken):
-                    self.logger.debug("Bot should finish sentence.")
-                    cut_off = True
-                else:
-                    self.logger.debug(
-                        "Interrupted, stopping text to speech after {} chunks".format(
-                            chunk_idx
-                        )
-                    )
-                    message_sent = f"{synthesis_result.get_message_up_to(seconds_spoken)}-"
-                    cut_off = True
+        seconds_spoken = 0.0
+        interrupted = False
+        try:
+            async for chunk_result in synthesis_result.chunk_generator:
+                if self.first_chunk_flag:
+                    self.first_chunk_flag = False
+                    self.first_synthesis_span.end()
+                for frame in playout_scheduler.get_frames(chunk_result.chunk):
+                    seconds_spoken = playout_scheduler.seconds_sent
+                    if stop_event.is_set() and (not cut_off):
+                        self.logger.debug("Stop event triggered, checking if bot should finish sentence.")
+                        if should_finish_sentence(message, seconds_spoken):
+                            self.logger.debug("Bot should finish sentence.")
+                            cut_off = True
+                        else:
+                            self.logger.debug(
+                                "Interrupted, stopping text to speech after {:.2f} seconds".format(
+                                    seconds_spoken
+                                )
+                            )
+                            message_sent = f"{synthesis_result.get_message_up_to(seconds_spoken)}-"
+                            cut_off = True
+                            interrupted = True
+                            break
+                    if started_event and not started_event.is_set():
+                        started_event.set()
+                    await playout_scheduler.send(frame)
+                    mark_first_audio_sent()
+                    self.mark_last_action_timestamp()
+                if interrupted:
                     break
-
-            if chunk_idx == 0:
-                if started_event:
-                    started_event.set()
-            self.logger.debug(f"Sending chunk {chunk_idx} to output device...")
-            self.output_device.consume_nonblocking(chunk_result.chunk)
-            end_time = time.time()
-            await asyncio.sleep(
-                max(
-                    speech_length_seconds
-                    - (end_time - start_time)
-                    - self.per_chunk_allowance_seconds,
-                    0,
-                )
-            )
-            self.logger.debug(
-                "Sent chunk {} with size {}".format(chunk_idx, len(chunk_result.chunk))
-            )
-            self.mark_last_action_timestamp()
-            chunk_idx += 1
-            seconds_spoken += seconds_per_chunk
-            if transcript_message:
-                transcript_message.text = synthesis_result.get_message_up_to(
-                    seconds_spoken
+                # the rest of the chunk, the next one may take a while to synthesize
+                await playout_scheduler.flush()
+                mark_first_audio_sent()
+                self.logger.debug(
+                    "Sent chunk {} with size {}".format(chunk_idx, len(chunk_result.chunk))
                 )
+                chunk_idx += 1
+                seconds_spoken = playout_scheduler.seconds_sent
+                if transcript_message:
+                    transcript_message.text = synthesis_result.get_message_up_to(
+                        seconds_spoken
+                    )
+            if not interrupted:
+                await playout_scheduler.wait_for_playout(self.per_chunk_allowance_seconds)
+        finally:
+            # stops the synthesizer read-ahead if we stopped early
+            await synthesis_result.close()
         if self.transcriber.get_transcriber_config().mute_during_speech:
             self.logger.debug("Unmuting transcriber")
             self.transcriber.unmute()
@@ -829,9 +878,12 @@ class StreamingConversation(Generic[OutputDeviceType]):
         self.logger.debug("Tearing down synthesizer")
         tear_down_synthesizer_task = asyncio.create_task(self.synthesizer.tear_down())
         self.logger.debug("Terminating agent")
+        # checked by config so that agent modules (and their SDKs) aren't
+        # imported here
+        agent_config = self.agent.get_agent_config()
         if (
-            isinstance(self.agent, ChatGPTAgent)
-            and self.agent.agent_config.vector_db_config
+            isinstance(agent_config, ChatGPTAgentConfig)
+            and agent_config.vector_db_config
         ):
             # Shutting down the vector db should be done in the agent's terminate method,
             # but it is done here because `vector_db.tear_down()` is async and
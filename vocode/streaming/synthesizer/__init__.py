@@ -1,14 +1,38 @@
-from vocode.streaming.synthesizer.azure_synthesizer import AzureSynthesizer
-from vocode.streaming.synthesizer.bark_synthesizer import BarkSynthesizer
-from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer
-from vocode.streaming.synthesizer.coqui_synthesizer import CoquiSynthesizer
-from vocode.streaming.synthesizer.coqui_tts_synthesizer import CoquiTTSSynthesizer
-from vocode.streaming.synthesizer.eleven_labs_synthesizer import ElevenLabsSynthesizer
-from vocode.streaming.synthesizer.google_synthesizer import GoogleSynthesizer
-from vocode.streaming.synthesizer.gtts_synthesizer import GTTSSynthesizer
-from vocode.streaming.synthesizer.play_ht_synthesizer import PlayHtSynthesizer
-from vocode.streaming.synthesizer.rime_synthesizer import RimeSynthesizer
-from vocode.streaming.synthesizer.polly_synthesizer import PollySynthesizer
-from vocode.streaming.synthesizer.stream_elements_synthesizer import (
-    StreamElementsSynthesizer,
-)
+from typing import TYPE_CHECKING
+
+from vocode.streaming.utils.lazy_import import lazy_getattr
+
+if TYPE_CHECKING:
+    from vocode.streaming.synthesizer.azure_synthesizer import AzureSynthesizer
+    from vocode.streaming.synthesizer.bark_synthesizer import BarkSynthesizer
+    from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer
+    from vocode.streaming.synthesizer.coqui_synthesizer import CoquiSynthesizer
+    from vocode.streaming.synthesizer.coqui_tts_synthesizer import CoquiTTSSynthesizer
+    from vocode.streaming.synthesizer.eleven_labs_synthesizer import (
+        ElevenLabsSynthesizer,
+    )
+    from vocode.streaming.synthesizer.google_synthesizer import GoogleSynthesizer
+    from vocode.streaming.synthesizer.gtts_synthesizer import GTTSSynthesizer
+    from vocode.streaming.synthesizer.play_ht_synthesizer import PlayHtSynthesizer
+    from vocode.streaming.synthesizer.rime_synthesizer import RimeSynthesizer
+    from vocode.streaming.synthesizer.polly_synthesizer import PollySynthesizer
+    from vocode.streaming.synthesizer.stream_elements_synthesizer import (
+        StreamElementsSynthesizer,
+    )
+
+_imports = {
+    "AzureSynthesizer": "vocode.streaming.synthesizer.azure_synthesizer",
+    "BarkSynthesizer": "vocode.streaming.synthesizer.bark_synthesizer",
+    "BaseSynthesizer": "vocode.streaming.synthesizer.base_synthesizer",
+    "CoquiSynthesizer": "vocode.streaming.synthesizer.coqui_synthesizer",
+    "CoquiTTSSynthesizer": "vocode.streaming.synthesizer.coqui_tts_synthesizer",
+    "ElevenLabsSynthesizer": "vocode.streaming.synthesizer.eleven_labs_synthesizer",
+    "GoogleSynthesizer": "vocode.streaming.synthesizer.google_synthesizer",
+    "GTTSSynthesizer": "vocode.streaming.synthesizer.gtts_synthesizer",
+    "PlayHtSynthesizer": "vocode.streaming.synthesizer.play_ht_synthesizer",
+    "RimeSynthesizer": "vocode.streaming.synthesizer.rime_synthesizer",
+    "PollySynthesizer": "vocode.streaming.synthesizer.polly_synthesizer",
+    "StreamElementsSynthesizer": "vocode.streaming.synthesizer.stream_elements_synthesizer",
+}
+__all__ = list(_imports)
+__getattr__ = lazy_getattr(__name__, _imports)
@@ -31,6 +31,7 @@ from vocode.streaming.models.agent import (
 )
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.utils.cache import RedisRenewableTTLCache
+from vocode.streaming.utils import get_chunk_sizes
 import azure.cognitiveservices.speech as speechsdk
 
 
@@ -318,7 +319,6 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         bot_sentiment: Optional[BotSentiment] = None,
         return_tuple: bool = False
     ) -> SynthesisResult:
-        offset = 0
         self.logger.debug(f"Synthesizing message: {message}")
 
         # Azure will return no audio for certain strings like "-", "[-", and "!"
@@ -330,30 +330,27 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
                 lambda _: message.text,
             )
 
+        chunk_sizes = get_chunk_sizes(
+            self.synthesizer_config.audio_encoding,
+            self.synthesizer_config.sampling_rate,
+            chunk_size,
+            self.synthesizer_config.first_chunk_size_seconds,
+        )
+
         async def chunk_generator(
             audio_data_stream: speechsdk.AudioDataStream, chunk_transform=lambda x: x
         ):
-            audio_buffer = bytes(chunk_size)
-            filled_size = await asyncio.get_event_loop().run_in_executor(
-                self.thread_pool_executor,
-                lambda: audio_data_stream.read_data(audio_buffer),
-            )
-            if filled_size != chunk_size:
-                yield SynthesisResult.ChunkResult(
-                    chunk_transform(audio_buffer[offset:]), True
-                )
-                return
-            else:
-                yield SynthesisResult.ChunkResult(
-                    chunk_transform(audio_buffer[offset:]), False
+            for size in chunk_sizes:
+                audio_buffer = bytes(size)
+                filled_size = await asyncio.get_event_loop().run_in_executor(
+                    self.thread_pool_executor,
+                    lambda: audio_data_stream.read_data(audio_buffer),
                 )
-            while True:
-                filled_size = audio_data_stream.read_data(audio_buffer)
-                if filled_size != chunk_size:
+                if filled_size != size:
                     yield SynthesisResult.ChunkResult(
-                        chunk_transform(audio_buffer[: filled_size - offset]), True
+                        chunk_transform(audio_buffer[:filled_size]), True
                     )
-                    break
+                    return
                 yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), False)
 
         word_boundary_event_pool = WordBoundaryEventPool()
@@ -1,4 +1,5 @@
 import asyncio
+import contextvars
 import os
 import __main__
 from typing import (
@@ -18,12 +19,10 @@ import math
 import io
 import wave
 import aiohttp
-from  aiobotocore.session import get_session
-from nltk.tokenize import word_tokenize
-from nltk.tokenize.treebank import TreebankWordDetokenizer
 from opentelemetry import trace
 from opentelemetry.trace import Span
 
+from vocode.streaming.constants import SYNTHESIS_PREFETCH_MAX_CHUNKS
 from vocode.streaming.utils.cache import RedisRenewableTTLCache
 from vocode.streaming.agent.bot_sentiment_analyser import BotSentiment
 from vocode.streaming.models.agent import (
@@ -33,11 +32,29 @@ from vocode.streaming.models.agent import (
 )
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.synthesizer.miniaudio_worker import MiniaudioWorker
-from vocode.streaming.utils import convert_wav, get_chunk_size_per_second
+from vocode.streaming.synthesizer.phrase_promotion import (
+    PhrasePromotion,
+    cached_characters_counter,
+    phrase_frequency_tracker,
+    phrase_promoter,
+    repeated_characters_counter,
+    tts_characters_counter,
+)
+from vocode.streaming.utils import (
+    convert_wav,
+    get_chunk_size_per_second,
+    get_chunk_sizes,
+    split_audio,
+)
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.models.synthesizer import SynthesizerConfig, TYPING_NOISE_PATH
+from vocode.streaming.utils.turn_timeline import (
+    TurnMark,
+    TurnTimeline,
+    current_turn_timeline,
+    mark_current_turn,
+)
 import logging
-import base64
 
 # Get the root logger
 logger = logging.getLogger()
@@ -67,9 +84,89 @@ class SynthesisResult:
         self,
         chunk_generator: AsyncGenerator[ChunkResult, None],
         get_message_up_to: Callable[[float], str],
+        max_prefetched_chunks: int = SYNTHESIS_PREFETCH_MAX_CHUNKS,
+        turn_timeline: Optional[TurnTimeline] = None,
     ):
-        self.chunk_generator = chunk_generator
+        self.chunk_generator = PrefetchingChunkGenerator(
+            chunk_generator, max_prefetched_chunks
+        )
         self.get_message_up_to = get_message_up_to
+        # synthesizers don't pass this: it's picked up from the worker that
+        # called create_speech
+        self.turn_timeline = turn_timeline or current_turn_timeline.get()
+
+    async def close(self):
+        await self.chunk_generator.aclose()
+
+
+class PrefetchingChunkGenerator:
+    """Reads ahead from a synthesizer's chunk generator.
+
+    A background task (started on the first read) keeps a bounded buffer of
+    chunks filled, so network reads and decoding happen while earlier chunks
+    are being played instead of after. `aclose` cancels the read-ahead.
+
+    The task runs in the context the generator was created in, so the
+    synthesizer's generator still sees the turn timeline of its create_speech
+    call.
+    """
+
+    _END = object()
+
+    def __init__(
+        self,
+        chunk_generator: AsyncGenerator["SynthesisResult.ChunkResult", None],
+        max_prefetched_chunks: int = SYNTHESIS_PREFETCH_MAX_CHUNKS,
+    ):
+        self.chunk_generator = chunk_generator
+        self.max_prefetched_chunks = max_prefetched_chunks
+        self.buffer: Optional[asyncio.Queue] = None
+        self.prefetch_task: Optional[asyncio.Task] = None
+        self.finished = False
+        self.context = contextvars.copy_context()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> "SynthesisResult.ChunkResult":
+        if self.finished:
+            raise StopAsyncIteration
+        if self.prefetch_task is None:
+            self.buffer = asyncio.Queue(maxsize=self.max_prefetched_chunks)
+            self.prefetch_task = self.context.run(
+                asyncio.create_task, self.prefetch()
+            )
+        item = await self.buffer.get()
+        if item is self._END:
+            self.finished = True
+            raise StopAsyncIteration
+        if isinstance(item, Exception):
+            self.finished = True
+            raise item
+        return item
+
+    async def prefetch(self):
+        try:
+            async for chunk_result in self.chunk_generator:
+                mark_current_turn(TurnMark.FIRST_CHUNK_READY)
+                await self.buffer.put(chunk_result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self.buffer.put(e)
+            return
+        await self.buffer.put(self._END)
+
+    async def aclose(self):
+        self.finished = True
+        if self.prefetch_task is not None and not self.prefetch_task.done():
+            self.prefetch_task.cancel()
+            try:
+                await self.prefetch_task
+            except asyncio.CancelledError:
+                pass
+        if hasattr(self.chunk_generator, "aclose"):
+            await self.chunk_generator.aclose()
 
 
 class FillerAudio:
@@ -96,16 +193,16 @@ class FillerAudio:
             * self.seconds_per_chunk
         )
 
+        chunk_sizes = get_chunk_sizes(
+            self.synthesizer_config.audio_encoding,
+            self.synthesizer_config.sampling_rate,
+            chunk_size,
+            self.synthesizer_config.first_chunk_size_seconds,
+        )
+
         async def chunk_generator(chunk_transform=lambda x: x):
-            for i in range(0, len(self.audio_data), chunk_size):
-                if i + chunk_size > len(self.audio_data):
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(self.audio_data[i:]), True
-                    )
-                else:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(self.audio_data[i : i + chunk_size]), False
-                    )
+            for chunk, is_last_chunk in split_audio(self.audio_data, chunk_sizes):
+                yield SynthesisResult.ChunkResult(chunk_transform(chunk), is_last_chunk)
 
         if self.synthesizer_config.should_encode_as_wav:
             output_generator = chunk_generator(
@@ -152,7 +249,16 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
             self.aiohttp_session = aiohttp.ClientSession()
             self.should_close_session_on_tear_down = True
         
-        self.aiobotocore_session = get_session()
+        self._aiobotocore_session = None
+
+    @property
+    def aiobotocore_session(self):
+        # created on first use, only synthesizers that read audio from S3 need it
+        if self._aiobotocore_session is None:
+            from aiobotocore.session import get_session
+
+            self._aiobotocore_session = get_session()
+        return self._aiobotocore_session
 
     async def empty_generator(self):
         yield SynthesisResult.ChunkResult(b"", True)
@@ -273,6 +379,9 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
     ) -> str:
         words_per_second = words_per_minute / 60
         estimated_words_spoken = math.floor(words_per_second * seconds)
+        from nltk.tokenize import word_tokenize
+        from nltk.tokenize.treebank import TreebankWordDetokenizer
+
         tokens = word_tokenize(message.text)
         return TreebankWordDetokenizer().detokenize(tokens[:estimated_words_spoken])
 
@@ -285,7 +394,8 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
     ) -> SynthesisResult:
         '''
         returns a chunk generator and a thunk that can tell you what part of the message was read given the number of seconds spoken
-        chunk generator must return a ChunkResult, essentially a tuple (bytes of size chunk_size, flag if it is the last chunk)
+        chunk generator must return a ChunkResult, essentially a tuple (bytes, flag if it is the last chunk)
+        chunks follow get_chunk_sizes: a short first chunk (first_chunk_size_seconds) that ramps up to chunk_size
         '''
         raise NotImplementedError
 
@@ -308,16 +418,16 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
         else:
             chunk_transform = lambda chunk: chunk
 
+        chunk_sizes = get_chunk_sizes(
+            synthesizer_config.audio_encoding,
+            synthesizer_config.sampling_rate,
+            chunk_size,
+            synthesizer_config.first_chunk_size_seconds,
+        )
+
         async def chunk_generator(output_bytes):
-            for i in range(0, len(output_bytes), chunk_size):
-                if i + chunk_size > len(output_bytes):
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(output_bytes[i:]), True
-                    )
-                else:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(output_bytes[i : i + chunk_size]), False
-                    )
+            for chunk, is_last_chunk in split_audio(output_bytes, chunk_sizes):
+                yield SynthesisResult.ChunkResult(chunk_transform(chunk), is_last_chunk)
 
         return SynthesisResult(
             chunk_generator(output_bytes),
@@ -359,15 +469,16 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
                     mp3_audio += chunk
                     if not got_first:
                         got_first = True
+                        mark_current_turn(TurnMark.TTS_FIRST_BYTE)
                         if create_speech_span is not None:
                             create_speech_span.end()
+                # only complete audio is cached
+                if message is not None and mp3_audio:
+                    self.record_synthesized_phrase(message.text, mp3_audio)
             except asyncio.TimeoutError:
                 self.logger.debug("Timeout while reading chunks from stream_reader")
             finally:
                 miniaudio_worker.consume_nonblocking(None)  # sentinel
-                cache_key = self.get_cache_key(message.text)
-                self.logger.debug(f"Caching {cache_key} in experimental_mp3_streaming")
-                self.cache.set(cache_key, base64.b64encode(mp3_audio))
 
         try:
             asyncio.create_task(send_chunks())
@@ -402,3 +513,44 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
 
     def get_cache_key(self, text: str) -> str:
         return self.synthesizer_config.get_cache_key(text)
+
+    def get_voice_key(self) -> str:
+        # the cache key of the empty phrase: the voice and its settings
+        return self.get_cache_key("")
+
+    def record_synthesized_phrase(self, text: str, mp3_audio: bytes):
+        """Counts a phrase the TTS service synthesized, and promotes its audio into
+        the cache (and index) once it's been said often enough"""
+        count = phrase_frequency_tracker.record(self.get_voice_key(), text)
+        attributes = {"synthesizer": self.synthesizer_config.type}
+        tts_characters_counter.add(len(text), attributes)
+        if count > 1:
+            repeated_characters_counter.add(len(text), attributes)
+        admit = (
+            self.cache is not None
+            and count >= self.synthesizer_config.cache_admission_threshold
+        )
+        index = (
+            self.synthesizer_config.index_config is not None
+            and self.synthesizer_config.index_promotion_threshold is not None
+            and count >= self.synthesizer_config.index_promotion_threshold
+        )
+        if admit or index:
+            phrase_promoter.promote(
+                PhrasePromotion(
+                    self.synthesizer_config,
+                    text,
+                    mp3_audio,
+                    cache_key=self.get_cache_key(text),
+                    voice_key=self.get_voice_key(),
+                    cache=self.cache if admit else None,
+                    index=index,
+                )
+            )
+
+    def record_cached_phrase(self, text: str):
+        """Counts a phrase served from the cache or index instead of the TTS service"""
+        phrase_frequency_tracker.record(self.get_voice_key(), text)
+        cached_characters_counter.add(
+            len(text), {"synthesizer": self.synthesizer_config.type}
+        )
@@ -33,6 +33,7 @@ from vocode.streaming.agent.bot_sentiment_analyser import BotSentiment
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.utils import convert_wav
 from vocode.streaming.utils.mp3_helper import decode_mp3
+from vocode.streaming.utils.turn_timeline import TurnMark, mark_current_turn
 from vocode.streaming.synthesizer.miniaudio_worker import MiniaudioWorker
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer
 
@@ -251,6 +252,7 @@ class ElevenLabsSynthesizer(BaseSynthesizer[ElevenLabsSynthesizerConfig]):
                     self.logger.debug(f"Error loading object from S3: {str(e)}")
                     audio_data = None
                 if audio_data is not None:
+                    self.record_cached_phrase(message.text)
                     if self.cache:
                         self.logger.debug(f"Adding {text_message} to cache.")
                         cache_key = self.get_cache_key(text_message)
@@ -285,6 +287,7 @@ class ElevenLabsSynthesizer(BaseSynthesizer[ElevenLabsSynthesizerConfig]):
                 self.logger.debug(
                     f"Retrieving text from synthesizer cache: {message.text}"
                 )
+                self.record_cached_phrase(message.text)
                 audio_data = base64.b64decode(audio_encoded)
                 result = self.get_result_from_mp3_audio_data(
                     audio_data, message, chunk_size
@@ -357,7 +360,9 @@ class ElevenLabsSynthesizer(BaseSynthesizer[ElevenLabsSynthesizerConfig]):
                     return result
             else:
                 audio_data = await response.read()
+                mark_current_turn(TurnMark.TTS_FIRST_BYTE)
                 create_speech_span.end()
+                self.record_synthesized_phrase(message.text, audio_data)
                 convert_span = tracer.start_span(
                     f"synthesizer.{SynthesizerType.ELEVEN_LABS.value.split('_', 1)[-1]}.convert",
                 )
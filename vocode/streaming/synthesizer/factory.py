@@ -16,20 +16,11 @@ from vocode.streaming.models.synthesizer import (
     SynthesizerConfig,
     SynthesizerType,
 )
-from vocode.streaming.synthesizer.azure_synthesizer import AzureSynthesizer
-from vocode.streaming.synthesizer.eleven_labs_synthesizer import ElevenLabsSynthesizer
-from vocode.streaming.synthesizer.google_synthesizer import GoogleSynthesizer
-from vocode.streaming.synthesizer.gtts_synthesizer import GTTSSynthesizer
-from vocode.streaming.synthesizer.play_ht_synthesizer import PlayHtSynthesizer
-from vocode.streaming.synthesizer.rime_synthesizer import RimeSynthesizer
-from vocode.streaming.synthesizer.polly_synthesizer import PollySynthesizer
-from vocode.streaming.synthesizer.stream_elements_synthesizer import (
-    StreamElementsSynthesizer,
-)
-from vocode.streaming.synthesizer.coqui_tts_synthesizer import CoquiTTSSynthesizer
-
 from vocode.streaming.utils.cache import RedisRenewableTTLCache
 
+
+# Provider modules are imported in their branch, so only the synthesizers that
+# are used get imported along with their SDKs
 class SynthesizerFactory:
     def create_synthesizer(
         self,
@@ -39,6 +30,8 @@ class SynthesizerFactory:
         aiohttp_session: Optional[aiohttp.ClientSession] = None,
     ):
         if isinstance(synthesizer_config, GoogleSynthesizerConfig):
+            from vocode.streaming.synthesizer.google_synthesizer import GoogleSynthesizer
+
             return GoogleSynthesizer(
                 synthesizer_config, 
                 cache=synthesizer_cache,
@@ -46,6 +39,8 @@ class SynthesizerFactory:
                 aiohttp_session=aiohttp_session
             )
         elif isinstance(synthesizer_config, AzureSynthesizerConfig):
+            from vocode.streaming.synthesizer.azure_synthesizer import AzureSynthesizer
+
             return AzureSynthesizer(
                 synthesizer_config, 
                 cache=synthesizer_cache,
@@ -53,6 +48,8 @@ class SynthesizerFactory:
                 aiohttp_session=aiohttp_session
             )
         elif isinstance(synthesizer_config, ElevenLabsSynthesizerConfig):
+            from vocode.streaming.synthesizer.eleven_labs_synthesizer import ElevenLabsSynthesizer
+
             return ElevenLabsSynthesizer(
                 synthesizer_config, 
                 cache=synthesizer_cache,
@@ -60,6 +57,8 @@ class SynthesizerFactory:
                 aiohttp_session=aiohttp_session
             )
         elif isinstance(synthesizer_config, PlayHtSynthesizerConfig):
+            from vocode.streaming.synthesizer.play_ht_synthesizer import PlayHtSynthesizer
+
             return PlayHtSynthesizer(
                 synthesizer_config, 
                 cache=synthesizer_cache,
@@ -67,6 +66,8 @@ class SynthesizerFactory:
                 aiohttp_session=aiohttp_session
             )
         elif isinstance(synthesizer_config, RimeSynthesizerConfig):
+            from vocode.streaming.synthesizer.rime_synthesizer import RimeSynthesizer
+
             return RimeSynthesizer(
                 synthesizer_config, 
                 cache=synthesizer_cache,
@@ -74,6 +75,8 @@ class SynthesizerFactory:
                 aiohttp_session=aiohttp_session
             )
         elif isinstance(synthesizer_config, GTTSSynthesizerConfig):
+            from vocode.streaming.synthesizer.gtts_synthesizer import GTTSSynthesizer
+
             return GTTSSynthesizer(
                 synthesizer_config, 
                 cache=synthesizer_cache,
@@ -81,6 +84,8 @@ class SynthesizerFactory:
                 aiohttp_session=aiohttp_session
             )
         elif isinstance(synthesizer_config, StreamElementsSynthesizerConfig):
+            from vocode.streaming.synthesizer.stream_elements_synthesizer import StreamElementsSynthesizer
+
             return StreamElementsSynthesizer(
                 synthesizer_config, 
                 cache=synthesizer_cache,
@@ -88,6 +93,8 @@ class SynthesizerFactory:
                 aiohttp_session=aiohttp_session
             )
         elif isinstance(synthesizer_config, CoquiTTSSynthesizerConfig):
+            from vocode.streaming.synthesizer.coqui_tts_synthesizer import CoquiTTSSynthesizer
+
             return CoquiTTSSynthesizer(
                 synthesizer_config, 
                 cache=synthesizer_cache,
@@ -95,6 +102,8 @@ class SynthesizerFactory:
                 aiohttp_session=aiohttp_session
             )
         elif isinstance(synthesizer_config, PollySynthesizerConfig):
+            from vocode.streaming.synthesizer.polly_synthesizer import PollySynthesizer
+
             return PollySynthesizer(
                 synthesizer_config, 
                 cache=synthesizer_cache,
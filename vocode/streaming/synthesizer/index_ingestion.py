@@ -0,0 +1,266 @@
+"""Builds the synthesizer index from a bank of phrases.
+
+Each phrase is synthesized once, its audio uploaded to the object store, and
+a vector of its text upserted with the object key in its metadata, which is
+what `RedisRenewableTTLCache.load_from_index` and
+`ElevenLabsSynthesizer.get_result_from_index` read.
+
+Object keys and vector ids are derived from the synthesizer's cache key, so
+a phrase whose audio is already in the store isn't synthesized again, and
+the ids of indexed phrases are appended to a state file, so a run that is
+interrupted (or had failures) can be rerun to finish the rest.
+
+Example usage:
+    python -m vocode.streaming.synthesizer.index_ingestion --phrases phrases.txt \\
+        --voice_id <voice id> --stability 0.5 --similarity_boost 0.75 \\
+        --bucket <bucket> --pinecone_index <index>
+    python -m vocode.streaming.synthesizer.index_ingestion --phrases phrases.txt \\
+        --object_store_path /tmp/audio --local_vector_db_path /tmp/index
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Awaitable, Callable, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from vocode.streaming.models.model import BaseModel
+from vocode.streaming.models.synthesizer import (
+    ElevenLabsSynthesizerConfig,
+    SynthesizerConfig,
+)
+from vocode.streaming.utils.object_store import ObjectStore
+from vocode.streaming.vector_db.base_vector_db import VectorDB
+
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1.0
+AUDIO_CONTENT_TYPE = "audio/mpeg"
+
+T = TypeVar("T")
+# text -> mp3 audio
+Synthesize = Callable[[str], Awaitable[bytes]]
+
+
+class IngestionResult(BaseModel):
+    num_phrases: int = 0
+    # indexed by an earlier run
+    num_skipped: int = 0
+    num_synthesized: int = 0
+    # synthesized by an earlier run that didn't index them
+    num_reused_audio: int = 0
+    num_indexed: int = 0
+    failed_phrases: List[str] = []
+
+
+def get_index_metadata(synthesizer_config: SynthesizerConfig) -> dict:
+    """The metadata the synthesizer filters its index lookups by"""
+    if isinstance(synthesizer_config, ElevenLabsSynthesizerConfig):
+        return {
+            "voice_id": synthesizer_config.voice_id,
+            "stability": synthesizer_config.stability,
+            "similarity_boost": synthesizer_config.similarity_boost,
+        }
+    return {}
+
+
+class PhraseIngestionPipeline:
+    def __init__(
+        self,
+        synthesizer_config: SynthesizerConfig,
+        synthesize: Synthesize,
+        object_store: ObjectStore,
+        vector_db: VectorDB,
+        state_path: Optional[str] = None,
+        max_concurrent_syntheses: int = 4,
+        batch_size: int = 100,
+        key_prefix: str = "phrases/",
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.synthesizer_config = synthesizer_config
+        self.synthesize = synthesize
+        self.object_store = object_store
+        self.vector_db = vector_db
+        self.state_path = state_path
+        self.synthesis_semaphore = asyncio.Semaphore(max_concurrent_syntheses)
+        self.batch_size = batch_size
+        self.key_prefix = key_prefix
+        self.logger = logger or logging.getLogger(__name__)
+
+    def get_phrase_id(self, text: str) -> str:
+        cache_key = self.synthesizer_config.get_cache_key(text)
+        return hashlib.sha256(cache_key.encode()).hexdigest()[:32]
+
+    def get_object_key(self, text: str) -> str:
+        return f"{self.key_prefix}{self.get_phrase_id(text)}.mp3"
+
+    def load_indexed_ids(self) -> Set[str]:
+        if self.state_path is None or not os.path.exists(self.state_path):
+            return set()
+        with open(self.state_path) as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def mark_indexed(self, ids: List[str]):
+        if self.state_path is None:
+            return
+        with open(self.state_path, "a") as f:
+            f.write("".join(f"{id}\n" for id in ids))
+
+    async def with_retries(self, description: str, f: Callable[[], Awaitable[T]]) -> T:
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return await f()
+            except Exception as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                self.logger.warning(f"Retrying {description}: {e}")
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2**attempt)
+        raise AssertionError("unreachable")
+
+    async def prepare_audio(
+        self, text: str, result: IngestionResult
+    ) -> Tuple[str, Optional[str]]:
+        """Makes sure the phrase's audio is in the object store, returns its key
+        (None if it failed)"""
+        object_key = self.get_object_key(text)
+        try:
+            async with self.synthesis_semaphore:
+                if await self.with_retries(
+                    f"checking {object_key}", lambda: self.object_store.exists(object_key)
+                ):
+                    result.num_reused_audio += 1
+                    return text, object_key
+                audio = await self.with_retries(
+                    f"synthesizing {text!r}", lambda: self.synthesize(text)
+                )
+                await self.with_retries(
+                    f"uploading {object_key}",
+                    lambda: self.object_store.put(object_key, audio, AUDIO_CONTENT_TYPE),
+                )
+                result.num_synthesized += 1
+                return text, object_key
+        except Exception as e:
+            self.logger.error(f"Failed to prepare audio for {text!r}: {e}")
+            return text, None
+
+    async def index_batch(self, batch: List[Tuple[str, str]], result: IngestionResult):
+        texts = [text for text, _ in batch]
+        ids = [self.get_phrase_id(text) for text in texts]
+        metadata = get_index_metadata(self.synthesizer_config)
+        metadatas = [{**metadata, "object_key": object_key} for _, object_key in batch]
+        try:
+            await self.with_retries(
+                f"indexing {len(batch)} phrases",
+                lambda: self.vector_db.add_texts(texts, metadatas=metadatas, ids=ids),
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to index {len(batch)} phrases: {e}")
+            result.failed_phrases.extend(texts)
+            return
+        self.mark_indexed(ids)
+        result.num_indexed += len(batch)
+        self.logger.debug(f"Indexed {result.num_indexed} phrases")
+
+    async def ingest(self, phrases: Iterable[str]) -> IngestionResult:
+        """Synthesizes, uploads and indexes the phrases that aren't indexed yet.
+        Batches are indexed as their audio is ready, while the rest is synthesized."""
+        texts = list(dict.fromkeys(phrase.strip() for phrase in phrases if phrase.strip()))
+        result = IngestionResult(num_phrases=len(texts))
+        indexed_ids = self.load_indexed_ids()
+        pending = [text for text in texts if self.get_phrase_id(text) not in indexed_ids]
+        result.num_skipped = len(texts) - len(pending)
+
+        batch: List[Tuple[str, str]] = []
+        for prepared in asyncio.as_completed(
+            [self.prepare_audio(text, result) for text in pending]
+        ):
+            text, object_key = await prepared
+            if object_key is None:
+                result.failed_phrases.append(text)
+                continue
+            batch.append((text, object_key))
+            if len(batch) >= self.batch_size:
+                await self.index_batch(batch, result)
+                batch = []
+        if batch:
+            await self.index_batch(batch, result)
+        return result
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--phrases", type=str, required=True, help="one phrase per line")
+parser.add_argument("--voice_id", type=str)
+parser.add_argument("--stability", type=float)
+parser.add_argument("--similarity_boost", type=float)
+parser.add_argument("--model_id", type=str)
+object_store_group = parser.add_mutually_exclusive_group(required=True)
+object_store_group.add_argument("--bucket", type=str)
+object_store_group.add_argument("--object_store_path", type=str)
+vector_db_group = parser.add_mutually_exclusive_group(required=True)
+vector_db_group.add_argument("--pinecone_index", type=str)
+vector_db_group.add_argument("--local_vector_db_path", type=str)
+# defaults to <phrases>.indexed
+parser.add_argument("--state_path", type=str)
+parser.add_argument("--max_concurrent_syntheses", type=int, default=4)
+parser.add_argument("--batch_size", type=int, default=100)
+
+
+async def run(args):
+    from vocode.streaming.models.message import BaseMessage
+    from vocode.streaming.models.vector_db import LocalVectorDBConfig, PineconeConfig
+    from vocode.streaming.synthesizer.eleven_labs_synthesizer import (
+        ElevenLabsSynthesizer,
+    )
+    from vocode.streaming.utils.object_store import LocalObjectStore, S3ObjectStore
+    from vocode.streaming.vector_db.factory import VectorDBFactory
+
+    synthesizer_config = ElevenLabsSynthesizerConfig.from_telephone_output_device(
+        voice_id=args.voice_id,
+        stability=args.stability,
+        similarity_boost=args.similarity_boost,
+        model_id=args.model_id,
+    )
+    synthesizer = ElevenLabsSynthesizer(synthesizer_config)
+    object_store = (
+        S3ObjectStore(args.bucket)
+        if args.bucket
+        else LocalObjectStore(args.object_store_path)
+    )
+    vector_db = VectorDBFactory().create_vector_db(
+        PineconeConfig(index=args.pinecone_index)
+        if args.pinecone_index
+        else LocalVectorDBConfig(path=args.local_vector_db_path)
+    )
+    with open(args.phrases) as f:
+        phrases = f.read().splitlines()
+    pipeline = PhraseIngestionPipeline(
+        synthesizer_config,
+        lambda text: synthesizer.download_filler_audio_data(BaseMessage(text=text)),
+        object_store,
+        vector_db,
+        state_path=args.state_path or f"{args.phrases}.indexed",
+        max_concurrent_syntheses=args.max_concurrent_syntheses,
+        batch_size=args.batch_size,
+    )
+    try:
+        result = await pipeline.ingest(phrases)
+    finally:
+        await vector_db.tear_down()
+        await synthesizer.tear_down()
+    print(
+        f"{result.num_phrases} phrases: {result.num_indexed} indexed"
+        f" ({result.num_synthesized} synthesized, {result.num_reused_audio} with audio"
+        f" from an earlier run), {result.num_skipped} already indexed,"
+        f" {len(result.failed_phrases)} failed"
+    )
+    for text in result.failed_phrases:
+        print(f"  failed: {text}")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
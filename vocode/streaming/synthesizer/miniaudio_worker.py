@@ -7,7 +7,7 @@ import asyncio
 import miniaudio
 
 from vocode.streaming.models.synthesizer import SynthesizerConfig
-from vocode.streaming.utils import convert_wav
+from vocode.streaming.utils import convert_wav, get_chunk_sizes
 from vocode.streaming.utils.mp3_helper import decode_mp3
 from vocode.streaming.utils.worker import ThreadAsyncWorker, logger
 import logging
@@ -65,6 +65,12 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
         self.output_queue = output_queue  # for typing
         self.synthesizer_config = synthesizer_config
         self.chunk_size = chunk_size
+        self.chunk_sizes = get_chunk_sizes(
+            synthesizer_config.audio_encoding,
+            synthesizer_config.sampling_rate,
+            chunk_size,
+            synthesizer_config.first_chunk_size_seconds,
+        )
         self.logger = logger
         self._ended = False
 
@@ -77,6 +83,7 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
             current_wav_buffer = bytearray()
             # the leftover chunks of the wav that haven't been sent to the output queue yet
             current_wav_output_buffer = bytearray()
+            next_chunk_size = next(self.chunk_sizes)
             while not self._ended:
                 # Get a tuple of (mp3_chunk, is_last) from the input queue
                 try:
@@ -124,16 +131,18 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
                 new_bytes = converted_output_bytes[len(current_wav_buffer) :]
                 current_wav_output_buffer.extend(new_bytes)
 
-                # chunk up new_bytes in chunks of chunk_size bytes, but keep the last chunk (less than chunk size) in the wav output buffer
+                # chunk up new_bytes following chunk_sizes (a short first chunk ramping up to chunk_size),
+                # but keep the last partial chunk in the wav output buffer
                 output_buffer_idx = 0
-                while output_buffer_idx < len(current_wav_output_buffer) - self.chunk_size:
+                while output_buffer_idx < len(current_wav_output_buffer) - next_chunk_size:
                     chunk = current_wav_output_buffer[
-                        output_buffer_idx : output_buffer_idx + self.chunk_size
+                        output_buffer_idx : output_buffer_idx + next_chunk_size
                     ]
                     self.output_janus_queue.sync_q.put(
                         (chunk, False)
                     )  # don't need to use bytes() since we already sliced it (which is a copy)
-                    output_buffer_idx += self.chunk_size
+                    output_buffer_idx += next_chunk_size
+                    next_chunk_size = next(self.chunk_sizes)
 
                 current_wav_output_buffer = current_wav_output_buffer[output_buffer_idx:]
                 current_wav_buffer.extend(new_bytes)
@@ -0,0 +1,198 @@
+"""Promotes frequently said phrases into the synthesizer cache and index.
+
+Every utterance is counted per voice in a count-min sketch shared by all
+conversations in the process. Once a phrase the TTS service synthesized has
+been said `cache_admission_threshold` times, its audio is handed to the
+promoter, which caches it in the background; at `index_promotion_threshold`
+it's also uploaded and indexed, so other nodes (and the cache warm-up) find it.
+"""
+
+import asyncio
+import base64
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from cachetools import LRUCache
+from opentelemetry import metrics
+
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.utils.bounded_queue import BoundedQueue, OverflowPolicy
+from vocode.streaming.utils.count_min_sketch import CountMinSketch
+
+if TYPE_CHECKING:
+    from vocode.streaming.utils.cache import RedisRenewableTTLCache
+    from vocode.streaming.utils.object_store import ObjectStore
+
+MAX_TRACKED_VOICES = 32
+MAX_QUEUED_PROMOTIONS = 256
+# phrases of a voice indexed together
+INDEX_BATCH_SIZE = 32
+# phrases remembered as indexed, so each is indexed once per process
+MAX_INDEXED_PHRASES = 100000
+
+meter = metrics.get_meter(__name__)
+tts_characters_counter = meter.create_counter(
+    name="synthesizer.tts_characters",
+    unit="characters",
+    description="Characters sent to the TTS service",
+)
+repeated_characters_counter = meter.create_counter(
+    name="synthesizer.repeated_tts_characters",
+    unit="characters",
+    description="Characters sent to the TTS service for phrases already said with "
+    "the same voice, the projected savings of caching repeated phrases",
+)
+cached_characters_counter = meter.create_counter(
+    name="synthesizer.cached_characters",
+    unit="characters",
+    description="Characters served from the cache or index instead of the TTS service",
+)
+promoted_phrases_counter = meter.create_counter(
+    name="synthesizer.promoted_phrases",
+    unit="phrases",
+    description="Phrases promoted into the cache or the index",
+)
+
+
+def normalize_utterance(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+class PhraseFrequencyTracker:
+    """How often each phrase has recently been said, per voice"""
+
+    def __init__(self, max_voices: int = MAX_TRACKED_VOICES, **sketch_kwargs):
+        self.max_voices = max_voices
+        self.sketch_kwargs = sketch_kwargs
+        self.sketches: "OrderedDict[str, CountMinSketch]" = OrderedDict()
+
+    def get_sketch(self, voice_key: str) -> CountMinSketch:
+        sketch = self.sketches.get(voice_key)
+        if sketch is None:
+            sketch = self.sketches[voice_key] = CountMinSketch(**self.sketch_kwargs)
+            while len(self.sketches) > self.max_voices:
+                self.sketches.popitem(last=False)
+        self.sketches.move_to_end(voice_key)
+        return sketch
+
+    def record(self, voice_key: str, text: str) -> int:
+        """Counts the phrase, returns how many times it's been said"""
+        return self.get_sketch(voice_key).add(normalize_utterance(text))
+
+    def estimate(self, voice_key: str, text: str) -> int:
+        return self.get_sketch(voice_key).estimate(normalize_utterance(text))
+
+
+class PhrasePromotion:
+    def __init__(
+        self,
+        synthesizer_config: SynthesizerConfig,
+        text: str,
+        mp3_audio: bytes,
+        cache_key: str,
+        voice_key: str,
+        cache: Optional["RedisRenewableTTLCache"] = None,
+        index: bool = False,
+    ):
+        self.synthesizer_config = synthesizer_config
+        self.text = text
+        self.mp3_audio = mp3_audio
+        self.cache_key = cache_key
+        self.voice_key = voice_key
+        self.cache = cache
+        self.index = index
+
+
+def create_s3_object_store(bucket_name: str) -> "ObjectStore":
+    from vocode.streaming.utils.object_store import S3ObjectStore
+
+    return S3ObjectStore(bucket_name)
+
+
+class PhrasePromoter:
+    """Caches and indexes promoted phrases in the background. Promotions beyond
+    MAX_QUEUED_PROMOTIONS are dropped, the phrase is promoted when it's said again."""
+
+    def __init__(
+        self,
+        create_object_store: Callable[[str], "ObjectStore"] = create_s3_object_store,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.create_object_store = create_object_store
+        self.logger = logger or logging.getLogger(__name__)
+        self.queue: Optional[BoundedQueue[PhrasePromotion]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.indexed_keys: LRUCache = LRUCache(maxsize=MAX_INDEXED_PHRASES)
+
+    def promote(self, promotion: PhrasePromotion):
+        # started on first use, and again if the event loop changed
+        if (
+            self.task is None
+            or self.task.done()
+            or self.task.get_loop() is not asyncio.get_running_loop()
+        ):
+            self.queue = BoundedQueue(
+                "phrase_promotion",
+                maxsize=MAX_QUEUED_PROMOTIONS,
+                overflow_policy=OverflowPolicy.DROP_NEWEST,
+            )
+            self.task = asyncio.create_task(self.run(self.queue))
+        self.queue.put_nowait(promotion)
+
+    async def run(self, queue: BoundedQueue[PhrasePromotion]):
+        while True:
+            promotions = [await queue.get()]
+            while not queue.empty() and len(promotions) < INDEX_BATCH_SIZE:
+                promotions.append(queue.get_nowait())
+            try:
+                await self.process(promotions)
+            except Exception as e:
+                self.logger.error(f"Error promoting phrases: {e}", exc_info=True)
+
+    async def process(self, promotions: List[PhrasePromotion]):
+        to_index: Dict[str, List[PhrasePromotion]] = {}
+        for promotion in promotions:
+            if promotion.cache is not None:
+                await promotion.cache.set_async(
+                    promotion.cache_key, base64.b64encode(promotion.mp3_audio)
+                )
+                promoted_phrases_counter.add(1, {"target": "cache"})
+            if promotion.index and promotion.cache_key not in self.indexed_keys:
+                to_index.setdefault(promotion.voice_key, []).append(promotion)
+        for voice_promotions in to_index.values():
+            await self.index(voice_promotions)
+
+    async def index(self, promotions: List[PhrasePromotion]):
+        from vocode.streaming.synthesizer.index_ingestion import (
+            PhraseIngestionPipeline,
+        )
+        from vocode.streaming.vector_db.factory import VectorDBFactory
+
+        synthesizer_config = promotions[0].synthesizer_config
+        index_config = synthesizer_config.index_config
+        # the pipeline strips the phrases it's given
+        audio = {promotion.text.strip(): promotion.mp3_audio for promotion in promotions}
+
+        async def synthesize(text: str) -> bytes:
+            return audio[text]
+
+        vector_db = VectorDBFactory().create_vector_db(index_config.vector_db_config)
+        try:
+            result = await PhraseIngestionPipeline(
+                synthesizer_config,
+                synthesize,
+                self.create_object_store(index_config.bucket_name),
+                vector_db,
+                logger=self.logger,
+            ).ingest(audio)
+        finally:
+            await vector_db.tear_down()
+        for promotion in promotions:
+            if promotion.text.strip() not in result.failed_phrases:
+                self.indexed_keys[promotion.cache_key] = True
+        promoted_phrases_counter.add(result.num_indexed, {"target": "index"})
+
+
+phrase_frequency_tracker = PhraseFrequencyTracker()
+phrase_promoter = PhrasePromoter()
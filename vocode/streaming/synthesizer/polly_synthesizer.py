@@ -15,6 +15,7 @@ from vocode.streaming.synthesizer.base_synthesizer import (
 )
 from vocode.streaming.models.synthesizer import PollySynthesizerConfig, SynthesizerType
 from vocode.streaming.utils.mp3_helper import decode_mp3
+from vocode.streaming.utils import get_chunk_sizes
 
 import boto3
 
@@ -104,23 +105,22 @@ class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
 
         create_speech_span.end()
 
+        chunk_sizes = get_chunk_sizes(
+            self.synthesizer_config.audio_encoding,
+            self.synthesizer_config.sampling_rate,
+            chunk_size,
+            self.synthesizer_config.first_chunk_size_seconds,
+        )
+
         async def chunk_generator(audio_data_stream, chunk_transform=lambda x: x):
-            audio_buffer = await asyncio.get_event_loop().run_in_executor(
-                self.thread_pool_executor,
-                lambda: audio_stream.read(chunk_size),
-            )
-            if len(audio_buffer) != chunk_size:
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), True)
-                return
-            else:
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), False)
-            while True:
-                audio_buffer = audio_stream.read(chunk_size)
-                if len(audio_buffer) != chunk_size:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(audio_buffer[: len(audio_buffer)]), True
-                    )
-                    break
+            for size in chunk_sizes:
+                audio_buffer = await asyncio.get_event_loop().run_in_executor(
+                    self.thread_pool_executor,
+                    lambda: audio_data_stream.read(size),
+                )
+                if len(audio_buffer) != size:
+                    yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), True)
+                    return
                 yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), False)
 
         if self.synthesizer_config.should_encode_as_wav:
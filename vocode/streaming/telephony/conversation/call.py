@@ -47,7 +47,7 @@ class Call(StreamingConversation[TelephonyOutputDeviceType]):
         transcriber_factory: TranscriberFactory = TranscriberFactory(),
         agent_factory: AgentFactory = AgentFactory(),
         synthesizer_factory: SynthesizerFactory = SynthesizerFactory(),
-        synthesizer_cache: RedisRenewableTTLCache = RedisRenewableTTLCache(),
+        synthesizer_cache: Optional[RedisRenewableTTLCache] = None,
         events_manager: Optional[EventsManager] = None,
         logger: Optional[logging.Logger] = None,
     ):
@@ -67,7 +67,8 @@ class Call(StreamingConversation[TelephonyOutputDeviceType]):
             agent_factory.create_agent(agent_config, logger=logger),
             synthesizer_factory.create_synthesizer(
                 synthesizer_config, 
-                synthesizer_cache=synthesizer_cache,
+                # its state is shared by all instances, so a new one is equivalent
+                synthesizer_cache=synthesizer_cache or RedisRenewableTTLCache(),
                 logger=logger
             ),
             conversation_id=conversation_id,
@@ -2,7 +2,6 @@ import asyncio
 from fastapi import WebSocket
 import base64
 from enum import Enum
-import json
 import logging
 from typing import Optional, Tuple
 from vocode import getenv
@@ -28,6 +27,7 @@ from vocode.streaming.transcriber.factory import TranscriberFactory
 from vocode.streaming.utils.events_manager import EventsManager
 from vocode.streaming.utils.state_manager import TwilioCallStateManager
 from vocode.streaming.utils.cache import RedisRenewableTTLCache
+from vocode.streaming.utils import serialization
 
 
 TWILIO_CHUNK_DURATION_MS = 20
@@ -158,7 +158,7 @@ class TwilioCall(Call[TwilioOutputDevice]):
             message = await ws.receive_text()
             if not message:
                 continue
-            data = json.loads(message)
+            data = serialization.loads(message)
             if data["event"] == "start":
                 self.logger.debug(
                     f"Media WS: Received event '{data['event']}': {message}"
@@ -176,7 +176,7 @@ class TwilioCall(Call[TwilioOutputDevice]):
             return PhoneCallWebsocketAction.CLOSE_WEBSOCKET, twilio_audio_time_ms
 
         # check https://github.com/deepgram-devs/deepgram-twilio-streaming-python/blob/master/twilio.py        
-        data = json.loads(message)
+        data = serialization.loads(message)
         if data["event"] == "media":
             media = data["media"]
             chunk = base64.b64decode(media["payload"])
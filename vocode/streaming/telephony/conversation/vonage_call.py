@@ -23,7 +23,6 @@ from vocode.streaming.telephony.conversation.call import Call
 from vocode.streaming.transcriber.factory import TranscriberFactory
 from vocode.streaming.utils.events_manager import EventsManager
 
-from vocode.streaming.output_device.speaker_output import SpeakerOutput
 from vocode.streaming.telephony.constants import VONAGE_CHUNK_SIZE, VONAGE_SAMPLING_RATE
 from vocode.streaming.utils.state_manager import (
     ConversationStateManager,
@@ -83,6 +82,9 @@ class VonageCall(Call[VonageOutputDevice]):
         )
         self.vonage_uuid = vonage_uuid
         if output_to_speaker:
+            # imported here so servers don't need sounddevice/PortAudio
+            from vocode.streaming.output_device.speaker_output import SpeakerOutput
+
             self.output_speaker = SpeakerOutput.from_default_device(
                 sampling_rate=VONAGE_SAMPLING_RATE, blocksize=VONAGE_CHUNK_SIZE // 2
             )
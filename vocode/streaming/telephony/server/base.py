@@ -1,6 +1,8 @@
 import abc
+import asyncio
 from functools import partial
 import logging
+import threading
 from typing import List, Optional
 from fastapi import APIRouter, Form, Request, Response
 from pydantic import BaseModel, Field
@@ -37,9 +39,13 @@ from vocode.streaming.transcriber.base_transcriber import BaseTranscriber
 from vocode.streaming.transcriber.factory import TranscriberFactory
 from vocode.streaming.utils import create_conversation_id
 from vocode.streaming.utils.events_manager import EventsManager
+from vocode.streaming.utils.loop_monitor import LoopMonitor, profile_event_loop
 from vocode.streaming.utils.cache import RedisRenewableTTLCache
 
 
+MAX_PROFILE_SECONDS = 60
+
+
 class AbstractInboundCallConfig(BaseModel, abc.ABC):
     url: str
     agent_config: AgentConfig
@@ -73,6 +79,8 @@ class TelephonyServer:
         synthesizer_cache: Optional[RedisRenewableTTLCache] = None,
         events_manager: Optional[EventsManager] = None,
         logger: Optional[logging.Logger] = None,
+        enable_loop_monitor: bool = True,
+        enable_profiler_endpoint: bool = False,
     ):
         self.base_url = base_url
         self.logger = logger or logging.getLogger(__name__)
@@ -81,15 +89,11 @@ class TelephonyServer:
         self.templater = Templater()
         self.events_manager = events_manager
         self.router.include_router(
-            CallsRouter(
-                base_url=base_url,
-                config_manager=self.config_manager,
+            self.create_calls_router(
                 transcriber_factory=transcriber_factory,
                 agent_factory=agent_factory,
                 synthesizer_factory=synthesizer_factory,
                 synthesizer_cache=synthesizer_cache,
-                events_manager=self.events_manager,
-                logger=self.logger,
             ).get_router()
         )
         for config in inbound_call_configs:
@@ -104,7 +108,34 @@ class TelephonyServer:
 
         self.router.add_api_route("/recordings/{conversation_id}", self.recordings, methods=["GET", "POST"])
         self.logger.info(f"Set up recordings endpoint at https://{self.base_url}/recordings/{{conversation_id}}")
+
+        self.loop_monitor: Optional[LoopMonitor] = None
+        if enable_loop_monitor:
+            self.loop_monitor = LoopMonitor(logger=self.logger)
+            self.router.add_event_handler("startup", self.loop_monitor.start)
+            self.router.add_event_handler("shutdown", self.loop_monitor.stop)
+        if enable_profiler_endpoint:
+            self.router.add_api_route("/debug/profile", self.profile, methods=["GET"])
+            self.logger.info(f"Set up profiler endpoint at https://{self.base_url}/debug/profile")
  
+    def create_calls_router(
+        self,
+        transcriber_factory: TranscriberFactory,
+        agent_factory: AgentFactory,
+        synthesizer_factory: SynthesizerFactory,
+        synthesizer_cache: Optional[RedisRenewableTTLCache] = None,
+    ) -> CallsRouter:
+        return CallsRouter(
+            base_url=self.base_url,
+            config_manager=self.config_manager,
+            transcriber_factory=transcriber_factory,
+            agent_factory=agent_factory,
+            synthesizer_factory=synthesizer_factory,
+            synthesizer_cache=synthesizer_cache,
+            events_manager=self.events_manager,
+            logger=self.logger,
+        )
+
     def events(self, request: Request):
         return Response()
 
@@ -114,6 +145,19 @@ class TelephonyServer:
             self.events_manager.publish_event(RecordingEvent(recording_url=recording_url, conversation_id=conversation_id))
         return Response()
 
+    async def profile(self, seconds: float = 10, interval_ms: float = 5):
+        """Samples the event loop for `seconds` and returns collapsed stacks by task"""
+        loop = asyncio.get_running_loop()
+        collapsed_stacks = await loop.run_in_executor(
+            None,
+            profile_event_loop,
+            loop,
+            threading.get_ident(),
+            min(seconds, MAX_PROFILE_SECONDS),
+            interval_ms / 1000,
+        )
+        return Response(content=collapsed_stacks, media_type="text/plain")
+
     def create_inbound_route(
         self,
         inbound_call_config: AbstractInboundCallConfig,
@@ -0,0 +1,342 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from functools import wraps
+from typing import List, Optional
+
+import aiohttp
+import uvicorn
+from fastapi import APIRouter, Response, WebSocket
+from starlette.websockets import WebSocketDisconnect
+
+from vocode.streaming.telephony.config_manager.base_config_manager import (
+    BaseConfigManager,
+)
+from vocode.streaming.telephony.config_manager.in_memory_config_manager import (
+    InMemoryConfigManager,
+)
+from vocode.streaming.telephony.server.base import (
+    AbstractInboundCallConfig,
+    TelephonyServer,
+)
+from vocode.streaming.utils.base_router import BaseRouter
+
+# websocket close code for "try again later"
+TRY_AGAIN_LATER_CLOSE_CODE = 1013
+
+
+def run_telephony_worker(app_factory: str, host: str, port: int, log_level: str):
+    uvicorn.run(app_factory, factory=True, host=host, port=port, log_level=log_level)
+
+
+class TelephonyWorker:
+    def __init__(self, index: int, host: str, port: int):
+        self.index = index
+        self.host = host
+        self.port = port
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.active_calls = 0
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class TelephonyWorkerPool:
+    """Runs TelephonyServer worker processes and places calls on them.
+
+    `app_factory` is an import string (`module:function`) for a function that
+    returns a FastAPI app including a TelephonyServer's router; each worker
+    process calls it and serves the app on its own port. Workers must share
+    call configs through a config manager like RedisConfigManager.
+
+    Calls are placed on the live worker with the fewest active calls. Workers
+    that die are restarted, and their calls are not moved.
+    """
+
+    def __init__(
+        self,
+        app_factory: str,
+        num_workers: Optional[int] = None,
+        host: str = "127.0.0.1",
+        base_port: int = 3100,
+        startup_timeout_seconds: float = 30,
+        log_level: str = "info",
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.app_factory = app_factory
+        self.log_level = log_level
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self.workers = [
+            TelephonyWorker(index, host, base_port + index)
+            for index in range(num_workers or os.cpu_count() or 1)
+        ]
+        # spawn rather than fork: the parent has a running event loop and threads
+        self.mp_context = multiprocessing.get_context("spawn")
+        self.draining = False
+        self.supervise_task: Optional[asyncio.Task] = None
+
+    @property
+    def active_calls(self) -> int:
+        return sum(worker.active_calls for worker in self.workers)
+
+    async def start(self):
+        for worker in self.workers:
+            self.spawn(worker)
+        await asyncio.gather(*(self.wait_until_ready(worker) for worker in self.workers))
+        self.supervise_task = asyncio.create_task(self.supervise())
+
+    def spawn(self, worker: TelephonyWorker):
+        worker.process = self.mp_context.Process(
+            target=run_telephony_worker,
+            args=(self.app_factory, worker.host, worker.port, self.log_level),
+            name=f"TelephonyWorker-{worker.index}",
+            daemon=True,
+        )
+        worker.process.start()
+        self.logger.info(
+            f"Started telephony worker {worker.index} (pid {worker.process.pid}) on port {worker.port}"
+        )
+
+    async def wait_until_ready(self, worker: TelephonyWorker):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.startup_timeout_seconds
+        while loop.time() < deadline:
+            if not worker.is_alive():
+                raise RuntimeError(f"Telephony worker {worker.index} exited on startup")
+            try:
+                _, writer = await asyncio.open_connection(worker.host, worker.port)
+                writer.close()
+                return
+            except OSError:
+                await asyncio.sleep(0.1)
+        raise TimeoutError(f"Telephony worker {worker.index} did not start listening")
+
+    async def supervise(self):
+        while not self.draining:
+            await asyncio.sleep(1)
+            for worker in self.workers:
+                if worker.is_alive() or self.draining:
+                    continue
+                await self.restart(worker)
+
+    async def restart(self, worker: TelephonyWorker):
+        # active_calls is left alone: the proxies of the dropped calls release
+        # them as they unwind, and resetting it would let those releases count
+        # against the restarted process's calls
+        self.logger.error(
+            f"Telephony worker {worker.index} exited with {worker.process.exitcode}, "
+            f"dropping {worker.active_calls} calls and restarting it"
+        )
+        self.spawn(worker)
+        try:
+            await self.wait_until_ready(worker)
+        except (RuntimeError, TimeoutError):
+            self.logger.exception(f"Telephony worker {worker.index} failed to restart")
+
+    def acquire(self) -> Optional[TelephonyWorker]:
+        live_workers = [worker for worker in self.workers if worker.is_alive()]
+        if not live_workers:
+            return None
+        worker = min(live_workers, key=lambda worker: worker.active_calls)
+        worker.active_calls += 1
+        return worker
+
+    def release(self, worker: TelephonyWorker):
+        worker.active_calls = max(worker.active_calls - 1, 0)
+
+    async def drain(self, timeout_seconds: Optional[float] = None):
+        """Waits for active calls to finish. New calls are refused from here on."""
+        self.draining = True
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout_seconds is None else loop.time() + timeout_seconds
+        while self.active_calls > 0:
+            if deadline is not None and loop.time() >= deadline:
+                self.logger.warning(
+                    f"Drain timed out with {self.active_calls} calls still active"
+                )
+                return
+            await asyncio.sleep(0.5)
+
+    async def stop(self, timeout_seconds: float = 10):
+        self.draining = True
+        if self.supervise_task is not None:
+            self.supervise_task.cancel()
+        processes = [worker.process for worker in self.workers if worker.is_alive()]
+        for process in processes:
+            process.terminate()
+        loop = asyncio.get_running_loop()
+        for process in processes:
+            await loop.run_in_executor(None, process.join, timeout_seconds)
+            if process.is_alive():
+                process.kill()
+
+
+class ShardingCallsRouter(BaseRouter):
+    """Serves /connect_call/{id} by proxying the media websocket to a worker.
+
+    Frames are forwarded as-is, so the front process never decodes audio or
+    parses media messages; all of that happens in the worker's call.
+    """
+
+    def __init__(
+        self,
+        worker_pool: TelephonyWorkerPool,
+        logger: Optional[logging.Logger] = None,
+    ):
+        super().__init__()
+        self.worker_pool = worker_pool
+        self.logger = logger or logging.getLogger(__name__)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.router = APIRouter()
+        self.router.websocket("/connect_call/{id}")(self.connect_call)
+
+    async def connect_call(self, websocket: WebSocket, id: str):
+        worker = self.worker_pool.acquire()
+        if worker is None:
+            self.logger.error(f"No telephony worker available for chat {id}")
+            await websocket.close(code=TRY_AGAIN_LATER_CLOSE_CODE)
+            return
+        try:
+            await websocket.accept()
+            self.logger.debug(f"Proxying chat {id} to telephony worker {worker.index}")
+            if self.session is None:
+                self.session = aiohttp.ClientSession()
+            async with self.session.ws_connect(
+                f"{worker.ws_url}/connect_call/{id}"
+            ) as worker_ws:
+                await self.proxy(websocket, worker_ws)
+        finally:
+            self.worker_pool.release(worker)
+            self.logger.debug(f"Proxy for chat {id} closed")
+
+    async def proxy(
+        self, websocket: WebSocket, worker_ws: aiohttp.ClientWebSocketResponse
+    ):
+        async def forward_to_worker():
+            try:
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        return
+                    if message.get("text") is not None:
+                        await worker_ws.send_str(message["text"])
+                    elif message.get("bytes") is not None:
+                        await worker_ws.send_bytes(message["bytes"])
+            except WebSocketDisconnect:
+                return
+
+        async def forward_to_caller():
+            async for message in worker_ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    await websocket.send_text(message.data)
+                elif message.type == aiohttp.WSMsgType.BINARY:
+                    await websocket.send_bytes(message.data)
+            await websocket.close()
+
+        tasks = [
+            asyncio.create_task(forward_to_worker()),
+            asyncio.create_task(forward_to_caller()),
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await worker_ws.close()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+    def get_router(self) -> APIRouter:
+        return self.router
+
+
+class ShardingTelephonyServer(TelephonyServer):
+    """A TelephonyServer front that hands calls to a TelephonyWorkerPool.
+
+    The front answers inbound call webhooks and accepts media websockets,
+    which it proxies to the least loaded worker process. The agent,
+    transcriber and synthesizer factories belong to the workers' apps.
+
+    Use `serve` to run it: on SIGINT/SIGTERM it drains first, answering new
+    inbound calls with 503 (so the provider's fallback URL is used) while
+    calls in progress finish, for up to `drain_timeout_seconds`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        config_manager: BaseConfigManager,
+        worker_pool: TelephonyWorkerPool,
+        inbound_call_configs: List[AbstractInboundCallConfig] = [],
+        drain_timeout_seconds: float = 600,
+        **kwargs,
+    ):
+        if isinstance(config_manager, InMemoryConfigManager):
+            raise ValueError(
+                "Worker processes can't read an InMemoryConfigManager, use RedisConfigManager"
+            )
+        self.worker_pool = worker_pool
+        self.drain_timeout_seconds = drain_timeout_seconds
+        super().__init__(
+            base_url=base_url,
+            config_manager=config_manager,
+            inbound_call_configs=inbound_call_configs,
+            **kwargs,
+        )
+        self.router.add_event_handler("startup", self.worker_pool.start)
+        self.router.add_event_handler("shutdown", self.shutdown)
+
+    def create_calls_router(self, **kwargs) -> ShardingCallsRouter:
+        self.calls_router = ShardingCallsRouter(self.worker_pool, logger=self.logger)
+        return self.calls_router
+
+    def create_inbound_route(self, inbound_call_config: AbstractInboundCallConfig):
+        route = super().create_inbound_route(inbound_call_config)
+
+        @wraps(route)
+        async def draining_route(*args, **kwargs):
+            if self.worker_pool.draining:
+                return Response(status_code=503)
+            return await route(*args, **kwargs)
+
+        return draining_route
+
+    async def drain(self):
+        self.logger.info(f"Draining {self.worker_pool.active_calls} active calls")
+        await self.worker_pool.drain(self.drain_timeout_seconds)
+
+    async def shutdown(self):
+        await self.calls_router.close()
+        await self.worker_pool.stop()
+
+    def serve(self, app, host: str = "0.0.0.0", port: int = 3000, **kwargs):
+        """Runs `app` (which includes this server's router) with draining on exit"""
+        DrainingServer(uvicorn.Config(app, host=host, port=port, **kwargs), self).run()
+
+
+class DrainingServer(uvicorn.Server):
+    """Drains the telephony server on the first exit signal, exits on the second"""
+
+    def __init__(self, config: uvicorn.Config, telephony_server: ShardingTelephonyServer):
+        super().__init__(config)
+        self.telephony_server = telephony_server
+        self.drain_task: Optional[asyncio.Task] = None
+
+    def handle_exit(self, sig, frame):
+        if self.drain_task is not None:
+            return super().handle_exit(sig, frame)
+        self.drain_task = asyncio.get_event_loop().create_task(
+            self.telephony_server.drain()
+        )
+        self.drain_task.add_done_callback(
+            lambda _: super(DrainingServer, self).handle_exit(sig, frame)
+        )
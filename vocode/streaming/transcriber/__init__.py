@@ -1,7 +1,32 @@
-from vocode.streaming.transcriber.assembly_ai_transcriber import AssemblyAITranscriber
-from vocode.streaming.transcriber.azure_transcriber import AzureTranscriber
-from vocode.streaming.transcriber.base_transcriber import BaseTranscriber
-from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
-from vocode.streaming.transcriber.google_transcriber import GoogleTranscriber
-from vocode.streaming.transcriber.rev_ai_transcriber import RevAITranscriber
-from vocode.streaming.transcriber.whisper_cpp_transcriber import WhisperCPPTranscriber
+from typing import TYPE_CHECKING
+
+from vocode.streaming.utils.lazy_import import lazy_getattr
+
+if TYPE_CHECKING:
+    from vocode.streaming.transcriber.assembly_ai_transcriber import (
+        AssemblyAITranscriber,
+    )
+    from vocode.streaming.transcriber.azure_transcriber import AzureTranscriber
+    from vocode.streaming.transcriber.base_transcriber import BaseTranscriber
+    from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
+    from vocode.streaming.transcriber.google_transcriber import GoogleTranscriber
+    from vocode.streaming.transcriber.rev_ai_transcriber import RevAITranscriber
+    from vocode.streaming.transcriber.streaming_websocket_transcriber import (
+        StreamingWebsocketTranscriber,
+    )
+    from vocode.streaming.transcriber.whisper_cpp_transcriber import (
+        WhisperCPPTranscriber,
+    )
+
+_imports = {
+    "AssemblyAITranscriber": "vocode.streaming.transcriber.assembly_ai_transcriber",
+    "AzureTranscriber": "vocode.streaming.transcriber.azure_transcriber",
+    "BaseTranscriber": "vocode.streaming.transcriber.base_transcriber",
+    "DeepgramTranscriber": "vocode.streaming.transcriber.deepgram_transcriber",
+    "GoogleTranscriber": "vocode.streaming.transcriber.google_transcriber",
+    "RevAITranscriber": "vocode.streaming.transcriber.rev_ai_transcriber",
+    "StreamingWebsocketTranscriber": "vocode.streaming.transcriber.streaming_websocket_transcriber",
+    "WhisperCPPTranscriber": "vocode.streaming.transcriber.whisper_cpp_transcriber",
+}
+__all__ = list(_imports)
+__getattr__ = lazy_getattr(__name__, _imports)
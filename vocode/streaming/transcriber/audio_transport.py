@@ -0,0 +1,113 @@
+import audioop
+import base64
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from websockets.client import WebSocketClientProtocol
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.utils import serialization
+
+# frames kept for reuse once they've been sent
+MAX_FREE_FRAMES = 8
+
+AudioChunk = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+class AudioFrameBuffer:
+    """Batches incoming audio into linear16 frames of `frame_size` bytes.
+
+    Chunks are copied into a preallocated frame (after decoding, for mu-law)
+    rather than extending a growing buffer. Full frames are returned to the
+    caller, which owns them until it hands them back with `release` (e.g. once
+    they've been sent), after which they're reused for later frames.
+    """
+
+    def __init__(self, frame_size: int, audio_encoding: AudioEncoding):
+        # whole linear16 samples
+        self.frame_size = max(frame_size - frame_size % 2, 2)
+        self.audio_encoding = audio_encoding
+        self.is_mulaw = audio_encoding == AudioEncoding.MULAW
+        self.free_frames: List[bytearray] = []
+        self.new_frame()
+
+    @classmethod
+    def from_duration(
+        cls, seconds: float, sampling_rate: int, audio_encoding: AudioEncoding
+    ) -> "AudioFrameBuffer":
+        return cls(int(seconds * sampling_rate) * 2, audio_encoding)
+
+    def new_frame(self):
+        self.frame = self.free_frames.pop() if self.free_frames else bytearray(self.frame_size)
+        self.frame_view = memoryview(self.frame)
+        self.position = 0
+
+    def write(self, chunk: AudioChunk) -> List[bytearray]:
+        """Adds a chunk of audio in `audio_encoding`, returns the frames it filled"""
+        if isinstance(chunk, np.ndarray):
+            # arrays are passed on as their raw bytes, as they always have been
+            chunk = chunk.astype(np.int16).tobytes()
+        if self.is_mulaw:
+            # audioop is a single C call, a numpy lookup table costs more per
+            # call than it saves on 20ms chunks
+            chunk = audioop.ulaw2lin(chunk, 2)
+        end = self.position + len(chunk)
+        if end < self.frame_size:
+            # the common case, a chunk is a fraction of a frame
+            self.frame_view[self.position : end] = chunk
+            self.position = end
+            return []
+        data = memoryview(chunk)
+        full_frames = []
+        while len(data):
+            num_bytes = min(len(data), self.frame_size - self.position)
+            self.frame_view[self.position : self.position + num_bytes] = data[:num_bytes]
+            data = data[num_bytes:]
+            self.position += num_bytes
+            if self.position == self.frame_size:
+                self.frame_view.release()
+                full_frames.append(self.frame)
+                self.new_frame()
+        return full_frames
+
+    def release(self, frame: bytearray):
+        """Takes back a frame returned by `write` that's no longer referenced"""
+        if len(frame) == self.frame_size and len(self.free_frames) < MAX_FREE_FRAMES:
+            self.free_frames.append(frame)
+
+
+class AudioTransport:
+    """How a streaming transcriber puts a frame of linear16 audio on the wire"""
+
+    def encode(self, frame: bytearray) -> Union[bytes, bytearray, str]:
+        raise NotImplementedError
+
+    async def send(self, ws: WebSocketClientProtocol, frame: bytearray):
+        await ws.send(self.encode(frame))
+
+
+class BinaryAudioTransport(AudioTransport):
+    """Sends frames as binary websocket messages, as they are"""
+
+    def encode(self, frame: bytearray) -> bytearray:
+        return frame
+
+
+class Base64JsonAudioTransport(AudioTransport):
+    """For protocols that only take audio as base64 in a JSON message.
+
+    The message is serialized once up front with a placeholder for the audio,
+    so each frame is a base64 encode and a string concatenation rather than a
+    json.dumps of the whole message.
+    """
+
+    PLACEHOLDER = "__audio__"
+
+    def __init__(self, audio_key: str, extra_fields: Optional[Dict[str, Any]] = None):
+        template = serialization.dumps({**(extra_fields or {}), audio_key: self.PLACEHOLDER})
+        self.prefix, self.suffix = template.split(f'"{self.PLACEHOLDER}"')
+        self.prefix += '"'
+        self.suffix = '"' + self.suffix
+
+    def encode(self, frame: bytearray) -> str:
+        return self.prefix + base64.b64encode(frame).decode("ascii") + self.suffix
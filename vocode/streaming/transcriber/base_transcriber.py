@@ -8,7 +8,9 @@ from typing import Generic, TypeVar, Union, Optional
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.models.model import BaseModel
 
+from vocode.streaming.constants import CONTROL_QUEUE_MAX_SIZE
 from vocode.streaming.models.transcriber import TranscriberConfig
+from vocode.streaming.utils.bounded_queue import BoundedQueue, OverflowPolicy
 from vocode.streaming.utils.worker import AsyncWorker, ThreadAsyncWorker
 from vocode.streaming.voice_activity_detection import BaseVoiceActivityDetector
 from vocode.streaming.voice_activity_detection.factory import VoiceActivityDetectorFactory
@@ -66,8 +68,14 @@ class BaseAsyncTranscriber(AbstractTranscriber[TranscriberConfigType], AsyncWork
     ):
         self.logger = logger or logging.getLogger(__name__)
 
-        self.input_queue: asyncio.Queue[bytes] = asyncio.Queue()
-        self.output_queue: asyncio.Queue[Transcription] = asyncio.Queue()
+        self.input_queue: asyncio.Queue[bytes] = BoundedQueue(
+            "transcriber.input_queue",
+            maxsize=transcriber_config.input_queue_max_size,
+            overflow_policy=OverflowPolicy.DROP_OLDEST,
+        )
+        self.output_queue: asyncio.Queue[Transcription] = BoundedQueue(
+            "transcriber.output_queue", maxsize=CONTROL_QUEUE_MAX_SIZE
+        )
         AsyncWorker.__init__(self, self.input_queue, self.output_queue)
         AbstractTranscriber.__init__(self, transcriber_config)
 
@@ -97,8 +105,14 @@ class BaseThreadAsyncTranscriber(
         self,
         transcriber_config: TranscriberConfigType,
     ):
-        self.input_queue: asyncio.Queue[bytes] = asyncio.Queue()
-        self.output_queue: asyncio.Queue[Transcription] = asyncio.Queue()
+        self.input_queue: asyncio.Queue[bytes] = BoundedQueue(
+            "transcriber.input_queue",
+            maxsize=transcriber_config.input_queue_max_size,
+            overflow_policy=OverflowPolicy.DROP_OLDEST,
+        )
+        self.output_queue: asyncio.Queue[Transcription] = BoundedQueue(
+            "transcriber.output_queue", maxsize=CONTROL_QUEUE_MAX_SIZE
+        )
         ThreadAsyncWorker.__init__(self, self.input_queue, self.output_queue)
         AbstractTranscriber.__init__(self, transcriber_config)
 
@@ -1,89 +1,66 @@
-import asyncio
 import json
 import logging
-import time
-from io import BytesIO
-from pydub import AudioSegment
-import struct
 from typing import Optional
-import websockets
 from websockets.client import WebSocketClientProtocol
 import audioop
 from urllib.parse import urlencode, quote
 from vocode import getenv
 
 from vocode.streaming.transcriber.base_transcriber import (
-    BaseAsyncTranscriber,
     Transcription,
-    tracer,
-    meter,
     HUMAN_ACTIVITY_DETECTED,
 )
+from vocode.streaming.transcriber.streaming_websocket_transcriber import (
+    StreamingWebsocketTranscriber,
+    WebsocketMessage,
+)
 from vocode.streaming.models.transcriber import (
+    ClassifierEndpointingConfig,
     DeepgramTranscriberConfig,
-    EndpointingConfig,
     EndpointingType,
     PunctuationEndpointingConfig,
     TimeEndpointingConfig,
 )
 from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.transcriber.endpointing import (
+    AudioEnergyTracker,
+    EndpointingClassifier,
+    EndpointingFeatures,
+)
+from vocode.streaming.utils.websocket_pool import WebsocketConnectionPool
+from vocode.streaming.utils import serialization
 
 
 PUNCTUATION_TERMINATORS = [".", "!", "?"]
-NUM_RESTARTS = 5
-
+DEEPGRAM_LISTEN_URL = "wss://api.deepgram.com/v1/listen"
 
-avg_latency_hist = meter.create_histogram(
-    name="transcriber.deepgram.avg_latency",
-    unit="seconds",
-)
-max_latency_hist = meter.create_histogram(
-    name="transcriber.deepgram.max_latency",
-    unit="seconds",
-)
-min_latency_hist = meter.create_histogram(
-    name="transcriber.deepgram.min_latency",
-    unit="seconds",
-)
-duration_hist = meter.create_histogram(
-    name="transcriber.deepgram.duration",
-    unit="seconds",
+# shared by all DeepgramTranscribers in the process, see prewarmed_connections
+deepgram_connection_pool = WebsocketConnectionPool(
+    keepalive_message=json.dumps({"type": "KeepAlive"}),
 )
 
 
-class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
+class DeepgramTranscriber(StreamingWebsocketTranscriber[DeepgramTranscriberConfig]):
+    provider_name = "deepgram"
+    connection_pool = deepgram_connection_pool
+    keepalive_message = json.dumps({"type": "KeepAlive"})
+    close_message = json.dumps({"type": "CloseStream"})
+
     def __init__(
         self,
         transcriber_config: DeepgramTranscriberConfig,
         api_key: Optional[str] = None,
         logger: Optional[logging.Logger] = None,
     ):
-        super().__init__(transcriber_config)
+        super().__init__(transcriber_config, logger)
         self.api_key = api_key or getenv("DEEPGRAM_API_KEY")
         if not self.api_key:
             raise Exception(
                 "Please set DEEPGRAM_API_KEY environment variable or pass it as a parameter"
             )
-        self._ended = False
-        self._task = None
-        self.received_first_audio = False
-        self.is_ready = asyncio.Event()
-        self.logger = logger or logging.getLogger(__name__)
-        self.audio_cursor = 0.0
-
-    async def _run_loop(self):
-        try:
-            restarts = 0
-            while not self._ended and restarts < NUM_RESTARTS:
-                await self.process()
-                if self._ended:
-                    break
-                restarts += 1
-                self.logger.debug(
-                    "Deepgram connection died, restarting, num_restarts: %s", restarts
-                )
-        except asyncio.CancelledError:
-            return
+        # built from the endpointing config when it's used, it can be changed mid-call
+        self.endpointing_classifier: Optional[EndpointingClassifier] = None
+        self.energy_tracker: Optional[AudioEnergyTracker] = None
 
     def send_audio(self, chunk):
         if (
@@ -101,23 +78,35 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
             )
         super().send_audio(chunk)
 
-    async def terminate(self):
-        terminate_msg = json.dumps({"type": "CloseStream"})
-        self.input_queue.put_nowait(terminate_msg)
-        self._ended = True
-        self._task.cancel()
-        super().terminate()
+    async def send_chunk(self, ws: WebSocketClientProtocol, chunk: bytes):
+        await super().send_chunk(ws, chunk)
+        energy_tracker = self.get_energy_tracker()
+        if energy_tracker is not None:
+            energy_tracker.add(chunk, self.audio_cursor)
 
-    async def ready(self):
-        """Waits for 2 seconds for websocket to connect"""
-        try:
-            await asyncio.wait_for(self.is_ready.wait(), timeout=2.0)
-            return True
-        except asyncio.TimeoutError:
-            self.logger.debug("Deepgram websocket connection timed out")
-            return False 
+    def get_endpointing_classifier(self) -> Optional[EndpointingClassifier]:
+        endpointing_config = self.transcriber_config.endpointing_config
+        if not isinstance(endpointing_config, ClassifierEndpointingConfig):
+            return None
+        if (
+            self.endpointing_classifier is None
+            or self.endpointing_classifier.endpointing_config is not endpointing_config
+        ):
+            self.endpointing_classifier = EndpointingClassifier(endpointing_config)
+        return self.endpointing_classifier
+
+    def get_energy_tracker(self) -> Optional[AudioEnergyTracker]:
+        if not isinstance(
+            self.transcriber_config.endpointing_config, ClassifierEndpointingConfig
+        ):
+            return None
+        if self.energy_tracker is None:
+            self.energy_tracker = AudioEnergyTracker(
+                self.transcriber_config.audio_encoding
+            )
+        return self.energy_tracker
 
-    def get_deepgram_url(self):
+    def get_url(self):
         if self.transcriber_config.audio_encoding == AudioEncoding.LINEAR16:
             encoding = "linear16"
         elif self.transcriber_config.audio_encoding == AudioEncoding.MULAW:
@@ -139,14 +128,13 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
             extra_params["filler_words"] = self.transcriber_config.filler_words
         if self.transcriber_config.deepgram_endpointing:
             extra_params["endpointing"] = self.transcriber_config.deepgram_endpointing
-        if (
-            self.transcriber_config.endpointing_config
-            and self.transcriber_config.endpointing_config.type
-            == EndpointingType.PUNCTUATION_BASED
+        if self.transcriber_config.endpointing_config and (
+            self.transcriber_config.endpointing_config.type
+            in (EndpointingType.PUNCTUATION_BASED, EndpointingType.CLASSIFIER_BASED)
         ):
             extra_params["punctuate"] = "true"
         url_params.update(extra_params)
-        final_url = f"wss://api.deepgram.com/v1/listen?{urlencode(url_params)}"
+        final_url = f"{DEEPGRAM_LISTEN_URL}?{urlencode(url_params)}"
 
         if self.transcriber_config.keywords:
             encoded_keywords = "&".join(
@@ -156,6 +144,9 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
 
         return final_url
 
+    def get_extra_headers(self):
+        return {"Authorization": f"Token {self.api_key}"}
+
     def is_speech_final(
         self, current_buffer: str, deepgram_response: dict, time_silent: float
     ):
@@ -197,8 +188,35 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
                     > self.transcriber_config.endpointing_config.time_cutoff_seconds
                 )
             )
+        elif isinstance(
+            self.transcriber_config.endpointing_config, ClassifierEndpointingConfig
+        ):
+            return self.is_classified_end_of_turn(
+                current_buffer, deepgram_response, time_silent
+            )
         raise Exception("Endpointing config not supported")
 
+    def is_classified_end_of_turn(
+        self, current_buffer: str, deepgram_response: dict, time_silent: float
+    ) -> bool:
+        endpointing_classifier = self.get_endpointing_classifier()
+        assert endpointing_classifier is not None
+        energy_tracker = self.get_energy_tracker()
+        top_choice = deepgram_response["channel"]["alternatives"][0]
+        if top_choice["words"] and energy_tracker is not None:
+            last_word = top_choice["words"][-1]
+            self.last_word_energy_ratio = energy_tracker.get_energy_ratio(
+                last_word["start"], last_word["end"]
+            )
+        # interim transcripts aren't added to the buffer, so the turn can only end on a final one
+        if not deepgram_response["is_final"]:
+            return False
+        transcript = f"{current_buffer} {top_choice['transcript']}"
+        features = EndpointingFeatures.from_transcript(
+            transcript, time_silent, self.last_word_energy_ratio
+        )
+        return endpointing_classifier.is_end_of_turn(transcript, features)
+
     def calculate_time_silent(self, data: dict):
         end = data["start"] + data["duration"]
         words = data["channel"]["alternatives"][0]["words"]
@@ -215,195 +233,96 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
             time_silent = time_silent + self.calculate_time_silent(data)
             return time_silent
 
-    async def sender(self, ws: WebSocketClientProtocol):  # sends audio to websocket
-        while not self._ended:
-            try:
-                if not self.received_first_audio:
-                    self.logger.debug("Deepgram sender: waiting for audio")
-                data = await asyncio.wait_for(self.input_queue.get(), 5)
-                if not self.received_first_audio:
-                    self.logger.debug("Deepgram sender: sent first audio")
-                self.received_first_audio = True
-                if self.transcriber_config.voice_activity_detector_config:
-                    # when using WebRTC VAD, there are too many false positive that break the conversation flow
-                    self.logger.debug(f"Using voice activity detector.")
-                    try:
-                        # TODO: make this async
-                        start_time = time.time()
-                        if self.voice_activity_detector.should_interrupt(data):
-                            self.logger.debug(
-                                f"VAD detected - took {time.time() - start_time:.3f} seconds"
-                            )
-                            self.output_queue.put_nowait(
-                                Transcription(
-                                    message=HUMAN_ACTIVITY_DETECTED,
-                                    confidence=1,
-                                    is_final=False,
-                                )
-                            )
+    def reset_transcript_state(self):
+        self.buffer = ""
+        self.buffer_avg_confidence = 0
+        self.num_buffer_utterances = 1
+        self.time_silent = 0
+        self.total_duration = 0.0
+        self.sent_vad_transcription = False
+        self.last_word_energy_ratio: Optional[float] = None
 
-                    except Exception as e:
-                        self.logger.debug(
-                            f"Error in voice activity detector: {repr(e)}"
-                        )
-            except asyncio.exceptions.TimeoutError:
-                if not self.received_first_audio:
-                    self.logger.debug("Deepgram sender: sending KeepAlive")
-                    await ws.send(json.dumps({"type": "KeepAlive"}))
-                    continue
-                if self._ended:
-                    self.logger.debug("Deepgram sender: sending CloseStream")
-                    terminate_msg = json.dumps({"type": "CloseStream"})
-                    await ws.send(terminate_msg)
-                    continue
-                break
-            num_channels = 1
-            # mulaw sample width is 1, linear16 is 2
-            sample_width = 1
-            self.audio_cursor += len(data) / (
-                self.transcriber_config.sampling_rate * num_channels * sample_width
+    def handle_message(self, message: WebsocketMessage) -> bool:
+        data = serialization.loads(message)
+        if not self.received_first_audio:
+            self.logger.debug(f"Deepgram receiver: got message {data}")
+        if not "is_final" in data:  # means we've finished receiving transcriptions
+            self.logger.debug(
+                f"Deepgram: received final transcription - _ended:{self._ended}"
             )
-            await ws.send(data)
-        self.logger.debug("Terminating Deepgram transcriber sender")
-        return
+            return False
+        cur_min_latency = self.record_latency(
+            data["start"], data["start"] + data["duration"]
+        )
 
-    async def receiver(self, ws: WebSocketClientProtocol):
-        buffer = ""
-        buffer_avg_confidence = 0
-        num_buffer_utterances = 1
-        time_silent = 0
-        transcript_cursor = 0.0
-        total_duration = 0.0
-        sent_vad_transcription = False
-        while not self._ended:
-            try:
-                msg = await ws.recv()
-            except websockets.exceptions.ConnectionClosed:
-                self.logger.debug("Deepgram websocket connection closed")
-                break
-            except asyncio.TimeoutError:
-                if self._ended:
-                    self.logger.debug("Deepgram receiver timeout error")
-                    break
-            except Exception as e:
-                self.logger.debug(f"Got error {e} in Deepgram receiver")
-                break
-            data = json.loads(msg)
-            if not self.received_first_audio:
-                self.logger.debug(f"Deepgram receiver: got message {data}")
-            if not "is_final" in data:  # means we've finished receiving transcriptions
-                self.logger.debug(
-                    f"Deepgram: received final transcription - _ended:{self._ended}"
-                )
-                self._ended = True
-                break
-            cur_max_latency = self.audio_cursor - transcript_cursor
-            transcript_cursor = data["start"] + data["duration"]
-            cur_min_latency = self.audio_cursor - transcript_cursor
+        is_final = data["is_final"]
+        self.time_silent = self.update_time_silent(data, self.time_silent)
+        speech_final = self.is_speech_final(self.buffer, data, self.time_silent)
+        top_choice = data["channel"]["alternatives"][0]
+        confidence = top_choice["confidence"]
 
-            avg_latency_hist.record(
-                (cur_min_latency + cur_max_latency) / 2 * data["duration"]
-            )
-            duration_hist.record(data["duration"])
-
-            # Log max and min latencies
-            max_latency_hist.record(cur_max_latency)
-            min_latency_hist.record(max(cur_min_latency, 0))
-
-            is_final = data["is_final"]
-            time_silent = self.update_time_silent(data, time_silent)
-            speech_final = self.is_speech_final(buffer, data, time_silent)
-            top_choice = data["channel"]["alternatives"][0]
-            confidence = top_choice["confidence"]
+        if is_final:
+            self.total_duration += data["duration"]
+            transcript_duration = self.total_duration
+        else:
+            transcript_duration = self.total_duration + data["duration"]
 
-            if is_final:
-                total_duration += data["duration"]
-                transcript_duration = total_duration
+        if top_choice["transcript"] and confidence > 0.0 and is_final:
+            self.buffer = f"{self.buffer} {top_choice['transcript']}"
+            if self.buffer_avg_confidence == 0:
+                self.buffer_avg_confidence = confidence
             else:
-                transcript_duration = total_duration + data["duration"]
-            
-            if top_choice["transcript"] and confidence > 0.0 and is_final:
-                buffer = f"{buffer} {top_choice['transcript']}"
-                if buffer_avg_confidence == 0:
-                    buffer_avg_confidence = confidence
-                else:
-                    buffer_avg_confidence = (
-                        buffer_avg_confidence + confidence / (num_buffer_utterances)
-                    ) * (num_buffer_utterances / (num_buffer_utterances + 1))
-                num_buffer_utterances += 1
+                self.buffer_avg_confidence = (
+                    self.buffer_avg_confidence
+                    + confidence / (self.num_buffer_utterances)
+                ) * (self.num_buffer_utterances / (self.num_buffer_utterances + 1))
+            self.num_buffer_utterances += 1
 
-            if speech_final:
-                self.output_queue.put_nowait(
-                    Transcription(
-                        message=buffer,
-                        confidence=buffer_avg_confidence,
-                        is_final=True,
-                        latency=cur_min_latency,
-                        time_silent=time_silent,
-                        duration=transcript_duration,
-                    )
+        if speech_final:
+            self.output_queue.put_nowait(
+                Transcription(
+                    message=self.buffer,
+                    confidence=self.buffer_avg_confidence,
+                    is_final=True,
+                    latency=cur_min_latency,
+                    time_silent=self.time_silent,
+                    duration=transcript_duration,
                 )
-                # reset quantities
-                buffer = ""
-                total_duration = 0.0
-                buffer_avg_confidence = 0
-                num_buffer_utterances = 1
-                time_silent = 0
-                sent_vad_transcription = False
-            elif (
-                data["duration"]
-                > self.transcriber_config.minimum_speaking_duration_to_interrupt
-                and len(top_choice["words"])
-                > self.transcriber_config.interruption_word_threshold
-                and not sent_vad_transcription
-            ):
-                # time_silent = self.calculate_time_silent(data)
-                self.logger.debug("Sending VAD transcription")
-                self.output_queue.put_nowait(
-                    Transcription(
-                        message=HUMAN_ACTIVITY_DETECTED,
-                        confidence=1,
-                        is_final=False,
-                        latency=cur_min_latency,
-                        time_silent=time_silent,
-                        duration=transcript_duration,
-                    )
+            )
+            self.mark_final(data["start"] + data["duration"])
+            self.reset_transcript_state()
+        elif (
+            data["duration"]
+            > self.transcriber_config.minimum_speaking_duration_to_interrupt
+            and len(top_choice["words"])
+            > self.transcriber_config.interruption_word_threshold
+            and not self.sent_vad_transcription
+        ):
+            self.logger.debug("Sending VAD transcription")
+            self.output_queue.put_nowait(
+                Transcription(
+                    message=HUMAN_ACTIVITY_DETECTED,
+                    confidence=1,
+                    is_final=False,
+                    latency=cur_min_latency,
+                    time_silent=self.time_silent,
+                    duration=transcript_duration,
                 )
-                sent_vad_transcription = True
+            )
+            self.sent_vad_transcription = True
 
-            elif top_choice["transcript"] and confidence > 0.0:
-                # time_silent = self.calculate_time_silent(data)
-                self.output_queue.put_nowait(
-                    Transcription(
-                        message=buffer,
-                        confidence=confidence,
-                        is_final=False,
-                        latency=cur_min_latency,
-                        time_silent=time_silent,
-                        duration=transcript_duration,
-                    )
+        elif top_choice["transcript"] and confidence > 0.0:
+            self.output_queue.put_nowait(
+                Transcription(
+                    message=self.buffer,
+                    confidence=confidence,
+                    is_final=False,
+                    latency=cur_min_latency,
+                    time_silent=self.time_silent,
+                    duration=transcript_duration,
                 )
+            )
 
-            else:
-                time_silent += data["duration"]
-        self.logger.debug("Terminating Deepgram transcriber receiver")
-        return
-
-    async def process(self):
-        try:
-            self.audio_cursor = 0.0
-            extra_headers = {"Authorization": f"Token {self.api_key}"}
-            self.logger.debug(f"Connecting to Deepgram...")
-            start_time = time.time()
-            deepgram_url = self.get_deepgram_url()
-            async with websockets.connect(
-                deepgram_url, extra_headers=extra_headers
-            ) as ws:
-                self.logger.debug(
-                    f"Connected to Deepgram! Connection took {time.time()-start_time:.2f} sec."
-                )
-                self.is_ready.set()
-                self._task = asyncio.gather(self.sender(ws), self.receiver(ws))
-                await self._task
-        except asyncio.CancelledError:
-            return
+        else:
+            self.time_silent += data["duration"]
+        return True
@@ -0,0 +1,186 @@
+import audioop
+import math
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.model import BaseModel
+from vocode.streaming.models.transcriber import ClassifierEndpointingConfig
+
+TERMINAL_PUNCTUATION = (".", "!", "?")
+# a turn rarely ends on these, the speaker is usually mid-thought
+CONTINUATION_WORDS = {
+    "a",
+    "an",
+    "and",
+    "because",
+    "but",
+    "for",
+    "if",
+    "like",
+    "my",
+    "of",
+    "or",
+    "so",
+    "that",
+    "the",
+    "to",
+    "uh",
+    "um",
+    "with",
+    "your",
+}
+QUESTION_STARTERS = {
+    "are",
+    "can",
+    "could",
+    "do",
+    "does",
+    "how",
+    "is",
+    "what",
+    "when",
+    "where",
+    "which",
+    "who",
+    "why",
+    "will",
+    "would",
+}
+# answers that are a whole turn on their own
+SHORT_ANSWERS = {
+    "bye",
+    "correct",
+    "goodbye",
+    "no",
+    "nope",
+    "okay",
+    "right",
+    "sure",
+    "thanks",
+    "yeah",
+    "yes",
+    "yep",
+}
+# the weights of a logistic regression over EndpointingFeatures, hand-tuned so
+# that (at the default threshold) a punctuated sentence ends after ~0.2s of
+# silence, an unpunctuated one after ~0.5s (a little over the default time
+# cutoff) and one ending in "and" or "um" after 1s
+DEFAULT_WEIGHTS = {
+    "bias": -3.0,
+    "silence_seconds": 6.0,
+    "terminal_punctuation": 2.0,
+    "question": 0.3,
+    "trailing_continuation": -3.0,
+    "short_answer": 1.5,
+    "energy_drop": 1.0,
+}
+# chunks quieter than this (linear16 RMS) aren't counted as speech
+SPEECH_RMS_FLOOR = 300
+MAX_ENERGY_HISTORY_SECONDS = 10.0
+
+
+def normalize_word(word: str) -> str:
+    return word.strip().strip(",.!?;:\"'").lower()
+
+
+class EndpointingFeatures(BaseModel):
+    silence_seconds: float
+    terminal_punctuation: float = 0
+    question: float = 0
+    trailing_continuation: float = 0
+    short_answer: float = 0
+    # how much quieter the last word was than the speaker's speech, 0 to 1
+    energy_drop: float = 0
+
+    @classmethod
+    def from_transcript(
+        cls,
+        transcript: str,
+        silence_seconds: float,
+        final_word_energy_ratio: Optional[float] = None,
+    ) -> "EndpointingFeatures":
+        text = transcript.strip()
+        words = [normalize_word(word) for word in text.split()]
+        words = [word for word in words if word]
+        if not words:
+            return cls(silence_seconds=silence_seconds)
+        trailing_continuation = words[-1] in CONTINUATION_WORDS or text.endswith(",")
+        energy_drop = 0.0
+        if final_word_energy_ratio is not None:
+            energy_drop = min(max(1 - final_word_energy_ratio, 0.0), 1.0)
+        return cls(
+            silence_seconds=silence_seconds,
+            terminal_punctuation=float(text.endswith(TERMINAL_PUNCTUATION)),
+            question=float(text.endswith("?") or words[0] in QUESTION_STARTERS),
+            trailing_continuation=float(trailing_continuation),
+            short_answer=float(
+                len(words) <= 2 and all(word in SHORT_ANSWERS for word in words)
+            ),
+            energy_drop=energy_drop,
+        )
+
+
+class EndpointingClassifier:
+    """Decides whether the speaker has finished their turn, see ClassifierEndpointingConfig"""
+
+    def __init__(self, endpointing_config: ClassifierEndpointingConfig):
+        self.endpointing_config = endpointing_config
+        self.weights = {**DEFAULT_WEIGHTS, **(endpointing_config.weights or {})}
+
+    def get_probability(self, features: EndpointingFeatures) -> float:
+        logit = self.weights["bias"] + sum(
+            self.weights.get(name, 0) * value for name, value in features.dict().items()
+        )
+        return 1 / (1 + math.exp(-logit))
+
+    def is_end_of_turn(self, transcript: str, features: EndpointingFeatures) -> bool:
+        if not transcript.strip():
+            return False
+        if features.silence_seconds < self.endpointing_config.min_silence_seconds:
+            return False
+        if features.silence_seconds >= self.endpointing_config.max_silence_seconds:
+            return True
+        return self.get_probability(features) >= self.endpointing_config.threshold
+
+
+class AudioEnergyTracker:
+    """RMS energy of the audio sent to a transcriber, looked up by audio cursor.
+
+    Used for the prosody feature: the energy of the last word relative to the
+    running energy of the speaker's speech.
+    """
+
+    def __init__(self, audio_encoding: AudioEncoding):
+        self.audio_encoding = audio_encoding
+        # (audio cursor at the end of the chunk, RMS)
+        self.chunks: Deque[Tuple[float, int]] = deque()
+        self.speech_energy = 0.0
+
+    def add(self, chunk: bytes, end_cursor: float):
+        if self.chunks and end_cursor < self.chunks[-1][0]:
+            # a new connection, cursors start over
+            self.chunks.clear()
+        if self.audio_encoding == AudioEncoding.MULAW:
+            chunk = audioop.ulaw2lin(chunk, 2)
+        rms = audioop.rms(chunk, 2)
+        self.chunks.append((end_cursor, rms))
+        while self.chunks[0][0] < end_cursor - MAX_ENERGY_HISTORY_SECONDS:
+            self.chunks.popleft()
+        if rms > SPEECH_RMS_FLOOR:
+            self.speech_energy = (
+                rms if not self.speech_energy else 0.9 * self.speech_energy + 0.1 * rms
+            )
+
+    def get_energy_ratio(self, start_cursor: float, end_cursor: float) -> Optional[float]:
+        """Energy of the audio between the cursors relative to the speech energy"""
+        if not self.speech_energy:
+            return None
+        energies = [
+            rms
+            for chunk_end_cursor, rms in self.chunks
+            if start_cursor < chunk_end_cursor <= end_cursor
+        ]
+        if not energies:
+            return None
+        return sum(energies) / len(energies) / self.speech_energy
@@ -9,14 +9,11 @@ from vocode.streaming.models.transcriber import (
     RevAITranscriberConfig,
     TranscriberConfig,
     TranscriberType,
+    WhisperCPPTranscriberConfig,
 )
-from vocode.streaming.transcriber.assembly_ai_transcriber import AssemblyAITranscriber
-from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
-from vocode.streaming.transcriber.google_transcriber import GoogleTranscriber
-from vocode.streaming.transcriber.rev_ai_transcriber import RevAITranscriber
-from vocode.streaming.transcriber.azure_transcriber import AzureTranscriber
-
 
+# Provider modules are imported in their branch, so only the transcribers that
+# are used get imported along with their SDKs
 class TranscriberFactory:
     def create_transcriber(
         self,
@@ -24,14 +21,30 @@ class TranscriberFactory:
         logger: Optional[logging.Logger] = None,
     ):
         if isinstance(transcriber_config, DeepgramTranscriberConfig):
+            from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscriber
+
             return DeepgramTranscriber(transcriber_config, logger=logger)
         elif isinstance(transcriber_config, GoogleTranscriberConfig):
+            from vocode.streaming.transcriber.google_transcriber import GoogleTranscriber
+
             return GoogleTranscriber(transcriber_config, logger=logger)
         elif isinstance(transcriber_config, AssemblyAITranscriberConfig):
+            from vocode.streaming.transcriber.assembly_ai_transcriber import AssemblyAITranscriber
+
             return AssemblyAITranscriber(transcriber_config, logger=logger)
         elif isinstance(transcriber_config, RevAITranscriberConfig):
+            from vocode.streaming.transcriber.rev_ai_transcriber import RevAITranscriber
+
             return RevAITranscriber(transcriber_config, logger=logger)
         elif isinstance(transcriber_config, AzureTranscriberConfig):
+            from vocode.streaming.transcriber.azure_transcriber import AzureTranscriber
+
             return AzureTranscriber(transcriber_config, logger=logger)
+        elif isinstance(transcriber_config, WhisperCPPTranscriberConfig):
+            from vocode.streaming.transcriber.whisper_cpp_transcriber import (
+                WhisperCPPTranscriber,
+            )
+
+            return WhisperCPPTranscriber(transcriber_config, logger=logger)
         else:
             raise Exception("Invalid transcriber config")
@@ -1,122 +1,82 @@
-import asyncio
 import json
-import base64
 import logging
-from typing import Optional
-import websockets
-import audioop
-import numpy as np
-from urllib.parse import urlencode
+from typing import List, Optional
 from vocode import getenv
 
 from vocode.streaming.models.transcriber import GladiaTranscriberConfig
-from vocode.streaming.models.websocket import AudioMessage
-from vocode.streaming.transcriber.base_transcriber import (
-    BaseAsyncTranscriber,
-    Transcription,
+from vocode.streaming.transcriber.audio_transport import (
+    AudioFrameBuffer,
+    Base64JsonAudioTransport,
 )
-from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.transcriber.base_transcriber import Transcription
+from vocode.streaming.transcriber.streaming_websocket_transcriber import (
+    StreamingWebsocketTranscriber,
+    WebsocketMessage,
+)
+from vocode.streaming.utils import serialization
 
 
 GLADIA_URL = "wss://api.gladia.io/audio/text/audio-transcription"
 
 
-class GladiaTranscriber(BaseAsyncTranscriber[GladiaTranscriberConfig]):
+class GladiaTranscriber(StreamingWebsocketTranscriber[GladiaTranscriberConfig]):
+    provider_name = "gladia"
+
     def __init__(
         self,
         transcriber_config: GladiaTranscriberConfig,
         api_key: Optional[str] = None,
         logger: Optional[logging.Logger] = None,
     ):
-        super().__init__(transcriber_config)
+        super().__init__(transcriber_config, logger)
         self.api_key = api_key or getenv("GLADIA_API_KEY")
         if not self.api_key:
             raise Exception(
                 "Please set GLADIA_API_KEY environment variable or pass it as a parameter"
             )
-        self._ended = False
-        self.logger = logger or logging.getLogger(__name__)
         if self.transcriber_config.endpointing_config:
             raise Exception("Gladia endpointing config not supported yet")
 
-        self.buffer = bytearray()
-
-    async def ready(self):
-        return True
-
-    async def _run_loop(self):
-        await self.process()
-
-    def send_audio(self, chunk):
-        if self.transcriber_config.audio_encoding == AudioEncoding.MULAW:
-            sample_width = 1
-            if isinstance(chunk, np.ndarray):
-                chunk = chunk.astype(np.int16)
-                chunk = chunk.tobytes()
-            chunk = audioop.ulaw2lin(chunk, sample_width)
-
-        self.buffer.extend(chunk)
-
-        if (
-            len(self.buffer) / (2 * self.transcriber_config.sampling_rate)
-        ) >= self.transcriber_config.buffer_size_seconds:
-            self.input_queue.put_nowait(self.buffer)
-            self.buffer = bytearray()
-
-    def terminate(self):
-        self._ended = True
-        super().terminate()
-
-    async def process(self):
-        async with websockets.connect(GLADIA_URL) as ws:
-            await ws.send(
-                json.dumps(
-                    {
-                        "x_gladia_key": self.api_key,
-                        "sample_rate": self.transcriber_config.sampling_rate,
-                        "encoding": "wav",
-                    }
-                )
+        self.frame_buffer = AudioFrameBuffer.from_duration(
+            self.transcriber_config.buffer_size_seconds,
+            self.transcriber_config.sampling_rate,
+            self.transcriber_config.audio_encoding,
+        )
+        # this endpoint only takes audio as base64 "frames" in JSON messages
+        self.audio_transport = Base64JsonAudioTransport(
+            "frames", {"x_gladia_key": self.api_key}
+        )
+
+    def get_url(self):
+        return GLADIA_URL
+
+    def get_initial_messages(self) -> List[WebsocketMessage]:
+        return [
+            json.dumps(
+                {
+                    "x_gladia_key": self.api_key,
+                    "sample_rate": self.transcriber_config.sampling_rate,
+                    "encoding": "wav",
+                }
             )
-
-            async def sender(ws):
-                while not self._ended:
-                    try:
-                        data = await asyncio.wait_for(self.input_queue.get(), 5)
-                    except asyncio.exceptions.TimeoutError:
-                        break
-
-                    await ws.send(
-                        json.dumps(
-                            {
-                                "x_gladia_key": self.api_key,
-                                "frames": AudioMessage.from_bytes(data).data,
-                            }
-                        )
+        ]
+
+    def handle_message(self, message: WebsocketMessage) -> bool:
+        data = serialization.loads(message)
+        if "error" in data and data["error"]:
+            raise Exception(data["error"])
+
+        if data:
+            is_final = data["type"] == "final"
+            if is_final and "time_end" in data:
+                self.mark_final(data["time_end"])
+
+            if "transcription" in data and data["transcription"]:
+                self.output_queue.put_nowait(
+                    Transcription(
+                        message=data["transcription"],
+                        confidence=data["confidence"],
+                        is_final=is_final,
                     )
-                self.logger.debug("Terminating Gladia transcriber sender")
-
-            async def receiver(ws):
-                while not self._ended:
-                    try:
-                        result_str = await ws.recv()
-                        data = json.loads(result_str)
-                        if "error" in data and data["error"]:
-                            raise Exception(data["error"])
-                    except websockets.exceptions.ConnectionClosedError as e:
-                        self.logger.debug(e)
-                        break
-
-                    if data:
-                        is_final = data["type"] == "final"
-
-                        if "transcription" in data and data["transcription"]:
-                            self.output_queue.put_nowait(
-                                Transcription(
-                                    message=data["transcription"],
-                                    confidence=data["confidence"],
-                                    is_final=is_final,
-                                )
-                            )
-
-            await asyncio.gather(sender(ws), receiver(ws))
+                )
+        return True
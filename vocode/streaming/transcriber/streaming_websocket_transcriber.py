@@ -0,0 +1,359 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+import websockets
+from websockets.client import WebSocketClientProtocol
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.transcriber.audio_transport import (
+    AudioFrameBuffer,
+    AudioTransport,
+    BinaryAudioTransport,
+)
+from vocode.streaming.transcriber.base_transcriber import (
+    HUMAN_ACTIVITY_DETECTED,
+    BaseAsyncTranscriber,
+    TranscriberConfigType,
+    Transcription,
+    meter,
+)
+from vocode.streaming.utils.websocket_pool import WebsocketConnectionPool
+
+NUM_RESTARTS = 5
+# how long the sender waits for audio before sending `keepalive_message`
+KEEPALIVE_INTERVAL_SECONDS = 5
+
+WebsocketMessage = Union[str, bytes]
+
+
+class TranscriberMetrics:
+    """Latency and connection metrics of a provider, shared by its transcribers"""
+
+    def __init__(self, provider_name: str):
+        self.avg_latency_hist = meter.create_histogram(
+            name=f"transcriber.{provider_name}.avg_latency",
+            unit="seconds",
+        )
+        self.max_latency_hist = meter.create_histogram(
+            name=f"transcriber.{provider_name}.max_latency",
+            unit="seconds",
+        )
+        self.min_latency_hist = meter.create_histogram(
+            name=f"transcriber.{provider_name}.min_latency",
+            unit="seconds",
+        )
+        self.duration_hist = meter.create_histogram(
+            name=f"transcriber.{provider_name}.duration",
+            unit="seconds",
+        )
+        self.connect_time_hist = meter.create_histogram(
+            name=f"transcriber.{provider_name}.connect_time",
+            unit="seconds",
+        )
+        self.reconnect_counter = meter.create_counter(
+            name=f"transcriber.{provider_name}.reconnects",
+        )
+
+
+transcriber_metrics: Dict[str, TranscriberMetrics] = {}
+
+
+def get_transcriber_metrics(provider_name: str) -> TranscriberMetrics:
+    if provider_name not in transcriber_metrics:
+        transcriber_metrics[provider_name] = TranscriberMetrics(provider_name)
+    return transcriber_metrics[provider_name]
+
+
+class StreamingWebsocketTranscriber(BaseAsyncTranscriber[TranscriberConfigType]):
+    """Base for transcribers that stream audio to a provider over a websocket.
+
+    Owns the connection: claiming pre-warmed connections from `connection_pool`,
+    sending `keepalive_message` while no audio is coming in, reconnecting up to
+    NUM_RESTARTS times when the connection drops and replaying the audio that
+    hadn't been finally transcribed, and the audio cursors and metrics used to
+    measure latency. Providers implement `get_url` and `handle_message`, and
+    override the other hooks (headers, initial messages, transport) as needed.
+    """
+
+    # names the provider in metrics and logs
+    provider_name: str = "base"
+    # pre-warmed connections are only used if the provider has a pool
+    connection_pool: Optional[WebsocketConnectionPool] = None
+    keepalive_message: Optional[str] = None
+    # sent when the transcriber is terminated, before closing the connection
+    close_message: Optional[str] = None
+    ping_interval_seconds: float = 20
+    ready_timeout_seconds: float = 2
+
+    def __init__(
+        self,
+        transcriber_config: TranscriberConfigType,
+        logger: Optional[logging.Logger] = None,
+    ):
+        super().__init__(transcriber_config, logger)
+        self.metrics = get_transcriber_metrics(self.provider_name)
+        self.audio_transport: AudioTransport = BinaryAudioTransport()
+        # set by providers that take linear16 frames rather than chunks as they come in
+        self.frame_buffer: Optional[AudioFrameBuffer] = None
+        self._ended = False
+        self.is_ready = asyncio.Event()
+        self.received_first_audio = False
+        # seconds of audio sent and transcribed on the current connection
+        self.audio_cursor = 0.0
+        self.transcript_cursor = 0.0
+        # (audio cursor at the end of the chunk, chunk) for the current connection
+        self.replay_buffer: Deque[Tuple[float, bytes]] = deque()
+        self.last_final_cursor = 0.0
+        self.reset_transcript_state()
+
+    @classmethod
+    async def warm_up(cls, transcriber_config: TranscriberConfigType, **kwargs):
+        """Pre-connects `prewarmed_connections` sockets for calls with this config"""
+        if cls.connection_pool is None:
+            return
+        transcriber = cls(transcriber_config, **kwargs)
+        await cls.connection_pool.warm_up(
+            transcriber.get_url(),
+            transcriber.get_extra_headers(),
+            transcriber_config.prewarmed_connections,
+        )
+
+    def get_url(self) -> str:
+        raise NotImplementedError
+
+    def get_extra_headers(self) -> Dict[str, str]:
+        return {}
+
+    def get_initial_messages(self) -> List[WebsocketMessage]:
+        """Sent on every new connection before any audio"""
+        return []
+
+    def reset_transcript_state(self):
+        """Called on every new connection, before messages are handled"""
+        pass
+
+    def handle_message(self, message: WebsocketMessage) -> bool:
+        """Decodes a message from the provider and puts any transcriptions on
+        the output queue. Returns False once the provider has ended the stream."""
+        raise NotImplementedError
+
+    @property
+    def sample_width(self) -> int:
+        """Bytes per sample of the audio sent"""
+        if (
+            self.frame_buffer is not None
+            or self.transcriber_config.audio_encoding == AudioEncoding.LINEAR16
+        ):
+            return 2
+        return 1
+
+    def record_latency(self, transcript_start: float, transcript_end: float) -> float:
+        """Records the metrics of a transcript of the audio between two cursors.
+
+        Returns the latency of its end, i.e. how much audio had been sent since.
+        """
+        cur_max_latency = self.audio_cursor - self.transcript_cursor
+        self.transcript_cursor = transcript_end
+        cur_min_latency = self.audio_cursor - transcript_end
+        duration = transcript_end - transcript_start
+        self.metrics.avg_latency_hist.record(
+            (cur_min_latency + cur_max_latency) / 2 * duration
+        )
+        self.metrics.duration_hist.record(duration)
+        self.metrics.max_latency_hist.record(cur_max_latency)
+        self.metrics.min_latency_hist.record(max(cur_min_latency, 0))
+        return cur_min_latency
+
+    def mark_final(self, cursor: float):
+        """Audio up to `cursor` has been finally transcribed and isn't replayed"""
+        self.last_final_cursor = cursor
+
+    def send_audio(self, chunk):
+        if self.is_muted:
+            chunk = self.create_silent_chunk(len(chunk))
+        if self.frame_buffer is None:
+            self.consume_nonblocking(chunk)
+            return
+        for frame in self.frame_buffer.write(chunk):
+            self.consume_nonblocking(frame)
+
+    async def ready(self):
+        try:
+            await asyncio.wait_for(self.is_ready.wait(), self.ready_timeout_seconds)
+            return True
+        except asyncio.TimeoutError:
+            self.logger.debug(f"{self.provider_name} websocket connection timed out")
+            return False
+
+    async def terminate(self):
+        self._ended = True
+        super().terminate()
+        if self.worker_task is not None:
+            # lets the connection send `close_message` and close
+            await asyncio.gather(self.worker_task, return_exceptions=True)
+
+    async def _run_loop(self):
+        restarts = 0
+        while not self._ended and restarts < NUM_RESTARTS:
+            try:
+                await self.process()
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                self.logger.error(
+                    f"{self.provider_name} transcriber connection failed: {repr(e)}"
+                )
+            if self._ended:
+                break
+            restarts += 1
+            self.metrics.reconnect_counter.add(1)
+            self.logger.debug(
+                f"{self.provider_name} connection died, restarting, num_restarts: {restarts}"
+            )
+
+    async def connect(self) -> WebSocketClientProtocol:
+        url = self.get_url()
+        extra_headers = self.get_extra_headers()
+        prewarmed_connections = self.transcriber_config.prewarmed_connections
+        if self.connection_pool is not None and prewarmed_connections > 0:
+            return await self.connection_pool.claim(
+                url, extra_headers, prewarmed_connections
+            )
+        return await websockets.connect(
+            url,
+            extra_headers=extra_headers,
+            ping_interval=self.ping_interval_seconds,
+        )
+
+    async def process(self):
+        replay_chunks = self.pop_replay_chunks()
+        self.audio_cursor = 0.0
+        self.transcript_cursor = 0.0
+        self.reset_transcript_state()
+        start_time = time.time()
+        ws = await self.connect()
+        connect_time = time.time() - start_time
+        self.metrics.connect_time_hist.record(connect_time)
+        self.logger.debug(
+            f"Connected to {self.provider_name}! Connection took {connect_time:.2f} sec."
+        )
+        try:
+            for message in self.get_initial_messages():
+                await ws.send(message)
+            self.is_ready.set()
+            sender = asyncio.create_task(self.sender(ws, replay_chunks))
+            receiver = asyncio.create_task(self.receiver(ws))
+            # otherwise the sender only notices a closed connection on its next send
+            receiver.add_done_callback(lambda _: sender.cancel())
+            for result in await asyncio.gather(
+                sender, receiver, return_exceptions=True
+            ):
+                if isinstance(result, Exception) and not isinstance(
+                    result, websockets.exceptions.ConnectionClosed
+                ):
+                    self.logger.error(
+                        f"{self.provider_name} transcriber error: {repr(result)}"
+                    )
+        finally:
+            await self.close_connection(ws)
+
+    async def close_connection(self, ws: WebSocketClientProtocol):
+        try:
+            if self._ended and self.close_message is not None:
+                await ws.send(self.close_message)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            await ws.close()
+
+    def pop_replay_chunks(self) -> List[bytes]:
+        """Audio sent on the last connection that hasn't been finally transcribed"""
+        replay_chunks = [
+            chunk
+            for chunk_end_cursor, chunk in self.replay_buffer
+            if chunk_end_cursor > self.last_final_cursor
+        ]
+        self.replay_buffer.clear()
+        self.last_final_cursor = 0.0
+        return replay_chunks
+
+    def release_chunk(self, chunk: bytes):
+        if self.frame_buffer is not None and isinstance(chunk, bytearray):
+            self.frame_buffer.release(chunk)
+
+    async def send_chunk(self, ws: WebSocketClientProtocol, chunk: bytes):
+        self.audio_cursor += len(chunk) / (
+            self.transcriber_config.sampling_rate * self.sample_width
+        )
+        replay_buffer_seconds = self.transcriber_config.replay_buffer_seconds
+        if replay_buffer_seconds <= 0:
+            await self.audio_transport.send(ws, chunk)
+            self.release_chunk(chunk)
+            return
+        # buffered before sending so a chunk that fails to send is replayed too
+        self.replay_buffer.append((self.audio_cursor, chunk))
+        while self.replay_buffer[0][0] < self.audio_cursor - replay_buffer_seconds:
+            _, expired_chunk = self.replay_buffer.popleft()
+            self.release_chunk(expired_chunk)
+        await self.audio_transport.send(ws, chunk)
+
+    def detect_voice_activity(self, chunk: bytes):
+        if self.voice_activity_detector is None:
+            return
+        # when using WebRTC VAD, there are too many false positive that break the conversation flow
+        try:
+            start_time = time.time()
+            if self.voice_activity_detector.should_interrupt(chunk):
+                self.logger.debug(
+                    f"VAD detected - took {time.time() - start_time:.3f} seconds"
+                )
+                self.output_queue.put_nowait(
+                    Transcription(
+                        message=HUMAN_ACTIVITY_DETECTED,
+                        confidence=1,
+                        is_final=False,
+                    )
+                )
+        except Exception as e:
+            self.logger.debug(f"Error in voice activity detector: {repr(e)}")
+
+    async def sender(
+        self, ws: WebSocketClientProtocol, replay_chunks: Optional[List[bytes]] = None
+    ):
+        if replay_chunks:
+            self.logger.debug(
+                f"{self.provider_name} sender: replaying {len(replay_chunks)} chunks after reconnecting"
+            )
+            for chunk in replay_chunks:
+                await self.send_chunk(ws, chunk)
+        while not self._ended:
+            try:
+                chunk = await asyncio.wait_for(
+                    self.input_queue.get(), KEEPALIVE_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if self.keepalive_message is not None:
+                    await ws.send(self.keepalive_message)
+                continue
+            if not self.received_first_audio:
+                self.logger.debug(f"{self.provider_name} sender: sent first audio")
+                self.received_first_audio = True
+            self.detect_voice_activity(chunk)
+            await self.send_chunk(ws, chunk)
+        self.logger.debug(f"Terminating {self.provider_name} transcriber sender")
+
+    async def receiver(self, ws: WebSocketClientProtocol):
+        while not self._ended:
+            try:
+                message = await ws.recv()
+            except websockets.exceptions.ConnectionClosed:
+                self.logger.debug(f"{self.provider_name} websocket connection closed")
+                break
+            if not self.handle_message(message):
+                self.logger.debug(f"{self.provider_name} ended the stream")
+                self._ended = True
+                break
+        self.logger.debug(f"Terminating {self.provider_name} transcriber receiver")
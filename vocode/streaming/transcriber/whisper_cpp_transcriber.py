@@ -1,92 +1,366 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-import ctypes
-import io
-import pathlib
-import wave
-from pydub import AudioSegment
+import audioop
+import logging
+import re
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
 
 import numpy as np
-from vocode.streaming.agent.utils import SENTENCE_ENDINGS
+from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.models.transcriber import WhisperCPPTranscriberConfig
 from vocode.streaming.transcriber.base_transcriber import (
     BaseAsyncTranscriber,
-    BaseThreadAsyncTranscriber,
     Transcription,
 )
-from vocode.utils.whisper_cpp.helpers import transcribe
-from vocode.utils.whisper_cpp.whisper_params import WhisperFullParams
+from vocode.utils.whisper_cpp.context_pool import (
+    WHISPER_CPP_SAMPLING_RATE,
+    WhisperCPPContextPool,
+    get_context_pool,
+)
+
+# audio kept from before speech was detected, so the onset isn't clipped
+PRE_ROLL_SECONDS = 0.3
+# VAD runs on 30ms frames of 16-bit audio, which every detector accepts
+VAD_FRAME_BYTES = WHISPER_CPP_SAMPLING_RATE * 30 // 1000 * 2
+# how far back a slid window's decode is searched for already committed words
+MAX_OVERLAP_WORDS = 20
+# characters of earlier utterances passed to whisper as the prompt
+MAX_PROMPT_CHARS = 200
+
+
+class AudioRingBuffer:
+    """A fixed size float32 buffer indexed by absolute sample position"""
+
+    def __init__(self, capacity: int):
+        self.buffer = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        # total samples ever appended
+        self.end = 0
+
+    @property
+    def start(self) -> int:
+        return max(self.end - self.capacity, 0)
+
+    def append(self, samples: np.ndarray):
+        if len(samples) > self.capacity:
+            self.end += len(samples) - self.capacity
+            samples = samples[-self.capacity :]
+        index = self.end % self.capacity
+        first = min(len(samples), self.capacity - index)
+        self.buffer[index : index + first] = samples[:first]
+        self.buffer[: len(samples) - first] = samples[first:]
+        self.end += len(samples)
+
+    def get(self, start: int) -> np.ndarray:
+        """A copy of the samples from absolute position `start` to the end"""
+        start = max(start, self.start)
+        begin, end = start % self.capacity, self.end % self.capacity
+        if self.end - start == 0:
+            return np.empty(0, dtype=np.float32)
+        if begin < end:
+            return self.buffer[begin:end].copy()
+        return np.concatenate((self.buffer[begin:], self.buffer[:end]))
+
+
+def normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class TranscriptStabilizer:
+    """Commits the words that consecutive decodes of a growing window agree on.
+
+    Every decode transcribes the window from its start, so its last words
+    change as more audio arrives. A word is committed once
+    `agreements_to_commit` decodes in a row have it in the same place.
+    Committed words never change; later decodes only add what follows them.
+    When the window slides forward, the words of the next decodes that repeat
+    the end of the committed text (the overlap) are dropped.
+    """
+
+    def __init__(self, agreements_to_commit: int = 2):
+        self.agreements_to_commit = agreements_to_commit
+        self.committed: List[str] = []
+        # committed words that decodes of the current window start with, None
+        # until the first decode after a slide finds the overlap
+        self.committed_in_window: Optional[int] = 0
+        # committed words from audio the window slid past
+        self.num_committed_before_window = 0
+        # the uncommitted words of the latest decodes
+        self.hypotheses: Deque[List[str]] = deque(maxlen=agreements_to_commit)
+
+    def get_overlap(self, words: List[str]) -> int:
+        max_size = min(len(words), len(self.committed), MAX_OVERLAP_WORDS)
+        for size in range(max_size, 0, -1):
+            if [normalize_word(word) for word in words[:size]] == [
+                normalize_word(word) for word in self.committed[-size:]
+            ]:
+                return size
+        return 0
+
+    def get_uncommitted(self, text: str) -> List[str]:
+        words = text.split()
+        if self.committed_in_window is None:
+            self.committed_in_window = self.get_overlap(words)
+            self.num_committed_before_window = (
+                len(self.committed) - self.committed_in_window
+            )
+        return words[self.committed_in_window :]
+
+    def commit(self, words: List[str]):
+        self.committed.extend(words)
+        if self.committed_in_window is not None:
+            self.committed_in_window += len(words)
+        self.hypotheses = deque(
+            (hypothesis[len(words) :] for hypothesis in self.hypotheses),
+            maxlen=self.agreements_to_commit,
+        )
+
+    def update(self, text: str) -> Tuple[str, str]:
+        """Takes a decode of the window, returns the (committed, tentative) text"""
+        uncommitted = self.get_uncommitted(text)
+        self.hypotheses.append(uncommitted)
+        if len(self.hypotheses) == self.agreements_to_commit:
+            num_agreed = 0
+            for words in zip(*self.hypotheses):
+                if len({normalize_word(word) for word in words}) > 1:
+                    break
+                num_agreed += 1
+            self.commit(uncommitted[:num_agreed])
+            uncommitted = uncommitted[num_agreed:]
+        return " ".join(self.committed), " ".join(uncommitted)
+
+    def get_committed_before_window(self) -> List[str]:
+        """Until the first decode after a slide finds the overlap, these are
+        the words before the previous window"""
+        return self.committed[: self.num_committed_before_window]
+
+    def slide(self):
+        """Commits the latest decode, the next decodes are of a window starting later"""
+        if self.hypotheses:
+            self.commit(self.hypotheses[-1])
+        self.hypotheses.clear()
+        self.committed_in_window = None
+
+    def finalize(self, text: str) -> str:
+        self.commit(self.get_uncommitted(text))
+        return " ".join(self.committed)
 
-WHISPER_CPP_SAMPLING_RATE = 16000
 
+class WhisperCPPTranscriber(BaseAsyncTranscriber[WhisperCPPTranscriberConfig]):
+    """Streams transcriptions from a local whisper.cpp model.
+
+    Caller audio goes into a 16kHz float32 ring buffer. Nothing is decoded
+    until the voice activity detector (or, without one, an energy threshold)
+    hears speech. While the caller speaks, the window from the start of the
+    utterance is decoded every `buffer_size_seconds`, so consecutive windows
+    overlap, and a TranscriptStabilizer turns the decodes into interim
+    transcriptions whose committed prefix doesn't change. Utterances longer
+    than `window_seconds` slide the window forward, keeping
+    `window_overlap_seconds` of audio. After `final_silence_seconds` of
+    silence the utterance is decoded once more and sent as final.
+
+    Decoding happens on a WhisperCPPContextPool shared by all calls in the
+    process, so the model is loaded `num_contexts` times in total.
+    """
 
-class WhisperCPPTranscriber(BaseThreadAsyncTranscriber[WhisperCPPTranscriberConfig]):
     def __init__(
         self,
         transcriber_config: WhisperCPPTranscriberConfig,
+        logger: Optional[logging.Logger] = None,
+        context_pool: Optional[WhisperCPPContextPool] = None,
     ):
-        super().__init__(transcriber_config)
-        self._ended = False
-        self.buffer_size = round(
-            transcriber_config.sampling_rate * transcriber_config.buffer_size_seconds
+        super().__init__(transcriber_config, logger)
+        self.context_pool = context_pool or self.get_context_pool(transcriber_config)
+        self.window_samples = int(
+            transcriber_config.window_seconds * WHISPER_CPP_SAMPLING_RATE
+        )
+        self.ring_buffer = AudioRingBuffer(
+            self.window_samples + int((PRE_ROLL_SECONDS + 1) * WHISPER_CPP_SAMPLING_RATE)
         )
-        self.buffer = np.empty(self.buffer_size, dtype=np.int16)
-        self.buffer_index = 0
-
-        # whisper cpp
-        # load library and model
-        libname = pathlib.Path().absolute() / self.transcriber_config.libname
-        self.whisper = ctypes.CDLL(libname)  # type: ignore
-
-        # tell Python what are the return types of the functions
-        self.whisper.whisper_init_from_file.restype = ctypes.c_void_p
-        self.whisper.whisper_full_default_params.restype = WhisperFullParams
-        self.whisper.whisper_full_get_segment_text.restype = ctypes.c_char_p
-
-        # initialize whisper.cpp context
-        self.ctx = self.whisper.whisper_init_from_file(
-            self.transcriber_config.fname_model.encode("utf-8")
+        self.ratecv_state = None
+        self.vad_buffer = bytearray()
+        # absolute sample position of the start of vad_buffer
+        self.vad_position = 0
+        self.last_speech_position = 0
+        # absolute sample position the window starts at, None between utterances
+        self.window_start: Optional[int] = None
+        self.last_decode_position = 0
+        self.utterance_id = 0
+        self.stabilizer = TranscriptStabilizer(transcriber_config.agreements_to_commit)
+        self.prompt = ""
+        self.decode_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_context_pool(
+        transcriber_config: WhisperCPPTranscriberConfig,
+    ) -> WhisperCPPContextPool:
+        return get_context_pool(
+            transcriber_config.libname,
+            transcriber_config.fname_model,
+            num_contexts=transcriber_config.num_contexts,
+            n_threads=transcriber_config.n_threads,
+            language=transcriber_config.language,
         )
 
-        # get default whisper parameters and adjust as needed
-        self.params = self.whisper.whisper_full_default_params()
-        self.params.print_realtime = False
-        self.params.print_progress = False
-        self.params.single_segment = True
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
-
-    def create_new_buffer(self):
-        buffer = io.BytesIO()
-        wav = wave.open(buffer, "wb")
-        wav.setnchannels(1)
-        wav.setsampwidth(2)
-        wav.setframerate(self.transcriber_config.sampling_rate)
-        return wav, buffer
-
-    def _run_loop(self):
-        in_memory_wav, audio_buffer = self.create_new_buffer()
-        message_buffer = ""
-        while not self._ended:
-            chunk = self.input_janus_queue.sync_q.get()
-            in_memory_wav.writeframes(chunk)
-            if audio_buffer.tell() >= self.buffer_size * 2:
-                audio_buffer.seek(0)
-                audio_segment = AudioSegment.from_wav(audio_buffer)
-                message, confidence = transcribe(
-                    self.whisper, self.params, self.ctx, audio_segment
+    @classmethod
+    async def warm_up(cls, transcriber_config: WhisperCPPTranscriberConfig):
+        """Loads the shared contexts for this config before the first call"""
+        await cls.get_context_pool(transcriber_config).warm_up()
+
+    def seconds_to_samples(self, seconds: float) -> int:
+        return int(seconds * WHISPER_CPP_SAMPLING_RATE)
+
+    def to_pcm16k(self, chunk: bytes) -> bytes:
+        if self.transcriber_config.audio_encoding == AudioEncoding.MULAW:
+            chunk = audioop.ulaw2lin(chunk, 2)
+        if self.transcriber_config.sampling_rate != WHISPER_CPP_SAMPLING_RATE:
+            chunk, self.ratecv_state = audioop.ratecv(
+                chunk,
+                2,
+                1,
+                self.transcriber_config.sampling_rate,
+                WHISPER_CPP_SAMPLING_RATE,
+                self.ratecv_state,
+            )
+        return chunk
+
+    def is_speech(self, frame: bytes) -> bool:
+        if self.voice_activity_detector is not None:
+            return self.voice_activity_detector.is_voice_active(frame)
+        return audioop.rms(frame, 2) >= self.transcriber_config.speech_energy_threshold
+
+    async def _run_loop(self):
+        while True:
+            chunk = await self.input_queue.get()
+            self.process_chunk(chunk)
+
+    def process_chunk(self, chunk: bytes):
+        pcm = self.to_pcm16k(chunk)
+        self.ring_buffer.append(
+            np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        )
+        self.detect_speech(pcm)
+        if self.window_start is None:
+            return
+        end = self.ring_buffer.end
+        if end - self.last_speech_position >= self.seconds_to_samples(
+            self.transcriber_config.final_silence_seconds
+        ):
+            self.finalize_utterance()
+            return
+        if end - self.window_start > self.window_samples:
+            self.window_start = end - self.seconds_to_samples(
+                self.transcriber_config.window_overlap_seconds
+            )
+            self.stabilizer.slide()
+        if end - self.last_decode_position >= self.seconds_to_samples(
+            self.transcriber_config.buffer_size_seconds
+        ) and (self.decode_task is None or self.decode_task.done()):
+            self.last_decode_position = end
+            self.decode_task = asyncio.create_task(
+                self.decode_interim(
+                    self.utterance_id,
+                    self.ring_buffer.get(self.window_start),
+                    self.get_prompt(self.stabilizer),
                 )
-                message_buffer += message
-                is_final = any(
-                    message_buffer.endswith(ending) for ending in SENTENCE_ENDINGS
+            )
+
+    def detect_speech(self, pcm: bytes):
+        self.vad_buffer.extend(pcm)
+        while len(self.vad_buffer) >= VAD_FRAME_BYTES:
+            frame = bytes(self.vad_buffer[:VAD_FRAME_BYTES])
+            del self.vad_buffer[:VAD_FRAME_BYTES]
+            frame_start = self.vad_position
+            self.vad_position += VAD_FRAME_BYTES // 2
+            if not self.is_speech(frame):
+                continue
+            self.last_speech_position = self.vad_position
+            if self.window_start is None:
+                self.window_start = max(
+                    frame_start - self.seconds_to_samples(PRE_ROLL_SECONDS),
+                    self.ring_buffer.start,
                 )
-                in_memory_wav, audio_buffer = self.create_new_buffer()
-                self.output_queue.put_nowait(
-                    Transcription(
-                        message=message_buffer, confidence=confidence, is_final=is_final
-                    )
+                self.last_decode_position = self.window_start
+
+    def get_prompt(self, stabilizer: TranscriptStabilizer) -> str:
+        """Earlier utterances and the words committed before the window, whisper
+        drops or repeats words that are also in the prompt"""
+        committed_before_window = stabilizer.get_committed_before_window()
+        return (self.prompt + " " + " ".join(committed_before_window)).strip()[
+            -MAX_PROMPT_CHARS:
+        ]
+
+    async def decode_interim(self, utterance_id: int, audio: np.ndarray, prompt: str):
+        start_time = time.time()
+        try:
+            text, confidence = await self.context_pool.transcribe(audio, prompt)
+        except Exception:
+            self.logger.exception("whisper.cpp decode failed")
+            return
+        if utterance_id != self.utterance_id:
+            # the utterance was finalized while this decode ran
+            return
+        committed, tentative = self.stabilizer.update(text)
+        message = (committed + " " + tentative).strip()
+        if message:
+            self.output_queue.put_nowait(
+                Transcription(
+                    message=message,
+                    confidence=confidence,
+                    is_final=False,
+                    latency=time.time() - start_time,
                 )
-                if is_final:
-                    message_buffer = ""
+            )
+
+    def finalize_utterance(self):
+        assert self.window_start is not None
+        audio = self.ring_buffer.get(self.window_start)
+        time_silent = (
+            self.ring_buffer.end - self.last_speech_position
+        ) / WHISPER_CPP_SAMPLING_RATE
+        stabilizer, self.stabilizer = self.stabilizer, TranscriptStabilizer(
+            self.transcriber_config.agreements_to_commit
+        )
+        prompt = self.get_prompt(stabilizer)
+        self.window_start = None
+        self.utterance_id += 1
+        self.decode_task = asyncio.create_task(
+            self.decode_final(self.decode_task, stabilizer, audio, prompt, time_silent)
+        )
+
+    async def decode_final(
+        self,
+        previous_decode_task: Optional[asyncio.Task],
+        stabilizer: TranscriptStabilizer,
+        audio: np.ndarray,
+        prompt: str,
+        time_silent: float,
+    ):
+        start_time = time.time()
+        if previous_decode_task is not None:
+            # keeps transcriptions in order
+            await asyncio.wait([previous_decode_task])
+        try:
+            text, confidence = await self.context_pool.transcribe(audio, prompt)
+        except Exception:
+            self.logger.exception("whisper.cpp decode failed")
+            return
+        message = stabilizer.finalize(text)
+        if not message:
+            return
+        self.prompt = (self.prompt + " " + message).strip()[-MAX_PROMPT_CHARS:]
+        self.output_queue.put_nowait(
+            Transcription(
+                message=message,
+                confidence=confidence,
+                is_final=True,
+                latency=time.time() - start_time,
+                time_silent=time_silent,
+            )
+        )
 
     def terminate(self):
-        pass
+        if self.decode_task is not None:
+            self.decode_task.cancel()
+        super().terminate()
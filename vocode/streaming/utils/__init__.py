@@ -1,7 +1,7 @@
 import asyncio
 import audioop
 import secrets
-from typing import Any
+from typing import Any, Iterator, Optional
 import wave
 from string import ascii_letters, digits
 
@@ -61,6 +61,38 @@ def get_chunk_size_per_second(audio_encoding: AudioEncoding, sampling_rate: int)
         raise Exception("Unsupported audio encoding")
 
 
+def get_chunk_sizes(
+    audio_encoding: AudioEncoding,
+    sampling_rate: int,
+    chunk_size: int,
+    first_chunk_size_seconds: Optional[float] = None,
+) -> Iterator[int]:
+    """Yields chunk sizes that start at first_chunk_size_seconds and double up to chunk_size"""
+    sample_width = 2 if audio_encoding == AudioEncoding.LINEAR16 else 1
+    if first_chunk_size_seconds:
+        size = int(
+            get_chunk_size_per_second(audio_encoding, sampling_rate)
+            * first_chunk_size_seconds
+        )
+        size = max(size // sample_width * sample_width, sample_width)
+        while size < chunk_size:
+            yield size
+            size *= 2
+    while True:
+        yield chunk_size
+
+
+def split_audio(audio: bytes, chunk_sizes: Iterator[int]) -> Iterator[tuple]:
+    """Splits audio into (chunk, is_last_chunk) tuples following chunk_sizes"""
+    i = 0
+    for size in chunk_sizes:
+        if i + size >= len(audio):
+            yield audio[i:], True
+            return
+        yield audio[i : i + size], False
+        i += size
+
+
 def create_conversation_id() -> str:
     return secrets.token_urlsafe(16)
 
@@ -1,17 +1,22 @@
-import boto3
-from botocore.client import Config
 import concurrent.futures
 import functools
 import asyncio
 
-config = Config(
-    s3 = {
-        'use_accelerate_endpoint': True
-    }
-)
-_s3 = boto3.client('s3', config=config)
 executor = concurrent.futures.ThreadPoolExecutor()
-from aiobotocore.session import get_session
+
+
+@functools.lru_cache(maxsize=None)
+def get_s3_client():
+    """The boto3 client is built on first use rather than at import"""
+    import boto3
+    from botocore.client import Config
+
+    config = Config(
+        s3 = {
+            'use_accelerate_endpoint': True
+        }
+    )
+    return boto3.client('s3', config=config)
 
 def aio(f):
     '''Takes a synchronous function 
@@ -22,7 +27,12 @@ def aio(f):
         return await loop.run_in_executor(executor, f_bound)
     return aio_wrapper
 
-get_object_async = aio(_s3.get_object)
+async def get_object_async(**kwargs):
+    # building the client is slow too, so it happens on the executor
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, lambda: get_s3_client().get_object(**kwargs)
+    )
 
 async def load_from_s3(bucket_name, object_key):
     try:
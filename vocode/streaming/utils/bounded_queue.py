@@ -0,0 +1,118 @@
+import asyncio
+import weakref
+from collections import defaultdict
+from enum import Enum
+from typing import Callable, Dict, Iterable, Optional, TypeVar
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+QueueItemType = TypeVar("QueueItemType")
+
+
+class OverflowPolicy(str, Enum):
+    # put() waits for space; put_nowait(), for producers that can't wait, admits
+    # the item over the bound and counts it as overflowed, so nothing is lost
+    BLOCK = "block"
+    # the oldest item is discarded to make space, e.g. for audio
+    DROP_OLDEST = "drop_oldest"
+    # the new item is discarded
+    DROP_NEWEST = "drop_newest"
+
+
+_queues: "weakref.WeakSet[BoundedQueue]" = weakref.WeakSet()
+
+
+def _observe_queue_depths(options: CallbackOptions) -> Iterable[Observation]:
+    depths: Dict[str, int] = defaultdict(int)
+    for queue in list(_queues):
+        depths[queue.name] += queue.qsize()
+    return [Observation(depth, {"queue": name}) for name, depth in depths.items()]
+
+
+meter = metrics.get_meter(__name__)
+meter.create_observable_gauge(
+    name="queue.depth",
+    callbacks=[_observe_queue_depths],
+    unit="items",
+    description="Items waiting in each named queue, summed over all conversations",
+)
+dropped_items_counter = meter.create_counter(
+    name="queue.dropped_items",
+    unit="items",
+    description="Items discarded because a queue was full",
+)
+overflowed_items_counter = meter.create_counter(
+    name="queue.overflowed_items",
+    unit="items",
+    description="Items admitted over a full queue's bound, because the producer "
+    "couldn't wait or nothing in the queue could be dropped",
+)
+
+
+class BoundedQueue(asyncio.Queue[QueueItemType]):
+    """An asyncio.Queue with a name, an overflow policy and a depth gauge.
+
+    maxsize=0 keeps the queue unbounded (it is still instrumented). If given,
+    is_droppable picks the items the drop policies may discard, e.g. audio but
+    not the messages interleaved with it; the others are always delivered.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 0,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        is_droppable: Optional[Callable[[QueueItemType], bool]] = None,
+    ):
+        super().__init__(maxsize=maxsize)
+        self.name = name
+        self.overflow_policy = overflow_policy
+        self.is_droppable = is_droppable
+        self.num_dropped = 0
+        self.num_overflowed = 0
+        _queues.add(self)
+
+    def drop(self):
+        self.num_dropped += 1
+        dropped_items_counter.add(1, {"queue": self.name})
+
+    def can_drop(self, item: QueueItemType) -> bool:
+        return self.is_droppable is None or self.is_droppable(item)
+
+    def drop_oldest(self):
+        for i, queued_item in enumerate(self._queue):
+            if self.can_drop(queued_item):
+                del self._queue[i]
+                self.task_done()
+                self.drop()
+                return
+
+    def put_nowait(self, item: QueueItemType):
+        if self.full():
+            if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+                self.drop_oldest()
+            elif self.overflow_policy == OverflowPolicy.DROP_NEWEST and self.can_drop(
+                item
+            ):
+                self.drop()
+                return
+        # still full if the producer can't wait or nothing could be dropped
+        if self.full():
+            self.overflow(item)
+        else:
+            super().put_nowait(item)
+
+    def overflow(self, item: QueueItemType):
+        self.num_overflowed += 1
+        overflowed_items_counter.add(1, {"queue": self.name})
+        maxsize, self._maxsize = self._maxsize, 0
+        try:
+            super().put_nowait(item)
+        finally:
+            self._maxsize = maxsize
+
+    async def put(self, item: QueueItemType):
+        if self.overflow_policy == OverflowPolicy.BLOCK:
+            return await super().put(item)
+        self.put_nowait(item)
@@ -1,47 +1,142 @@
 import os
-from typing import Dict, List
-from langchain.docstore.document import Document
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Set, Tuple
 from cachetools import LRUCache
-from redis import Redis
 from vocode.streaming.models.index_config import IndexConfig
+from vocode.streaming.models.model import BaseModel
 from vocode.streaming.models.synthesizer import (
     SynthesizerConfig,
     ElevenLabsSynthesizerConfig
 )
 from vocode.streaming.vector_db.factory import VectorDBFactory
-from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.base_vector_db import DEFAULT_PAGE_SIZE, VectorDB
 
 from vocode.streaming.utils.aws_s3 import load_from_s3_async
 import logging
 
+if TYPE_CHECKING:
+    from langchain.docstore.document import Document
+    from redis import Redis
+    from vocode.streaming.utils.object_store import ObjectStore
+
 DAYS_TO_KEEP = 4
 SECONDS_PER_DAY = 60 * 60 * 24
+# sorted set of cache key -> number of cache hits, to warm the most used phrases first
+HIT_COUNTS_KEY = "synthesizer_cache_hit_counts"
+# the set is trimmed to the most hit keys every interval, from the next cache write
+MAX_HIT_COUNTS = 100000
+HIT_COUNTS_TRIM_INTERVAL_SECONDS = 60 * 10
+WARM_UP_CONCURRENCY = 16
+WARM_UP_PROGRESS_INTERVAL_SECONDS = 5
+
+
+class WarmUpResult(BaseModel):
+    num_listed: int = 0
+    # already in redis
+    num_cached: int = 0
+    num_downloaded: int = 0
+    num_failed: int = 0
+    bytes_downloaded: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        seconds = max(self.seconds, 1e-6)
+        return (
+            f"{self.num_listed} listed, {self.num_cached} already cached,"
+            f" {self.num_downloaded} downloaded"
+            f" ({self.num_downloaded / seconds:.1f}/s,"
+            f" {self.bytes_downloaded / seconds / 1e6:.2f} MB/s),"
+            f" {self.num_failed} failed in {self.seconds:.1f}s"
+        )
+
 
 class RedisRenewableTTLCache:
-    _redis_client = Redis(
-        host=os.environ.get("REDISHOST", "localhost"),
-        port=int(os.environ.get("REDISPORT", 6379)))
+    # shared by every cache in the process, created on first use
+    _redis_client: Optional["Redis"] = None
     _lru_cache = LRUCache(maxsize=2048)
     _ttl_in_seconds = int(os.environ.get("REDIS_TTL_IN_SECONDS", SECONDS_PER_DAY * DAYS_TO_KEEP))
     _factory = VectorDBFactory()
+    _last_hit_counts_trim_time = 0.0
+
+    @property
+    def redis_client(self) -> "Redis":
+        if RedisRenewableTTLCache._redis_client is None:
+            from redis import Redis
+
+            RedisRenewableTTLCache._redis_client = Redis(
+                host=os.environ.get("REDISHOST", "localhost"),
+                port=int(os.environ.get("REDISPORT", 6379)))
+        return RedisRenewableTTLCache._redis_client
 
     def get(self, key):
         if key in self._lru_cache:
-            self._redis_client.expire(key, self._ttl_in_seconds)
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.expire(key, self._ttl_in_seconds)
+            pipeline.zincrby(HIT_COUNTS_KEY, 1, key)
+            pipeline.execute()
             return self._lru_cache[key]
 
-        value = self._redis_client.getex(key, ex=self._ttl_in_seconds)
+        # one round trip; the hit is only counted if the key was set, so misses
+        # don't add to the hit counts
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.getex(key, ex=self._ttl_in_seconds)
+        pipeline.zadd(HIT_COUNTS_KEY, {key: 1}, xx=True, incr=True)
+        value, _ = pipeline.execute()
         if not value is None:
             self._lru_cache[key] = value
 
         return value
 
+    def get_many_with_hit_counts(
+        self, keys: List[str]
+    ) -> Tuple[List[Optional[bytes]], List[float]]:
+        """Values (None if missing) and hit counts of the keys, in one round trip.
+        Doesn't touch the LRU, so it can be called off the event loop."""
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.getex(key, ex=self._ttl_in_seconds)
+        pipeline.zmscore(HIT_COUNTS_KEY, keys)
+        *values, hit_counts = pipeline.execute()
+        return values, [hit_count or 0 for hit_count in hit_counts]
+
+    def get_most_hit_keys(self, num_keys: int) -> Set[str]:
+        if num_keys <= 0:
+            return set()
+        return {
+            key.decode() if isinstance(key, bytes) else key
+            for key in self.redis_client.zrevrange(HIT_COUNTS_KEY, 0, num_keys - 1)
+        }
+
     def set(self, key, value):
         self._lru_cache[key] = value
 
         # TODO: in the future we could use pickle.dumps/pickle.loads for classes, with caveats
         if self.value_type_is_supported(value):
-            self._redis_client.setex(key, self._ttl_in_seconds, value)
+            self.set_in_redis(key, value)
+
+    async def set_async(self, key, value):
+        import asyncio
+
+        self._lru_cache[key] = value
+        if self.value_type_is_supported(value):
+            await asyncio.to_thread(self.set_in_redis, key, value)
+
+    def set_in_redis(self, key, value):
+        """Sets the value and starts counting its hits. Every
+        HIT_COUNTS_TRIM_INTERVAL_SECONDS the hit counts are also trimmed to the
+        MAX_HIT_COUNTS most hit keys, and expire if the cache stops being written."""
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.setex(key, self._ttl_in_seconds, value)
+        pipeline.zadd(HIT_COUNTS_KEY, {key: 0}, nx=True)
+        now = time.time()
+        if (
+            now - RedisRenewableTTLCache._last_hit_counts_trim_time
+            >= HIT_COUNTS_TRIM_INTERVAL_SECONDS
+        ):
+            RedisRenewableTTLCache._last_hit_counts_trim_time = now
+            pipeline.zremrangebyrank(HIT_COUNTS_KEY, 0, -MAX_HIT_COUNTS - 1)
+            pipeline.expire(HIT_COUNTS_KEY, self._ttl_in_seconds)
+        pipeline.execute()
 
     def value_type_is_supported(self, value) -> bool:
         return (
@@ -66,29 +161,38 @@ class RedisRenewableTTLCache:
     async def load_from_index(
         self,
         synthesizer_config: SynthesizerConfig,
-        load_size: int = 100,
+        load_size: Optional[int] = 100,
+        max_concurrency: int = WARM_UP_CONCURRENCY,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        object_store: Optional["ObjectStore"] = None,
         logger: logging.Logger = None
-    ):
-        import base64 
+    ) -> Optional[WarmUpResult]:
+        """Warm the cache with the synthesizer's indexed phrases.
+
+        The index is listed a page at a time. Phrases already in redis are
+        pulled into the in-process LRU, the rest are downloaded from the object
+        store (S3 by default) by at most max_concurrency downloads at a time,
+        most hit phrases first, until load_size phrases have been downloaded
+        (or all of them, if load_size is None). Failed downloads don't count
+        toward load_size. The load_size most hit keys are downloaded as soon as
+        they're listed; other phrases only once the listing is done, when
+        they can be ranked."""
         import asyncio
+        import base64
+        import heapq
         from botocore.client import Config
-        config = Config(
-            s3 = {
-            'use_accelerate_endpoint': True
-            }
-        )
         from aiobotocore.session import get_session
 
         logger = logger or logging.getLogger(__name__)
         logger.setLevel(logging.DEBUG)
-        
+
         index_config: IndexConfig = synthesizer_config.index_config
         if index_config is None:
             logger.info("No index config found, skipping preload")
-            return
+            return None
         vector_db: VectorDB = self._factory.create_vector_db(index_config.vector_db_config)
         bucket_name = index_config.bucket_name
-        
+
         filters = {}
         if isinstance(synthesizer_config, ElevenLabsSynthesizerConfig):
             filters = {
@@ -97,50 +201,126 @@ class RedisRenewableTTLCache:
                 "similarity_boost": synthesizer_config.similarity_boost,
             }
 
-        # preloaded_vectors is a Dict [ voice_id : List of Documents]
-        preloaded_vectors: Dict[str: List[Document]] = {}
-        preloaded_vectors_count = 0
-        vecs: List[Document] = await vector_db.retrieve_k_vectors_with_filter(
-            filters=filters,
-            k=load_size
+        result = WarmUpResult()
+        start_time = time.time()
+        most_hit_keys = await asyncio.to_thread(
+            self.get_most_hit_keys, load_size or 0
         )
-        preloaded_vectors_count += len(vecs)
-        preloaded_vectors = vecs      
-        await vector_db.tear_down()
+        # (not among the most hit, -hit count, listing order, cache key, object
+        # key), the most hit phrase first
+        queue: List[Tuple[bool, float, int, str, str]] = []
+        listing_done = False
+        queue_changed = asyncio.Condition()
+        num_downloading = 0
 
-        logger.debug(f"Preloading {preloaded_vectors_count} items from index")
-    
-        async def load_from_s3_and_save_task(
-                cache: "RedisRenewableTTLCache", 
-                doc: Document, 
-                s3_client
-            ):
-            object_key= doc.metadata.get("object_key")
-            text_message = doc.page_content
-            cache_key = synthesizer_config.get_cache_key(text_message)
-            audio_encoded = cache.get(cache_key)
-            if audio_encoded is not None:
-                return
+        def is_loaded() -> bool:
+            return (
+                load_size is not None
+                and result.num_downloaded + num_downloading >= load_size
+            )
+
+        async def list_phrases():
+            nonlocal listing_done
+            try:
+                async for page in vector_db.iterate_documents(
+                    filters=filters, page_size=page_size
+                ):
+                    cache_keys = [
+                        synthesizer_config.get_cache_key(doc.page_content)
+                        for doc in page
+                    ]
+                    values, hit_counts = await asyncio.to_thread(
+                        self.get_many_with_hit_counts, cache_keys
+                    )
+                    async with queue_changed:
+                        for doc, cache_key, value, hit_count in zip(
+                            page, cache_keys, values, hit_counts
+                        ):
+                            result.num_listed += 1
+                            if value is not None:
+                                self._lru_cache[cache_key] = value
+                                result.num_cached += 1
+                            elif doc.metadata.get("object_key"):
+                                heapq.heappush(
+                                    queue,
+                                    (
+                                        cache_key not in most_hit_keys,
+                                        -hit_count,
+                                        result.num_listed,
+                                        cache_key,
+                                        doc.metadata["object_key"],
+                                    ),
+                                )
+                        queue_changed.notify_all()
+                    if load_size is not None and result.num_downloaded >= load_size:
+                        break
+            finally:
+                async with queue_changed:
+                    listing_done = True
+                    queue_changed.notify_all()
+
+        async def download_phrases(download: Callable[[str], Awaitable[bytes]]):
+            nonlocal num_downloading
+            while True:
+                async with queue_changed:
+                    await queue_changed.wait_for(
+                        lambda: listing_done or (queue and not queue[0][0])
+                    )
+                    if not queue or is_loaded():
+                        return
+                    _, _, _, cache_key, object_key = heapq.heappop(queue)
+                    num_downloading += 1
+                try:
+                    audio_data = await download(object_key)
+                    await self.set_async(cache_key, base64.b64encode(audio_data))
+                except Exception as e:
+                    logger.debug(f"Error loading object {object_key}: {str(e)}")
+                    result.num_failed += 1
+                else:
+                    result.num_downloaded += 1
+                    result.bytes_downloaded += len(audio_data)
+                finally:
+                    num_downloading -= 1
+
+        async def report_progress():
+            while True:
+                await asyncio.sleep(WARM_UP_PROGRESS_INTERVAL_SECONDS)
+                result.seconds = time.time() - start_time
+                logger.info(f"Warming up cache: {result}, {len(queue)} queued")
+
+        async def warm_up(download: Callable[[str], Awaitable[bytes]]):
+            lister = asyncio.create_task(list_phrases())
+            progress_reporter = asyncio.create_task(report_progress())
             try:
-                audio_data = await load_from_s3_async(bucket_name, object_key, s3_client)
-                audio_encoded: bytes = base64.b64encode(audio_data)
-                cache.set(cache_key, audio_encoded)
-            except Exception as e:
-                print(f"Error loading object from S3: {str(e)}")
-                logger.debug(f"Error loading object from S3: {str(e)}")
-            return
+                await asyncio.gather(
+                    *[download_phrases(download) for _ in range(max_concurrency)]
+                )
+                await lister
+            finally:
+                lister.cancel()
+                progress_reporter.cancel()
 
         try:
-            aiosession = get_session()
-            async with aiosession.create_client('s3', config=config) as _s3: 
-                tasks = [
-                    load_from_s3_and_save_task(self, doc, _s3)
-                    for doc in preloaded_vectors
-                ]
-                await asyncio.gather(*tasks)
-            logger.debug(f"Cache loaded! {self.get_total_items()} items.")
+            if object_store is not None:
+                await warm_up(object_store.get)
+            else:
+                config = Config(
+                    s3={"use_accelerate_endpoint": True},
+                    max_pool_connections=max_concurrency,
+                )
+                async with get_session().create_client("s3", config=config) as s3_client:
+                    await warm_up(
+                        lambda object_key: load_from_s3_async(
+                            bucket_name, object_key, s3_client
+                        )
+                    )
         except Exception as e:
-            logger.debug(f"Error loading cache: {str(e)}")
+            logger.error(f"Error loading cache: {str(e)}")
+        finally:
+            await vector_db.tear_down()
+        result.seconds = time.time() - start_time
+        logger.info(f"Cache warmed up: {result}")
+        return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+import hashlib
+from typing import Optional
+
+import numpy as np
+
+
+class CountMinSketch:
+    """Approximate counts of strings in a fixed amount of memory.
+
+    Estimates never undercount; they overcount only when an item collides
+    with others in every row. Conservative updates keep that rare, and the
+    counts are halved every halve_every additions (width / 2 by default), so
+    the sketch tracks recent frequencies and never fills up.
+    """
+
+    def __init__(
+        self, width: int = 2**16, depth: int = 4, halve_every: Optional[int] = None
+    ):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self.rows = np.arange(depth)
+        self.halve_every = width // 2 if halve_every is None else halve_every
+        self.num_added = 0
+
+    def get_cells(self, item: str) -> np.ndarray:
+        # one hash split in two, combined per row (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + row * h2) % self.width for row in range(self.depth)])
+
+    def estimate(self, item: str) -> int:
+        return int(self.table[self.rows, self.get_cells(item)].min())
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Counts the item, returns its estimated count including this one"""
+        cells = self.get_cells(item)
+        estimate = int(self.table[self.rows, cells].min()) + count
+        # only the cells below the new estimate are raised
+        self.table[self.rows, cells] = np.maximum(self.table[self.rows, cells], estimate)
+        self.num_added += count
+        if self.halve_every and self.num_added >= self.halve_every:
+            self.table >>= 1
+            self.num_added = 0
+        return estimate
@@ -1,19 +1,22 @@
-from nltk.tokenize import word_tokenize
-import numpy as np
-from pkg_resources import resource_filename
+import functools
+import os
 
-coefficients_file_path = resource_filename(
-    __name__,
+COEFFICIENTS_FILE_PATH = os.path.join(
+    os.path.dirname(__file__),
     "quadratic_coefficients.csv"
 )
 
-QUADRATIC_COEFFICIENTS: np.ndarray = np.loadtxt(
-    coefficients_file_path,
-    delimiter=","
-)
-QUADRATIC_POLYNOMIAL: np.poly1d = np.poly1d(QUADRATIC_COEFFICIENTS)
+
+@functools.lru_cache(maxsize=None)
+def get_quadratic_polynomial():
+    # loaded on first use, numpy and the csv aren't needed at import
+    import numpy as np
+
+    return np.poly1d(np.loadtxt(COEFFICIENTS_FILE_PATH, delimiter=","))
 
 def count_tokens_in_text(text: str):
+    from nltk.tokenize import word_tokenize
+
     tokens = word_tokenize(text)
     return len(tokens)
 
@@ -25,7 +28,7 @@ def count_words_in_text(text: str):
 
 def get_duration_from_message(message: str)-> float:
     num_tokens = count_tokens_in_text(message)
-    quadratic_fit = QUADRATIC_POLYNOMIAL
+    quadratic_fit = get_quadratic_polynomial()
     duration_seconds = quadratic_fit(num_tokens)
     return duration_seconds
 
@@ -2,7 +2,9 @@ from __future__ import annotations
 import asyncio
 
 
+from vocode.streaming.constants import CONTROL_QUEUE_MAX_SIZE
 from vocode.streaming.models.events import Event
+from vocode.streaming.utils.bounded_queue import BoundedQueue
 
 
 async def flush_event(event):
@@ -11,10 +13,12 @@ async def flush_event(event):
 
 
 class EventsManager:
-    def __init__(self, subscriptions=None):
+    def __init__(self, subscriptions=None, max_queue_size: int = CONTROL_QUEUE_MAX_SIZE):
         if subscriptions is None:
             subscriptions = []
-        self.queue: asyncio.Queue[Event] = asyncio.Queue()
+        self.queue: asyncio.Queue[Event] = BoundedQueue(
+            "events_manager.queue", maxsize=max_queue_size
+        )
         self.subscriptions = set(subscriptions)
         self.active = False
 
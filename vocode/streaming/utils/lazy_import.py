@@ -0,0 +1,20 @@
+import importlib
+from typing import Any, Callable, Dict
+
+
+def lazy_getattr(package_name: str, imports: Dict[str, str]) -> Callable[[str], Any]:
+    """A module `__getattr__` that imports `name` from `imports[name]` on first access.
+
+    Provider packages re-export their classes this way so that importing the
+    package doesn't import every provider's SDK.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = imports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name), name)
+        setattr(importlib.import_module(package_name), name, value)
+        return value
+
+    return __getattr__
@@ -0,0 +1,176 @@
+import asyncio
+import contextvars
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from opentelemetry import metrics
+
+from vocode.streaming.constants import (
+    LOOP_MONITOR_INTERVAL_SECONDS,
+    SLOW_CALLBACK_SECONDS,
+)
+
+meter = metrics.get_meter(__name__)
+loop_lag_histogram = meter.create_histogram(
+    name="event_loop.lag",
+    unit="seconds",
+    description="How late the event loop resumed a sleeping task",
+)
+slow_callback_histogram = meter.create_histogram(
+    name="event_loop.slow_callback",
+    unit="seconds",
+    description="How long a single callback blocked the event loop, by task",
+)
+
+# Set by StreamingConversation.start, so tasks it starts are named after it
+current_conversation_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_conversation_id", default=None
+)
+TASK_NAME_SEPARATOR = ":"
+
+
+def get_task_name(name: str) -> str:
+    """Names a task `<name>:<conversation id>` inside a conversation"""
+    conversation_id = current_conversation_id.get()
+    if conversation_id is None:
+        return name
+    return f"{name}{TASK_NAME_SEPARATOR}{conversation_id}"
+
+
+def describe_task(task: Optional[asyncio.Task]) -> Tuple[str, Optional[str]]:
+    """Returns the (worker name, conversation id) a task was named with"""
+    if task is None:
+        # a plain callback (call_soon, transport protocol) rather than a task
+        return "callback", None
+    name, _, conversation_id = task.get_name().partition(TASK_NAME_SEPARATOR)
+    return name, conversation_id or None
+
+
+def format_stack(frame, limit: Optional[int] = None) -> List[str]:
+    return [
+        f"{summary.name} ({summary.filename}:{summary.lineno})"
+        for summary in traceback.extract_stack(frame, limit=limit)
+    ]
+
+
+class LoopMonitor:
+    """Measures event loop lag and attributes stalls to the task that caused them.
+
+    A task on the loop sleeps for `interval_seconds` at a time and records how
+    late it woke up as `event_loop.lag`. A watchdog thread checks that task's
+    heartbeat; if the loop has been blocked for `slow_callback_seconds` it
+    captures the running task and the loop thread's stack. Once the loop
+    recovers, the stall is recorded as `event_loop.slow_callback` (by worker
+    name) and logged with the conversation id and stack.
+
+    Nothing is traced per callback, so this is cheap enough to leave on: the
+    cost is one wakeup per interval on the loop and one in the watchdog.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = LOOP_MONITOR_INTERVAL_SECONDS,
+        slow_callback_seconds: float = SLOW_CALLBACK_SECONDS,
+        stack_limit: int = 8,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.interval_seconds = interval_seconds
+        self.slow_callback_seconds = slow_callback_seconds
+        self.stack_limit = stack_limit
+        self.logger = logger or logging.getLogger(__name__)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.heartbeat = time.monotonic()
+        # (task, stack) captured by the watchdog during the current stall
+        self.stall: Optional[Tuple[Optional[asyncio.Task], List[str]]] = None
+        self.monitor_task: Optional[asyncio.Task] = None
+        self.watchdog_thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+
+    def start(self):
+        """Must be called from the event loop being monitored"""
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.stopped.clear()
+        self.monitor_task = asyncio.create_task(self.run(), name="LoopMonitor")
+        self.watchdog_thread = threading.Thread(
+            target=self.watch, name="LoopMonitorWatchdog", daemon=True
+        )
+        self.watchdog_thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.monitor_task is not None:
+            self.monitor_task.cancel()
+
+    async def run(self):
+        assert self.loop is not None
+        while True:
+            expected_time = self.loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag = max(self.loop.time() - expected_time, 0)
+            self.heartbeat = time.monotonic()
+            loop_lag_histogram.record(lag)
+            if lag >= self.slow_callback_seconds:
+                self.report_stall(lag)
+
+    def report_stall(self, duration: float):
+        stall, self.stall = self.stall, None
+        if stall is None:
+            # the watchdog didn't catch it in the act
+            task_name, conversation_id, stack = "unknown", None, []
+        else:
+            task, stack = stall
+            task_name, conversation_id = describe_task(task)
+        slow_callback_histogram.record(duration, {"task": task_name})
+        self.logger.warning(
+            "Event loop blocked for %.3f seconds by %s (conversation %s)%s",
+            duration,
+            task_name,
+            conversation_id,
+            "".join(f"\n  {line}" for line in stack),
+        )
+
+    def watch(self):
+        # poll faster than the threshold so short stalls are still attributed
+        poll_seconds = min(self.interval_seconds, self.slow_callback_seconds) / 2
+        while not self.stopped.wait(poll_seconds):
+            blocked_seconds = time.monotonic() - self.heartbeat - self.interval_seconds
+            if blocked_seconds < self.slow_callback_seconds or self.stall is not None:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            self.stall = (
+                asyncio.current_task(self.loop),
+                format_stack(frame, self.stack_limit) if frame is not None else [],
+            )
+
+
+def profile_event_loop(
+    loop: asyncio.AbstractEventLoop,
+    loop_thread_id: int,
+    seconds: float,
+    interval_seconds: float = 0.005,
+) -> str:
+    """Samples the event loop thread's stack from another thread.
+
+    Each sample is attributed to the task running at the time, or to
+    `(no task)` while the loop polls for I/O or runs plain callbacks. Returns
+    collapsed stacks, one `task;frame;frame count` line per distinct stack,
+    which flamegraph.pl and speedscope read directly.
+    """
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(loop_thread_id)
+        if frame is not None:
+            task = asyncio.current_task(loop)
+            task_name = task.get_name() if task is not None else "(no task)"
+            counts[";".join([task_name] + format_stack(frame))] += 1
+        time.sleep(interval_seconds)
+    return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
@@ -0,0 +1,85 @@
+import asyncio
+import os
+
+from vocode.streaming.utils.aws_s3 import executor, get_s3_client
+
+
+class ObjectStore:
+    """Where synthesized audio is kept, by object key"""
+
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    async def get(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    async def put(self, key: str, data: bytes, content_type: str):
+        raise NotImplementedError
+
+
+class S3ObjectStore(ObjectStore):
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+
+    async def run(self, f):
+        return await asyncio.get_running_loop().run_in_executor(executor, f)
+
+    async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            await self.run(
+                lambda: get_s3_client().head_object(Bucket=self.bucket_name, Key=key)
+            )
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def get(self, key: str) -> bytes:
+        response = await self.run(
+            lambda: get_s3_client().get_object(Bucket=self.bucket_name, Key=key)
+        )
+        return await self.run(response["Body"].read)
+
+    async def put(self, key: str, data: bytes, content_type: str):
+        await self.run(
+            lambda: get_s3_client().put_object(
+                Bucket=self.bucket_name, Key=key, Body=data, ContentType=content_type
+            )
+        )
+
+
+class LocalObjectStore(ObjectStore):
+    """Objects as files under a directory, for development and tests"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def get_path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.path, key))
+        if not path.startswith(os.path.abspath(self.path) + os.sep):
+            raise ValueError(f"Object key outside of the store: {key}")
+        return path
+
+    async def exists(self, key: str) -> bool:
+        return os.path.exists(self.get_path(key))
+
+    async def get(self, key: str) -> bytes:
+        def read():
+            with open(self.get_path(key), "rb") as f:
+                return f.read()
+
+        return await asyncio.to_thread(read)
+
+    async def put(self, key: str, data: bytes, content_type: str):
+        def write():
+            path = self.get_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # written then renamed, so a crash never leaves a partial object
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(data)
+            os.replace(f"{path}.tmp", path)
+
+        await asyncio.to_thread(write)
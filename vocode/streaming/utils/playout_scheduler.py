@@ -0,0 +1,91 @@
+import asyncio
+from typing import Iterator, List, Optional
+
+from vocode.streaming.constants import (
+    PLAYOUT_BATCH_SECONDS,
+    PLAYOUT_FRAME_SECONDS,
+    PLAYOUT_LEAD_SECONDS,
+)
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.output_device.base_output_device import BaseOutputDevice
+from vocode.streaming.utils import get_chunk_size_per_second
+
+
+class PlayoutScheduler:
+    """Paces audio to an output device against monotonic loop deadlines.
+
+    Audio is sliced into frames of `frame_seconds`, which are sent to the
+    output device in batches of about `batch_seconds`, so each message to the
+    device carries several frames. The byte at offset t (in seconds) is assumed
+    to play at `start_time + t`, and its batch is sent `lead_seconds` before
+    the batch's first byte plays. Deadlines are absolute, so a late wakeup is
+    caught up on the next batch instead of accumulating as drift. If the output
+    runs dry (a batch is later than its playback time) the timeline is
+    re-anchored so the backlog isn't burst out. Frames not sent yet are
+    dropped on an interrupt, so at most `lead_seconds + batch_seconds` of
+    audio is still played after one.
+    """
+
+    def __init__(
+        self,
+        output_device: BaseOutputDevice,
+        audio_encoding: AudioEncoding,
+        sampling_rate: int,
+        frame_seconds: float = PLAYOUT_FRAME_SECONDS,
+        lead_seconds: float = PLAYOUT_LEAD_SECONDS,
+        batch_seconds: float = PLAYOUT_BATCH_SECONDS,
+    ):
+        self.output_device = output_device
+        self.bytes_per_second = get_chunk_size_per_second(audio_encoding, sampling_rate)
+        sample_width = 2 if audio_encoding == AudioEncoding.LINEAR16 else 1
+        self.frame_size = max(
+            int(self.bytes_per_second * frame_seconds) // sample_width * sample_width,
+            sample_width,
+        )
+        self.batch_size = self.frame_size * max(round(batch_seconds / frame_seconds), 1)
+        self.lead_seconds = lead_seconds
+        self.loop = asyncio.get_running_loop()
+        self.start_time: Optional[float] = None
+        self.bytes_sent = 0
+        self.pending_frames: List[bytes] = []
+        self.pending_size = 0
+
+    @property
+    def seconds_sent(self) -> float:
+        return self.bytes_sent / self.bytes_per_second
+
+    def get_frames(self, chunk: bytes) -> Iterator[bytes]:
+        for i in range(0, len(chunk), self.frame_size):
+            yield chunk[i : i + self.frame_size]
+
+    async def send(self, frame: bytes):
+        """Adds the frame to the current batch, sending the batch once it's full"""
+        self.pending_frames.append(frame)
+        self.pending_size += len(frame)
+        if self.pending_size >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """Sends the current batch, however full, when it's due"""
+        if not self.pending_frames:
+            return
+        now = self.loop.time()
+        playback_time = self.seconds_sent
+        if self.start_time is None or now > self.start_time + playback_time:
+            self.start_time = now - playback_time
+        delay = self.start_time + playback_time - self.lead_seconds - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.output_device.consume_nonblocking(b"".join(self.pending_frames))
+        self.bytes_sent += self.pending_size
+        self.pending_frames = []
+        self.pending_size = 0
+
+    async def wait_for_playout(self, allowance_seconds: float = 0):
+        """Waits until everything sent so far has been played, flush() first
+        to include the current batch"""
+        if self.start_time is None:
+            return
+        delay = self.start_time + self.seconds_sent - allowance_seconds - self.loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
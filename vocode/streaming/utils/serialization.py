@@ -0,0 +1,57 @@
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+
+class JsonSerializer:
+    """The stdlib fallback, producing the same output as before"""
+
+    name = "json"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        # default options only, so json uses its cached C encoder
+        return json.dumps(obj)
+
+
+class OrjsonSerializer(JsonSerializer):
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+
+def get_default_serializer() -> JsonSerializer:
+    if orjson is not None:
+        return OrjsonSerializer()
+    return JsonSerializer()
+
+
+serializer: JsonSerializer = get_default_serializer()
+
+
+def set_serializer(new_serializer: Optional[JsonSerializer]):
+    """Swaps the serializer used for streaming messages; None restores the default"""
+    global serializer
+    serializer = new_serializer or get_default_serializer()
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    return serializer.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    return serializer.dumps(obj)
@@ -0,0 +1,136 @@
+import contextvars
+import time
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from opentelemetry import metrics, trace
+
+tracer = trace.get_tracer(__name__)
+meter = metrics.get_meter(__name__)
+
+
+class TurnMark(str, Enum):
+    # estimated from the final transcription's latency and trailing silence
+    SPEECH_ENDED = "speech_ended"
+    TRANSCRIPTION_RECEIVED = "transcription_received"
+    AGENT_STARTED = "agent_started"
+    LLM_FIRST_TOKEN = "llm_first_token"
+    FIRST_SENTENCE = "first_sentence"
+    SYNTHESIS_STARTED = "synthesis_started"
+    TTS_FIRST_BYTE = "tts_first_byte"
+    FIRST_CHUNK_READY = "first_chunk_ready"
+    FIRST_AUDIO_SENT = "first_audio_sent"
+
+
+# (segment name, start mark, end mark), in pipeline order. A segment is only
+# reported when both of its marks were recorded.
+TURN_SEGMENTS: List[Tuple[str, TurnMark, TurnMark]] = [
+    ("endpointing_delay", TurnMark.SPEECH_ENDED, TurnMark.TRANSCRIPTION_RECEIVED),
+    ("agent_queue", TurnMark.TRANSCRIPTION_RECEIVED, TurnMark.AGENT_STARTED),
+    ("llm_ttft", TurnMark.AGENT_STARTED, TurnMark.LLM_FIRST_TOKEN),
+    ("segmenter_wait", TurnMark.LLM_FIRST_TOKEN, TurnMark.FIRST_SENTENCE),
+    ("synthesis_queue", TurnMark.FIRST_SENTENCE, TurnMark.SYNTHESIS_STARTED),
+    ("tts_ttfb", TurnMark.SYNTHESIS_STARTED, TurnMark.TTS_FIRST_BYTE),
+    ("decode", TurnMark.TTS_FIRST_BYTE, TurnMark.FIRST_CHUNK_READY),
+    ("playout", TurnMark.FIRST_CHUNK_READY, TurnMark.FIRST_AUDIO_SENT),
+]
+
+segment_histograms = {
+    name: meter.create_histogram(
+        name=f"conversation.turn.{name}",
+        unit="seconds",
+        description=f"Per-turn {name.replace('_', ' ')}",
+    )
+    for name, _, _ in TURN_SEGMENTS
+}
+total_histogram = meter.create_histogram(
+    name="conversation.turn.total",
+    unit="seconds",
+    description="End of human speech to first bot audio sent",
+)
+
+
+class TurnTimeline:
+    """Timestamps one conversational turn as it moves through the pipeline.
+
+    Created when a final transcription arrives and handed along with the
+    agent input, agent response and synthesis result. Each mark is kept the
+    first time it is recorded, so later sentences of the same response don't
+    move it. `close` (on the first audio sent) emits one `conversation.turn`
+    span with a child span per segment, and records a histogram per segment.
+    """
+
+    def __init__(self, conversation_id: Optional[str] = None):
+        self.conversation_id = conversation_id
+        self.marks: Dict[TurnMark, float] = {}
+        self.closed = False
+
+    def mark(self, mark: TurnMark, timestamp: Optional[float] = None):
+        if self.closed or mark in self.marks:
+            return
+        self.marks[mark] = time.time() if timestamp is None else timestamp
+
+    def get_segments(self) -> Dict[str, float]:
+        return {
+            name: self.marks[end] - self.marks[start]
+            for name, start, end in TURN_SEGMENTS
+            if start in self.marks and end in self.marks
+        }
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if not self.marks:
+            return
+        attributes = {}
+        if self.conversation_id is not None:
+            attributes["conversation_id"] = self.conversation_id
+        start_time = min(self.marks.values())
+        end_time = max(self.marks.values())
+        turn_span = tracer.start_span(
+            "conversation.turn",
+            start_time=_to_ns(start_time),
+            attributes=attributes,
+        )
+        context = trace.set_span_in_context(turn_span)
+        for name, start, end in TURN_SEGMENTS:
+            if start not in self.marks or end not in self.marks:
+                continue
+            segment_span = tracer.start_span(
+                f"conversation.turn.{name}",
+                context=context,
+                start_time=_to_ns(self.marks[start]),
+            )
+            segment_span.end(end_time=_to_ns(self.marks[end]))
+            segment_histograms[name].record(
+                max(self.marks[end] - self.marks[start], 0)
+            )
+        turn_span.end(end_time=_to_ns(end_time))
+        if (
+            TurnMark.SPEECH_ENDED in self.marks
+            and TurnMark.FIRST_AUDIO_SENT in self.marks
+        ):
+            total_histogram.record(
+                self.marks[TurnMark.FIRST_AUDIO_SENT]
+                - self.marks[TurnMark.SPEECH_ENDED]
+            )
+
+
+def _to_ns(timestamp: float) -> int:
+    return int(timestamp * 1e9)
+
+
+# The timeline of the turn being handled by the current task. Workers set it
+# before calling into agents and synthesizers, which can then mark segments
+# (first LLM token, first TTS byte) without it being threaded through every
+# implementation's signature.
+current_turn_timeline: contextvars.ContextVar[
+    Optional[TurnTimeline]
+] = contextvars.ContextVar("current_turn_timeline", default=None)
+
+
+def mark_current_turn(mark: TurnMark):
+    turn_timeline = current_turn_timeline.get()
+    if turn_timeline is not None:
+        turn_timeline.mark(mark)
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+
+import websockets
+from websockets.client import WebSocketClientProtocol
+
+
+class PooledConnection:
+    def __init__(self, ws: WebSocketClientProtocol):
+        self.ws = ws
+        self.connected_at = time.monotonic()
+        self.keepalive_task: Optional[asyncio.Task] = None
+
+
+class WebsocketConnectionPool:
+    """Keeps websockets connected ahead of time so calls don't wait on a handshake.
+
+    Connections are pooled by signature (URL and headers), so only a call with
+    the same provider settings can claim one. Idle connections are sent
+    `keepalive_message` every `keepalive_interval_seconds` and replaced after
+    `max_idle_seconds`. `claim` returns an idle connection immediately if there
+    is one (and connects a replacement in the background), or connects a new
+    one otherwise. A signature that hasn't been claimed or warmed up for
+    `max_unused_seconds` stops being replaced, so settings no call uses anymore
+    don't keep upstream connections open forever.
+    """
+
+    def __init__(
+        self,
+        keepalive_message: Optional[str] = None,
+        keepalive_interval_seconds: float = 5,
+        max_idle_seconds: float = 60,
+        max_unused_seconds: float = 60 * 10,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.keepalive_message = keepalive_message
+        self.keepalive_interval_seconds = keepalive_interval_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self.max_unused_seconds = max_unused_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self.idle_connections: Dict[str, Deque[PooledConnection]] = defaultdict(deque)
+        self.num_connecting: Dict[str, int] = defaultdict(int)
+        # signature -> when it was last claimed or warmed up
+        self.last_used: Dict[str, float] = {}
+
+    @staticmethod
+    def get_signature(url: str, extra_headers: Dict[str, str]) -> str:
+        signature = url + "\n" + "\n".join(
+            f"{key}: {value}" for key, value in sorted(extra_headers.items())
+        )
+        # don't keep credentials from the headers around as dict keys
+        return hashlib.sha256(signature.encode()).hexdigest()
+
+    async def connect(
+        self, url: str, extra_headers: Dict[str, str]
+    ) -> WebSocketClientProtocol:
+        return await websockets.connect(url, extra_headers=extra_headers)
+
+    async def claim(
+        self, url: str, extra_headers: Dict[str, str], pool_size: int = 1
+    ) -> WebSocketClientProtocol:
+        signature = self.get_signature(url, extra_headers)
+        self.last_used[signature] = time.monotonic()
+        idle_connections = self.idle_connections[signature]
+        connection = None
+        while idle_connections:
+            candidate = idle_connections.popleft()
+            self.stop_keepalive(candidate)
+            if candidate.ws.open:
+                connection = candidate
+                break
+        self.replenish(url, extra_headers, pool_size)
+        if connection is not None:
+            return connection.ws
+        return await self.connect(url, extra_headers)
+
+    def replenish(self, url: str, extra_headers: Dict[str, str], pool_size: int):
+        signature = self.get_signature(url, extra_headers)
+        missing = (
+            pool_size
+            - len(self.idle_connections[signature])
+            - self.num_connecting[signature]
+        )
+        for _ in range(missing):
+            self.num_connecting[signature] += 1
+            asyncio.create_task(self.add_connection(url, extra_headers, signature))
+
+    async def warm_up(self, url: str, extra_headers: Dict[str, str], pool_size: int):
+        """Fills the pool for this signature and waits for the connections"""
+        signature = self.get_signature(url, extra_headers)
+        self.last_used[signature] = time.monotonic()
+        missing = (
+            pool_size
+            - len(self.idle_connections[signature])
+            - self.num_connecting[signature]
+        )
+        self.num_connecting[signature] += max(missing, 0)
+        await asyncio.gather(
+            *(
+                self.add_connection(url, extra_headers, signature)
+                for _ in range(missing)
+            )
+        )
+
+    async def add_connection(
+        self, url: str, extra_headers: Dict[str, str], signature: str
+    ):
+        try:
+            ws = await self.connect(url, extra_headers)
+        except Exception as e:
+            self.logger.warning(f"Could not pre-connect websocket: {repr(e)}")
+            return
+        finally:
+            self.num_connecting[signature] -= 1
+        connection = PooledConnection(ws)
+        connection.keepalive_task = asyncio.create_task(
+            self.keep_alive(connection, url, extra_headers, signature)
+        )
+        self.idle_connections[signature].append(connection)
+
+    async def keep_alive(
+        self,
+        connection: PooledConnection,
+        url: str,
+        extra_headers: Dict[str, str],
+        signature: str,
+    ):
+        try:
+            while connection.ws.open:
+                await asyncio.sleep(self.keepalive_interval_seconds)
+                if time.monotonic() - connection.connected_at > self.max_idle_seconds:
+                    break
+                if self.keepalive_message is not None:
+                    await connection.ws.send(self.keepalive_message)
+        except asyncio.CancelledError:
+            # claimed
+            return
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        # expired or closed by the server: replace it, unless nobody uses the signature anymore
+        if connection in self.idle_connections[signature]:
+            self.idle_connections[signature].remove(connection)
+            await connection.ws.close()
+            if self.is_unused(signature):
+                self.forget(signature)
+                return
+            self.num_connecting[signature] += 1
+            await self.add_connection(url, extra_headers, signature)
+
+    def is_unused(self, signature: str) -> bool:
+        last_used = self.last_used.get(signature)
+        return last_used is None or time.monotonic() - last_used > self.max_unused_seconds
+
+    def forget(self, signature: str):
+        """Drops the bookkeeping of a signature once its last connection is gone"""
+        if not self.idle_connections[signature] and not self.num_connecting[signature]:
+            del self.idle_connections[signature]
+            del self.num_connecting[signature]
+            self.last_used.pop(signature, None)
+
+    def stop_keepalive(self, connection: PooledConnection):
+        if connection.keepalive_task is not None:
+            connection.keepalive_task.cancel()
+
+    async def close(self):
+        for idle_connections in self.idle_connections.values():
+            while idle_connections:
+                connection = idle_connections.popleft()
+                self.stop_keepalive(connection)
+                await connection.ws.close()
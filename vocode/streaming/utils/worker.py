@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import threading
+import weakref
 import janus
-from typing import Any, Optional
+from typing import Any, Callable, List, Optional, Union
 from typing import TypeVar, Generic
 import logging
 
+from vocode.streaming.utils.bounded_queue import BoundedQueue
+from vocode.streaming.utils.loop_monitor import get_task_name
+
 
 logger = logging.getLogger(__name__)
 
@@ -17,14 +21,21 @@ class AsyncWorker(Generic[WorkerInputType]):
     def __init__(
         self,
         input_queue: asyncio.Queue,
-        output_queue: asyncio.Queue = asyncio.Queue(),
+        output_queue: Optional[asyncio.Queue] = None,
     ) -> None:
         self.worker_task: Optional[asyncio.Task] = None
         self.input_queue = input_queue
-        self.output_queue = output_queue
+        # each worker gets its own output queue, never a shared default instance
+        self.output_queue = (
+            output_queue
+            if output_queue is not None
+            else BoundedQueue(f"{type(self).__name__}.output_queue")
+        )
 
     def start(self) -> asyncio.Task:
-        self.worker_task = asyncio.create_task(self._run_loop())
+        self.worker_task = asyncio.create_task(
+            self._run_loop(), name=get_task_name(type(self).__name__)
+        )
         return self.worker_task
 
     def consume_nonblocking(self, item: WorkerInputType):
@@ -33,6 +44,12 @@ class AsyncWorker(Generic[WorkerInputType]):
     def produce_nonblocking(self, item):
         self.output_queue.put_nowait(item)
 
+    async def consume(self, item: WorkerInputType):
+        await self.input_queue.put(item)
+
+    async def produce(self, item):
+        await self.output_queue.put(item)
+
     async def _run_loop(self):
         raise NotImplementedError
 
@@ -47,7 +64,7 @@ class ThreadAsyncWorker(AsyncWorker[WorkerInputType]):
     def __init__(
         self,
         input_queue: asyncio.Queue[WorkerInputType],
-        output_queue: asyncio.Queue = asyncio.Queue(),
+        output_queue: Optional[asyncio.Queue] = None,
     ) -> None:
         super().__init__(input_queue, output_queue)
         self.worker_thread: Optional[threading.Thread] = None
@@ -57,7 +74,10 @@ class ThreadAsyncWorker(AsyncWorker[WorkerInputType]):
     def start(self) -> asyncio.Task:
         self.worker_thread = threading.Thread(target=self._run_loop)
         self.worker_thread.start()
-        self.worker_task = asyncio.create_task(self.run_thread_forwarding())
+        self.worker_task = asyncio.create_task(
+            self.run_thread_forwarding(),
+            name=get_task_name(f"{type(self).__name__}.forwarding"),
+        )
         return self.worker_task
 
     async def run_thread_forwarding(self):
@@ -108,16 +128,54 @@ class AsyncQueueWorker(AsyncWorker):
 Payload = TypeVar("Payload")
 
 
+class InterruptionFlag:
+    """A cheap stand-in for threading.Event when nothing needs to wait() on the interruption.
+
+    Reads and writes of the flag are atomic, so threads can still check it.
+    """
+
+    __slots__ = ("_is_set",)
+
+    def __init__(self):
+        self._is_set = False
+
+    def set(self):
+        self._is_set = True
+
+    def clear(self):
+        self._is_set = False
+
+    def is_set(self) -> bool:
+        return self._is_set
+
+
+InterruptionEventType = Union[threading.Event, InterruptionFlag]
+
+
 class InterruptibleEvent(Generic[Payload]):
     def __init__(
         self,
         payload: Payload,
         is_interruptible: bool = True,
-        interruption_event: Optional[threading.Event] = None,
+        interruption_event: Optional[InterruptionEventType] = None,
     ):
-        self.interruption_event = interruption_event or threading.Event()
+        self.interruption_event = interruption_event or InterruptionFlag()
         self.is_interruptible = is_interruptible
         self.payload = payload
+        self.is_completed = False
+        self.completion_callbacks: List[Callable[[InterruptibleEvent], Any]] = []
+
+    def add_completion_callback(self, callback: Callable[[InterruptibleEvent], Any]):
+        self.completion_callbacks.append(callback)
+
+    def mark_completed(self):
+        """Called once the event has been processed (or skipped) and can no longer be interrupted usefully"""
+        if self.is_completed:
+            return
+        self.is_completed = True
+        for callback in self.completion_callbacks:
+            callback(self)
+        self.completion_callbacks.clear()
 
     def interrupt(self) -> bool:
         """
@@ -138,7 +196,7 @@ class InterruptibleAgentResponseEvent(InterruptibleEvent[Payload]):
         payload: Payload,
         agent_response_tracker: asyncio.Event,
         is_interruptible: bool = True,
-        interruption_event: Optional[threading.Event] = None,
+        interruption_event: Optional[InterruptionEventType] = None,
     ):
         super().__init__(payload, is_interruptible, interruption_event)
         self.agent_response_tracker = agent_response_tracker
@@ -163,6 +221,38 @@ class InterruptibleEventFactory:
         )
 
 
+class InterruptibleEventRegistry:
+    """Tracks the interruptible events that are still in flight.
+
+    Events are dropped as soon as a worker has processed them (mark_completed) or
+    they are garbage collected (e.g. when a queue is cleared), so the cost of
+    interrupt_all is proportional to the events in flight, not the length of the call.
+    """
+
+    def __init__(self):
+        self.events: weakref.WeakSet[InterruptibleEvent] = weakref.WeakSet()
+
+    def register(self, event: InterruptibleEvent):
+        if event.is_completed:
+            return
+        self.events.add(event)
+        event.add_completion_callback(self.events.discard)
+
+    def interrupt_all(self) -> int:
+        """Interrupts all in-flight events, returns the number of events interrupted"""
+        num_interrupts = 0
+        for event in list(self.events):
+            if event.is_interrupted():
+                self.events.discard(event)
+            elif event.interrupt():
+                self.events.discard(event)
+                num_interrupts += 1
+        return num_interrupts
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
 InterruptibleEventType = TypeVar("InterruptibleEventType", bound=InterruptibleEvent)
 
 
@@ -170,7 +260,7 @@ class InterruptibleWorker(AsyncWorker[InterruptibleEventType]):
     def __init__(
         self,
         input_queue: asyncio.Queue[InterruptibleEventType],
-        output_queue: asyncio.Queue = asyncio.Queue(),
+        output_queue: Optional[asyncio.Queue] = None,
         interruptible_event_factory: InterruptibleEventFactory = InterruptibleEventFactory(),
         max_concurrency=2,
     ) -> None:
@@ -191,29 +281,55 @@ class InterruptibleWorker(AsyncWorker[InterruptibleEventType]):
         )
         return super().produce_nonblocking(interruptible_event)
 
+    def create_interruptible_agent_response_event(
+        self,
+        item: Any,
+        is_interruptible: bool = True,
+        agent_response_tracker: Optional[asyncio.Event] = None,
+    ) -> InterruptibleAgentResponseEvent:
+        return self.interruptible_event_factory.create_interruptible_agent_response_event(
+            item,
+            is_interruptible=is_interruptible,
+            agent_response_tracker=agent_response_tracker or asyncio.Event(),
+        )
+
     def produce_interruptible_agent_response_event_nonblocking(
         self,
         item: Any,
         is_interruptible: bool = True,
         agent_response_tracker: Optional[asyncio.Event] = None,
     ):
-        interruptible_utterance_event = (
-            self.interruptible_event_factory.create_interruptible_agent_response_event(
-                item,
-                is_interruptible=is_interruptible,
-                agent_response_tracker=agent_response_tracker or asyncio.Event(),
+        return super().produce_nonblocking(
+            self.create_interruptible_agent_response_event(
+                item, is_interruptible, agent_response_tracker
+            )
+        )
+
+    async def produce_interruptible_agent_response_event(
+        self,
+        item: Any,
+        is_interruptible: bool = True,
+        agent_response_tracker: Optional[asyncio.Event] = None,
+    ):
+        """Waits for space in the output queue, unlike the nonblocking variant"""
+        await super().produce(
+            self.create_interruptible_agent_response_event(
+                item, is_interruptible, agent_response_tracker
             )
         )
-        return super().produce_nonblocking(interruptible_utterance_event)
 
     async def _run_loop(self):
         # TODO Implement concurrency with max_nb_of_thread
         while True:
             item = await self.input_queue.get()
             if item.is_interrupted():
+                item.mark_completed()
                 continue
             self.interruptible_event = item
-            self.current_task = asyncio.create_task(self.process(item))
+            self.current_task = asyncio.create_task(
+                self.process(item),
+                name=get_task_name(f"{type(self).__name__}.process"),
+            )
             try:
                 await self.current_task
             except asyncio.CancelledError:
@@ -221,6 +337,7 @@ class InterruptibleWorker(AsyncWorker[InterruptibleEventType]):
             except Exception as e:
                 logger.exception("InterruptibleWorker", exc_info=True)
             self.interruptible_event.is_interruptible = False
+            self.interruptible_event.mark_completed()
             self.current_task = None
 
     async def process(self, item: InterruptibleEventType):
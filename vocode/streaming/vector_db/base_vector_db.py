@@ -1,16 +1,64 @@
 import os
-from typing import Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, List, Optional, Tuple
 import aiohttp
-from openai import AsyncAzureOpenAI, AsyncOpenAI
-from langchain.docstore.document import Document
+
+if TYPE_CHECKING:
+    from langchain.docstore.document import Document
 
 DEFAULT_OPENAI_EMBEDDING_MODEL = "text-embedding-ada-002"
+# texts per embeddings request
+EMBEDDING_BATCH_SIZE = 100
+DEFAULT_PAGE_SIZE = 100
+
+
+def matches_condition(value: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict):
+        return value == condition
+    for operator, operand in condition.items():
+        if operator == "$eq":
+            matches = value == operand
+        elif operator == "$ne":
+            matches = value != operand
+        elif operator == "$in":
+            matches = value in operand
+        elif operator == "$nin":
+            matches = value not in operand
+        elif operator in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None:
+                return False
+            matches = {
+                "$gt": lambda: value > operand,
+                "$gte": lambda: value >= operand,
+                "$lt": lambda: value < operand,
+                "$lte": lambda: value <= operand,
+            }[operator]()
+        else:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+        if not matches:
+            return False
+    return True
+
+
+def matches_filter(metadata: dict, filter: dict) -> bool:
+    """Pinecone-style metadata filter: {"genre": "drama", "year": {"$gte": 2020}},
+    with "$and" and "$or" taking lists of filters"""
+    for key, condition in filter.items():
+        if key == "$and":
+            matches = all(matches_filter(metadata, f) for f in condition)
+        elif key == "$or":
+            matches = any(matches_filter(metadata, f) for f in condition)
+        else:
+            matches = matches_condition(metadata.get(key), condition)
+        if not matches:
+            return False
+    return True
 
 
 class VectorDB:
     def __init__(
         self,
         aiohttp_session: Optional[aiohttp.ClientSession] = None,
+        create_openai_client: bool = True,
     ):
         if aiohttp_session:
             # the caller is responsible for closing the session
@@ -19,7 +67,14 @@ class VectorDB:
         else:
             self.aiohttp_session = aiohttp.ClientSession(trust_env = True)
             self.should_close_session_on_tear_down = True
-        
+
+        # backends with their own embedding function don't need an OpenAI client
+        self.openai_client = None
+        if not create_openai_client:
+            return
+
+        from openai import AsyncAzureOpenAI, AsyncOpenAI
+
         if os.getenv("AZURE_OPENAI_API_BASE") is not None:  
             self.openai_client = AsyncAzureOpenAI(
                 api_version="2023-07-01-preview",
@@ -33,6 +88,7 @@ class VectorDB:
     async def create_openai_embedding(
         self, text, model=DEFAULT_OPENAI_EMBEDDING_MODEL
     ) -> List[float]:
+        assert self.openai_client is not None
         params = {
             "input": text,
         }
@@ -49,6 +105,24 @@ class VectorDB:
         return list(embedding)
         # return list((await openai.Embedding.acreate(**params))["data"][0]["embedding"])
 
+    async def create_openai_embeddings(
+        self, texts: List[str], model=DEFAULT_OPENAI_EMBEDDING_MODEL
+    ) -> List[List[float]]:
+        """Embeds texts in batches of EMBEDDING_BATCH_SIZE, one request per batch"""
+        assert self.openai_client is not None
+        engine = os.getenv("AZURE_OPENAI_TEXT_EMBEDDING_ENGINE")
+        embeddings: List[List[float]] = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            response = await self.openai_client.embeddings.create(
+                input=texts[start : start + EMBEDDING_BATCH_SIZE],
+                model=engine or model,
+            )
+            embeddings.extend(
+                list(item.embedding)
+                for item in sorted(response.data, key=lambda item: item.index)
+            )
+        return embeddings
+
     async def add_texts(
         self,
         texts: Iterable[str],
@@ -63,18 +137,61 @@ class VectorDB:
         query: str,
         filter: Optional[dict] = None,
         namespace: Optional[str] = None,
-    ) -> List[Tuple[Document, float]]:
+    ) -> List[Tuple["Document", float]]:
         raise NotImplementedError
     
+    async def list_documents(
+        self,
+        filters: Optional[dict] = None,
+        namespace: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        pagination_token: Optional[str] = None,
+    ) -> Tuple[List["Document"], Optional[str]]:
+        """Return one page of the documents matching the filter, and the token
+        of the next page (None after the last page). Pages may hold fewer than
+        page_size documents when the filter is applied after listing."""
+        raise NotImplementedError
+
+    async def iterate_documents(
+        self,
+        filters: Optional[dict] = None,
+        namespace: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[List["Document"]]:
+        """Yield every document matching the filter, a page at a time"""
+        pagination_token = None
+        while True:
+            documents, pagination_token = await self.list_documents(
+                filters=filters,
+                namespace=namespace,
+                page_size=page_size,
+                pagination_token=pagination_token,
+            )
+            if documents:
+                yield documents
+            if pagination_token is None:
+                return
+
     async def retrieve_k_vectors_with_filter(
         self,
         filters: Optional[dict] = None,
         k: Optional[int] = 50,
         namespace: Optional[str] = None,
-    ) -> List[Document]:
-        raise NotImplementedError
+    ) -> List["Document"]:
+        """Return the first k documents matching the filter (all of them if k is None)"""
+        documents: List["Document"] = []
+        async for page in self.iterate_documents(
+            filters=filters,
+            namespace=namespace,
+            page_size=min(k, DEFAULT_PAGE_SIZE) if k else DEFAULT_PAGE_SIZE,
+        ):
+            documents.extend(page)
+            if k is not None and len(documents) >= k:
+                return documents[:k]
+        return documents
 
     async def tear_down(self):
         if self.should_close_session_on_tear_down:
             await self.aiohttp_session.close()
-        await self.openai_client.close()
+        if self.openai_client is not None:
+            await self.openai_client.close()
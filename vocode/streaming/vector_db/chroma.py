@@ -1,42 +1,90 @@
+import asyncio
+import json
 import logging
-from typing import Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 import uuid
 from langchain.docstore.document import Document
 from vocode import getenv
 from vocode.streaming.models.vector_db import ChromaDBConfig
-from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.base_vector_db import DEFAULT_PAGE_SIZE, VectorDB
 import chromadb
 from chromadb.utils import embedding_functions
 
 logger = logging.getLogger(__name__)
 
-EMBEDDING_DIMENSION = 1536
+# similarity queries with the same filter are sent together, up to this many per request
+MAX_QUERY_BATCH_SIZE = 32
+# texts embedded and added per request
+ADD_BATCH_SIZE = 100
+MAX_CONCURRENT_ADD_BATCHES = 4
 
 class ChromaDB(VectorDB):
 
-    """VectorDB implementation using ChromaDB."""
+    """VectorDB implementation using ChromaDB.
+
+    The chromadb client is synchronous, so connecting and every collection
+    call run in a worker thread. Similarity queries made while one with the
+    same filter is in flight are queued and sent as a single query for all
+    of them when it returns.
+    """
 
     def __init__(self, config: ChromaDBConfig, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
+        # chroma embeds with the collection's embedding function
+        super().__init__(*args, create_openai_client=False, **kwargs)
         self.config = config
         self.collection_name = self.config.collection
         self.chroma_api_key = self.config.api_key or getenv("CHROMA_API_KEY")
         self.port = config.port or getenv("CHROMA_SERVER_HTTP_PORT", "8000")
         self.host = config.host or getenv("CHROMA_SERVER_HOST", "localhost")
 
-        self.client = chromadb.HttpClient(
+        self.collection: Optional[chromadb.Collection] = None
+        self.connect_task: Optional[asyncio.Task] = None
+        # where filter -> (query, future for its results) waiting to be sent
+        self.pending_queries: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self.filters_in_flight: Set[str] = set()
+
+        self._text_key = "text"
+
+        try:
+            asyncio.get_running_loop()
+            # connect while the rest of the conversation starts up
+            self.start_connecting()
+        except RuntimeError:
+            pass
+
+    def start_connecting(self):
+        self.connect_task = asyncio.create_task(asyncio.to_thread(self.connect))
+        self.connect_task.add_done_callback(self.log_connect_error)
+
+    def log_connect_error(self, connect_task: asyncio.Task):
+        if not connect_task.cancelled() and connect_task.exception():
+            logger.error(f"Failed to connect to chroma: {connect_task.exception()}")
+
+    def connect(self) -> chromadb.Collection:
+        client = chromadb.HttpClient(
             host=self.host, 
             port=self.port,
             headers={
                 "X-Chroma-Token": f"{self.chroma_api_key}"
             }
         )
-        self.collection = self.client.get_collection(
+        return client.get_collection(
             name=self.collection_name,
             embedding_function=self.config.embeddings_function or self._default_embedding_fn(),
         )
 
-        self._text_key = "text"
+    async def get_collection(self) -> chromadb.Collection:
+        if self.collection is None:
+            if self.connect_task is None:
+                self.start_connecting()
+            assert self.connect_task is not None
+            try:
+                self.collection = await asyncio.shield(self.connect_task)
+            except Exception:
+                # retried on the next call
+                self.connect_task = None
+                raise
+        return self.collection
 
     def _default_embedding_fn(self):
         OPENAI_API_KEY = getenv("OPENAI_API_KEY")
@@ -47,6 +95,10 @@ class ChromaDB(VectorDB):
         return default_embedding_fn
 
     def _create_AND_eq_filter(self, input_data: dict) -> dict:
+        if len(input_data) == 1:
+            # chroma rejects an $and of fewer than two conditions
+            key, value = next(iter(input_data.items()))
+            return {key: {"$eq": value}}
         and_query = {"$and": []}
 
         for key, value in input_data.items():
@@ -64,22 +116,94 @@ class ChromaDB(VectorDB):
     ) -> List[str]:
         """Run more texts through the embeddings and add to the vectorstore.
 
+        Texts are embedded and added in batches of ADD_BATCH_SIZE, a few
+        batches at a time.
+
         Args:
             texts: Iterable of strings to add to the vectorstore.
             metadatas: Optional list of metadatas associated with the texts.
             ids: Optional list of ids to associate with the texts.
-            namespace: Optional pinecone namespace to add the texts to.
+            namespace: Ignored, chroma has no namespaces.
 
         Returns:
             List of ids from adding the texts into the vectorstore.
         """
-        raise NotImplementedError
-        self.collection.add(
-            ids=ids or [str(uuid.uuid4()) for _ in texts],
-            documents=texts,
-            metadatas=metadatas
+        texts = list(texts)
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        # the text is also kept in the metadata, where the queries read it from
+        metadatas = [
+            {**(metadatas[i] if metadatas else {}), self._text_key: text}
+            for i, text in enumerate(texts)
+        ]
+        collection = await self.get_collection()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_ADD_BATCHES)
+
+        async def add_batch(start: int):
+            end = start + ADD_BATCH_SIZE
+            async with semaphore:
+                await asyncio.to_thread(
+                    collection.add,
+                    ids=ids[start:end],
+                    documents=texts[start:end],
+                    metadatas=metadatas[start:end],
+                )
+
+        await asyncio.gather(
+            *[add_batch(start) for start in range(0, len(texts), ADD_BATCH_SIZE)]
         )
-        raise NotImplementedError
+        return ids
+
+    async def query(self, query: str, where: Optional[dict]) -> Dict[str, Any]:
+        """Metadatas and distances of the top_k results of one query, sent
+        in a batch with the other queries for the same filter"""
+        key = json.dumps(where, sort_keys=True, default=str)
+        future = asyncio.get_running_loop().create_future()
+        self.pending_queries.setdefault(key, []).append((query, future))
+        if key not in self.filters_in_flight:
+            self.filters_in_flight.add(key)
+            asyncio.create_task(self.send_queries(key, where))
+        return await future
+
+    async def send_queries(self, key: str, where: Optional[dict]):
+        batch: List[Tuple[str, asyncio.Future]] = []
+        try:
+            while self.pending_queries.get(key):
+                batch = self.pending_queries[key][:MAX_QUERY_BATCH_SIZE]
+                del self.pending_queries[key][:MAX_QUERY_BATCH_SIZE]
+                try:
+                    collection = await self.get_collection()
+                    results = await asyncio.to_thread(
+                        collection.query,
+                        query_texts=[query for query, _ in batch],
+                        n_results=self.config.top_k,
+                        include=["metadatas", "distances"],
+                        where=where,
+                    )
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for i, (_, future) in enumerate(batch):
+                    if not future.done():
+                        future.set_result(
+                            {
+                                "metadatas": results["metadatas"][i]
+                                if results["metadatas"] is not None
+                                else None,
+                                "distances": results["distances"][i]
+                                if results["distances"] is not None
+                                else None,
+                            }
+                        )
+        finally:
+            self.filters_in_flight.discard(key)
+            # if cancelled, nothing else would resolve the queued queries
+            for _, future in batch + self.pending_queries.pop(key, []):
+                if not future.done():
+                    future.set_exception(
+                        Exception("Chroma query batch was cancelled")
+                    )
 
     async def similarity_search_with_score(
         self,
@@ -100,12 +224,7 @@ class ChromaDB(VectorDB):
         """
         docs = []
         filters = self._create_AND_eq_filter(input_data=filter) if filter else None
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=self.config.top_k,
-            include=["metadatas", "distances"],
-            where=filters,
-        )
+        results = await self.query(query, filters)
 
         metadatas = results["metadatas"]
         distances = results["distances"]
@@ -113,7 +232,7 @@ class ChromaDB(VectorDB):
         if metadatas is None or distances is None:
             return docs
         
-        metadatas_and_distances = zip(metadatas[0], distances[0])
+        metadatas_and_distances = zip(metadatas, distances)
         for item in metadatas_and_distances:
             metadata: dict = item[0]
             dist: float = item[1]
@@ -133,40 +252,37 @@ class ChromaDB(VectorDB):
                 )
         return docs
     
-    async def retrieve_k_vectors_with_filter(
+    async def list_documents(
         self,
         filters: Optional[dict] = None,
-        k: Optional[int] = 50,
         namespace: Optional[str] = None,
-    ) -> List[Document]:
-        """Return pinecone list of documents based on filter.
+        page_size: int = DEFAULT_PAGE_SIZE,
+        pagination_token: Optional[str] = None,
+    ) -> Tuple[List[Document], Optional[str]]:
+        """Return a page of the collection's documents matching the filter.
 
         Args:
             filters: Dictionary of argument(s) to filter on metadata
-            k: Int of number of vectors to retrieve. Default is 500.
-            include: List of what to include in the response. Default is ["metadatas", "distances"].
+            namespace: Unused, chroma collections have no namespaces.
+            page_size: Maximum number of documents in the page.
+            pagination_token: Token of the page, from the previous page.
 
         Returns:
-            List of Documents where each document is a vector and metadata.
+            The documents and the token of the next page, None after the last page.
         """
-        query_embedding = [1] + [0] * (EMBEDDING_DIMENSION - 1)
-        logger.debug(f"filters: {filters}")
-        assert isinstance(filters, dict)
-        logger.debug(f"type(filters): {type(filters)}")
-        docs = []
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=k,
-            include=["metadatas", "documents", "distances"],
+        offset = int(pagination_token) if pagination_token else 0
+        collection = await self.get_collection()
+        results = await asyncio.to_thread(
+            collection.get,
             where=self._create_AND_eq_filter(filters) if filters else None,
+            limit=page_size,
+            offset=offset,
+            include=["metadatas"],
         )
+        metadatas: List[dict] = results["metadatas"] or []
+        next_token = str(offset + page_size) if len(metadatas) == page_size else None
 
-        metadatas = results["metadatas"]
-
-        if metadatas is None or len(metadatas[0]) == 0:
-            return docs
-        
-        metadatas: List[dict] = metadatas[0]
+        docs = []
         for metadata in metadatas:
             if self._text_key in metadata:
                 text = metadata.pop(self._text_key)
@@ -175,4 +291,4 @@ class ChromaDB(VectorDB):
                 logger.warning(
                     f"Found document with no `{self._text_key}` key. Skipping."
                 )
-        return docs
\ No newline at end of file
+        return docs, next_token
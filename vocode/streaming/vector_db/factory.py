@@ -1,11 +1,15 @@
 import logging
 from typing import Optional
 import aiohttp
-from vocode.streaming.models.vector_db import PineconeConfig, VectorDBConfig, ChromaDBConfig
+from vocode.streaming.models.vector_db import (
+    ChromaDBConfig,
+    LocalVectorDBConfig,
+    PineconeConfig,
+    VectorDBConfig,
+)
 from vocode.streaming.vector_db.base_vector_db import VectorDB
-from vocode.streaming.vector_db.pinecone import PineconeDB
-from vocode.streaming.vector_db.chroma import ChromaDB
 
+# Imported in their branch so the vector db clients are only loaded when used
 class VectorDBFactory:
     def create_vector_db(
         self,
@@ -13,7 +17,15 @@ class VectorDBFactory:
         aiohttp_session: Optional[aiohttp.ClientSession] = None,
     ) -> VectorDB:
         if isinstance(vector_db_config, PineconeConfig):
+            from vocode.streaming.vector_db.pinecone import PineconeDB
+
             return PineconeDB(vector_db_config, aiohttp_session=aiohttp_session)
         elif isinstance(vector_db_config, ChromaDBConfig):
+            from vocode.streaming.vector_db.chroma import ChromaDB
+
             return ChromaDB(vector_db_config, aiohttp_session=aiohttp_session)
+        elif isinstance(vector_db_config, LocalVectorDBConfig):
+            from vocode.streaming.vector_db.local import LocalVectorDB
+
+            return LocalVectorDB(vector_db_config, aiohttp_session=aiohttp_session)
         raise Exception("Invalid vector db config", vector_db_config.type)
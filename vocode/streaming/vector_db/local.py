@@ -0,0 +1,373 @@
+import asyncio
+import copy
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain.docstore.document import Document
+
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
+from vocode.streaming.vector_db.base_vector_db import (
+    DEFAULT_PAGE_SIZE,
+    VectorDB,
+    matches_filter,
+)
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+DOCUMENTS_FILE = "documents.jsonl"
+MANIFEST_FILE = "manifest.json"
+KMEANS_ITERATIONS = 8
+# k-means is trained on a sample of this many vectors per IVF list
+KMEANS_SAMPLE_PER_LIST = 32
+# rows assigned to IVF lists at a time, bounds the memory of the score matrix
+ASSIGN_BATCH_SIZE = 8192
+MAX_CACHED_FILTERS = 64
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class IVFIndex:
+    """Inverted file index over normalized vectors: each vector is filed under
+    its nearest k-means centroid, and a query only scores the vectors filed
+    under its `num_probes` nearest centroids."""
+
+    def __init__(self, vectors: np.ndarray, num_lists: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), num_lists * KMEANS_SAMPLE_PER_LIST)
+        sample = np.asarray(
+            vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        )
+        centroids = sample[rng.choice(sample_size, num_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignments, kind="stable")
+            counts = np.bincount(assignments, minlength=num_lists)
+            non_empty = np.flatnonzero(counts)
+            # empty lists keep their centroid
+            centroids[non_empty] = normalize(
+                np.add.reduceat(
+                    sample[order], np.concatenate([[0], np.cumsum(counts)[:-1]])[non_empty]
+                )
+            )
+        self.centroids = centroids
+        self.lists: List[np.ndarray] = [
+            np.empty(0, dtype=np.int64) for _ in range(num_lists)
+        ]
+        self.num_rows = 0
+        self.add(vectors, 0)
+
+    def add(self, vectors: np.ndarray, start_row: int):
+        if not len(vectors):
+            return
+        assignments = np.concatenate(
+            [
+                np.argmax(
+                    vectors[start : start + ASSIGN_BATCH_SIZE] @ self.centroids.T,
+                    axis=1,
+                )
+                for start in range(0, len(vectors), ASSIGN_BATCH_SIZE)
+            ]
+        )
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=len(self.lists))
+        for list_index, rows in enumerate(np.split(order, np.cumsum(counts)[:-1])):
+            if len(rows):
+                self.lists[list_index] = np.concatenate(
+                    [self.lists[list_index], rows + start_row]
+                )
+        self.num_rows = start_row + len(vectors)
+
+    def snapshot(self) -> "IVFIndex":
+        """A copy that later adds don't change, for searching in a thread.
+        add() replaces the lists' arrays rather than growing them, so sharing
+        the arrays is safe."""
+        snapshot = copy.copy(self)
+        snapshot.lists = list(self.lists)
+        return snapshot
+
+    def get_candidates(self, query: np.ndarray, num_probes: int) -> np.ndarray:
+        nearest = np.argsort(-(self.centroids @ query))[:num_probes]
+        return np.concatenate([self.lists[i] for i in nearest])
+
+
+class LocalVectorDB(VectorDB):
+    """VectorDB stored in a local directory and searched in process.
+
+    Embeddings are normalized and appended to a float32 file that is memory
+    mapped for search, with the text, metadata and namespace of each row in a
+    JSON lines file next to it. Scores are cosine similarities. Small corpora
+    are searched exhaustively with one matrix-vector product, large ones
+    through an IVF index (see LocalVectorDBConfig). Searches run in a thread,
+    numpy releases the GIL for the heavy part.
+    """
+
+    def __init__(self, config: LocalVectorDBConfig, *args, **kwargs) -> None:
+        super().__init__(
+            *args, create_openai_client=config.embeddings_function is None, **kwargs
+        )
+        self.config = config
+        os.makedirs(self.config.path, exist_ok=True)
+        self.vectors_path = os.path.join(self.config.path, VECTORS_FILE)
+        self.documents_path = os.path.join(self.config.path, DOCUMENTS_FILE)
+        self.manifest_path = os.path.join(self.config.path, MANIFEST_FILE)
+
+        self.dimension: Optional[int] = None
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.dimension = json.load(f)["dimension"]
+        self.documents: List[dict] = []
+        if os.path.exists(self.documents_path):
+            with open(self.documents_path) as f:
+                self.documents = [json.loads(line) for line in f if line.strip()]
+        self.vectors = self.load_vectors()
+        self.drop_incomplete_rows()
+
+        self.index: Optional[IVFIndex] = None
+        self.build_index_task: Optional[asyncio.Task] = None
+        # filter -> which rows match
+        self.filter_masks: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def load_vectors(self) -> np.ndarray:
+        if self.dimension is None or not os.path.exists(self.vectors_path):
+            return np.empty((0, self.dimension or 0), dtype=np.float32)
+        num_rows = os.path.getsize(self.vectors_path) // (4 * self.dimension)
+        if num_rows == 0:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.memmap(
+            self.vectors_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(num_rows, self.dimension),
+        )
+
+    def drop_incomplete_rows(self):
+        """Truncates both files to the rows they share, after an interrupted add_texts"""
+        num_rows = min(len(self.vectors), len(self.documents))
+        if self.dimension is not None and os.path.exists(self.vectors_path):
+            row_bytes = 4 * self.dimension
+            if os.path.getsize(self.vectors_path) != num_rows * row_bytes:
+                logger.warning(f"Dropping incomplete vectors in {self.config.path}")
+                self.vectors = np.empty((0, self.dimension), dtype=np.float32)
+                os.truncate(self.vectors_path, num_rows * row_bytes)
+                self.vectors = self.load_vectors()
+        if len(self.documents) > num_rows:
+            logger.warning(f"Dropping incomplete documents in {self.config.path}")
+            del self.documents[num_rows:]
+            with open(self.documents_path, "w") as f:
+                for document in self.documents:
+                    f.write(json.dumps(document) + "\n")
+
+    async def create_embeddings(self, texts: List[str]) -> np.ndarray:
+        if self.config.embeddings_function is not None:
+            embeddings = await asyncio.to_thread(self.config.embeddings_function, texts)
+        else:
+            embeddings = await self.create_openai_embeddings(
+                texts, model=self.config.embeddings_model
+            )
+        return normalize(np.asarray(embeddings, dtype=np.float32))
+
+    async def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        namespace: Optional[str] = None,
+    ) -> List[str]:
+        """Embed texts and append them to the store.
+
+        Args:
+            texts: Iterable of strings to add to the vectorstore.
+            metadatas: Optional list of metadatas associated with the texts.
+            ids: Optional list of ids to associate with the texts.
+            namespace: Optional namespace to add the texts to.
+
+        Returns:
+            List of ids from adding the texts into the vectorstore.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        vectors = await self.create_embeddings(texts)
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+            with open(self.manifest_path, "w") as f:
+                json.dump({"dimension": self.dimension}, f)
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embeddings have dimension {vectors.shape[1]}, the store has {self.dimension}"
+            )
+
+        start_row = len(self.documents)
+        # vectors first: on load, documents without a vector are dropped
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        documents = [
+            {
+                "id": ids[i],
+                "text": text,
+                "metadata": metadatas[i] if metadatas else {},
+                "namespace": namespace or "",
+            }
+            for i, text in enumerate(texts)
+        ]
+        with open(self.documents_path, "a") as f:
+            for document in documents:
+                f.write(json.dumps(document) + "\n")
+        self.documents.extend(documents)
+        self.vectors = self.load_vectors()
+        self.filter_masks.clear()
+        if self.index is not None:
+            self.index.add(vectors, start_row)
+        return ids
+
+    def get_filter_mask(
+        self, filter: Optional[dict], namespace: Optional[str]
+    ) -> np.ndarray:
+        key = json.dumps([filter, namespace or ""], sort_keys=True, default=str)
+        mask = self.filter_masks.get(key)
+        if mask is None:
+            mask = np.fromiter(
+                (
+                    document["namespace"] == (namespace or "")
+                    and (not filter or matches_filter(document["metadata"], filter))
+                    for document in self.documents
+                ),
+                dtype=bool,
+                count=len(self.documents),
+            )
+            self.filter_masks[key] = mask
+            while len(self.filter_masks) > MAX_CACHED_FILTERS:
+                self.filter_masks.popitem(last=False)
+        self.filter_masks.move_to_end(key)
+        return mask
+
+    def get_index(self) -> Optional[IVFIndex]:
+        """The IVF index, if the corpus is large enough for one and it's built.
+        The first call starts building it in a thread, searches are exhaustive
+        until it's done."""
+        if (
+            self.config.ivf_min_vectors is None
+            or len(self.vectors) < self.config.ivf_min_vectors
+        ):
+            return None
+        if self.index is None and self.build_index_task is None:
+            num_lists = max(int(np.sqrt(len(self.vectors))), 1)
+            logger.debug(f"Building IVF index over {len(self.vectors)} vectors")
+            self.build_index_task = asyncio.create_task(
+                asyncio.to_thread(IVFIndex, self.vectors, num_lists)
+            )
+            self.build_index_task.add_done_callback(self.on_index_built)
+        return self.index
+
+    def on_index_built(self, build_index_task: asyncio.Task):
+        if build_index_task.cancelled() or build_index_task.exception():
+            logger.error(f"Failed to build IVF index: {build_index_task}")
+            return
+        index: IVFIndex = build_index_task.result()
+        # rows added while the index was being built
+        index.add(self.vectors[index.num_rows :], index.num_rows)
+        self.index = index
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        vectors: np.ndarray,
+        mask: np.ndarray,
+        k: int,
+        index: Optional[IVFIndex],
+    ) -> List[Tuple[int, float]]:
+        """Runs in a thread, over vectors, mask and index snapshotted together
+        on the event loop, so texts added meanwhile aren't seen half-way"""
+        rows: Optional[np.ndarray] = None
+        if index is not None:
+            candidates = index.get_candidates(query_vector, self.config.ivf_probes)
+            candidates = candidates[mask[candidates]]
+            # a selective filter can leave too few candidates in the probed lists
+            if len(candidates) >= k:
+                rows = candidates
+        if rows is None:
+            rows = np.flatnonzero(mask)
+        if len(rows) == len(vectors):
+            scores = vectors @ query_vector
+        else:
+            scores = vectors[rows] @ query_vector
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def to_document(self, row: int) -> Document:
+        document = self.documents[row]
+        return Document(
+            page_content=document["text"], metadata=dict(document["metadata"])
+        )
+
+    async def similarity_search_with_score(
+        self,
+        query: str,
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Return documents most similar to query, along with scores.
+
+        Args:
+            query: Text to look up documents similar to.
+            filter: Dictionary of argument(s) to filter on metadata
+            namespace: Namespace to search in. Default will search in '' namespace.
+
+        Returns:
+            List of Documents most similar to the query and score for each
+        """
+        if not self.documents:
+            return []
+        query_vector = (await self.create_embeddings([query]))[0]
+        mask = self.get_filter_mask(filter, namespace)
+        if not mask.any():
+            return []
+        index = self.get_index()
+        results = await asyncio.to_thread(
+            self.search,
+            query_vector,
+            self.vectors,
+            mask,
+            self.config.top_k,
+            index.snapshot() if index is not None else None,
+        )
+        return [(self.to_document(row), score) for row, score in results]
+
+    async def list_documents(
+        self,
+        filters: Optional[dict] = None,
+        namespace: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        pagination_token: Optional[str] = None,
+    ) -> Tuple[List[Document], Optional[str]]:
+        """Return a page of the documents matching the filter, in insertion order.
+
+        Args:
+            filters: Dictionary of argument(s) to filter on metadata
+            namespace: Namespace to list. Default will list the '' namespace.
+            page_size: Maximum number of documents in the page.
+            pagination_token: Token of the page, from the previous page.
+
+        Returns:
+            The documents and the token of the next page, None after the last page.
+        """
+        start_row = int(pagination_token) if pagination_token else 0
+        rows = start_row + np.flatnonzero(
+            self.get_filter_mask(filters, namespace)[start_row:]
+        )
+        next_token = str(rows[page_size]) if len(rows) > page_size else None
+        return [self.to_document(row) for row in rows[:page_size]], next_token
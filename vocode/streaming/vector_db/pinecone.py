@@ -1,14 +1,27 @@
+import asyncio
 import logging
 from typing import Iterable, List, Optional, Tuple
 import uuid
+import aiohttp
 from langchain.docstore.document import Document
 from vocode import getenv
 from vocode.streaming.models.vector_db import PineconeConfig
-from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.base_vector_db import (
+    DEFAULT_PAGE_SIZE,
+    VectorDB,
+    matches_filter,
+)
 
 logger = logging.getLogger(__name__)
 
-EMBEDDING_DIMENSION = 1536
+# vectors per upsert request, pinecone recommends at most 100
+UPSERT_BATCH_SIZE = 100
+MAX_UPSERT_RETRIES = 3
+UPSERT_RETRY_BACKOFF_SECONDS = 0.5
+# /vectors/list is only supported by serverless indexes, pod-based indexes answer with these
+LIST_UNSUPPORTED_STATUSES = (400, 404, 405, 501)
+# most matches a query returns with metadata, which bounds listing pod-based indexes
+MAX_QUERY_TOP_K = 1000
 class PineconeDB(VectorDB):
     def __init__(self, config: PineconeConfig, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -23,6 +36,9 @@ class PineconeDB(VectorDB):
         )
 
         self._text_key = "text"
+        # None until the first listing tells whether the index is serverless
+        self.supports_list_endpoint: Optional[bool] = None
+        self.dimension: Optional[int] = None
 
     async def add_texts(
         self,
@@ -45,29 +61,45 @@ class PineconeDB(VectorDB):
         # Adapted from: langchain/vectorstores/pinecone.py. Made langchain implementation async.
         if namespace is None:
             namespace = ""
+        texts = list(texts)
         # Embed and create the documents
         docs = []
         ids = ids or [str(uuid.uuid4()) for _ in texts]
+        embeddings = await self.create_openai_embeddings(texts)
         for i, text in enumerate(texts):
-            embedding = await self.create_openai_embedding(text)
-            metadata = metadatas[i] if metadatas else {}
+            metadata = dict(metadatas[i]) if metadatas else {}
             metadata[self._text_key] = text
-            docs.append({"id": ids[i], "values": embedding, "metadata": metadata})
+            docs.append({"id": ids[i], "values": embeddings[i], "metadata": metadata})
         # upsert to Pinecone
-        async with self.aiohttp_session.post(
-            f"{self.pinecone_url}/vectors/upsert",
-            headers={"Api-Key": self.pinecone_api_key},
-            json={
-                "vectors": docs,
-                "namespace": namespace,
-            },
-        ) as response:
-            response_json = await response.json()
-            if "message" in response_json:
-                logger.error(f"Error upserting vectors: {response_json}")
+        for start in range(0, len(docs), UPSERT_BATCH_SIZE):
+            await self.upsert(docs[start : start + UPSERT_BATCH_SIZE], namespace)
 
         return ids
 
+    async def upsert(self, vectors: List[dict], namespace: str):
+        """Upserts one batch of vectors, retrying rate limits, server and connection errors"""
+        for attempt in range(MAX_UPSERT_RETRIES + 1):
+            try:
+                async with self.aiohttp_session.post(
+                    f"{self.pinecone_url}/vectors/upsert",
+                    headers={"Api-Key": self.pinecone_api_key},
+                    json={
+                        "vectors": vectors,
+                        "namespace": namespace,
+                    },
+                ) as response:
+                    if response.ok:
+                        return
+                    error = f"{response.status} {await response.text()}"
+                    if response.status != 429 and response.status < 500:
+                        raise Exception(f"Error upserting vectors: {error}")
+            except aiohttp.ClientError as e:
+                error = str(e)
+            if attempt == MAX_UPSERT_RETRIES:
+                raise Exception(f"Error upserting vectors: {error}")
+            logger.warning(f"Retrying upsert of {len(vectors)} vectors: {error}")
+            await asyncio.sleep(UPSERT_RETRY_BACKOFF_SECONDS * 2**attempt)
+
     async def similarity_search_with_score(
         self,
         query: str,
@@ -114,48 +146,159 @@ class PineconeDB(VectorDB):
                 )
         return docs
     
-    async def retrieve_k_vectors_with_filter(
+    async def list_documents(
         self,
         filters: Optional[dict] = None,
-        k: Optional[int] = 50,
         namespace: Optional[str] = None,
-    ) -> List[Document]:
-        """Return pinecone list of documents based on filter.
+        page_size: int = DEFAULT_PAGE_SIZE,
+        pagination_token: Optional[str] = None,
+    ) -> Tuple[List[Document], Optional[str]]:
+        """Return a page of the pinecone documents matching the filter.
+
+        On serverless indexes, ids are listed with /vectors/list and their
+        metadata fetched with /vectors/fetch. Listing doesn't take a metadata
+        filter, so it's applied here, and a page can hold fewer than page_size
+        documents. Pod-based indexes don't support listing, so their documents
+        are found with a filtered query instead, which returns at most
+        MAX_QUERY_TOP_K of them.
 
         Args:
-            filter: Dictionary of argument(s) to filter on metadata
-            k: Int of number of vectors to retrieve. Default is 500.
-            namespace: Namespace to search in. Default will search in '' namespace.
+            filters: Dictionary of argument(s) to filter on metadata
+            namespace: Namespace to list. Default will list the '' namespace.
+            page_size: Number of ids to list, at most 100.
+            pagination_token: Token of the page, from the previous page.
 
         Returns:
-            List of Documents most similar to the query and score for each
+            The documents and the token of the next page, None after the last page.
         """
-        # Adapted from: langchain/vectorstores/pinecone.py. Made langchain implementation async.
         if namespace is None:
             namespace = ""
-      
-        query_embedding = [1] + [0] * (EMBEDDING_DIMENSION - 1)  
+        if self.supports_list_endpoint is not False:
+            listing = await self.list_ids(namespace, page_size, pagination_token)
+            if listing is not None:
+                ids, next_token = listing
+                return await self.fetch_documents(ids, filters, namespace), next_token
+        return await self.query_documents(
+            filters, namespace, page_size, pagination_token
+        )
+
+    async def list_ids(
+        self, namespace: str, page_size: int, pagination_token: Optional[str]
+    ) -> Optional[Tuple[List[str], Optional[str]]]:
+        """A page of ids and the token of the next page, None if the index doesn't support listing"""
+        params = {"namespace": namespace, "limit": page_size}
+        if pagination_token:
+            params["paginationToken"] = pagination_token
+        async with self.aiohttp_session.get(
+            f"{self.pinecone_url}/vectors/list",
+            headers={"Api-Key": self.pinecone_api_key},
+            params=params,
+        ) as response:
+            if (
+                response.status in LIST_UNSUPPORTED_STATUSES
+                and self.supports_list_endpoint is None
+            ):
+                logger.info(
+                    f"Index {self.index_name} doesn't support listing vectors, "
+                    "listing with queries instead"
+                )
+                self.supports_list_endpoint = False
+                return None
+            if not response.ok:
+                raise Exception(
+                    f"Error listing vectors: {response.status} {await response.text()}"
+                )
+            listing = await response.json()
+        self.supports_list_endpoint = True
+        ids = [vector["id"] for vector in listing.get("vectors", [])]
+        return ids, listing.get("pagination", {}).get("next")
+
+    async def fetch_documents(
+        self, ids: List[str], filters: Optional[dict], namespace: str
+    ) -> List[Document]:
+        if not ids:
+            return []
+        async with self.aiohttp_session.get(
+            f"{self.pinecone_url}/vectors/fetch",
+            headers={"Api-Key": self.pinecone_api_key},
+            params=[("ids", id) for id in ids] + [("namespace", namespace)],
+        ) as response:
+            if not response.ok:
+                raise Exception(
+                    f"Error fetching vectors: {response.status} {await response.text()}"
+                )
+            vectors = (await response.json())["vectors"]
+
         recordings = []
+        for id in ids:
+            # deleted since it was listed
+            if id not in vectors:
+                continue
+            metadata = dict(vectors[id].get("metadata") or {})
+            if filters and not matches_filter(metadata, filters):
+                continue
+            recordings.extend(self.to_documents([metadata]))
+        return recordings
+
+    async def get_dimension(self) -> int:
+        if self.dimension is None:
+            async with self.aiohttp_session.post(
+                f"{self.pinecone_url}/describe_index_stats",
+                headers={"Api-Key": self.pinecone_api_key},
+                json={},
+            ) as response:
+                if not response.ok:
+                    raise Exception(
+                        f"Error describing index: {response.status} {await response.text()}"
+                    )
+                self.dimension = (await response.json())["dimension"]
+        return self.dimension
+
+    async def query_documents(
+        self,
+        filters: Optional[dict],
+        namespace: str,
+        page_size: int,
+        pagination_token: Optional[str],
+    ) -> Tuple[List[Document], Optional[str]]:
+        """Lists with a filtered query for a fixed vector, so the matches come back
+        in the same order every time and the token is an offset into them"""
+        offset = int(pagination_token) if pagination_token else 0
+        top_k = min(offset + page_size, MAX_QUERY_TOP_K)
+        query_embedding = [1.0] + [0.0] * (await self.get_dimension() - 1)
         async with self.aiohttp_session.post(
             f"{self.pinecone_url}/query",
             headers={"Api-Key": self.pinecone_api_key},
             json={
-                "top_k": k,
+                "top_k": top_k,
                 "namespace": namespace,
                 "filter": filters,
                 "vector": query_embedding,
                 "includeMetadata": True,
             },
         ) as response:
-            results = await response.json()
+            if not response.ok:
+                raise Exception(
+                    f"Error querying vectors: {response.status} {await response.text()}"
+                )
+            matches = (await response.json())["matches"]
+        next_token = (
+            str(top_k) if len(matches) == top_k and top_k < MAX_QUERY_TOP_K else None
+        )
+        return (
+            self.to_documents([match["metadata"] for match in matches[offset:]]),
+            next_token,
+        )
 
-        for res in results["matches"]:
-            metadata = res["metadata"]
+    def to_documents(self, metadatas: List[dict]) -> List[Document]:
+        recordings = []
+        for metadata in metadatas:
             if self._text_key in metadata:
+                metadata = dict(metadata)
                 text = metadata.pop(self._text_key)
                 recordings.append(Document(page_content=text, metadata=metadata))
             else:
                 logger.warning(
                     f"Found vector with no `{self._text_key}` key. Skipping."
                 )
-        return recordings
\ No newline at end of file
+        return recordings
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+from opentelemetry import metrics
+
+from vocode.streaming.models.model import BaseModel
+from vocode.streaming.vector_db.base_vector_db import VectorDB
+
+if TYPE_CHECKING:
+    from langchain.docstore.document import Document
+
+meter = metrics.get_meter(__name__)
+retrieval_wait_histogram = meter.create_histogram(
+    name="agent.retrieval.wait_time",
+    unit="seconds",
+    description="Time a turn waited on vector db retrieval before starting the LLM",
+)
+retrieval_counter = meter.create_counter(
+    name="agent.retrieval.lookups",
+    unit="lookups",
+    description="Retrievals per turn, by whether a speculative retrieval was used",
+)
+
+# interim transcripts shorter than this aren't worth a retrieval
+MIN_SPECULATIVE_QUERY_WORDS = 3
+MAX_CACHED_QUERIES = 32
+
+
+class RetrievalStatus(str, Enum):
+    # a speculative retrieval of the same query had finished
+    HIT = "hit"
+    # a speculative retrieval of the same query was still running
+    PENDING = "pending"
+    # no speculative retrieval of the query, it was started on the final transcript
+    MISS = "miss"
+    # the retrieval of the query didn't finish within the budget, the results of
+    # a speculative retrieval of an earlier interim transcript were used
+    PARTIAL = "partial"
+    # the retrieval didn't finish within the budget (or failed), no results were used
+    TIMEOUT = "timeout"
+
+
+class RetrievalResult(BaseModel):
+    docs_with_scores: List[Tuple[Any, float]]
+    status: RetrievalStatus
+    wait_seconds: float
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s']", " ", text.lower()).split())
+
+
+def is_failed(retrieval: asyncio.Task) -> bool:
+    return retrieval.done() and (
+        retrieval.cancelled() or retrieval.exception() is not None
+    )
+
+
+class SpeculativeRetriever:
+    """Runs vector db retrievals ahead of the final transcript.
+
+    Retrievals are started from stable interim transcripts (the same text in
+    two consecutive interims) and cached for the conversation by normalized
+    query, so the final transcript often finds its results already fetched.
+    On turns with speculative retrievals, `retrieve` never waits longer than
+    the latency budget: the LLM is started with whatever finished in time.
+    Turns without any wait for the retrieval of the final transcript, as does
+    every turn if the budget is None.
+    """
+
+    def __init__(
+        self,
+        vector_db: VectorDB,
+        latency_budget_seconds: Optional[float],
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.vector_db = vector_db
+        self.latency_budget_seconds = latency_budget_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        # normalized query -> retrieval, oldest first
+        self.retrievals: OrderedDict[
+            str, asyncio.Task[List[Tuple["Document", float]]]
+        ] = OrderedDict()
+        # normalized queries prefetched this turn, in the order they were started
+        self.turn_queries: List[str] = []
+        self.last_interim: Optional[str] = None
+
+    def get_retrieval(
+        self, query: str, key: str
+    ) -> "asyncio.Task[List[Tuple[Document, float]]]":
+        retrieval = self.retrievals.get(key)
+        # failures aren't cached
+        if retrieval is None or is_failed(retrieval):
+            retrieval = asyncio.create_task(
+                self.vector_db.similarity_search_with_score(query)
+            )
+            retrieval.add_done_callback(self.log_failure)
+            self.retrievals[key] = retrieval
+        self.retrievals.move_to_end(key)
+        while len(self.retrievals) > MAX_CACHED_QUERIES:
+            _, evicted = self.retrievals.popitem(last=False)
+            evicted.cancel()
+        return retrieval
+
+    def log_failure(self, retrieval: asyncio.Task):
+        if is_failed(retrieval) and not retrieval.cancelled():
+            self.logger.debug(f"Retrieval failed: {retrieval.exception()}")
+
+    def on_interim_transcript(self, text: str):
+        key = normalize_query(text)
+        is_stable = key == self.last_interim
+        self.last_interim = key
+        if not is_stable or len(key.split()) < MIN_SPECULATIVE_QUERY_WORDS:
+            return
+        if key not in self.turn_queries:
+            self.logger.debug(f"Starting speculative retrieval for: {text}")
+            self.turn_queries.append(key)
+        self.get_retrieval(text, key)
+
+    def get_partial_results(self, key: str) -> Optional[List[Tuple["Document", float]]]:
+        """Results of the latest finished retrieval this turn of a prefix of the query"""
+        for turn_query in reversed(self.turn_queries):
+            retrieval = self.retrievals.get(turn_query)
+            if (
+                retrieval is not None
+                and f"{key} ".startswith(f"{turn_query} ")
+                and retrieval.done()
+                and not is_failed(retrieval)
+            ):
+                return retrieval.result()
+        return None
+
+    async def retrieve(self, query: str) -> RetrievalResult:
+        start_time = time.time()
+        key = normalize_query(query)
+        retrieval = self.retrievals.get(key)
+        if retrieval is None or is_failed(retrieval):
+            status = RetrievalStatus.MISS
+        elif retrieval.done():
+            status = RetrievalStatus.HIT
+        else:
+            status = RetrievalStatus.PENDING
+        retrieval = self.get_retrieval(query, key)
+        # with nothing retrieved ahead of the final transcript, starting the LLM
+        # without documents would only save the time of one retrieval
+        latency_budget_seconds = (
+            self.latency_budget_seconds if self.turn_queries else None
+        )
+        docs_with_scores: List[Tuple["Document", float]] = []
+        try:
+            # shielded so that a retrieval that misses the budget still fills the cache
+            docs_with_scores = await asyncio.wait_for(
+                asyncio.shield(retrieval), latency_budget_seconds
+            )
+        except asyncio.TimeoutError:
+            partial_results = self.get_partial_results(key)
+            if partial_results is not None:
+                status = RetrievalStatus.PARTIAL
+                docs_with_scores = partial_results
+            else:
+                status = RetrievalStatus.TIMEOUT
+        except Exception as e:
+            self.logger.error(f"Error while hitting vector db: {e}", exc_info=True)
+            status = RetrievalStatus.TIMEOUT
+        wait_seconds = time.time() - start_time
+        retrieval_wait_histogram.record(wait_seconds, {"status": status.value})
+        retrieval_counter.add(1, {"status": status.value})
+        self.logger.debug(
+            f"Retrieval {status.value}: waited {wait_seconds:.3f}s for {len(docs_with_scores)} documents"
+        )
+        self.turn_queries = []
+        self.last_interim = None
+        return RetrievalResult(
+            docs_with_scores=docs_with_scores,
+            status=status,
+            wait_seconds=wait_seconds,
+        )
+
+    def cancel(self):
+        for retrieval in self.retrievals.values():
+            retrieval.cancel()
+        self.retrievals.clear()
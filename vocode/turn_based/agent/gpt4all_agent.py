@@ -2,7 +2,8 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor, wait
 import logging
 import sys
-from typing import Optional
+import threading
+from typing import Callable, Optional
 from vocode.turn_based.agent.base_agent import BaseAgent
 
 
@@ -66,12 +67,21 @@ class GPT4AllAgent(BaseAgent):
         self.logger.debug(f"LLM response: {response}")
         return response
 
-    async def respond_async(self, human_input) -> str:
+    async def respond_async(
+        self,
+        human_input,
+        cancel_event: Optional[threading.Event] = None,
+        new_token_callback: Optional[Callable[[str], None]] = None,
+    ) -> str:
         prompt = self.create_prompt(human_input)
         response_buffer = ""
 
         def new_text_callback(text):
             nonlocal response_buffer
+            if cancel_event is not None and cancel_event.is_set():
+                raise StopThreadException("Generation cancelled")
+            if new_token_callback is not None:
+                new_token_callback(text)
             response_buffer += text
             if len(response_buffer) > len(prompt) and response_buffer.endswith(
                 "Human:"
@@ -0,0 +1,153 @@
+import asyncio
+import ctypes
+import multiprocessing
+import pathlib
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from vocode.utils.whisper_cpp.whisper_params import WhisperFullParams
+
+WHISPER_CPP_SAMPLING_RATE = 16000
+
+# whisper.cpp state of a pool worker process, one context per process
+_whisper = None
+_ctx = None
+_params: Optional[WhisperFullParams] = None
+_language: Optional[bytes] = None
+
+
+def init_whisper_worker(libname: str, fname_model: str, n_threads: int, language: str):
+    global _whisper, _ctx, _params, _language
+    _whisper = ctypes.CDLL(libname)
+    _whisper.whisper_init_from_file.restype = ctypes.c_void_p
+    _whisper.whisper_full_default_params.restype = WhisperFullParams
+    _whisper.whisper_full_get_segment_text.restype = ctypes.c_char_p
+    _whisper.whisper_full_get_token_p.restype = ctypes.c_float
+    _ctx = _whisper.whisper_init_from_file(fname_model.encode("utf-8"))
+    if not _ctx:
+        raise RuntimeError(f"Could not load whisper model {fname_model}")
+    _params = _whisper.whisper_full_default_params()
+    _params.print_realtime = False
+    _params.print_progress = False
+    _params.single_segment = False
+    _params.n_threads = n_threads
+    _language = language.encode("utf-8")
+    _params.language = _language
+
+
+def transcribe_window(audio: bytes, initial_prompt: str) -> Tuple[str, float]:
+    """Runs whisper_full on float32 16kHz audio in a pool worker.
+
+    Returns the text of all segments and the mean token probability.
+    """
+    assert _whisper is not None and _params is not None
+    samples = np.frombuffer(audio, dtype=np.float32)
+    # kept referenced until whisper_full returns
+    prompt = initial_prompt.encode("utf-8")
+    _params.initial_prompt = prompt if prompt else None
+    result = _whisper.whisper_full(
+        ctypes.c_void_p(_ctx),
+        _params,
+        samples.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+        len(samples),
+    )
+    if result != 0:
+        raise RuntimeError(f"whisper_full failed with {result}")
+    texts = []
+    token_probabilities = []
+    for i_segment in range(_whisper.whisper_full_n_segments(ctypes.c_void_p(_ctx))):
+        texts.append(
+            _whisper.whisper_full_get_segment_text(
+                ctypes.c_void_p(_ctx), i_segment
+            ).decode("utf-8", errors="ignore")
+        )
+        for i_token in range(
+            _whisper.whisper_full_n_tokens(ctypes.c_void_p(_ctx), i_segment)
+        ):
+            token_probabilities.append(
+                _whisper.whisper_full_get_token_p(
+                    ctypes.c_void_p(_ctx), i_segment, i_token
+                )
+            )
+    text = "".join(texts).strip()
+    # heuristic to filter out non-speech, e.g. "[BLANK_AUDIO]" or "(music)"
+    if not re.search(r"^\w", text):
+        return "", 0.0
+    confidence = float(np.mean(token_probabilities)) if token_probabilities else 0.0
+    return text, confidence
+
+
+def warm_up_worker() -> bool:
+    return _ctx is not None
+
+
+class WhisperCPPContextPool:
+    """A process pool where every worker holds a loaded whisper.cpp context.
+
+    Transcribers share it rather than each loading the model, so the number of
+    models in memory (and concurrent decodes) is `num_contexts` however many
+    calls are running. whisper_full runs outside of the calling process, so it
+    neither blocks the event loop nor holds the GIL.
+    """
+
+    def __init__(
+        self,
+        libname: str,
+        fname_model: str,
+        num_contexts: int = 1,
+        n_threads: int = 4,
+        language: str = "en",
+    ):
+        self.num_contexts = num_contexts
+        # resolved here like WhisperCPPTranscriber always did, relative to the cwd
+        libname = str(pathlib.Path().absolute() / libname)
+        self.executor = ProcessPoolExecutor(
+            max_workers=num_contexts,
+            # spawn rather than fork: the parent has a running event loop and threads
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_whisper_worker,
+            initargs=(libname, fname_model, n_threads, language),
+        )
+
+    async def transcribe(
+        self, audio: np.ndarray, initial_prompt: str = ""
+    ) -> Tuple[str, float]:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            transcribe_window,
+            audio.astype(np.float32).tobytes(),
+            initial_prompt,
+        )
+
+    async def warm_up(self):
+        """Starts the workers and loads their models ahead of the first call"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, warm_up_worker)
+                for _ in range(self.num_contexts)
+            )
+        )
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+context_pools: Dict[Tuple, WhisperCPPContextPool] = {}
+
+
+def get_context_pool(
+    libname: str,
+    fname_model: str,
+    num_contexts: int = 1,
+    n_threads: int = 4,
+    language: str = "en",
+) -> WhisperCPPContextPool:
+    """The process-wide pool for this model, created on first use"""
+    key = (libname, fname_model, num_contexts, n_threads, language)
+    if key not in context_pools:
+        context_pools[key] = WhisperCPPContextPool(*key)
+    return context_pools[key]